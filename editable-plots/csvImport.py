@@ -0,0 +1,407 @@
+"""
+Import of chart data from CSV input.
+
+Rows are parsed in chunks and the values of each chunk are converted and validated at once with NumPy.
+Large files are imported on a background thread, which reports its progress and the first invalid row
+to a queue polled from the Tk thread, so the window does not freeze while a file is imported.
+Binary datasets (kiwiplots.Dataset) are opened memory-mapped instead of being parsed.
+"""
+import csv
+import os
+import queue
+from itertools import islice
+from threading import Event, Thread
+from typing import Iterable, Iterator
+import numpy as np
+from kiwiplots import Dataset
+
+CHUNK_ROWS = 50000
+
+class CSVFormatError(ValueError):
+    """
+    Error raised for the first row of CSV input which is not in the format of the chart.
+
+    Attributes:
+        row (int): number of the invalid row, starting from 1
+    """
+    def __init__(self, row: int, message: str):
+        super().__init__(f"Row {row}: {message}")
+        self.row : int = row
+
+def _chunks(rows: Iterable[list[str]], chunkRows: int) -> Iterator[list[list[str]]]:
+    """Splits rows to lists of at most chunkRows rows.
+    """
+    rows = iter(rows)
+    while chunk := list(islice(rows, chunkRows)):
+        yield chunk
+
+def _toFloats(fields: list[str] | tuple[str, ...]) -> tuple[np.ndarray, np.ndarray]:
+    """Converts fields to floats.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: Values (NaN for invalid fields) and mask of fields which are not numbers.
+    """
+    try:
+        return np.array(fields, dtype=np.float64), np.zeros(len(fields), dtype=bool)
+    except ValueError:
+        pass
+    # only chunks with an invalid field are converted one by one to find it
+    invalid = np.zeros(len(fields), dtype=bool)
+    values = np.full(len(fields), np.nan)
+    for index, field in enumerate(fields):
+        try:
+            values[index] = float(field)
+        except ValueError:
+            invalid[index] = True
+    return values, invalid
+
+def _concatenate(chunks: list[np.ndarray]) -> np.ndarray:
+    """Concatenates arrays of chunks, no chunks give an empty array.
+    """
+    return np.concatenate(chunks) if chunks else np.empty(0)
+
+class ChartDataParser:
+    """
+    Abstract parser converting and validating rows of CSV input for one chart type.
+
+    Rows are fed in chunks. Number of values in rows is checked first, values of a chunk are then converted and validated at once.
+    Result has the format of arguments of the UIFactory method creating the chart.
+
+    Attributes:
+        rows (int): number of valid rows fed so far
+    """
+    WIDTH : int = 0
+    LENGTH_MESSAGE : str = ""
+
+    def __init__(self):
+        self.rows : int = 0
+
+    def Feed(self, rows: list[list[str]]):
+        """Converts and validates a chunk of rows.
+
+        Args:
+            rows (list[list[str]]): Rows of CSV input following the rows fed before.
+
+        Raises:
+            CSVFormatError: If a row is not in the format of the chart. The first invalid row is reported.
+        """
+        lengths = np.fromiter(map(len, rows), dtype=np.int64, count=len(rows))
+        invalidLength = self._invalidLength(lengths)
+        end = int(np.argmax(invalidLength)) if invalidLength.any() else len(rows)
+        # rows before the first row of wrong length may still contain an invalid value
+        if end > 0:
+            self._parse(rows[:end], lengths[:end])
+        self.rows += end
+        if end < len(rows):
+            raise CSVFormatError(self.rows + 1, self.LENGTH_MESSAGE)
+
+    def ParseRows(self, rows: Iterable[list[str]], chunkRows: int = CHUNK_ROWS) -> list:
+        """Converts and validates all rows.
+
+        Args:
+            rows (Iterable[list[str]]): Rows of CSV input, e.g. a csv.reader.
+            chunkRows (int): Number of rows validated at once.
+
+        Returns:
+            list: Data of the chart, see Result.
+
+        Raises:
+            CSVFormatError: If a row is not in the format of the chart.
+        """
+        for chunk in _chunks(rows, chunkRows):
+            self.Feed(chunk)
+        return self.Result()
+
+    def Result(self) -> list:
+        """Returns data of all fed rows in the format of arguments of the UIFactory method creating the chart.
+
+        Returns:
+            list: Data of the chart.
+        """
+        raise NotImplementedError("Method ChartDataParser.Result must be declared in subclass")
+
+    def _invalidLength(self, lengths: np.ndarray) -> np.ndarray:
+        """Mask of rows with a wrong number of values. Rows of fixed width charts have WIDTH values.
+        """
+        return lengths != self.WIDTH
+
+    def _parse(self, rows: list[list[str]], lengths: np.ndarray):
+        """Converts and validates a chunk of rows of correct length.
+        """
+        raise NotImplementedError("Method ChartDataParser._parse must be declared in subclass")
+
+    def _check(self, *conditions: tuple[np.ndarray, str]):
+        """Raises CSVFormatError for the first row marked by any mask of invalid rows, the message of the mask is reported.
+        """
+        first : tuple[int, str] | None = None
+        for invalid, message in conditions:
+            if invalid.any():
+                index = int(np.argmax(invalid))
+                if first is None or index < first[0]:
+                    first = (index, message)
+        if first is not None:
+            raise CSVFormatError(self.rows + first[0] + 1, first[1])
+
+class BarChartDataParser(ChartDataParser):
+    """
+    Parser of bar chart input. Every row is a group of bars given as pairs of name and value.
+    """
+    LENGTH_MESSAGE = "Row must contain pairs of name and value"
+
+    def __init__(self):
+        super().__init__()
+        self.names : list[list[str]] = []
+        self.values : list[np.ndarray] = []
+        self.counts : list[np.ndarray] = []
+
+    def _invalidLength(self, lengths: np.ndarray) -> np.ndarray:
+        return lengths % 2 != 0
+
+    def _parse(self, rows: list[list[str]], lengths: np.ndarray):
+        counts = lengths // 2
+        values, invalid = _toFloats([value for row in rows for value in row[1::2]])
+        rowOfValue = np.repeat(np.arange(len(rows)), counts)
+        self._check((np.bincount(rowOfValue[invalid], minlength=len(rows)) > 0, "Value of a bar is not a number"))
+        self.names.extend(row[0::2] for row in rows)
+        self.values.append(values)
+        self.counts.append(counts)
+
+    def Result(self) -> list:
+        """Returns names and values of bars grouped by rows.
+
+        Returns:
+            list: [names, values] as lists of groups.
+        """
+        values = _concatenate(self.values).tolist()
+        bounds = np.cumsum(_concatenate(self.counts).astype(np.int64)).tolist()
+        return [self.names, [values[start:end] for start, end in zip([0] + bounds[:-1], bounds)]]
+
+class HistogramDataParser(ChartDataParser):
+    """
+    Parser of histogram input. Every row is a bucket given by low and high boundary of its interval and its value.
+    Intervals must be nonempty and contiguous.
+    """
+    WIDTH = 3
+    LENGTH_MESSAGE = "Row must contain low and high boundary of interval and value"
+
+    def __init__(self):
+        super().__init__()
+        self.lows : list[np.ndarray] = []
+        self.highs : list[np.ndarray] = []
+        self.values : list[np.ndarray] = []
+        self.lastHigh : float | None = None
+
+    def _parse(self, rows: list[list[str]], lengths: np.ndarray):
+        columns = list(zip(*rows))
+        (low, invalidLow), (high, invalidHigh), (values, invalidValue) = (_toFloats(column) for column in columns)
+        # the first interval starts anywhere, every next one starts at the end of the previous one
+        previousHigh = np.concatenate(([low[0] if self.lastHigh is None else self.lastHigh], high[:-1]))
+        self._check((invalidLow | invalidHigh | invalidValue, "Value is not a number"),
+                    (~((previousHigh == low) & (high > low)), "Intervals must be nonempty and contiguous"))
+        self.lows.append(low)
+        self.highs.append(high)
+        self.values.append(values)
+        self.lastHigh = float(high[-1])
+
+    def Result(self) -> list:
+        """Returns values and intervals of buckets.
+
+        Returns:
+            list: [values, intervals] where intervals is a list of (low, high) tuples.
+        """
+        return [_concatenate(self.values).tolist(), list(zip(_concatenate(self.lows).tolist(), _concatenate(self.highs).tolist()))]
+
+class CandlestickDataParser(ChartDataParser):
+    """
+    Parser of candlestick chart input. Every row is a candle given by name, opening, closing, minimum and maximum.
+    Opening and closing must be between minimum and maximum.
+    """
+    WIDTH = 5
+    LENGTH_MESSAGE = "Row must contain name, opening, closing, minimum and maximum"
+
+    def __init__(self):
+        super().__init__()
+        self.names : list[str] = []
+        self.values : list[np.ndarray] = []
+
+    def _parse(self, rows: list[list[str]], lengths: np.ndarray):
+        columns = list(zip(*rows))
+        converted = [_toFloats(column) for column in columns[1:]]
+        opening, closing, minimum, maximum = (values for values, _ in converted)
+        inRange = (minimum <= maximum) & (minimum <= opening) & (opening <= maximum) & (minimum <= closing) & (closing <= maximum)
+        self._check((np.logical_or.reduce([invalid for _, invalid in converted]), "Value is not a number"),
+                    (~inRange, "Opening and closing must be between minimum and maximum"))
+        self.names.extend(columns[0])
+        self.values.append(np.column_stack((opening, closing, minimum, maximum)))
+
+    def Result(self) -> list:
+        """Returns names and values of candles.
+
+        Returns:
+            list: [names, openings, closings, minima, maxima] as lists.
+        """
+        values = np.concatenate(self.values) if self.values else np.empty((0, 4))
+        return [self.names] + [values[:, column].tolist() for column in range(4)]
+
+class LineChartDataParser(ChartDataParser):
+    """
+    Parser of line chart input. Every row is a point given by name and value.
+    """
+    WIDTH = 2
+    LENGTH_MESSAGE = "Row must contain name and value"
+
+    def __init__(self):
+        super().__init__()
+        self.names : list[str] = []
+        self.values : list[np.ndarray] = []
+
+    def _parse(self, rows: list[list[str]], lengths: np.ndarray):
+        names, fields = zip(*rows)
+        values, invalid = _toFloats(fields)
+        self._check((invalid, "Value is not a number"))
+        self.names.extend(names)
+        self.values.append(values)
+
+    def Result(self) -> list:
+        """Returns names and values of points.
+
+        Returns:
+            list: [names, values] as lists.
+        """
+        return [self.names, _concatenate(self.values).tolist()]
+
+PARSERS : dict[str, type[ChartDataParser]] = {
+    "Bar chart": BarChartDataParser,
+    "Histogram": HistogramDataParser,
+    "Candlestick chart": CandlestickDataParser,
+    "Line chart": LineChartDataParser,
+}
+
+DATASET_PLOT_TYPES : dict[str, str] = {
+    "bar_chart": "Bar chart",
+    "histogram": "Histogram",
+    "candlestick_chart": "Candlestick chart",
+    "line_chart": "Line chart",
+}
+
+DATASET_COLUMNS : dict[str, tuple[str, ...]] = {
+    "bar_chart": ("names", "groups", Dataset.GROUP_SIZES),
+    "histogram": ("values", "interval_boundries"),
+    "candlestick_chart": ("names", "openings", "closings", "minimums", "maximums"),
+    "line_chart": ("names", "points"),
+}
+
+def DatasetChartData(dataset: Dataset) -> list:
+    """Converts columns of a dataset to data of the chart in the format of results of the parsers.
+    Numeric columns are not copied, UIFactory reads them as arrays.
+
+    Args:
+        dataset (Dataset): Opened dataset.
+
+    Returns:
+        list: Data of the chart, see Result of the parser of the chart type.
+
+    Raises:
+        ValueError: If the dataset lacks a column of the chart or columns have different lengths.
+    """
+    missing = [name for name in DATASET_COLUMNS[dataset.chart] if name not in dataset]
+    if missing:
+        raise ValueError(f"Dataset has no column {missing[0]}")
+    if dataset.chart == "bar_chart":
+        if len(dataset["names"]) != len(dataset["groups"]) or dataset[Dataset.GROUP_SIZES].sum() != len(dataset["groups"]):
+            raise ValueError("Names, values and group sizes of bars do not match")
+        return [[group.tolist() for group in dataset.Grouped("names")], dataset.Grouped("groups")]
+    if dataset.chart == "histogram":
+        boundaries = dataset["interval_boundries"].tolist()
+        if len(boundaries) != len(dataset["values"]) + 1:
+            raise ValueError("Dataset must contain one more interval boundary than values")
+        return [dataset["values"], list(zip(boundaries[:-1], boundaries[1:]))]
+    columns = [dataset[name] for name in DATASET_COLUMNS[dataset.chart]]
+    if any(len(column) != len(columns[0]) for column in columns):
+        raise ValueError("Columns of the dataset must have the same length")
+    # names are copied to lists, numeric columns are passed to the chart as (memory-mapped) arrays
+    return [columns[0].tolist()] + columns[1:]
+
+class ImportEvent:
+    """
+    Progress of a CSV import reported by the import thread.
+
+    Attributes:
+        state (str): "progress", "finished" or "failed"
+        rows (int): number of rows imported so far
+        progress (float): imported part of the file between 0 and 1
+        result (list | None): data of the chart when the import is finished
+        error (Exception | None): error of a failed import, CSVFormatError for the first invalid row
+    """
+    PROGRESS : str = "progress"
+    FINISHED : str = "finished"
+    FAILED : str = "failed"
+
+    def __init__(self, state: str, rows: int, progress: float, result: list | None = None, error: Exception | None = None):
+        self.state : str = state
+        self.rows : int = rows
+        self.progress : float = progress
+        self.result : list | None = result
+        self.error : Exception | None = error
+
+class CSVImport:
+    """
+    Import of a CSV file on a background thread. Chunks of rows are parsed and validated by the parser of the chart type,
+    the import stops at the first invalid row. Progress is reported after every chunk.
+
+    Attributes:
+        file (str): path of the imported file
+        plotType (str): chart type the data are validated for, a key of PARSERS
+        chunkRows (int): number of rows validated at once
+    """
+    def __init__(self, file: str, plotType: str, chunkRows: int = CHUNK_ROWS):
+        self.file : str = file
+        self.plotType : str = plotType
+        self.chunkRows : int = chunkRows
+        self._events : queue.Queue[ImportEvent] = queue.Queue()
+        self._cancelled : Event = Event()
+        # an abandoned import must not keep the application running
+        self._worker : Thread = Thread(target=self._run, name="kiwiplots-csv-import", daemon=True)
+
+    def Start(self):
+        """Starts the import thread.
+        """
+        self._worker.start()
+
+    def Cancel(self):
+        """Stops the import after the current chunk. No more events are reported.
+        """
+        self._cancelled.set()
+
+    def Poll(self) -> list[ImportEvent]:
+        """Returns events reported since the last call without waiting. Called from the Tk thread.
+
+        Returns:
+            list[ImportEvent]: Reported events in order.
+        """
+        events = []
+        while True:
+            try:
+                events.append(self._events.get_nowait())
+            except queue.Empty:
+                return events
+
+    def _run(self):
+        """Body of the import thread.
+        """
+        parser = PARSERS[self.plotType]()
+        try:
+            size = os.path.getsize(self.file)
+            with open(self.file, "r", newline="") as file:
+                for chunk in _chunks(csv.reader(file), self.chunkRows):
+                    if self._cancelled.is_set():
+                        return
+                    parser.Feed(chunk)
+                    self._events.put(ImportEvent(ImportEvent.PROGRESS, parser.rows, file.buffer.tell() / size if size else 1.0))
+                result = parser.Result()
+        except Exception as error:
+            if not self._cancelled.is_set():
+                self._events.put(ImportEvent(ImportEvent.FAILED, parser.rows, 1.0, error=error))
+            return
+        if not self._cancelled.is_set():
+            self._events.put(ImportEvent(ImportEvent.FINISHED, parser.rows, 1.0, result=result))
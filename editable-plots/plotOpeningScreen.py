@@ -2,7 +2,9 @@ import tkinter as tk
 from tkinter import simpledialog
 from tkinter import messagebox, filedialog
 from kiwiplots import *
+from csvImport import CSVImport, ImportEvent, PARSERS, CSVFormatError, DATASET_PLOT_TYPES, DatasetChartData
 import csv
+import os
 import kiwisolver
 
 # Font constants
@@ -17,6 +19,10 @@ DEFAULT_PLOT_HEIGHT = 500
 DATA_INPUT_HEIGHT = 20
 DATA_INPUT_WIDTH = 50
 
+# CSV import constants
+CSV_TEXT_IMPORT_LIMIT = 1 << 20 # larger files are imported in background and not shown in the data input
+IMPORT_POLL_INTERVAL = 100 # milliseconds between checks of the progress of an import
+
 class MenuScreen:
     """
     A GUI application for data visualization using tkinter.
@@ -41,6 +47,11 @@ class MenuScreen:
         self.mainMenu = tk.Frame(self.root, bg="bisque2")
         self.mainMenu.pack(fill="both",expand=True)
         self.xAxisValueEntry = None
+        self.csvImport : CSVImport | None = None
+        self.importedData : list | None = None
+        self.importError : Exception | None = None
+        self.importedPlotType : str | None = None
+        self._importNote : str = ""
 
         self._setDataInput()
         self._setPlotTypeMenu()
@@ -52,6 +63,7 @@ class MenuScreen:
         self._setPlotDimentionsMenu()
         self._setAxisLabelsMenu()
         self.chosenPlotType.trace_add("write", self._updateXAxisValueEntry)
+        self.chosenPlotType.trace_add("write", self._on_plotType_change)
         self._setGenerateButton()
         self._setXAxisValueEntry()
         self._updateXAxisValueEntry()
@@ -110,8 +122,8 @@ class MenuScreen:
         """
         Set up the data input section of the GUI.
 
-        Creates a frame with a text area for manual data entry and an import button
-        for loading CSV files.
+        Creates a frame with a text area for manual data entry, an import button
+        for loading CSV files and a label showing the progress of an import.
         """
         self.dataInputFrame = tk.Frame(self.mainMenu, bg="bisque2")
         self.dataInputFrame.pack()
@@ -123,6 +135,8 @@ class MenuScreen:
 
         self.importButton = tk.Button(self.dataInputFrame, text="Import as CSV", command=self.on_importCSV_click)
         self.importButton.grid(row=2, column=0, pady=PADDING_SMALL, sticky="w")
+        self.importStatus = tk.Label(self.dataInputFrame, text="", font=("Arial", LABEL_FONT_SIZE), bg="bisque2")
+        self.importStatus.grid(row=3, column=0, sticky="w")
 
     def _setPlotTypeMenu(self):
         """
@@ -221,269 +235,199 @@ class MenuScreen:
         """
         Handle the CSV import button click event.
 
-        Opens a dialog for the user to enter a file path, reads the CSV file,
-        and populates the data input text field with its contents.
+        Opens a dialog for the user to choose a file. Small files populate the data input text field.
+        Files larger than CSV_TEXT_IMPORT_LIMIT bypass the text field, they are parsed and validated
+        for the chosen plot type on a background thread while the window stays responsive.
+        Datasets (.npz) are opened memory-mapped and select the plot type of their data.
         """
         #fileAddress = simpledialog.askstring("Enter address of the file","File path: ")
-        fileAddress = filedialog.askopenfilename(parent=self.root,title="Load data from csv", filetypes=[("CSV files","*.csv"),("All files","*.*")])
-        if fileAddress is None:
+        fileAddress = filedialog.askopenfilename(parent=self.root,title="Load data", filetypes=[("CSV files","*.csv"),("Datasets","*.npz"),("All files","*.*")])
+        if not fileAddress:
             return
-        
-        else:
-            input : str = ""
-            with open(fileAddress, "r") as file:
-                for line in file:
-                    input += line
-            self.dataInputField.delete("1.0", "end")
-            self.dataInputField.insert("1.0", input)
-    
-    def on_generateButton_click(self):
-        """
-        Handle the generate button click event.
-
-        Retrieves all user inputs (dimensions, data, plot type, labels), validates
-        the data format, and launches the appropriate plot based on the selected type.
-        Destroys the current window and opens the plot visualization.
-        """
-        width = int(self.widthEntry.get())
-        height = int(self.heightEntry.get())
-        input : str = self.dataInputField.get("1.0", "end").strip()
-        plotType = self.chosenPlotType.get()
-        xLabel = self.xAxisEntry.get()
-        yLabel = self.yAxisEntry.get()
-        title = self.plotTitle.get()
-        if plotType == "Bar chart":
-            self._runBarChart(input, width, height, xLabel, yLabel,title)
-        elif plotType == "Histogram":
-            self._runHistogram(input, width, height, xLabel, yLabel,title)
-        elif plotType == "Candlestick chart":
-            self._runCandlestickChart(input, width, height, xLabel, yLabel,title)
-        elif plotType == "Line chart":
-            self._runLineChart(input, width, height, xLabel, yLabel,title)
+        self._cancelImport()
+        if fileAddress.lower().endswith(".npz"):
+            self._openDataset(fileAddress)
+            return
+        if os.path.getsize(fileAddress) > CSV_TEXT_IMPORT_LIMIT:
+            self._startImport(fileAddress)
+            return
+        with open(fileAddress, "r") as file:
+            input : str = file.read()
+        self.dataInputField.delete("1.0", "end")
+        self.dataInputField.insert("1.0", input)
 
-    @staticmethod
-    def _csvToListOfLists(fileString : str):
+    def _startImport(self, fileAddress : str):
         """
-        Convert a CSV string to a list of lists.
+        Start a background import of a CSV file for the chosen plot type.
 
-        Parses the input string as CSV data and returns it as a list where each
-        element is a list representing a row of the CSV.
+        The data input text field shows a note instead of the file contents.
+        Replacing the note with other text switches back to manual data entry.
 
         Args:
-            fileString (str): The CSV data as a string.
-
-        Returns:
-            list[list[str]]: A list of lists containing the CSV data.
-        """
-        return list(csv.reader(fileString.splitlines()))
-    
-    @staticmethod
-    def _isFloat(string : str):
+            fileAddress (str): Path of the CSV file.
         """
-        Check if a string can be converted to a float.
+        self._cancelImport()
+        self.csvImport = CSVImport(fileAddress, self.chosenPlotType.get())
+        self.importedPlotType = self.csvImport.plotType
+        self._showImportNote(fileAddress)
+        self.importStatus.config(text=f"Importing {os.path.basename(fileAddress)}...")
+        self.csvImport.Start()
+        self.root.after(IMPORT_POLL_INTERVAL, self._pollImport, self.csvImport)
 
-        Attempts to convert the string to a float and returns True if successful,
-        False otherwise.
+    def _openDataset(self, fileAddress : str):
+        """
+        Open a dataset and select the plot type of its data. The data input text field shows a note instead of the data.
 
         Args:
-            string (str): The string to check.
-
-        Returns:
-            bool: True if the string is a valid float, False otherwise.
+            fileAddress (str): Path of the dataset.
         """
         try:
-            a = float(string)
-            return True
-        except ValueError:
-            return False
+            dataset = Dataset.Open(fileAddress)
+            data = DatasetChartData(dataset)
+        except (OSError, ValueError) as e:
+            messagebox.showerror("Warning", f"Dataset cannot be opened.\n{e}")
+            return
+        self.importedPlotType = DATASET_PLOT_TYPES[dataset.chart]
+        self.chosenPlotType.set(self.importedPlotType)
+        self.importedData = data
+        self._showImportNote(fileAddress)
+        self.importStatus.config(text=f"Opened dataset {os.path.basename(fileAddress)}")
 
-    def _validateInput_For_BarChart(self, CSVlistOfLists : list[list[str]]):
+    def _showImportNote(self, fileAddress : str):
         """
-        Validate CSV data for bar chart format.
-
-        Checks that each row has an even number of columns (alternating names and values)
-        and that all value columns contain valid floats.
+        Replace the contents of the data input text field with a note about the imported file.
+        Replacing the note with other text switches back to manual data entry.
 
         Args:
-            CSVlistOfLists (list[list[str]]): The CSV data as a list of lists.
+            fileAddress (str): Path of the imported file.
+        """
+        self._importNote = f"Data are imported from {os.path.basename(fileAddress)} and are not shown.\nReplace this text to enter data manually."
+        self.dataInputField.delete("1.0", "end")
+        self.dataInputField.insert("1.0", self._importNote)
 
-        Returns:
-            bool: True if the data is valid for a bar chart, False otherwise.
+    def _cancelImport(self):
         """
-        for line in CSVlistOfLists:
-            if (len(line) % 2 != 0):
-                return False
-            for i in range(1,len(line),2):
-                if not self._isFloat(line[i]):
-                    return False
-        return True
-    
-    def _validateInput_For_Histogram(self, CSVlistOfLists : list[list[str]]):
+        Cancel the background import and forget imported data.
         """
-        Validate CSV data for histogram format.
+        if self.csvImport is not None:
+            self.csvImport.Cancel()
+        self.csvImport = None
+        self.importedData = None
+        self.importError = None
+        self.importedPlotType = None
+        self._importNote = ""
+        self.importStatus.config(text="")
 
-        Checks that each row has exactly 3 columns (low, high, value), all are floats,
-        intervals are contiguous (each low equals previous high), and high > low.
+    def _pollImport(self, csvImport : CSVImport):
+        """
+        Show the progress of a background import. Runs on the Tk thread until the import finishes, fails or is replaced.
 
         Args:
-            CSVlistOfLists (list[list[str]]): The CSV data as a list of lists.
+            csvImport (CSVImport): The polled import.
+        """
+        if csvImport is not self.csvImport:
+            return
+        name = os.path.basename(csvImport.file)
+        for event in csvImport.Poll():
+            if event.state == ImportEvent.PROGRESS:
+                self.importStatus.config(text=f"Importing {name}: {event.rows} rows ({event.progress:.0%})")
+            elif event.state == ImportEvent.FINISHED:
+                self.importedData = event.result
+                self.importStatus.config(text=f"Imported {event.rows} rows from {name}")
+                return
+            else:
+                self.importError = event.error
+                self.importStatus.config(text=f"Import of {name} failed")
+                messagebox.showerror("Warning", f"Input file is not in correct format.\n{event.error}")
+                return
+        self.root.after(IMPORT_POLL_INTERVAL, self._pollImport, csvImport)
 
-        Returns:
-            bool: True if the data is valid for a histogram, False otherwise.
+    def _on_plotType_change(self, *args):
         """
-        lastIntervalBoundary = None
-        for line in CSVlistOfLists:
-            if len(line) != 3:
-                return False
-            if not (self._isFloat(line[0]) and self._isFloat(line[1]) and self._isFloat(line[2])):
-                return False
-            low, high = float(line[0]), float(line[1])
-            if lastIntervalBoundary == None:
-                lastIntervalBoundary = low
-            if lastIntervalBoundary != low or (high <= low):
-                return False
-            lastIntervalBoundary = high
-        return True
-    
-    def _validateInput_For_CandlestickChart(self, CSVlistOfLists : list[list[str]]):
+        Import the file again when the plot type changes, imported data are validated for the plot type.
         """
-        Validate CSV data for candlestick chart format.
-
-        Checks that each row has exactly 5 columns (name, open, close, min, max),
-        all numeric columns are floats, min <= max, and open/close are within min-max range.
-
-        Args:
-            CSVlistOfLists (list[list[str]]): The CSV data as a list of lists.
+        if self.csvImport is not None and self._isImportShown():
+            self._startImport(self.csvImport.file)
 
-        Returns:
-            bool: True if the data is valid for a candlestick chart, False otherwise.
+    def _isImportShown(self) -> bool:
         """
-        for line in CSVlistOfLists:
-            if len(line) != 5:
-                return False
-            if not (self._isFloat(line[1]) and self._isFloat(line[2]) and self._isFloat(line[3] and self._isFloat(line[4]))): # pyright: ignore[reportArgumentType]
-                    return False
-            opening, closing, minimum, maximum = float(line[1]), float(line[2]), float(line[3]), float(line[4])
-            if (minimum > maximum) or not (minimum <= opening <= maximum) or not (minimum <= closing <= maximum):
-                return False
-        return True
-    
-    def _validateInput_For_LineChart(self, CSVlistOfLists : list[list[str]]):
-        for line in CSVlistOfLists:
-            if len(line) != 2:
-                return False
-            if not (self._isFloat(line[1])):
-                return False
-        return True
-            
-
-    def _prepareInput_BarChart(self, inputString : str):
+        Check whether the data input text field shows the note of an imported file instead of manually entered data.
         """
-        Prepare and validate input data for bar chart generation.
-
-        Converts CSV string to list format, validates it, and organizes data
-        into names and values lists for bar chart creation.
+        return self._importNote != "" and self.dataInputField.get("1.0", "end").strip() == self._importNote.strip()
 
-        Args:
-            inputString (str): The CSV data as a string.
-
-        Returns:
-            list or None: [names, values] where names and values are lists of lists,
-                         or None if validation fails.
-        """
-        CSVlist = self._csvToListOfLists(inputString)
-        if not self._validateInput_For_BarChart(CSVlist):
-            return None        
-        names = []
-        values = []
-        for line in CSVlist:
-            newValueGroup = []
-            newNameGroup = []
-            for i in range(len(line)):
-                if i%2 == 0:
-                    newNameGroup.append(line[i])
-                else:
-                    newValueGroup.append(float(line[i]))
-            names.append(newNameGroup)
-            values.append(newValueGroup)
-        return [names, values]
     
-    def _prepareInput_Histogram(self, inputString : str):
+    def on_generateButton_click(self):
         """
-        Prepare and validate input data for histogram generation.
-
-        Converts CSV string to list format, validates it, and organizes data
-        into values and intervals for histogram creation.
-
-        Args:
-            inputString (str): The CSV data as a string.
+        Handle the generate button click event.
 
-        Returns:
-            list or None: [values, intervals] where values is a list of floats
-                         and intervals is a list of (low, high) tuples, or None if validation fails.
+        Retrieves all user inputs (dimensions, data, plot type, labels), validates
+        the data format, and launches the appropriate plot based on the selected type.
+        Data of a file imported in background are used when the data input shows its note.
+        Destroys the current window and opens the plot visualization.
         """
-        CSVlist = self._csvToListOfLists(inputString)
-        if not self._validateInput_For_Histogram(CSVlist):
-            return None
-        intervals = []
-        values = []
-        for line in CSVlist:
-            intervals.append((float(line[0]),float(line[1])))
-            values.append(float(line[2]))
-        return [values, intervals]
-
-    def _prepareInput_CandlestickChart(self, inputString : str):
+        width = int(self.widthEntry.get())
+        height = int(self.heightEntry.get())
+        input : str = self.dataInputField.get("1.0", "end").strip()
+        plotType = self.chosenPlotType.get()
+        xLabel = self.xAxisEntry.get()
+        yLabel = self.yAxisEntry.get()
+        title = self.plotTitle.get()
+        if self._isImportShown():
+            if self.importError is not None:
+                messagebox.showerror("Warning", f"Input file is not in correct format.\n{self.importError}")
+                return
+            if self.importedData is None:
+                messagebox.showinfo("Import in progress", "Data are still being imported.")
+                return
+            if plotType != self.importedPlotType:
+                messagebox.showerror("Warning", f"Imported data are data of {self.importedPlotType}.")
+                return
+            data = self.importedData
+        else:
+            data = self._prepareInput(plotType, input)
+        if plotType == "Bar chart":
+            self._runBarChart(data, width, height, xLabel, yLabel,title)
+        elif plotType == "Histogram":
+            self._runHistogram(data, width, height, xLabel, yLabel,title)
+        elif plotType == "Candlestick chart":
+            self._runCandlestickChart(data, width, height, xLabel, yLabel,title)
+        elif plotType == "Line chart":
+            self._runLineChart(data, width, height, xLabel, yLabel,title)
+    
+    @staticmethod
+    def _prepareInput(plotType : str, inputString : str):
         """
-        Prepare and validate input data for candlestick chart generation.
+        Prepare and validate input data for generation of a chart.
 
-        Converts CSV string to list format, validates it, and organizes data
-        into separate lists for names, openings, closings, minima, and maxima.
+        Parses the CSV string and validates it in chunks by the parser of the plot type.
 
         Args:
+            plotType (str): The chosen plot type.
             inputString (str): The CSV data as a string.
 
         Returns:
-            list or None: [names, openings, closings, minima, maxima] as lists,
-                         or None if validation fails.
+            list or None: Data of the chart in the format of arguments of the UIFactory method creating it
+                         (see parsers in csvImport), or None if validation fails.
         """
-        CSVlist = self._csvToListOfLists(inputString)
-        if not self._validateInput_For_CandlestickChart(CSVlist):
-            return None
-        names, openings, closings, minima, maxima = [], [], [], [], []
-        for line in CSVlist:
-            names.append(line[0])
-            openings.append(float(line[1]))
-            closings.append(float(line[2]))
-            minima.append(float(line[3]))
-            maxima.append(float(line[4]))
-        return [names, openings, closings, minima, maxima]
-    
-    def _prepareInput_LineChart(self, inputString : str):
-        CSVlist = self._csvToListOfLists(inputString)
-        if not self._validateInput_For_LineChart(CSVlist):
+        try:
+            return PARSERS[plotType]().ParseRows(csv.reader(inputString.splitlines()))
+        except CSVFormatError:
             return None
-        names, values = [], []
-        for line in CSVlist:
-            names.append(line[0])
-            values.append(float(line[1]))
-        return [names,values]
-        
 
-    def _runBarChart(self, input : str, width : int, height : int, xLabel : str, yLabel : str, title: str):
+    def _runBarChart(self, data : list | None, width : int, height : int, xLabel : str, yLabel : str, title: str):
         """
         Generate and display a bar chart.
 
-        Prepares the input data, validates it, and if valid, destroys the current
+        Checks the prepared input data, and if valid, destroys the current
         window and opens a new bar chart visualization using UIFactory.
 
         Args:
-            input (str): The CSV data as a string.
+            data (list | None): The prepared input data, None if the input is not in correct format.
             width (int): The width of the plot canvas.
             height (int): The height of the plot canvas.
             xLabel (str): The label for the X axis.
             yLabel (str): The label for the Y axis.
         """
-        data = self._prepareInput_BarChart(input)
         if data is None:
             messagebox.showerror("Warning","Input text is not in correct format.")
             return
@@ -494,21 +438,20 @@ class MenuScreen:
         self.root.destroy()
         UIFactory.CreateBarChart(title,xLabel,yLabel,values,names,width,height).View()
     
-    def _runHistogram(self, input : str, width : int, height : int, xLabel : str, yLabel : str, title: str):
+    def _runHistogram(self, data : list | None, width : int, height : int, xLabel : str, yLabel : str, title: str):
         """
         Generate and display a histogram.
 
-        Prepares the input data, validates it, and if valid, destroys the current
+        Checks the prepared input data, and if valid, destroys the current
         window and opens a new histogram visualization using UIFactory.
 
         Args:
-            input (str): The CSV data as a string.
+            data (list | None): The prepared input data, None if the input is not in correct format.
             width (int): The width of the plot canvas.
             height (int): The height of the plot canvas.
             xLabel (str): The label for the X axis.
             yLabel (str): The label for the Y axis.
         """
-        data = self._prepareInput_Histogram(input)
         if data is None or len(data) == 0:
             messagebox.showerror("Empty data","Data must be be nonempty")
             return
@@ -517,22 +460,21 @@ class MenuScreen:
         UIFactory.CreateHistogram(title,xLabel,yLabel,data[0],data[1],width,height).View()
         
 
-    def _runCandlestickChart(self, input : str, width : int, height : int, xLabel : str, yLabel : str, title: str):
+    def _runCandlestickChart(self, data : list | None, width : int, height : int, xLabel : str, yLabel : str, title: str):
         """
         Generate and display a candlestick chart.
 
-        Prepares the input data, validates it, and if valid, destroys the current
+        Checks the prepared input data, and if valid, destroys the current
         window and opens a new candlestick chart visualization using UIFactory.
         Includes the X axis value from the additional input field.
 
         Args:
-            input (str): The CSV data as a string.
+            data (list | None): The prepared input data, None if the input is not in correct format.
             width (int): The width of the plot canvas.
             height (int): The height of the plot canvas.
             xLabel (str): The label for the X axis.
             yLabel (str): The label for the Y axis.
         """
-        data = self._prepareInput_CandlestickChart(input)
         if data is None:
             messagebox.showerror("Warning","Input text is not in correct format.")
             return
@@ -545,9 +487,8 @@ class MenuScreen:
         self.root.destroy()
         UIFactory.CreateCandlesticChart(title,xLabel,yLabel,xAxisValue,openings,closings,minima,maxima,names,width,height).View()
     
-    def _runLineChart(self, input : str, width : int, height : int, xLabel : str, yLabel : str, title: str):
+    def _runLineChart(self, data : list | None, width : int, height : int, xLabel : str, yLabel : str, title: str):
         print("Line chart checkpoint 1")
-        data = self._prepareInput_LineChart(input)
         if data is None:
             messagebox.showerror("Warning","Input text is not in correct format.")
             return
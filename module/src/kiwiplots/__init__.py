@@ -20,4 +20,20 @@ from kiwiplots.plotui.histogrameventhandler import *
 
 from kiwiplots.plotui.barcharteventhandler import *
 from kiwiplots.plotui.plotmetadata import *
-from kiwiplots.plotui.datautils import *
\ No newline at end of file
+from kiwiplots.plotui.datautils import *
+from kiwiplots.plotui.downsampling import *
+from kiwiplots.plotui.raster import *
+from kiwiplots.plotui.labelplacement import *
+from kiwiplots.plotui.fonts import *
+from kiwiplots.plotui.picturelayout import *
+from kiwiplots.plotui.tiledexport import *
+from kiwiplots.plotui.vectorexport import *
+from kiwiplots.plotui.exportcache import *
+from kiwiplots.plotui.exportqueue import *
+from kiwiplots.plotui.viewtransform import *
+from kiwiplots.plotui.datasets import *
+from kiwiplots.plotui.sqlitesource import *
+from kiwiplots.plotui.livefeed import *
+from kiwiplots.plotui.tickaggregator import *
+from kiwiplots.plotui.histogrambinning import *
+from kiwiplots.plotui.histogramsketch import *
\ No newline at end of file
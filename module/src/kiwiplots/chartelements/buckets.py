@@ -62,7 +62,25 @@ class VariableBucket(VariableRectangle):
             tuple[float,float]: interval the bucket represents
         """
         return self.interval
-    
+
+    def ChangeInterval(self, interval: tuple[float,float], widthScale: float = 1) -> tuple[Constraint, Constraint]:
+        """
+        Interval setter. The name follows the interval, the width scale replaces the horizontal position constraint.
+
+        Args:
+            interval (tuple[float,float]): new interval of the bucket.
+            widthScale (float, optional): new width scale of the bucket. Defaults to 1.
+
+        Returns:
+            tuple[Constraint, Constraint]: replaced and new horizontal position constraint.
+        """
+        oldConstraint = self.horizontalPositionConstraint
+        self.interval = interval
+        self.name = f"[{interval[0]}, {interval[1]}]"
+        self.widthScale = widthScale
+        self.horizontalPositionConstraint = ((self.leftBottom.X + self.width * self.widthScale == self.rightTop.X) | "required")
+        return oldConstraint, self.horizontalPositionConstraint
+
     def Value(self)->ValueBucket:
         """
         Value representation of the bucket.
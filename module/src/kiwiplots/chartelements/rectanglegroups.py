@@ -1,3 +1,4 @@
+import bisect
 from kiwisolver import Variable, Constraint
 from .basicelements import VariableElement
 from .rectangles import *
@@ -161,6 +162,11 @@ class VariableBarGroup(VariableRectangleGroup):
 
 class VariableBucketGroup(VariableRectangleGroup):
     """Represents group of buckets for histogram
+
+    Attributes:
+        buckets (list[VariableBucket]) : buckets in the group, the same list as rectangles
+        color (Union[str,int]) : color of new buckets
+        alignmentConstraints (dict[VariableBucket, Constraint]) : constraints aligning the bottom of each bucket (except the one defining bottomY) to bottomY
     """
     def __init__(self, bucketWidth: Variable, innerSpacing: Variable, intervals: list[tuple[float,float]], widthScales : list[float], color : Union[str,int] = "blue"):
         assert len(intervals) == len(widthScales)
@@ -172,16 +178,27 @@ class VariableBucketGroup(VariableRectangleGroup):
         self.rectangles = self.buckets
         self.innerSpacing = innerSpacing
         self.width = bucketWidth
+        self.color = color
 
         for i in range(1,len(self.rectangles)):
-            self.rectangles[i].SetSpacingConstraint((self.rectangles[i-1].rightTop.X + self.innerSpacing == self.rectangles[i].leftBottom.X) | "required")
+            self.rectangles[i].SetSpacingConstraint(self._createSpacingConstraint(self.rectangles[i-1], self.rectangles[i]))
 
         self.leftMostX : Variable = self.rectangles[0].leftBottom.X
         self.rightMostX : Variable = self.rectangles[-1].rightTop.X
         self.bottomY : Variable = self.rectangles[0].leftBottom.Y
+        self.alignmentConstraints : dict[VariableBucket, Constraint] = {bucket: self._createAlignmentConstraint(bucket) for bucket in self.buckets[1:]}
 
         self.spacingConstraint : Constraint | None = None
-    
+
+    def _createSpacingConstraint(self, previous: VariableBucket, bucket: VariableBucket) -> Constraint:
+        return (previous.rightTop.X + self.innerSpacing == bucket.leftBottom.X) | "required"
+
+    def _createAlignmentConstraint(self, bucket: VariableBucket) -> Constraint:
+        return (bucket.leftBottom.Y == self.bottomY) | "required"
+
+    def _getVerticalAligmentConstraints(self)->list[Constraint]:
+        return list(self.alignmentConstraints.values())
+
     def AddBucket(self, interval: tuple[float,float], widthScale: float = 1):
         """Appends new bucket to the group
 
@@ -192,9 +209,81 @@ class VariableBucketGroup(VariableRectangleGroup):
         Returns:
             VariableBucket: new bucket
         """
-        newBucket = VariableBucket(width=self.width, interval=interval, widthScale=widthScale)
+        newBucket = VariableBucket(width=self.width, interval=interval, color=self.color, widthScale=widthScale)
         lastRectangle = self.rectangles[-1]
         self.rectangles.append(newBucket)
-        newBucket.SetSpacingConstraint((lastRectangle.rightTop.X + self.innerSpacing == newBucket.leftBottom.X) | "required")
+        newBucket.SetSpacingConstraint(self._createSpacingConstraint(lastRectangle, newBucket))
+        self.alignmentConstraints[newBucket] = self._createAlignmentConstraint(newBucket)
         self.rightMostX = newBucket.rightTop.X
-        return newBucket
\ No newline at end of file
+        return newBucket
+
+    def SetIntervals(self, intervals: list[tuple[float,float]], widthScales: list[float]):
+        """Changes intervals of all buckets, keeping the variables of the current buckets.
+
+        Every current bucket is mapped to the new interval containing its start. The first bucket mapped to an interval
+        takes the interval, other buckets mapped to it are removed (merged into it), so are buckets outside of the new intervals.
+        Intervals without mapped buckets get new buckets. A merged bucket takes a changed color of the buckets merged into it.
+
+        Args:
+            intervals (list[tuple[float,float]]): sorted, non-overlapping intervals of the buckets
+            widthScales (list[float]): width scales of the buckets
+
+        Returns:
+            tuple: indices of current buckets mapped to each new bucket, added buckets, removed buckets,
+                   list of constraints to add and list of constraints to remove.
+        """
+        assert len(intervals) == len(widthScales) and len(intervals) > 0
+        oldBuckets = self.buckets
+        starts = [interval[0] for interval in intervals]
+        sources : list[list[int]] = [[] for _ in intervals]
+        for index, bucket in enumerate(oldBuckets):
+            target = bisect.bisect_right(starts, bucket.interval[0]) - 1
+            if target >= 0 and bucket.interval[0] < intervals[target][1]:
+                sources[target].append(index)
+
+        constraintsToAdd : list[Constraint] = []
+        constraintsToRemove : list[Constraint] = []
+        buckets : list[VariableBucket] = []
+        added : list[VariableBucket] = []
+        for target in range(len(intervals)):
+            if sources[target]:
+                bucket = oldBuckets[sources[target][0]]
+                if tuple(bucket.interval) != tuple(intervals[target]) or bucket.widthScale != widthScales[target]:
+                    oldConstraint, newConstraint = bucket.ChangeInterval(intervals[target], widthScales[target])
+                    constraintsToRemove.append(oldConstraint)
+                    constraintsToAdd.append(newConstraint)
+                for index in sources[target]:
+                    if oldBuckets[index].color != self.color:
+                        bucket.ChangeColor(oldBuckets[index].color)
+                        break
+            else:
+                bucket = VariableBucket(width=self.width, interval=intervals[target], color=self.color, widthScale=widthScales[target])
+                added.append(bucket)
+                constraintsToAdd.extend(bucket.GetAllConstraints())
+            buckets.append(bucket)
+
+        kept = set(buckets)
+        removed = [bucket for bucket in oldBuckets if bucket not in kept]
+        for bucket in removed:
+            constraintsToRemove.extend(bucket.GetAllConstraints())
+            if bucket in self.alignmentConstraints:
+                constraintsToRemove.append(self.alignmentConstraints.pop(bucket))
+
+        # spacing constraints change only where the left neighbour of a bucket changes
+        previousBuckets = {bucket: oldBuckets[index-1] if index else None for index, bucket in enumerate(oldBuckets)}
+        for index, bucket in enumerate(buckets):
+            previous = buckets[index-1] if index else None
+            if bucket not in previousBuckets or previousBuckets[bucket] is not previous:
+                if bucket.spacingConstraint is not None and bucket in previousBuckets:
+                    constraintsToRemove.append(bucket.spacingConstraint)
+                bucket.spacingConstraint = None if previous is None else self._createSpacingConstraint(previous, bucket)
+                if bucket.spacingConstraint is not None:
+                    constraintsToAdd.append(bucket.spacingConstraint)
+            if bucket.leftBottom.Y is not self.bottomY and bucket not in self.alignmentConstraints:
+                self.alignmentConstraints[bucket] = self._createAlignmentConstraint(bucket)
+                constraintsToAdd.append(self.alignmentConstraints[bucket])
+
+        self.buckets = self.rectangles = buckets
+        self.leftMostX = buckets[0].leftBottom.X
+        self.rightMostX = buckets[-1].rightTop.X
+        return sources, added, removed, constraintsToAdd, constraintsToRemove
@@ -49,6 +49,7 @@ class VariableRectangle(VariableElement):
         horizontalPositionConstraint (Constraint) : constraint declaring the distance of vertical sides of the rectangle
         verticalPositionConstraint (Constraint) : constraint declaring the distance of horizontal sides of the rectangle
         spacingConstraint (Constraint) : constraint declaring left spacing of the rectangle on the canvas. It is not created during construction and has to be set externaly using SetSpacingConstraint method.
+        positionConstraints (list[Constraint]) : constraints keeping the height and the corners non-negative, created once so that they can be removed from a solver
     """
     def __init__(self, width: Variable, name: str, color : Union[str,int] = "blue", widthScale : float = 1):
         self.height = Variable(f"{name}_height")
@@ -62,6 +63,7 @@ class VariableRectangle(VariableElement):
         self.horizontalPositionConstraint : Constraint = ((self.leftBottom.X + self.width * self.widthScale == self.rightTop.X) | "required")
         self.verticalPositionConstraint : Constraint = ((self.leftBottom.Y + self.height == self.rightTop.Y) | "required")
         self.spacingConstraint : Constraint | None = None 
+        self.positionConstraints : list[Constraint] = [(self.height >= 0)|"required",(self.leftBottom.X >= 0) | "required", (self.leftBottom.Y >= 0) | "required", (self.rightTop.X >= 0) | "required", (self.rightTop.Y >= 0) | "required"]
 
 
     def ChangeName(self, name: str):
@@ -92,7 +94,7 @@ class VariableRectangle(VariableElement):
         return constraints
 
     def _getPositionConstraints(self) -> list[Constraint]:
-        return [(self.height >= 0)|"required",(self.leftBottom.X >= 0) | "required", (self.leftBottom.Y >= 0) | "required", (self.rightTop.X >= 0) | "required", (self.rightTop.Y >= 0) | "required"]
+        return list(self.positionConstraints)
 
     def SetSpacingConstraint(self, spacingConstraint : Constraint):
         """
@@ -30,34 +30,38 @@ class BarChartEventHandler(RectangleEventHandler):
     # Inicialization #
     ###################
 
-    def __init__(self, plotMetadata: BarChartMetadata, solver: BarChartSolver) -> None:
+    def __init__(self, plotMetadata: BarChartMetadata, solver: BarChartSolver, canvasDrawerType: type[BarChartCanvasDrawer] = BarChartCanvasDrawer, dataViewerType: type[BarChartDataViewer] = BarChartDataViewer) -> None:
         """Initializes the BarChartEventHandler with plot metadata and solver.
 
         Args:
             plotMetadata (BarChartMetadata): Metadata about the bar chart including scale factor and axis values.
             solver (BarChartSolver): Solver containing bar chart data.
+            canvasDrawerType (type[BarChartCanvasDrawer], optional): Canvas drawer class used for rendering. Defaults to BarChartCanvasDrawer.
+            dataViewerType (type[BarChartDataViewer], optional): Data viewer class used for showing values. Defaults to BarChartDataViewer.
         """
         super().__init__(plotMetadata, solver)
         self.plotSolver : BarChartSolver = solver
         self.plotMetadata : BarChartMetadata = plotMetadata
+        self.canvasDrawerType : type[BarChartCanvasDrawer] = canvasDrawerType
+        self.dataViewerType : type[BarChartDataViewer] = dataViewerType
 
     @inheritdocstring(RectangleEventHandler.initializeDataView)
     def initializeDataView(self, textWindow: tk.Text) -> None:
         """Initializes the data viewer for bar chart display.
         
-        Creates a BarChartDataViewer to display bar values in the text window.
+        Creates a data viewer of dataViewerType to display bar values in the text window.
         """
-        self.dataViewer = BarChartDataViewer(textWindow)
+        self.dataViewer = self.dataViewerType(textWindow)
     
     @inheritdocstring(RectangleEventHandler.initializeCanvas)
     def initializeCanvas(self, canvas: tk.Canvas, width: int, height: int) -> None:
         """Initializes the canvas drawer for bar chart visualization.
         
-        Creates a BarChartCanvasDrawer for rendering bars on the canvas.
+        Creates a canvas drawer of canvasDrawerType for rendering bars on the canvas.
         """
         self.canvas = canvas
         self.canvasHeight = height
-        self.drawer = BarChartCanvasDrawer(canvas,width,height)
+        self.drawer = self.canvasDrawerType(canvas,width,height)
     
     @inheritdocstring(RectangleEventHandler.initializeRightClickMenu)
     def initializeRightClickMenu(self, menu: tk.Menu) -> None:
@@ -61,15 +61,19 @@ class CandlesticEventHandler(EventHandler):
     
     LeftEvents: TypeAlias = CandleEventRegistersLeftButton.CandleLeftEvents
 
-    def __init__(self, plotMetadata: CandlesticPlotMetadata, solver: CandlestickChartSolver) -> None:
+    def __init__(self, plotMetadata: CandlesticPlotMetadata, solver: CandlestickChartSolver, canvasDrawerType: type[CandlesticCanvasDrawer] = CandlesticCanvasDrawer, dataViewerType: type[CandlesticDataViewer] = CandlesticDataViewer) -> None:
         """Initializes the CandlesticEventHandler with plot metadata and solver.
 
         Args:
             plotMetadata (CandlesticPlotMetadata): Metadata about the candlestick chart including scale factor and axis values.
             solver (CandlestickChartSolver): Solver containing candlestick data.
+            canvasDrawerType (type[CandlesticCanvasDrawer], optional): Canvas drawer class used for rendering. Defaults to CandlesticCanvasDrawer.
+            dataViewerType (type[CandlesticDataViewer], optional): Data viewer class used for showing values. Defaults to CandlesticDataViewer.
         """
         super().__init__(plotMetadata)
         self.plotSolver : CandlestickChartSolver = solver
+        self.canvasDrawerType : type[CandlesticCanvasDrawer] = canvasDrawerType
+        self.dataViewerType : type[CandlesticDataViewer] = dataViewerType
         self.canvasHeight : int = None  # pyright: ignore[reportAttributeAccessIssue]
         self.eventRegistersLeft : CandlesticEventHandler.CandleEventRegistersLeftButton = CandlesticEventHandler.CandleEventRegistersLeftButton()
         self.eventRegistersRight : CandlesticEventHandler.CandleEventRegistersRightButton = CandlesticEventHandler.CandleEventRegistersRightButton()
@@ -81,19 +85,19 @@ class CandlesticEventHandler(EventHandler):
     def initializeDataView(self, textWindow: tk.Text):
         """Initializes the data viewer for candlestick chart display.
         
-        Creates a CandlesticDataViewer to display candle values in the text window.
+        Creates a data viewer of dataViewerType to display candle values in the text window.
         """
-        self.dataViewer = CandlesticDataViewer(textWindow)
+        self.dataViewer = self.dataViewerType(textWindow)
     
     @inheritdocstring(EventHandler.initializeCanvas)
     def initializeCanvas(self, canvas: tk.Canvas, width: int, height : int):
         """Initializes the canvas drawer for candlestick chart visualization.
         
-        Creates a CandlesticCanvasDrawer for rendering candles on the canvas.
+        Creates a canvas drawer of canvasDrawerType for rendering candles on the canvas.
         """
         self.canvas = canvas
         self.canvasHeight = height
-        self.drawer = CandlesticCanvasDrawer(canvas, width, height)
+        self.drawer = self.canvasDrawerType(canvas, width, height)
     
     @inheritdocstring(EventHandler.initializeRightClickMenu)
     def initializeRightClickMenu(self, menu: tk.Menu) -> None:
@@ -326,6 +330,7 @@ class CandlesticEventHandler(EventHandler):
     @inheritdocstring(EventHandler.on_left_up)
     def on_left_up(self, event: tk.Event):
         self.eventRegistersLeft.reset()
+        self._endGesture()
     
     #######################
     # Mouse move handling #
@@ -366,7 +371,7 @@ class CandlesticEventHandler(EventHandler):
             if newHeight > 10:
                 self.plotSolver.ChangeAxisHeight(int(newHeight))
         
-        self._updateCanvas()
+        self._updateCanvas(interactive=True)
         self._updateDataView()
     
     def check_cursor(self,event: tk.Event):
@@ -6,7 +6,15 @@ from kiwiplots.solvers import *
 from kiwiplots.solvers import ChartSolver
 from .plotmetadata import *
 from .plotmath import ceilToNearestTen, divideInterval
-from kiwiplots.chartelements import ValuePoint2D, ValueBucket
+from kiwiplots.chartelements import ValuePoint2D, ValueBucket, ValueCandle
+from .downsampling import LineDownsampler, CandleResampler
+from .raster import RGBColor
+from .labelplacement import LabelPlacer, LabelSize
+from .viewtransform import ViewTransform, ProjectedRaster
+from typing import Union
+import numpy as np
+import time
+from kiwiplots.utils import inheritdocstring
 
 # Constants
 TITLE_Y_POSITION = 20
@@ -22,7 +30,25 @@ class CanvasDrawer(ABC):
     """
     Abstract class. Contains logic to draw given plot element to canvas (tk.canvas).
     Implementations depend on given type of plot element. 
+
+    Frames rendered by Render during a mouse gesture are timed. When a frame takes longer than frameBudget,
+    following frames of the gesture are drawn in degraded quality (outlines only, without element names and axis tick labels).
+    Full quality is restored when the gesture ends or when no frame has been rendered for idleDelay milliseconds.
+
+    Plots are drawn in layout space (the canvas size given at creation, in which the solver lays the chart out)
+    and projected to the current size of the canvas by the view transform. Resizing the canvas only redraws the last frame
+    with a new projection, the chart is not solved again.
+
+    Attributes:
+        frameBudget (float): longest acceptable duration of a frame in seconds
+        idleDelay (int): milliseconds without a new frame after which a full quality frame is rendered
+        degraded (bool): whether frames are currently rendered in degraded quality
+        labelPlacer (LabelPlacer): chooses which element labels are drawn, so that they do not overlap
+        viewTransform (ViewTransform): projection of the layout space to the canvas
     """
+    FRAME_BUDGET : float = 0.016
+    IDLE_DELAY : int = 150
+
     def __init__(self, canvas : tk.Canvas, canvasWidth: int, canvasHeight: int) -> None:
         """
         Initializes the CanvasDrawer with a canvas for rendering.
@@ -35,6 +61,69 @@ class CanvasDrawer(ABC):
         self.canvas : tk.Canvas = canvas
         self.canvasWidth : int = canvasWidth
         self.canvasHeight = canvasHeight
+        self.frameBudget : float = CanvasDrawer.FRAME_BUDGET
+        self.idleDelay : int = CanvasDrawer.IDLE_DELAY
+        self.degraded : bool = False
+        self._lastFrame : tuple[PlotMetadata, ChartSolver] | None = None
+        self._idleJob : str | None = None
+        self.labelPlacer : LabelPlacer = LabelPlacer(self._measureLabel)
+        self._labelFont : font.Font | None = None
+        self.viewTransform : ViewTransform = ViewTransform(canvasWidth, canvasHeight)
+
+    def Render(self, plotMetadata: PlotMetadata, solver: ChartSolver, interactive: bool = False):
+        """Renders the whole plot in the current quality and measures how long it took.
+
+        Args:
+            plotMetadata (PlotMetadata): Metadata about the plot.
+            solver (ChartSolver): Solver containing plot data.
+            interactive (bool, optional): Whether the frame is a part of a mouse gesture. Only such frames can switch
+                the drawer to degraded quality. Defaults to False.
+        """
+        self._cancelIdleRestore()
+        self._lastFrame = (plotMetadata, solver)
+        if not interactive:
+            self.degraded = False
+        drawnDegraded = self.degraded
+        start = time.perf_counter()
+        self.draw(plotMetadata, solver, outlineOnly=drawnDegraded)
+        self.viewTransform.ProjectCanvas(self.canvas)
+        if interactive and time.perf_counter() - start > self.frameBudget:
+            self.degraded = True
+        if drawnDegraded:
+            self._idleJob = self.canvas.after(self.idleDelay, self._restoreQuality)
+
+    def Resize(self, width: int, height: int):
+        """Projects the plot to a new size of the canvas. The last frame is redrawn from the values already held by the solver.
+
+        Args:
+            width (int): New width of the canvas in pixels.
+            height (int): New height of the canvas in pixels.
+        """
+        if self.viewTransform.Resize(width, height):
+            self._restoreQuality()
+
+    def EndGesture(self):
+        """Ends a mouse gesture. If the last frame was rendered in degraded quality, a full quality frame is rendered.
+        """
+        if self._idleJob is not None:
+            self._restoreQuality()
+        self.degraded = False
+
+    def _restoreQuality(self):
+        """Switches back to full quality and renders the last frame again.
+        """
+        self._cancelIdleRestore()
+        self.degraded = False
+        if self._lastFrame is not None:
+            self.draw(*self._lastFrame)
+            self.viewTransform.ProjectCanvas(self.canvas)
+
+    def _cancelIdleRestore(self):
+        """Cancels a scheduled full quality frame.
+        """
+        if self._idleJob is not None:
+            self.canvas.after_cancel(self._idleJob)
+            self._idleJob = None
     
     @abstractmethod
     def drawBare(self, plotMetadata: PlotMetadata, solver : ChartSolver, clear : bool = True, outlineOnly: bool = False, specialHighlight : bool = False):
@@ -63,6 +152,23 @@ class CanvasDrawer(ABC):
         """
         raise NotImplementedError("Method CanvasDrawer.draw must be declared in subclass")
 
+    def _measureLabel(self, text: str) -> LabelSize:
+        """Measures a text written by canvas.create_text with the default font.
+        """
+        if self._labelFont is None:
+            self._labelFont = font.nametofont("TkDefaultFont", root=self.canvas)
+        return self._labelFont.measure(text), self._labelFont.metrics("linespace")
+
+    def _writeLabels(self, labels: list[tuple[float, float, str]]):
+        """Writes labels centered at given points. Labels overlapping previously written labels or lying outside of the canvas are dropped.
+
+        Args:
+            labels (list[tuple[float, float, str]]): Center (x, y) and text of every label.
+        """
+        for index in self.labelPlacer.Place(labels, self.canvasWidth, self.canvasHeight):
+            x, y, text = labels[index]
+            self.canvas.create_text(x, y, text=text)
+
     def _writePlotTitle(self, title: str):
         self.canvas.create_text(self.canvasWidth / 2, TITLE_Y_POSITION,text=title,font=("Arial", TITLE_FONT_SIZE, "bold")) 
 
@@ -80,6 +186,8 @@ class CanvasDrawer(ABC):
         for mark in marks:
             y = self.canvasHeight - origin.Y - mark
             self.canvas.create_line(origin.X - AXIS_MARK_PIXEL_WIDTH, y, origin.X, y, fill="black")
+            if self.degraded:
+                continue
 
             trueValue = mark/scaleFactor + xAxisValue
             valueString = f"{(trueValue):.2g}" if (trueValue <= 1e-04 or trueValue >= 1e06) else f"{(trueValue):.2f}"
@@ -97,6 +205,10 @@ class CandlesticCanvasDrawer(CanvasDrawer):
     
     Renders candlesticks with wicks, bodies, and optional names on a tkinter canvas.
     """
+    def __init__(self, canvas: tk.Canvas, canvasWidth: int, canvasHeight: int) -> None:
+        super().__init__(canvas, canvasWidth, canvasHeight)
+        self.resampler : CandleResampler = CandleResampler()
+
     def _drawCandles(self, solver: CandlestickChartSolver, outlineOnly: bool = False, specialHighlight : bool = False):
         """Draws candlesticks with wicks and names on the canvas.
 
@@ -107,7 +219,7 @@ class CandlesticCanvasDrawer(CanvasDrawer):
         """ 
         
         origin = solver.GetOrigin()
-        candles = solver.GetCandleData()
+        candles = self.resampler.GetCandles(solver, solver.GetCandleData(), self.canvasWidth)
         for candle in candles:
             leftBottomX, leftBottomY = None, None
             rightTopX, rightTopY = None, None
@@ -137,8 +249,18 @@ class CandlesticCanvasDrawer(CanvasDrawer):
             if specialHighlight:
                 self.canvas.create_line(minX-HIGHLIGHT_MARK_OFFSET, minY, minX+HIGHLIGHT_MARK_OFFSET, minY, fill=candle.color, width=1 if not outlineOnly else 3) # pyright: ignore[reportArgumentType]
                 self.canvas.create_line(maxX-HIGHLIGHT_MARK_OFFSET, maxY, maxX+HIGHLIGHT_MARK_OFFSET, maxY, fill=candle.color, width=1 if not outlineOnly else 3) # pyright: ignore[reportArgumentType]
-            if candle.nameVisible: 
-                self.canvas.create_text(candle.wickBottom.X ,self.canvasHeight - origin.Y + TEXT_OFFSET, text=candle.name)
+        if not self.degraded:
+            self._writeCandleNames(candles, origin)
+
+    def _writeCandleNames(self, candles: list[ValueCandle], origin: ValuePoint2D):
+        """Writes names of the candles with visible names under the x axis.
+
+        Args:
+            candles (list[ValueCandle]): Drawn candles.
+            origin (ValuePoint2D): Origin of the chart.
+        """
+        y = self.canvasHeight - origin.Y + TEXT_OFFSET
+        self._writeLabels([(candle.wickBottom.X, y, candle.name) for candle in candles if candle.nameVisible])
     
     def drawBare(self, plotMetadata: PlotMetadata, solver: CandlestickChartSolver, clear: bool = True, outlineOnly: bool = False, specialHighlight : bool = False):
         """Renders candlesticks without axes or title.
@@ -196,7 +318,16 @@ class BarChartCanvasDrawer(CanvasDrawer):
             x2 = rec.rightTop.X
             y2 = self.canvasHeight - rec.rightTop.Y
             self.canvas.create_rectangle(x1,y2,x2,y1, fill=rec.color if not outlineOnly else "", outline="black" if not outlineOnly else "red", width= 1 if not outlineOnly else 3) # pyright: ignore[reportArgumentType]
-            self.canvas.create_text((x1+x2)/2,y1 + TEXT_OFFSET, text=rec.name)
+        if not self.degraded:
+            self._writeRectangleLabels(rectangles)
+
+    def _writeRectangleLabels(self, rectangles: list):
+        """Writes names of the bars under them.
+
+        Args:
+            rectangles (list): Solved rectangles.
+        """
+        self._writeLabels([((rec.leftBottom.X + rec.rightTop.X)/2, self.canvasHeight - rec.leftBottom.Y + TEXT_OFFSET, rec.name) for rec in rectangles])
 
     def drawBare(self, plotMetadata: PlotMetadata, solver : BarChartSolver, clear : bool = True, outlineOnly: bool = False, specialHighlight : bool = False):
         """Renders bars without axes or title.
@@ -250,15 +381,30 @@ class HistogramCanvasDrawer(BarChartCanvasDrawer):
         """
         rectangles : list[ValueBucket] = solver.GetRectangleDataAsList() # pyright: ignore[reportAssignmentType]
         for rec in rectangles: 
-            interval = rec.interval
             x1 = rec.leftBottom.X
             y1 = self.canvasHeight - rec.leftBottom.Y
             
             x2 = rec.rightTop.X
             y2 = self.canvasHeight - rec.rightTop.Y
             self.canvas.create_rectangle(x1,y2,x2,y1, fill=rec.color if not outlineOnly else "", outline="black" if not outlineOnly else "red", width= 1 if not outlineOnly else 3) # pyright: ignore[reportArgumentType]
-            self.canvas.create_text(x1,y1 + TEXT_OFFSET, text=interval[0])
-            self.canvas.create_text(x2,y1 + TEXT_OFFSET, text=interval[1])
+        if not self.degraded:
+            self._writeRectangleLabels(rectangles)
+
+    def _writeRectangleLabels(self, rectangles: list[ValueBucket]):
+        """Writes interval bounds under the buckets. A bound shared by two adjacent buckets is written once, under the end of the first one.
+
+        Args:
+            rectangles (list[ValueBucket]): Solved buckets.
+        """
+        labels = []
+        previousEnd = None
+        for rec in rectangles:
+            y = self.canvasHeight - rec.leftBottom.Y + TEXT_OFFSET
+            if rec.interval[0] != previousEnd:
+                labels.append((rec.leftBottom.X, y, str(rec.interval[0])))
+            labels.append((rec.rightTop.X, y, str(rec.interval[1])))
+            previousEnd = rec.interval[1]
+        self._writeLabels(labels)
 
 class LineChartCanvasDrawer(CanvasDrawer):
     """
@@ -266,43 +412,50 @@ class LineChartCanvasDrawer(CanvasDrawer):
     
     Renders connected line segments with colored data points and point names on a tkinter canvas.
     """
+    def __init__(self, canvas: tk.Canvas, canvasWidth: int, canvasHeight: int) -> None:
+        super().__init__(canvas, canvasWidth, canvasHeight)
+        self.downsampler : LineDownsampler = LineDownsampler()
+
     def _drawLines(self, plotMetadata: LineChartMetadata, solver: LineChartSolver):
         """Draws line segments with data points and point names on the canvas.
+        Only points chosen by the downsampler are drawn, the whole polyline is a single canvas item.
+        In degraded quality only the polyline is drawn.
 
         Args:
             plotMetadata (LineChartMetadata): Metadata containing line color.
             solver (LineChartSolver): Solver containing line data.
         """
         RADIUS : int = POINT_RADIUS
-        lines = solver.GetLineData()
+        points = solver.GetPoints()
         origin = solver.GetOrigin()
-        for index, line in enumerate(lines):
-            x1, y1 = line.leftEnd.X, self.canvasHeight - (line.leftEnd.Y )
-            x2, y2 = line.rightEnd.X, self.canvasHeight - (line.rightEnd.Y)
-            
-            if not line.ignoreRight:
-                self.canvas.create_line(x1,y1,x2,y2, width = 1)
-                self.canvas.create_oval(
-                x1 - RADIUS, y1 - RADIUS,
-                x1 + RADIUS, y1 + RADIUS,
-                fill=plotMetadata.color) # pyright: ignore[reportArgumentType]
-
-                self.canvas.create_oval(
-                x2 - RADIUS, y2 - RADIUS,
-                x2 + RADIUS, y2 + RADIUS,
-                fill=plotMetadata.color # pyright: ignore[reportArgumentType]
-                )
-            else:
-                self.canvas.create_oval(
-                x1 - RADIUS, y1 - RADIUS,
-                x1 + RADIUS, y1 + RADIUS,
-                fill=plotMetadata.color) # pyright: ignore[reportArgumentType]
-
-            self.canvas.create_text(x1,self.canvasHeight - (origin.Y)+TEXT_OFFSET,text=line.leftEnd.name)
-            if index == len(lines) - 1 and not line.ignoreRight:
-                self.canvas.create_text(x2,self.canvasHeight - (origin.Y)+TEXT_OFFSET,text=line.rightEnd.name)
-
+        indices = self.downsampler.GetIndices(solver, points, self.canvasWidth)
+        visiblePoints = [points[index] for index in indices]
+
+        if len(visiblePoints) > 1:
+            coordinates = []
+            for point in visiblePoints:
+                coordinates.extend((point.X, self.canvasHeight - point.Y))
+            self.canvas.create_line(*coordinates, width = 1)
+
+        if self.degraded:
+            return
+        for point in visiblePoints:
+            x, y = point.X, self.canvasHeight - point.Y
+            self.canvas.create_oval(
+            x - RADIUS, y - RADIUS,
+            x + RADIUS, y + RADIUS,
+            fill=plotMetadata.color) # pyright: ignore[reportArgumentType]
+        self._writePointNames(visiblePoints, origin)
+
+    def _writePointNames(self, points: list[ValuePoint2D], origin: ValuePoint2D):
+        """Writes names of the points under the x axis.
 
+        Args:
+            points (list[ValuePoint2D]): Drawn points.
+            origin (ValuePoint2D): Origin of the chart.
+        """
+        y = self.canvasHeight - origin.Y + TEXT_OFFSET
+        self._writeLabels([(point.X, y, point.name) for point in points])
 
     def drawBare(self, plotMetadata: LineChartMetadata, solver : LineChartSolver, clear : bool = True, outlineOnly: bool = False, specialHighlight : bool = False):
         """Renders lines without axes or title.
@@ -339,4 +492,151 @@ class LineChartCanvasDrawer(CanvasDrawer):
         minimum: float = min([line.leftHeight for line in lines] + [line.rightHeight for line in lines])
 
         self._drawAxes(solver.GetAxisHeight(),int(lines[-1].rightEnd.X),origin,plotMetadata.heightScaleFactor,int(min([minimum,0])),plotMetadata.xAxisLabel,plotMetadata.yAxisLabel,plotMetadata.xAxisValue)
-        self.drawBare(plotMetadata,solver,clear=False,outlineOnly=outlineOnly,specialHighlight=specialHighlight)
\ No newline at end of file
+        self.drawBare(plotMetadata,solver,clear=False,outlineOnly=outlineOnly,specialHighlight=specialHighlight)
+
+class RasterCanvasDrawer(CanvasDrawer):
+    """
+    Base class for canvas drawers which rasterize data elements into a RasterBuffer instead of creating
+    one canvas item per element. The buffer is shown as a single tk.PhotoImage placed below all other items.
+    Axes, titles, names and highlight marks are still drawn as vector canvas items.
+    Data elements are rasterized in the resolution of the canvas, their coordinates are projected by the view transform.
+
+    It is meant to be the first base class of a raster drawer, followed by the vector drawer of the chart type,
+    e.g. RasterBarChartCanvasDrawer(RasterCanvasDrawer, BarChartCanvasDrawer).
+
+    Attributes:
+        raster (ProjectedRaster): pixel buffer with the data layer
+        photo (tk.PhotoImage | None): image displaying the buffer on the canvas
+    """
+    def __init__(self, canvas: tk.Canvas, canvasWidth: int, canvasHeight: int) -> None:
+        super().__init__(canvas, canvasWidth, canvasHeight)
+        self.raster : ProjectedRaster = ProjectedRaster(self.viewTransform)
+        self.photo : tk.PhotoImage | None = None
+        self._imageItem : int | None = None
+        self._colorCache : dict[Union[str,int], RGBColor] = {}
+
+    @inheritdocstring(CanvasDrawer.drawBare)
+    def drawBare(self, plotMetadata: PlotMetadata, solver: ChartSolver, clear: bool = True, outlineOnly: bool = False, specialHighlight: bool = False):
+        if clear:
+            self.raster.Clear()
+        super().drawBare(plotMetadata, solver, clear, outlineOnly, specialHighlight) # pyright: ignore[reportAbstractUsage]
+
+    @inheritdocstring(CanvasDrawer.draw)
+    def draw(self, plotMetadata: PlotMetadata, solver: ChartSolver, clear: bool = True, outlineOnly: bool = False, specialHighlight: bool = False) -> None:
+        if clear:
+            self.raster.Clear()
+        super().draw(plotMetadata, solver, clear, outlineOnly, specialHighlight) # pyright: ignore[reportAbstractUsage]
+
+    def _presentRaster(self):
+        """Pushes the content of the raster buffer to the canvas.
+        """
+        if self.photo is None or (self.photo.width(), self.photo.height()) != (self.raster.width, self.raster.height):
+            self.photo = tk.PhotoImage(master=self.canvas, width=self.raster.width, height=self.raster.height)
+            if self._imageItem is not None:
+                self.canvas.delete(self._imageItem)
+                self._imageItem = None
+        self.photo.configure(data=self.raster.ToPPM(), format="PPM")
+        if self._imageItem is None or not self.canvas.type(self._imageItem):
+            self._imageItem = self.canvas.create_image(0, 0, anchor="nw", image=self.photo)
+        self.canvas.tag_lower(self._imageItem)
+
+    def _rgb(self, color: Union[str,int]) -> RGBColor:
+        """Converts a Tk color to RGB tuple.
+
+        Args:
+            color (Union[str,int]): Color name, hex string or integer 0xRRGGBB.
+
+        Returns:
+            RGBColor: 8-bit RGB components.
+        """
+        if color not in self._colorCache:
+            name = color if isinstance(color, str) else f"#{color:06x}"
+            red, green, blue = self.canvas.winfo_rgb(name)
+            self._colorCache[color] = (red >> 8, green >> 8, blue >> 8)
+        return self._colorCache[color]
+
+    def _rgbArray(self, colors: list[Union[str,int]]) -> np.ndarray:
+        """Converts a list of Tk colors to an array of shape (n, 3).
+        """
+        return np.array([self._rgb(color) for color in colors], dtype=np.uint8).reshape(-1, 3)
+
+class RasterCandlesticCanvasDrawer(RasterCanvasDrawer, CandlesticCanvasDrawer):
+    """
+    Raster version of CandlesticCanvasDrawer. Candle bodies and wicks are rasterized, names and highlight marks stay vector items.
+    """
+    @inheritdocstring(CandlesticCanvasDrawer._drawCandles)
+    def _drawCandles(self, solver: CandlestickChartSolver, outlineOnly: bool = False, specialHighlight : bool = False):
+        origin = solver.GetOrigin()
+        candles = self.resampler.GetCandles(solver, solver.GetCandleData(), self.canvasWidth)
+        if len(candles) > 0:
+            left = np.array([candle.openingCorner.X for candle in candles])
+            right = np.array([candle.closingCorner.X for candle in candles])
+            opening = self.canvasHeight - (np.array([candle.openingCorner.Y for candle in candles]) + origin.Y)
+            closing = self.canvasHeight - (np.array([candle.closingCorner.Y for candle in candles]) + origin.Y)
+            wickX = np.array([candle.wickBottom.X for candle in candles])
+            wickBottom = self.canvasHeight - (np.array([candle.wickBottom.Y for candle in candles]) + origin.Y)
+            wickTop = self.canvasHeight - (np.array([candle.wickTop.Y for candle in candles]) + origin.Y)
+            colors = self._rgbArray([candle.color for candle in candles])
+
+            if not outlineOnly:
+                self.raster.FillRectangles(left, closing, right, opening, colors)
+                self.raster.OutlineRectangles(left, closing, right, opening, self._rgb("black"))
+            else:
+                self.raster.OutlineRectangles(left, closing, right, opening, colors, 3)
+            self.raster.DrawLines(wickX, wickBottom, wickX, wickTop, colors, 1 if not outlineOnly else 3)
+
+        for candle in candles:
+            minX, minY = candle.wickBottom.X, self.canvasHeight - (candle.wickBottom.Y + origin.Y)
+            maxX, maxY = candle.wickTop.X, self.canvasHeight - (candle.wickTop.Y + origin.Y)
+            if specialHighlight:
+                self.canvas.create_line(minX-HIGHLIGHT_MARK_OFFSET, minY, minX+HIGHLIGHT_MARK_OFFSET, minY, fill=candle.color, width=1 if not outlineOnly else 3) # pyright: ignore[reportArgumentType]
+                self.canvas.create_line(maxX-HIGHLIGHT_MARK_OFFSET, maxY, maxX+HIGHLIGHT_MARK_OFFSET, maxY, fill=candle.color, width=1 if not outlineOnly else 3) # pyright: ignore[reportArgumentType]
+        if not self.degraded:
+            self._writeCandleNames(candles, origin)
+        self._presentRaster()
+
+class RasterBarChartCanvasDrawer(RasterCanvasDrawer, BarChartCanvasDrawer):
+    """
+    Raster version of BarChartCanvasDrawer. Bars are rasterized, names stay vector items.
+    """
+    @inheritdocstring(BarChartCanvasDrawer._drawRectangles)
+    def _drawRectangles(self, solver: BarChartSolver, outlineOnly: bool = False):
+        rectangles = solver.GetRectangleDataAsList()
+        if len(rectangles) > 0:
+            x1 = np.array([rec.leftBottom.X for rec in rectangles])
+            y1 = self.canvasHeight - np.array([rec.leftBottom.Y for rec in rectangles])
+            x2 = np.array([rec.rightTop.X for rec in rectangles])
+            y2 = self.canvasHeight - np.array([rec.rightTop.Y for rec in rectangles])
+            if not outlineOnly:
+                self.raster.FillRectangles(x1, y2, x2, y1, self._rgbArray([rec.color for rec in rectangles]))
+                self.raster.OutlineRectangles(x1, y2, x2, y1, self._rgb("black"))
+            else:
+                self.raster.OutlineRectangles(x1, y2, x2, y1, self._rgb("red"), 3)
+        if not self.degraded:
+            self._writeRectangleLabels(rectangles)
+        self._presentRaster()
+
+class RasterHistogramCanvasDrawer(RasterBarChartCanvasDrawer, HistogramCanvasDrawer):
+    """
+    Raster version of HistogramCanvasDrawer. Buckets are rasterized, interval labels stay vector items.
+    """
+    pass
+
+class RasterLineChartCanvasDrawer(RasterCanvasDrawer, LineChartCanvasDrawer):
+    """
+    Raster version of LineChartCanvasDrawer. The line and the points are rasterized, names stay vector items.
+    """
+    @inheritdocstring(LineChartCanvasDrawer._drawLines)
+    def _drawLines(self, plotMetadata: LineChartMetadata, solver: LineChartSolver):
+        points = solver.GetPoints()
+        origin = solver.GetOrigin()
+        indices = self.downsampler.GetIndices(solver, points, self.canvasWidth)
+        visiblePoints = [points[index] for index in indices]
+
+        x = np.array([point.X for point in visiblePoints])
+        y = self.canvasHeight - np.array([point.Y for point in visiblePoints])
+        self.raster.DrawPolyline(x, y, self._rgb("black"))
+        if not self.degraded:
+            self.raster.DrawDiscs(x, y, POINT_RADIUS, self._rgb(plotMetadata.color), self._rgb("black"))
+            self._writePointNames(visiblePoints, origin)
+        self._presentRaster()
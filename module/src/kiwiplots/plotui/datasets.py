@@ -0,0 +1,147 @@
+"""Binary dataset format for chart data.
+
+A dataset is a NumPy .npz archive with a .npy member per column and a small JSON header in the member header.json.
+The header holds the chart type and attributes which are not columns (colors, axis value, ...). Columns and attributes
+are named by the keys of data sections of game configuration files, so a dataset can stand in for the data of a section.
+
+Members are stored without compression, so columns are opened as read-only memory maps of the archive:
+opening a dataset reads only the headers and data are paged in when they are used.
+"""
+import json
+import struct
+import zipfile
+from typing import Any
+import numpy as np
+
+class Dataset:
+    """
+    Columns of chart data with a chart type and attributes.
+
+    Bar chart columns (values, names, ...) are flat, the column group_sizes gives the number of bars in each group.
+
+    Attributes:
+        chart (str): chart type, one of CHART_TYPES (names of data sections of game configuration files)
+        columns (dict[str, np.ndarray]): one dimensional columns, memory maps for opened datasets
+        attributes (dict[str, Any]): JSON values which are not columns
+        file (str | None): file the dataset was opened from
+    """
+    FORMAT : str = "kiwiplots-dataset"
+    VERSION : int = 1
+    HEADER_MEMBER : str = "header.json"
+    CHART_TYPES : tuple[str, ...] = ("bar_chart", "histogram", "candlestick_chart", "line_chart")
+    GROUP_SIZES : str = "group_sizes"
+
+    def __init__(self, chart: str, columns: dict[str, Any], attributes: dict[str, Any] | None = None):
+        if chart not in Dataset.CHART_TYPES:
+            raise ValueError(f"Unknown chart type {chart}")
+        self.chart : str = chart
+        self.columns : dict[str, np.ndarray] = {name: np.asarray(column) for name, column in columns.items()}
+        self.attributes : dict[str, Any] = dict(attributes) if attributes is not None else {}
+        self.file : str | None = None
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.columns
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        if name not in self.columns:
+            raise KeyError(f"Dataset has no column {name}")
+        return self.columns[name]
+
+    def Grouped(self, name: str) -> list[np.ndarray]:
+        """Splits a flat column of a bar chart to groups given by the column group_sizes.
+
+        Args:
+            name (str): Name of the column.
+
+        Returns:
+            list[np.ndarray]: Values of the column in every group.
+        """
+        bounds = np.cumsum(self[Dataset.GROUP_SIZES])
+        return np.split(self[name], bounds[:-1])
+
+    def Section(self) -> dict[str, Any]:
+        """Returns the dataset as a data section of a game configuration file - attributes and columns by their names.
+        Columns of bar charts are nested lists of groups, other columns are arrays.
+
+        Returns:
+            dict[str, Any]: Values of the data section.
+        """
+        section = dict(self.attributes)
+        for name, column in self.columns.items():
+            if name == Dataset.GROUP_SIZES:
+                continue
+            section[name] = [group.tolist() for group in self.Grouped(name)] if self.chart == "bar_chart" else column
+        return section
+
+    def Write(self, file: str):
+        """Writes the dataset to an uncompressed archive, which can be opened memory-mapped.
+
+        Args:
+            file (str): Path of the archive, usually with the extension .npz.
+
+        Raises:
+            ValueError: If a column contains Python objects.
+        """
+        header = {"format": Dataset.FORMAT, "version": Dataset.VERSION, "chart": self.chart, "attributes": self.attributes}
+        with zipfile.ZipFile(file, "w", compression=zipfile.ZIP_STORED, allowZip64=True) as archive:
+            archive.writestr(Dataset.HEADER_MEMBER, json.dumps(header, ensure_ascii=False))
+            for name, column in self.columns.items():
+                with archive.open(name + ".npy", "w", force_zip64=True) as member:
+                    np.lib.format.write_array(member, column, allow_pickle=False)
+
+    @staticmethod
+    def Open(file: str, memoryMap: bool = True) -> "Dataset":
+        """Opens a dataset.
+
+        Args:
+            file (str): Path of the archive.
+            memoryMap (bool): Whether columns stored without compression are memory-mapped. Other columns are read to memory.
+
+        Returns:
+            Dataset: The opened dataset.
+
+        Raises:
+            ValueError: If the file is not a dataset.
+        """
+        try:
+            archive = zipfile.ZipFile(file)
+        except zipfile.BadZipFile as error:
+            raise ValueError(f"File {file} is not a dataset") from error
+        with archive, open(file, "rb") as stream:
+            names = archive.namelist()
+            if Dataset.HEADER_MEMBER not in names:
+                raise ValueError(f"File {file} has no dataset header")
+            header = json.loads(archive.read(Dataset.HEADER_MEMBER))
+            if header.get("format") != Dataset.FORMAT or header.get("version", 0) > Dataset.VERSION:
+                raise ValueError(f"File {file} is not a supported dataset")
+            columns = {}
+            for info in archive.infolist():
+                if info.filename.endswith(".npy"):
+                    columns[info.filename[:-4]] = _readColumn(file, archive, stream, info, memoryMap)
+        dataset = Dataset(header.get("chart"), columns, header.get("attributes")) # pyright: ignore[reportArgumentType]
+        dataset.file = file
+        return dataset
+
+_HEADER_READERS = {(1, 0): np.lib.format.read_array_header_1_0, (2, 0): np.lib.format.read_array_header_2_0}
+
+def _readColumn(file: str, archive: zipfile.ZipFile, stream, info: zipfile.ZipInfo, memoryMap: bool) -> np.ndarray:
+    """Reads a .npy member of an archive, uncompressed members are memory-mapped.
+    """
+    if memoryMap and info.compress_type == zipfile.ZIP_STORED:
+        # the data of a stored member follow its local header
+        stream.seek(info.header_offset)
+        local = stream.read(30)
+        if local[:4] != b"PK\x03\x04":
+            raise ValueError(f"Member {info.filename} of {file} is damaged")
+        nameLength, extraLength = struct.unpack("<HH", local[26:30])
+        stream.seek(info.header_offset + 30 + nameLength + extraLength)
+        version = np.lib.format.read_magic(stream)
+        if version in _HEADER_READERS:
+            shape, fortranOrder, dtype = _HEADER_READERS[version](stream)
+            if dtype.hasobject:
+                raise ValueError(f"Column {info.filename[:-4]} of {file} contains Python objects")
+            if 0 in shape:
+                return np.empty(shape, dtype=dtype)
+            return np.asarray(np.memmap(file, dtype=dtype, mode="r", offset=stream.tell(), shape=shape, order="F" if fortranOrder else "C"))
+    with archive.open(info) as member:
+        return np.lib.format.read_array(member, allow_pickle=False)
@@ -1,5 +1,35 @@
+import numpy as np
+from numpy.typing import ArrayLike
 
-def CalculateScaleFactor(values: list[float],height: int)->float:
+def AsValues(values: ArrayLike) -> np.ndarray:
+    """
+    View numeric data as a one dimensional float array.
+
+    Lists, NumPy arrays (including memory maps) and objects supporting the
+    buffer protocol are accepted. Float arrays are returned without copying.
+
+    Args:
+        values (ArrayLike): Sequence of data values.
+
+    Returns:
+        np.ndarray: Values as a flat array of floats.
+    """
+    return np.asarray(values, dtype=np.float64).reshape(-1)
+
+def ConcatenateValues(groups) -> np.ndarray:
+    """
+    Join groups of numeric data into a single flat float array.
+
+    Args:
+        groups (Iterable[ArrayLike]): Groups of data values, e.g. groups of bars or columns of candles.
+
+    Returns:
+        np.ndarray: Values of all groups in order.
+    """
+    arrays = [AsValues(group) for group in groups]
+    return np.concatenate(arrays) if arrays else np.empty(0)
+
+def CalculateScaleFactor(values: ArrayLike,height: int)->float:
     """
     Compute a vertical scale factor to fit numeric values into a plot height.
 
@@ -8,39 +38,46 @@ def CalculateScaleFactor(values: list[float],height: int)->float:
     maximum maps to approximately 80% of the provided `height`.
 
     Args:
-        values (list[float]): Sequence of data values to be plotted.
+        values (ArrayLike): Sequence or array of data values to be plotted.
         height (int): Pixel height of the plot area.
 
     Returns:
         float: Scale factor to multiply raw values by to convert to pixels.
     """
     scaleFactor : float = 1
-    absValues = [abs(val) for val in values]
-    maxValue = max(absValues,default=1)
+    absValues = np.abs(AsValues(values))
+    maxValue = float(absValues.max()) if absValues.size else 1
     if not (height*0.3 <= maxValue <= height*0.7):
         scaleFactor = height*0.8/maxValue
     return scaleFactor
 
 
-def RescaleList(inputList : list[float], scaleFactor : float, scaledXAxisValue: float = 0) -> list[float]:
+def RescaleList(inputList : ArrayLike, scaleFactor : float, scaledXAxisValue: float = 0) -> list[int]:
     """
-    Rescale a list of float values to integers using a scale factor and optional offset.
+    Rescale float values to integers using a scale factor and optional offset.
 
     Applies the formula: int(value * scaleFactor - scaledXAxisValue) to each value
-    in the input list, converting them to pixel coordinates for plotting.
+    in the input, converting them to pixel coordinates for plotting. Values are
+    rescaled as an array and converted to Python integers for the solvers.
 
     Args:
-        inputList (list[float]): List of float values to rescale.
+        inputList (ArrayLike): Sequence or array of float values to rescale.
         scaleFactor (float): Factor to multiply each value by.
         scaledXAxisValue (float, optional): Offset value to subtract after scaling. Defaults to 0.
 
     Returns:
         list[int]: List of rescaled integer values.
+
+    Raises:
+        ValueError: If a rescaled value is not finite.
     """
-    return [int(value*scaleFactor-scaledXAxisValue) for value in inputList]
+    rescaled = AsValues(inputList)*scaleFactor-scaledXAxisValue
+    if not np.isfinite(rescaled).all():
+        raise ValueError("Cannot rescale values which are not finite")
+    return rescaled.astype(np.int64).tolist()
 
 
-def CreateScalesForIntervalGroup(intervals : list[tuple[float,float]])->list[float]:
+def CreateScalesForIntervalGroup(intervals : ArrayLike)->list[float]:
     """
     Compute relative width scale factors for a group of histogram intervals.
 
@@ -48,42 +85,48 @@ def CreateScalesForIntervalGroup(intervals : list[tuple[float,float]])->list[flo
     intervals are scaled relative to that minimum length.
 
     Args:
-        intervals (list[tuple[float,float]]): List of (start, end) bin ranges.
+        intervals (ArrayLike): List of (start, end) bin ranges or an array of shape (n, 2).
 
     Returns:
         list[float]: Scale factors proportional to interval lengths.
     """
-    intervalLengths : list[float] = [interval[1]-interval[0] for interval in intervals]
-    minimum = min([length for length in intervalLengths if length > 0], default=1)
-    scales = [length/minimum for length in intervalLengths]
-    return scales
+    bounds = AsValues(intervals).reshape(-1, 2)
+    intervalLengths = bounds[:, 1]-bounds[:, 0]
+    positiveLengths = intervalLengths[intervalLengths > 0]
+    minimum = positiveLengths.min() if positiveLengths.size else 1
+    return (intervalLengths/minimum).tolist()
 
-def CreateIntervalScales(intervals : list[tuple[float,float]])->list[float]:
+def CreateIntervalScales(intervals : ArrayLike)->list[float]:
     """Create scale for intervals
 
     Args:
-        intervals (list[tuple[float,float]]): intervals
+        intervals (ArrayLike): intervals
 
     Returns:
         list[float]: Scale for each interval at corresponding index
     """
-    intervalLengths : list[float] = [interval[1]-interval[0] for interval in intervals]
-    minimum = min([length for length in intervalLengths if length > 0], default=1)
-    scales : list[float] = [length/minimum for length in intervalLengths]
-    return scales
+    return CreateScalesForIntervalGroup(intervals)
 
-def RescaleListOfLists(input: list[list[float]], scaleFactor: float, scaledXAxisValue: float = 0):
+def RescaleListOfLists(input, scaleFactor: float, scaledXAxisValue: float = 0) -> list[list[int]]:
     """RescaleList version for nested lists
 
+    Groups may have different lengths, all values are rescaled at once and split back to the groups.
+
     Args:
-        input (list[list[float]]): input nested lsit
+        input (Iterable[ArrayLike]): input nested list or groups of arrays
         scaleFactor (float): scale factor
         scaledXAxisValue (float, optional): Scaled value of the x axis. Defaults to 0.
 
     Returns:
-        list[list[float]]: scaled nested list
+        list[list[int]]: scaled nested list
     """
+    groups = [AsValues(sublist) for sublist in input]
+    if not groups:
+        return []
+    rescaled = RescaleList(np.concatenate(groups), scaleFactor, scaledXAxisValue)
     result = []
-    for sublist in input:
-        result.append(RescaleList(sublist,scaleFactor,scaledXAxisValue))
-    return result
\ No newline at end of file
+    start = 0
+    for group in groups:
+        result.append(rescaled[start:start+len(group)])
+        start += len(group)
+    return result
@@ -1,15 +1,21 @@
-from abc import ABC
+from abc import ABC, abstractmethod
+from typing import Callable
 import tkinter as tk
 from kiwiplots.plotui.plotmetadata import PlotMetadata
 from kiwiplots.solvers import ChartSolver
 from .plotmetadata import *
 from kiwiplots.solvers import *
 from kiwiplots.chartelements import ValueBucket
+from kiwiplots.utils import inheritdocstring
+
+HeaderSegment = tuple[str, str | None]
 
 class DataViewer(ABC):
     """
 
     Abstract class. Contains logic for showing current data values represented by a graph.
+    Every data element is shown as one row of text marked by its own Text tag, so that rows can be
+    rewritten individually. Subclasses only describe how rows look.
 
     """
     def __init__(self, textWindow : tk.Text):
@@ -20,21 +26,120 @@ class DataViewer(ABC):
             textWindow: A tkinter Text widget where data will be displayed.
         """
         self.dataWindow : tk.Text = textWindow
+        self._rows : list[str] = []
+        self._header : list[HeaderSegment] = []
+        self._highlightedRow : int | None = None
 
     def Write(self, plotMetadata: PlotMetadata, solver: ChartSolver, changedIndex: int, valueChanged: bool)->None: # type: ignore
         """
         Displays plot data in the text window.
         
-        This method should update the text window with current data values from the solver,
-        and highlight the data element that is currently being edited.
+        Updates the text window with current data values from the solver,
+        and highlights the data element that is currently being edited.
+        Only rows whose text has changed since the last call are rewritten, the whole text is rewritten only when the number of elements changes.
         
         Args:
             plotMetadata: Metadata about the plot including scale factor and axis values.
             solver: The solver containing the plot data to be displayed.
             changedIndex: Index of the data element currently being modified. -1 or None if none are being modified.
-            changedStatus: Name of the value being changed (e.g., 'opening', 'closing', 'maximum', 'minimum').
+            valueChanged: Whether a value of the element is currently being changed.
+        """
+        rowCount, formatRow = self._prepareRows(plotMetadata, solver)
+        self._writeRows([formatRow(i) for i in range(rowCount)], changedIndex if valueChanged else None, self._getHeader())
+
+    @abstractmethod
+    def _prepareRows(self, plotMetadata: PlotMetadata, solver: ChartSolver) -> tuple[int, Callable[[int], str]]:
+        """Prepares formatting of rows, one row per data element.
+
+        Args:
+            plotMetadata (PlotMetadata): Metadata about the plot including scale factor and axis values.
+            solver (ChartSolver): The solver containing the plot data to be displayed.
+
+        Returns:
+            tuple[int, Callable[[int], str]]: Number of rows and a function formatting the row of a given element.
+        """
+        raise NotImplementedError("Method DataViewer._prepareRows must be declared in subclass")
+
+    def _getHeader(self) -> list[HeaderSegment]:
+        """Returns text written above the rows as a list of (text, tag) segments. There is no header by default.
+        """
+        return []
+
+    def _invalidateRows(self):
+        """Forgets the written rows, so that the next write rewrites the whole text. Has to be called when the text window is written to directly.
         """
-        raise NotImplementedError("Method DataViewr.write must be declared in subclass")
+        self._rows = []
+        self._header = []
+        self._highlightedRow = None
+
+    def _writeRows(self, rows: list[str], highlightedRow: int | None, header: list[HeaderSegment]):
+        """Writes rows to the text window. Rows which have not changed are left untouched.
+
+        Args:
+            rows (list[str]): Text of the rows.
+            highlightedRow (int | None): Index of the row marked by the "changing_Value" tag.
+            header (list[HeaderSegment]): Text written above the rows.
+        """
+        self.dataWindow.config(state="normal")
+        self.dataWindow.tag_configure("changing_Value", foreground="red")
+        if len(rows) != len(self._rows) or header != self._header:
+            self._rewriteRows(rows, header)
+        else:
+            for i, row in enumerate(rows):
+                if row != self._rows[i]:
+                    self._replaceRow(i, row)
+        self._moveHighlight(highlightedRow if highlightedRow is not None and 0 <= highlightedRow < len(rows) else None)
+        self.dataWindow.config(state="disabled")
+
+    def _rewriteRows(self, rows: list[str], header: list[HeaderSegment]):
+        """Replaces the whole text with the header and the rows, each row is marked by tag "row<index>".
+        """
+        self.dataWindow.delete("1.0", "end")
+        arguments : list = []
+        for text, tag in header:
+            arguments.extend((text, (tag,) if tag else ()))
+        for i, row in enumerate(rows):
+            arguments.extend((row, (f"row{i}",)))
+        if arguments:
+            self.dataWindow.insert("end", *arguments)
+        self._rows = list(rows)
+        self._header = list(header)
+        self._highlightedRow = None
+
+    def _replaceRow(self, index: int, row: str):
+        """Replaces text of a single row.
+        """
+        tag = f"row{index}"
+        start, end = self.dataWindow.tag_ranges(tag)
+        self.dataWindow.delete(start, end)
+        self.dataWindow.insert(start, row, (tag,))
+        self._rows[index] = row
+        if self._highlightedRow == index:
+            self._highlightedRow = None
+
+    def _moveHighlight(self, highlightedRow: int | None):
+        """Moves the "changing_Value" tag to a given row.
+        """
+        if self._highlightedRow == highlightedRow:
+            return
+        if self._highlightedRow is not None:
+            self.dataWindow.tag_remove("changing_Value", "1.0", "end")
+        if highlightedRow is not None:
+            self.dataWindow.tag_add("changing_Value", *self.dataWindow.tag_ranges(f"row{highlightedRow}"))
+        self._highlightedRow = highlightedRow
+
+def FormatValue(value: float) -> str:
+    """Formats a value shown in a data viewer, using scientific notation for very large or very small values.
+
+    Args:
+        value (float): The value to format.
+
+    Returns:
+        str: Formatted value.
+    """
+    if ((value >= 1e+06) or (value <= 1e-04)):
+        return f"{value:.4g}"
+    return str(value)
 
 
 class CandlesticDataViewer(DataViewer):
@@ -46,36 +151,25 @@ class CandlesticDataViewer(DataViewer):
     def __init__(self, textWindow: tk.Text):
         super().__init__(textWindow)
 
-    def Write(self, plotMetadata: CandlesticPlotMetadata, solver: CandlestickChartSolver, changedIndex: int, valueChanged: bool): # pyright: ignore[reportIncompatibleMethodOverride]
-        """Displays candlestick data with highlighting for edited values.
+    def _prepareRows(self, plotMetadata: CandlesticPlotMetadata, solver: CandlestickChartSolver) -> tuple[int, Callable[[int], str]]: # pyright: ignore[reportIncompatibleMethodOverride]
+        """Prepares one block of lines per candle with its opening, closing, minimum and maximum value.
 
         Args:
             plotMetadata (CandlesticPlotMetadata): Metadata containing scale factor and axis values.
             solver (CandlestickChartSolver): Solver containing candle data.
-            changedIndex (int): Index of the candle being modified.
-            valueChanged (bool): Whether a value is currently being changed.
         """
         xAxisValue = plotMetadata.xAxisValue
         scaleFactor = plotMetadata.heightScaleFactor
-        self.dataWindow.config(state="normal")
-        self.dataWindow.delete("1.0", "end")
-
-        self.dataWindow.tag_configure("changing_Value", foreground="red")
         candles = solver.GetCandleData()
 
-        for i in range(len(candles)-1, -1, -1):
+        def formatRow(i: int) -> str:
             candle = candles[i]
             openingValue = candle.openingCorner.Y/scaleFactor + xAxisValue
             closingValue = candle.closingCorner.Y/scaleFactor + xAxisValue
             maximumValue = candle.wickTop.Y/scaleFactor + xAxisValue
             minimumValue = candle.wickBottom.Y/scaleFactor + xAxisValue/scaleFactor
-            
-            string = f"{candle.name}:\n\topening = {openingValue:.4f},\n\tclosing = {closingValue:.4f},\n\tmin = {minimumValue:.4f},\n\tmax = {maximumValue:.4f}\n\n"
-            if valueChanged and i == changedIndex:
-                self.dataWindow.insert("1.0",f"{string}\n", "changing_Value")
-            else:
-                self.dataWindow.insert("1.0",f"{string}\n")
-        self.dataWindow.config(state="disabled")
+            return f"{candle.name}:\n\topening = {openingValue:.4f},\n\tclosing = {closingValue:.4f},\n\tmin = {minimumValue:.4f},\n\tmax = {maximumValue:.4f}\n\n\n"
+        return len(candles), formatRow
 
 class BarChartDataViewer(DataViewer):
     """
@@ -83,35 +177,19 @@ class BarChartDataViewer(DataViewer):
     
     Displays bar values in a text window.
     """
-    def Write(self, plotMetadata: BarChartMetadata, solver: BarChartSolver, changedIndex: int, valueChanged: bool) -> None: # pyright: ignore[reportIncompatibleMethodOverride]
-        """Displays bar data with highlighting for edited values.
+    def _prepareRows(self, plotMetadata: BarChartMetadata, solver: BarChartSolver) -> tuple[int, Callable[[int], str]]: # pyright: ignore[reportIncompatibleMethodOverride]
+        """Prepares one line per bar with its name and value.
 
         Args:
             plotMetadata (BarChartMetadata): Metadata containing scale factor and axis values.
             solver (BarChartSolver): Solver containing rectangle data.
-            changedIndex (int): Index of the bar being modified.
-            valueChanged (bool): Whether a value is currently being changed.
         """
-        self.dataWindow.config(state="normal")
-        self.dataWindow.delete("1.0", "end")
-
-        self.dataWindow.tag_configure("changing_Value", foreground="red")
         rectangles = solver.GetBarDataAsList()
 
-        for i in range(len(rectangles)-1, -1, -1):
+        def formatRow(i: int) -> str:
             rec = rectangles[i]
-            trueValue = rec.GetHeight()/plotMetadata.heightScaleFactor
-            valueString = ""
-            if ((trueValue >= 1e+06) or (trueValue <= 1e-04)):
-                valueString = f"{trueValue:.4g}"
-            else:
-                valueString = str(trueValue)
-
-            if valueChanged and i == changedIndex:
-                self.dataWindow.insert("1.0",f"{rec.name} = {valueString}\n", "changing_Value")
-            else:
-                self.dataWindow.insert("1.0",f"{rec.name} = {valueString}\n")
-        self.dataWindow.config(state="disabled")
+            return f"{rec.name} = {FormatValue(rec.GetHeight()/plotMetadata.heightScaleFactor)}\n"
+        return len(rectangles), formatRow
 
 class HistogramDataViewer(DataViewer):
     """
@@ -119,35 +197,19 @@ class HistogramDataViewer(DataViewer):
     
     Displays histogram bucket intervals and values in a text window.
     """
-    def Write(self, plotMetadata: HistogramMetadata, solver: BarChartSolver, changedIndex: int, valueChanged: bool) -> None: # pyright: ignore[reportIncompatibleMethodOverride]
-        """Displays histogram bucket data with highlighting for edited values.
+    def _prepareRows(self, plotMetadata: HistogramMetadata, solver: BarChartSolver) -> tuple[int, Callable[[int], str]]: # pyright: ignore[reportIncompatibleMethodOverride]
+        """Prepares one line per bucket with its interval and value.
 
         Args:
             plotMetadata (HistogramMetadata): Metadata containing scale factor and axis values.
             solver (BarChartSolver): Solver containing bucket data.
-            changedIndex (int): Index of the bucket being modified.
-            valueChanged (bool): Whether a value is currently being changed.
         """
-        self.dataWindow.config(state="normal")
-        self.dataWindow.delete("1.0", "end")
-
-        self.dataWindow.tag_configure("changing_Value", foreground="red")
         rectangles : list[ValueBucket] = solver.GetRectangleDataAsList() # pyright: ignore[reportAssignmentType]
 
-        for i in range(len(rectangles)-1, -1, -1):
+        def formatRow(i: int) -> str:
             rec = rectangles[i]
-            trueValue = rec.GetHeight()/plotMetadata.heightScaleFactor
-            valueString = ""
-            if ((trueValue >= 1e+06) or (trueValue <= 1e-04)):
-                valueString = f"{trueValue:.4g}"
-            else:
-                valueString = str(trueValue)
-
-            if valueChanged and i == changedIndex:
-                self.dataWindow.insert("1.0",f"({rec.interval[0]}, {rec.interval[1]}) = {valueString}\n", "changing_Value")
-            else:
-                self.dataWindow.insert("1.0",f"({rec.interval[0]}, {rec.interval[1]}) = {valueString}\n")
-        self.dataWindow.config(state="disabled")
+            return f"({rec.interval[0]}, {rec.interval[1]}) = {FormatValue(rec.GetHeight()/plotMetadata.heightScaleFactor)}\n"
+        return len(rectangles), formatRow
 
 class LineChartDataViewer(DataViewer):
     """
@@ -155,35 +217,121 @@ class LineChartDataViewer(DataViewer):
     
     Displays line chart data point values in a text window.
     """
-    def Write(self, plotMetadata: LineChartMetadata, solver: LineChartSolver, changedIndex: int, valueChanged: bool)->None:
-        """Displays line chart data with highlighting for edited values.
+    def _prepareRows(self, plotMetadata: LineChartMetadata, solver: LineChartSolver) -> tuple[int, Callable[[int], str]]: # pyright: ignore[reportIncompatibleMethodOverride]
+        """Prepares one line per data point with its name and value.
 
         Args:
             plotMetadata (LineChartMetadata): Metadata containing scale factor and axis values.
             solver (LineChartSolver): Solver containing line data.
-            changedIndex (int): Index of the point being modified.
-            valueChanged (bool): Whether a value is currently being changed.
         """
-        self.dataWindow.config(state="normal")
-        self.dataWindow.delete("1.0", "end")
-        self.dataWindow.tag_configure("changing_Value", foreground="red")
-        #lines = solver.GetLineData()
         origin = solver.GetOrigin()
-        #points = [line.leftEnd for line in lines] + [lines[-1].rightEnd]
         points = solver.GetPoints()
-        points.reverse()
-
-        for i,point in enumerate(points):
-            value = point.Y - origin.Y
-            label = point.name
-            trueValue = value/plotMetadata.heightScaleFactor + plotMetadata.xAxisValue
-            valueString = ""
-            if ((trueValue >= 1e+06) or (trueValue <= 1e-04)):
-                valueString = f"{trueValue:.4g}"
-            else:
-                valueString = str(trueValue)
-            if valueChanged and i == len(points)-1 - changedIndex:
-                self.dataWindow.insert("1.0",f"{label} = {valueString}\n", "changing_Value")
-            else:
-                self.dataWindow.insert("1.0",f"{label} = {valueString}\n")
-        self.dataWindow.config(state="disabled")
+
+        def formatRow(i: int) -> str:
+            point = points[i]
+            trueValue = (point.Y - origin.Y)/plotMetadata.heightScaleFactor + plotMetadata.xAxisValue
+            return f"{point.name} = {FormatValue(trueValue)}\n"
+        return len(points), formatRow
+
+class VirtualizedDataViewer(DataViewer):
+    """
+    Data viewer for charts with a large number of elements.
+
+    Only the rows which fit into the text window are formatted and written, other rows are never formatted.
+    The window is scrolled by the mouse wheel and by the arrow, page, home and end keys,
+    and it follows the element which is currently being dragged.
+    A status line above the rows shows which elements are visible.
+    Has to be combined with a concrete DataViewer implementing _prepareRows.
+    """
+    def __init__(self, textWindow: tk.Text):
+        super().__init__(textWindow)
+        self._firstRow : int = 0
+        self._rowCount : int = 0
+        self._formatRow : Callable[[int], str] | None = None
+        self._pendingHighlight : int | None = None
+        for sequence, step in (("<Button-4>", -1), ("<Button-5>", 1), ("<Up>", -1), ("<Down>", 1)):
+            textWindow.bind(sequence, lambda event, step=step: self._scrollBy(step))
+        textWindow.bind("<MouseWheel>", lambda event: self._scrollBy(-1 if event.delta > 0 else 1))
+        textWindow.bind("<Prior>", lambda event: self._scrollBy(-self._getVisibleRowCount()))
+        textWindow.bind("<Next>", lambda event: self._scrollBy(self._getVisibleRowCount()))
+        textWindow.bind("<Home>", lambda event: self._scrollBy(-self._rowCount))
+        textWindow.bind("<End>", lambda event: self._scrollBy(self._rowCount))
+
+    @inheritdocstring(DataViewer.Write)
+    def Write(self, plotMetadata: PlotMetadata, solver: ChartSolver, changedIndex: int, valueChanged: bool) -> None:
+        self._rowCount, self._formatRow = self._prepareRows(plotMetadata, solver)
+        followedRow = changedIndex if changedIndex is not None and 0 <= changedIndex < self._rowCount else None
+        if followedRow is not None:
+            self._scrollTo(followedRow)
+        self._pendingHighlight = followedRow if valueChanged else None
+        self._writeVisibleRows()
+
+    def _getVisibleRowCount(self) -> int:
+        """Computes how many rows fit into the text window, based on the number of lines of the first visible row.
+        """
+        if self._formatRow is None or self._rowCount == 0:
+            return 1
+        windowLines = int(self.dataWindow.cget("height")) - 1 - sum(text.count("\n") for text, _ in super()._getHeader())
+        rowLines = max(self._formatRow(min(self._firstRow, self._rowCount - 1)).count("\n"), 1)
+        return max(windowLines // rowLines, 1)
+
+    def _scrollTo(self, row: int):
+        """Moves the visible window by the smallest amount so that a given row is visible.
+        """
+        visibleRowCount = self._getVisibleRowCount()
+        if row < self._firstRow:
+            self._firstRow = row
+        elif row >= self._firstRow + visibleRowCount:
+            self._firstRow = row - visibleRowCount + 1
+
+    def _scrollBy(self, step: int) -> str:
+        """Moves the visible window by a given number of rows and rewrites it.
+
+        Returns:
+            str: "break", so that the text window does not scroll on its own.
+        """
+        self._firstRow += step
+        self._writeVisibleRows()
+        return "break"
+
+    def _writeVisibleRows(self):
+        """Formats and writes the rows in the visible window.
+        """
+        if self._formatRow is None:
+            return
+        visibleRowCount = self._getVisibleRowCount()
+        self._firstRow = max(min(self._firstRow, self._rowCount - visibleRowCount), 0)
+        end = min(self._firstRow + visibleRowCount, self._rowCount)
+        rows = [self._formatRow(i) for i in range(self._firstRow, end)]
+        highlightedRow = self._pendingHighlight - self._firstRow if self._pendingHighlight is not None else None
+        self._writeRows(rows, highlightedRow, self._getHeader())
+
+    @inheritdocstring(DataViewer._getHeader)
+    def _getHeader(self) -> list[HeaderSegment]:
+        end = min(self._firstRow + self._getVisibleRowCount(), self._rowCount)
+        status = f"{self._firstRow + 1}-{end} of {self._rowCount} (scroll to move)\n" if self._rowCount > 0 else "no data\n"
+        return [(status, None)] + super()._getHeader()
+
+class VirtualizedCandlesticDataViewer(VirtualizedDataViewer, CandlesticDataViewer):
+    """
+    Virtualized data viewer for candlestick charts.
+    """
+    pass
+
+class VirtualizedBarChartDataViewer(VirtualizedDataViewer, BarChartDataViewer):
+    """
+    Virtualized data viewer for bar charts.
+    """
+    pass
+
+class VirtualizedHistogramDataViewer(VirtualizedDataViewer, HistogramDataViewer):
+    """
+    Virtualized data viewer for histograms.
+    """
+    pass
+
+class VirtualizedLineChartDataViewer(VirtualizedDataViewer, LineChartDataViewer):
+    """
+    Virtualized data viewer for line charts.
+    """
+    pass
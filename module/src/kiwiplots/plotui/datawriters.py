@@ -1,116 +1,323 @@
 from abc import ABC
+from typing import Any, BinaryIO, Iterable, Iterator, TextIO
+from itertools import islice
+import bz2
+import csv
+import gzip
+import io
+import json
+import lzma
+import os
+import shutil
+import numpy as np
 from .plotmetadata import *
 from kiwiplots.solvers import *
+from kiwiplots.utils import inheritdocstring
+from .exportcache import ExportCache
 
 
 class DataWriter(ABC):
     """
     Abstract class for exporting plot data to file formats.
+
+    Subclasses provide the data of the chart as columns (NumPy arrays of equal length), which are written as
+    CSV (csv.writer), NumPy .npz archive or JSON Lines (one JSON object per element). The format of a file is given by its extension.
+    CSV and JSON Lines files can be compressed by gzip, bzip2 or xz, selected by an additional extension (e.g. data.csv.gz). Text formats are written
+    in chunks of rows, so the size of the formatted text held in memory is bounded.
+    Data can be written to a file, to any binary stream or as CSV to any text stream (e.g. io.StringIO or a response of a web server).
+    With an export cache, written files are cached by the content of the chart, so re-exporting an unchanged chart only copies the cached file.
+
+    Attributes:
+        exportCache (ExportCache | None): cache of written files, None disables caching
+        compressionLevel (int | None): level of compression (0-9), None uses the default level of the codec
+        chunkRows (int): number of rows formatted and written at once
     """
+    FORMATS : tuple[str, ...] = ("csv", "npz", "jsonl")
+    COMPRESSIONS : tuple[str, ...] = ("gz", "bz2", "xz")
+    BUFFER_SIZE : int = 1 << 20
+    CHUNK_ROWS : int = 10000
+
+    def __init__(self):
+        self.exportCache : ExportCache | None = None
+        self.compressionLevel : int | None = None
+        self.chunkRows : int = DataWriter.CHUNK_ROWS
 
     def write(self, plotMetada : PlotMetadata, solver: ChartSolver, file: str):
         """
         Exports plot data to a file.
-        
-        This method should retrieve all plot data from the solver and write it to
-        a file in a structured format (CSV).
-        
+
+        Args:
+            plotMetada: Metadata about the plot including scale factor and axis values.
+            solver: The solver containing the plot data to be exported.
+            file: Path to the output file. The format is given by the extension (.npz or .jsonl), files with other extensions (e.g. .csv or .txt) are written as CSV.
+                An additional extension .gz, .bz2 or .xz compresses the file (e.g. data.csv.gz).
+        """
+        root, extension = os.path.splitext(file)
+        compression = extension[1:].lower()
+        if compression in DataWriter.COMPRESSIONS:
+            extension = os.path.splitext(root)[1]
+        else:
+            compression = None
+        dataFormat = extension[1:].lower()
+        if dataFormat not in DataWriter.FORMATS:
+            dataFormat = "csv"
+        with open(file, "wb", buffering=DataWriter.BUFFER_SIZE) as stream:
+            self.WriteBinary(plotMetada, solver, stream, dataFormat, compression)
+
+    def WriteBinary(self, plotMetada : PlotMetadata, solver: ChartSolver, stream: BinaryIO, dataFormat: str = "csv", compression: str | None = None):
+        """
+        Exports plot data to a binary stream. Texts are encoded in UTF-8.
+
         Args:
             plotMetada: Metadata about the plot including scale factor and axis values.
             solver: The solver containing the plot data to be exported.
+            stream: Binary stream the data are written to.
+            dataFormat: "csv", "npz" or "jsonl". Defaults to "csv".
+            compression: "gz", "bz2", "xz" or None for uncompressed output. Only CSV and JSON Lines can be compressed. Defaults to None.
         """
-        raise NotImplementedError("Method DataWriter.write must be declared in subclass")
+        if compression is not None and compression not in DataWriter.COMPRESSIONS:
+            raise ValueError(f"Unknown compression {compression}")
+        if compression is not None and dataFormat == "npz":
+            # zip archives are written with seeks, which compressing streams do not support
+            raise ValueError("NumPy archives can not be compressed")
+
+        def writeData(output: BinaryIO):
+            if compression is None:
+                self._writeFormat(plotMetada, solver, output, dataFormat)
+                return
+            with self._compress(output, compression) as compressed:
+                self._writeFormat(plotMetada, solver, compressed, dataFormat)
+
+        if self.exportCache is None:
+            writeData(stream)
+            return
+        key = self.exportCache.Key(plotMetada, solver, type(self).__qualname__, dataFormat, compression, self.compressionLevel)
+        with self.exportCache.Open(key, writeData) as cached:
+            shutil.copyfileobj(cached, stream)
+
+    def WriteStream(self, plotMetada : PlotMetadata, solver: ChartSolver, output: TextIO):
+        """
+        Exports plot data to a text stream in CSV format. Rows are formatted by csv.writer in chunks, every chunk is written by a single call.
+
+        Args:
+            plotMetada: Metadata about the plot including scale factor and axis values.
+            solver: The solver containing the plot data to be exported.
+            output: Text stream the data are written to.
+        """
+        chunk = io.StringIO()
+        writer = csv.writer(chunk, lineterminator="\n")
+        rows = iter(self.Rows(plotMetada, solver))
+        while block := list(islice(rows, self.chunkRows)):
+            writer.writerows(block)
+            output.write(chunk.getvalue())
+            chunk.seek(0)
+            chunk.truncate()
+
+    def WriteJSONLines(self, plotMetada : PlotMetadata, solver: ChartSolver, output: TextIO):
+        """
+        Exports plot data to a text stream in JSON Lines format, one object with all columns per data element. Lines are written in chunks.
+
+        Args:
+            plotMetada: Metadata about the plot including scale factor and axis values.
+            solver: The solver containing the plot data to be exported.
+            output: Text stream the data are written to.
+        """
+        columns = self.Columns(plotMetada, solver)
+        # values are encoded column by column, rows are then filled into a template of the object
+        template = "{" + ", ".join(json.dumps(name, ensure_ascii=False).replace("%", "%%") + ": %s" for name in columns) + "}\n"
+        for chunk in self._chunks(columns):
+            encoded = [self._encodeJSONColumn(column) for column in chunk]
+            output.write("".join([template % row for row in zip(*encoded)]))
+
+    def WriteNPZ(self, plotMetada : PlotMetadata, solver: ChartSolver, stream: BinaryIO):
+        """
+        Exports plot data to a binary stream as a NumPy .npz archive with one array per column. Values keep their full precision.
+
+        Args:
+            plotMetada: Metadata about the plot including scale factor and axis values.
+            solver: The solver containing the plot data to be exported.
+            stream: Binary stream the archive is written to.
+        """
+        np.savez(stream, **self.Columns(plotMetada, solver))
+
+    def Columns(self, plotMetada : PlotMetadata, solver: ChartSolver) -> dict[str, np.ndarray]:
+        """
+        Retrieves the plot data as named columns, arrays of equal length with one value per data element.
+
+        Args:
+            plotMetada: Metadata about the plot including scale factor and axis values.
+            solver: The solver containing the plot data to be exported.
+
+        Returns:
+            dict[str, np.ndarray]: Columns of the data in their order in the output.
+        """
+        raise NotImplementedError("Method DataWriter.Columns must be declared in subclass")
+
+    def Rows(self, plotMetada : PlotMetadata, solver: ChartSolver) -> Iterable[list[Any]]:
+        """
+        Retrieves the plot data as rows of the CSV output. By default every data element is a row with values of all columns.
+
+        Args:
+            plotMetada: Metadata about the plot including scale factor and axis values.
+            solver: The solver containing the plot data to be exported.
+
+        Returns:
+            Iterable[list[Any]]: Rows of the CSV output.
+        """
+        for chunk in self._chunks(self.Columns(plotMetada, solver)):
+            yield from zip(*(column.tolist() for column in chunk))
+
+    def _chunks(self, columns: dict[str, np.ndarray]) -> Iterator[list[np.ndarray]]:
+        """Splits columns to chunks of chunkRows values.
+        """
+        length = len(next(iter(columns.values()))) if columns else 0
+        for start in range(0, length, self.chunkRows):
+            yield [column[start:start + self.chunkRows] for column in columns.values()]
+
+    def _compress(self, stream: BinaryIO, compression: str) -> BinaryIO:
+        """Opens a compressing stream writing to the given stream, which is left open when the compressing stream is closed.
+        """
+        level = self.compressionLevel
+        if compression == "gz":
+            # no timestamp in the header, equal data give equal files
+            return gzip.GzipFile(fileobj=stream, mode="wb", compresslevel=9 if level is None else level, mtime=0) # pyright: ignore[reportReturnType]
+        if compression == "bz2":
+            return bz2.BZ2File(stream, "wb", compresslevel=9 if level is None else level) # pyright: ignore[reportReturnType]
+        return lzma.LZMAFile(stream, "wb", preset=level) # pyright: ignore[reportReturnType]
+
+    @staticmethod
+    def _encodeJSONColumn(column: np.ndarray) -> list[str]:
+        """Encodes every value of a column as a JSON value.
+        """
+        if column.dtype.kind in "US":
+            return [json.encoder.encode_basestring(value) for value in column.tolist()] # pyright: ignore[reportAttributeAccessIssue]
+        if len(column) == 0:
+            return []
+        # numbers never contain the separator of array items
+        return json.dumps(column.tolist())[1:-1].split(", ")
+
+    def _writeFormat(self, plotMetada : PlotMetadata, solver: ChartSolver, stream: BinaryIO, dataFormat: str):
+        """Writes the data to a binary stream in the given format (lowercase file extension without the dot).
+        """
+        if dataFormat == "npz":
+            self.WriteNPZ(plotMetada, solver, stream)
+            return
+        if dataFormat not in DataWriter.FORMATS:
+            raise ValueError(f"Unknown data format {dataFormat}")
+        output = io.TextIOWrapper(stream, encoding="utf-8", newline="")
+        if dataFormat == "csv":
+            self.WriteStream(plotMetada, solver, output)
+        else:
+            self.WriteJSONLines(plotMetada, solver, output)
+        output.detach()
 
 class CandlesticDataWriter(DataWriter):
     """
     Data writer for candlestick charts.
-    
-    Exports candlestick data to CSV format.
+
+    Exports name, opening, closing, minimum and maximum value of every candle.
     """
-    def write(self, plotMetadata: CandlesticPlotMetadata, solver: CandlestickChartSolver, file: str):
-        """Exports candlestick data to a CSV file.
+    def Columns(self, plotMetadata: CandlesticPlotMetadata, solver: CandlestickChartSolver) -> dict[str, np.ndarray]: # pyright: ignore[reportIncompatibleMethodOverride]
+        """Retrieves names and values of candles.
 
         Args:
             plotMetadata (CandlesticPlotMetadata): Metadata containing scale factor and axis values.
             solver (CandlestickChartSolver): Solver containing candle data.
-            file (str): Path to the output CSV file.
+
+        Returns:
+            dict[str, np.ndarray]: Columns name, opening, closing, minimum and maximum.
         """
-        with open(file,"w") as output:
-            candles = solver.GetCandleData()
-            for candle in candles:
-                output.write(f"{candle.name},{candle.openingCorner.Y/plotMetadata.heightScaleFactor + plotMetadata.xAxisValue},{candle.closingCorner.Y/plotMetadata.heightScaleFactor + plotMetadata.xAxisValue},{candle.wickBottom.Y/plotMetadata.heightScaleFactor + plotMetadata.xAxisValue},{candle.wickTop.Y/plotMetadata.heightScaleFactor + plotMetadata.xAxisValue}")
-                output.write("\n")
+        candles = solver.GetCandleData()
+        coordinates = np.array([(candle.openingCorner.Y, candle.closingCorner.Y, candle.wickBottom.Y, candle.wickTop.Y) for candle in candles], dtype=np.float64).reshape(-1, 4)
+        values = coordinates / plotMetadata.heightScaleFactor + plotMetadata.xAxisValue
+        return {
+            "name": np.array([candle.name for candle in candles], dtype=str),
+            "opening": values[:, 0],
+            "closing": values[:, 1],
+            "minimum": values[:, 2],
+            "maximum": values[:, 3],
+        }
 
 class BarChartDataWriter(DataWriter):
     """
     Data writer for bar charts.
-    
-    Exports bar chart data to CSV format.
+
+    Exports group index, name and value of every bar. CSV output has one row per group with name and value of every bar in the group.
     """
-    def write(self, plotMetadata: BarChartMetadata, solver: BarChartSolver, file: str):
-        """Exports bar chart data to a CSV file.
+    def Columns(self, plotMetadata: BarChartMetadata, solver: BarChartSolver) -> dict[str, np.ndarray]: # pyright: ignore[reportIncompatibleMethodOverride]
+        """Retrieves groups, names and values of bars.
 
         Args:
             plotMetadata (BarChartMetadata): Metadata containing scale factor and axis values.
             solver (BarChartSolver): Solver containing bar data.
-            file (str): Path to the output CSV file.
-        """
-        with open(file,"w") as output:
-            groups = solver.GetBarData()
-            for group in groups: # pyright: ignore[reportOptionalIterable]
-                for i in range(len(group)):
-                    rec = group[i]
-                    if i != 0:
-                        output.write(",")
-                    height = rec.GetHeight()
-                    value = height/plotMetadata.heightScaleFactor
-                    output.write(f"{rec.name},{value}")
-                output.write("\n")
+
+        Returns:
+            dict[str, np.ndarray]: Columns group, name and value.
+        """
+        groups = solver.GetBarData()
+        rectangles = [(index, rec) for index, group in enumerate(groups) for rec in group] # pyright: ignore[reportArgumentType]
+        return {
+            "group": np.array([index for index, _ in rectangles], dtype=np.int64),
+            "name": np.array([rec.name for _, rec in rectangles], dtype=str),
+            "value": np.array([rec.GetHeight() for _, rec in rectangles], dtype=np.float64) / plotMetadata.heightScaleFactor,
+        }
+
+    @inheritdocstring(DataWriter.Rows)
+    def Rows(self, plotMetadata: BarChartMetadata, solver: BarChartSolver) -> Iterable[list[Any]]: # pyright: ignore[reportIncompatibleMethodOverride]
+        columns = self.Columns(plotMetadata, solver)
+        names, values = columns["name"].tolist(), columns["value"].tolist()
+        # bars are ordered by groups, a group ends where the next one starts
+        bounds = [0] + (np.flatnonzero(np.diff(columns["group"])) + 1).tolist() + [len(names)]
+        rows = []
+        for start, end in zip(bounds[:-1], bounds[1:]):
+            row = [None] * (2 * (end - start))
+            row[0::2], row[1::2] = names[start:end], values[start:end]
+            rows.append(row)
+        return rows
 
 class HistogramDataWriter(DataWriter):
     """
     Data writer for histograms.
-    
-    Exports histogram bucket data to CSV format.
+
+    Exports start, end and value of every bucket.
     """
-    def write(self, plotMetadata: HistogramMetadata, solver: HistogramSolver, file: str):
-        """Exports histogram bucket data to a CSV file.
+    def Columns(self, plotMetadata: HistogramMetadata, solver: HistogramSolver) -> dict[str, np.ndarray]: # pyright: ignore[reportIncompatibleMethodOverride]
+        """Retrieves intervals and values of buckets.
 
         Args:
             plotMetadata (HistogramMetadata): Metadata containing scale factor and axis values.
             solver (HistogramSolver): Solver containing bucket data.
-            file (str): Path to the output CSV file.
+
+        Returns:
+            dict[str, np.ndarray]: Columns start, end and value.
         """
-        with open(file,"w") as output:
-            rectangles = solver.GetBucketData()
-            for rec in rectangles:
-                height = rec.GetHeight()
-                value = height/plotMetadata.heightScaleFactor
-                output.write(f"{rec.interval[0]},{rec.interval[1]},{value}\n")
+        rectangles = solver.GetBucketData()
+        return {
+            "start": np.array([rec.interval[0] for rec in rectangles]),
+            "end": np.array([rec.interval[1] for rec in rectangles]),
+            "value": np.array([rec.GetHeight() for rec in rectangles], dtype=np.float64) / plotMetadata.heightScaleFactor,
+        }
 
 class LineChartDataWriter(DataWriter):
     """
     Data writer for line charts.
-    
-    Exports line chart data to CSV format.
+
+    Exports name and value of every point.
     """
-    def write(self, plotMetadata: LineChartMetadata, solver: LineChartSolver, file: str):
-        """Exports line chart data to a CSV file.
+    def Columns(self, plotMetadata: LineChartMetadata, solver: LineChartSolver) -> dict[str, np.ndarray]: # pyright: ignore[reportIncompatibleMethodOverride]
+        """Retrieves names and values of points.
 
         Args:
             plotMetadata (LineChartMetadata): Metadata containing scale factor and axis values.
             solver (LineChartSolver): Solver containing line data.
-            file (str): Path to the output CSV file.
-        """
-        with open(file,"w") as output:
-            lines = solver.GetLineData()
-            origin = solver.GetOrigin()
-            points = solver.GetPoints()
-            for i,point in enumerate(points):
-                value = point.Y - origin.Y
-                label = point.name
-                trueValue = value/plotMetadata.heightScaleFactor + plotMetadata.xAxisValue
-                output.write(label)
-                output.write(",")
-                output.write(str(trueValue))
-                output.write("\n")
+
+        Returns:
+            dict[str, np.ndarray]: Columns name and value.
+        """
+        origin = solver.GetOrigin()
+        points = solver.GetPoints()
+        heights = np.array([point.Y for point in points], dtype=np.float64) - origin.Y
+        return {
+            "name": np.array([point.name for point in points], dtype=str),
+            "value": heights / plotMetadata.heightScaleFactor + plotMetadata.xAxisValue,
+        }
@@ -0,0 +1,230 @@
+"""Display-level downsampling of line and candlestick chart data.
+
+Downsampling only decides which of the solved points are rendered. The solver keeps
+all of the original points, so hit-testing and editing still work on the original data.
+"""
+import numpy as np
+from kiwiplots.solvers import ChartSolver
+from kiwiplots.chartelements import ValuePoint2D, ValueCandle
+
+def LargestTriangleThreeBuckets(x: np.ndarray, y: np.ndarray, threshold: int) -> np.ndarray:
+    """Selects representative points of a polyline using the Largest-Triangle-Three-Buckets algorithm.
+    The first and the last point are always kept. Inner points are split into threshold - 2 buckets,
+    and from every bucket the point forming the largest triangle with the previously selected point
+    and the average of the next bucket is chosen.
+
+    Args:
+        x (np.ndarray): X coordinates of the points, sorted in ascending order.
+        y (np.ndarray): Y coordinates of the points.
+        threshold (int): Number of points to keep.
+
+    Returns:
+        np.ndarray: Sorted indices of the selected points.
+    """
+    count = len(x)
+    if threshold >= count or threshold < 3:
+        return np.arange(count)
+
+    # Bucket i spans indices [edges[i], edges[i+1]), the first and the last point are not part of any bucket
+    every = (count - 2) / (threshold - 2)
+    edges = (np.arange(threshold - 1) * every).astype(np.int64) + 1
+    edges[-1] = count - 1
+    sizes = np.diff(edges)
+
+    # Average of the following bucket (the last point for the last bucket), computed for all buckets at once
+    averageX = np.add.reduceat(x[1:count-1], edges[:-1] - 1) / sizes
+    averageY = np.add.reduceat(y[1:count-1], edges[:-1] - 1) / sizes
+    nextX = np.append(averageX[1:], x[-1])
+    nextY = np.append(averageY[1:], y[-1])
+
+    selected = np.empty(threshold, dtype=np.int64)
+    selected[0] = 0
+    selected[-1] = count - 1
+    previous = 0
+    for bucket in range(threshold - 2):
+        start, end = edges[bucket], edges[bucket + 1]
+        bucketX = x[start:end]
+        bucketY = y[start:end]
+        areas = np.abs((x[previous] - nextX[bucket]) * (bucketY - y[previous]) - (x[previous] - bucketX) * (nextY[bucket] - y[previous]))
+        previous = start + int(np.argmax(areas))
+        selected[bucket + 1] = previous
+    return selected
+
+def VisibleIndices(x: np.ndarray, left: float, right: float) -> np.ndarray:
+    """Selects indices of points lying in the horizontal range [left, right]. The nearest point outside the range
+    on each side is kept as well, so that the segments crossing the edges of the range are still rendered.
+
+    Args:
+        x (np.ndarray): X coordinates of the points, sorted in ascending order.
+        left (float): Left edge of the visible range.
+        right (float): Right edge of the visible range.
+
+    Returns:
+        np.ndarray: Sorted indices of the points in the visible range.
+    """
+    start = max(int(np.searchsorted(x, left, side="left")) - 1, 0)
+    end = min(int(np.searchsorted(x, right, side="right")) + 1, len(x))
+    return np.arange(start, end)
+
+class LineDownsampler:
+    """
+    Chooses which points of a line chart are rendered. Points outside of the drawn area are culled and,
+    if there are still more points than horizontal pixels, the rest is reduced by LTTB to one point per pixel.
+    The selection is cached and recomputed only when the layout of the solver changes.
+    """
+    def __init__(self):
+        self._cacheKey : tuple | None = None
+        self._cachedIndices : np.ndarray | None = None
+
+    def GetIndices(self, solver: ChartSolver, points: list[ValuePoint2D], pixelWidth: int) -> np.ndarray:
+        """Computes indices of points which should be rendered.
+
+        Args:
+            solver (ChartSolver): Solver which solved the points. Its layout version is used to invalidate the cache.
+            points (list[ValuePoint2D]): Solved points of the line chart (in the order given by the solver).
+            pixelWidth (int): Width of the drawn area in pixels.
+
+        Returns:
+            np.ndarray: Sorted indices into the points list.
+        """
+        key = (id(solver), solver.layoutVersion, len(points), pixelWidth)
+        if key == self._cacheKey and self._cachedIndices is not None:
+            return self._cachedIndices
+
+        x = np.fromiter((point.X for point in points), dtype=np.float64, count=len(points))
+        y = np.fromiter((point.Y for point in points), dtype=np.float64, count=len(points))
+        visible = VisibleIndices(x, 0, pixelWidth)
+        if len(visible) > 0:
+            spannedPixels = int(x[visible[-1]] - x[visible[0]]) + 1
+            threshold = min(spannedPixels, pixelWidth)
+            if len(visible) > threshold:
+                visible = visible[LargestTriangleThreeBuckets(x[visible], y[visible], threshold)]
+
+        self._cacheKey = key
+        self._cachedIndices = visible
+        return visible
+
+class CandleResampler:
+    """
+    Chooses which candles of a candlestick chart are rendered. Candles outside of the drawn area are culled and,
+    if the candles are narrower than MINIMAL_BAR_PIXELS, adjacent candles are merged into coarser OHLC bars
+    (first opening, last closing, lowest wick bottom, highest wick top).
+    Buckets are aligned to multiples of the bucket size, so they stay stable while the chart is moved and the chart
+    returns to individual candles as soon as they are wide enough again.
+    Geometry of the bars is cached and recomputed only when the layout of the solver changes.
+    Colors and names are always taken from the current candles.
+
+    Attributes:
+        minimalBarPixels (float): minimal horizontal pitch (in pixels) of rendered bars
+    """
+    MINIMAL_BAR_PIXELS : float = 3
+
+    def __init__(self, minimalBarPixels: float = MINIMAL_BAR_PIXELS):
+        self.minimalBarPixels : float = minimalBarPixels
+        self._cacheKey : tuple | None = None
+        self._cachedBars : tuple | None = None
+
+    def GetBucketSize(self, candles: list[ValueCandle]) -> int:
+        """Computes how many adjacent candles are merged into one rendered bar.
+
+        Args:
+            candles (list[ValueCandle]): Solved candles.
+
+        Returns:
+            int: Number of candles per rendered bar.
+        """
+        if len(candles) < 2:
+            return 1
+        pixelsPerCandle = (candles[-1].openingCorner.X - candles[0].openingCorner.X) / (len(candles) - 1)
+        if pixelsPerCandle >= self.minimalBarPixels:
+            return 1
+        return int(np.ceil(self.minimalBarPixels / max(pixelsPerCandle, 1e-9)))
+
+    def GetCandles(self, solver: ChartSolver, candles: list[ValueCandle], pixelWidth: int) -> list[ValueCandle]:
+        """Computes candles which should be rendered.
+
+        Args:
+            solver (ChartSolver): Solver which solved the candles. Its layout version is used to invalidate the cache.
+            candles (list[ValueCandle]): Solved candles (in the order given by the solver).
+            pixelWidth (int): Width of the drawn area in pixels.
+
+        Returns:
+            list[ValueCandle]: Original visible candles if no merging is needed, merged bars otherwise.
+        """
+        key = (id(solver), solver.layoutVersion, len(candles), pixelWidth)
+        if key != self._cacheKey or self._cachedBars is None:
+            self._cachedBars = self._computeBars(candles, pixelWidth)
+            self._cacheKey = key
+
+        start, end, starts, ends, opening, closing, low, high, left, right = self._cachedBars
+        if starts is None:
+            return candles[start:end]
+
+        visible = candles[start:end]
+        positiveColor, negativeColor = self._getColors(visible)
+        bars : list[ValueCandle] = []
+        for i in range(len(starts)):
+            first = visible[starts[i]]
+            middle = (left[i] + right[i]) / 2
+            bars.append(ValueCandle(openingCorner=ValuePoint2D(left[i], opening[i]),
+                                    closingCorner=ValuePoint2D(right[i], closing[i]),
+                                    wickBottom=ValuePoint2D(middle, low[i]),
+                                    wickTop=ValuePoint2D(middle, high[i]),
+                                    color=positiveColor if closing[i] >= opening[i] else negativeColor,
+                                    name=first.name,
+                                    nameVisible=first.nameVisible))
+        return bars
+
+    def _computeBars(self, candles: list[ValueCandle], pixelWidth: int) -> tuple:
+        """Culls candles outside of the drawn area and merges the rest into OHLC bars.
+
+        Args:
+            candles (list[ValueCandle]): Solved candles.
+            pixelWidth (int): Width of the drawn area in pixels.
+
+        Returns:
+            tuple: Range of visible candles, bucket boundaries (relative to the range, None if nothing is merged)
+            and arrays of opening, closing, low, high, left and right coordinates of the bars.
+        """
+        count = len(candles)
+        left = np.fromiter((candle.openingCorner.X for candle in candles), dtype=np.float64, count=count)
+        right = np.fromiter((candle.closingCorner.X for candle in candles), dtype=np.float64, count=count)
+        start = int(np.searchsorted(right, 0, side="left"))
+        end = max(int(np.searchsorted(left, pixelWidth, side="right")), start)
+        bucketSize = self.GetBucketSize(candles)
+        if bucketSize == 1 or start == end:
+            return (start, end, None, None, None, None, None, None, None, None)
+
+        visible = candles[start:end]
+        visibleCount = len(visible)
+        opening = np.fromiter((candle.openingCorner.Y for candle in visible), dtype=np.float64, count=visibleCount)
+        closing = np.fromiter((candle.closingCorner.Y for candle in visible), dtype=np.float64, count=visibleCount)
+        low = np.fromiter((candle.wickBottom.Y for candle in visible), dtype=np.float64, count=visibleCount)
+        high = np.fromiter((candle.wickTop.Y for candle in visible), dtype=np.float64, count=visibleCount)
+
+        indices = np.arange(start, end)
+        starts = np.flatnonzero((indices % bucketSize == 0) | (indices == start))
+        ends = np.append(starts[1:], visibleCount) - 1
+
+        return (start, end, starts, ends,
+                opening[starts], closing[ends],
+                np.minimum.reduceat(low, starts), np.maximum.reduceat(high, starts),
+                left[start:end][starts], right[start:end][ends])
+
+    def _getColors(self, candles: list[ValueCandle]) -> tuple:
+        """Finds colors used for positive and negative candles.
+
+        Returns:
+            tuple: Positive and negative color. If no candle of one kind exists, the color of the other kind is used.
+        """
+        positiveColor, negativeColor = None, None
+        for candle in candles:
+            if candle.closingCorner.Y >= candle.openingCorner.Y:
+                positiveColor = candle.color if positiveColor is None else positiveColor
+            else:
+                negativeColor = candle.color if negativeColor is None else negativeColor
+            if positiveColor is not None and negativeColor is not None:
+                break
+        positiveColor = positiveColor if positiveColor is not None else negativeColor
+        negativeColor = negativeColor if negativeColor is not None else positiveColor
+        return positiveColor, negativeColor
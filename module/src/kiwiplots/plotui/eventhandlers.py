@@ -93,13 +93,48 @@ class EventHandler(ABC):
         raise NotImplementedError("Method must be declared in a subclass.")
     
     
-    def _updateCanvas(self):
+    def _updateCanvas(self, interactive: bool = False):
         """
         Redraws the plot on the canvas using the current solver state.
+
+        Args:
+            interactive (bool, optional): Whether the redraw is a frame of a mouse gesture, which can be rendered in degraded quality when drawing is slow. Defaults to False.
         """
         assert self.plotSolver is not None
         assert self.drawer is not None
-        self.drawer.draw(self.plotMetadata,self.plotSolver) 
+        self.drawer.Render(self.plotMetadata,self.plotSolver,interactive) 
+
+    def Resize(self, width: int, height: int):
+        """
+        Projects the plot to a new size of the canvas. The chart is not solved again, event positions are mapped back to the original layout.
+
+        Args:
+            width (int): New width of the canvas in pixels.
+            height (int): New height of the canvas in pixels.
+        """
+        if self.drawer is not None:
+            self.drawer.Resize(width, height)
+
+    def MapEvent(self, event: tk.Event) -> tk.Event:
+        """
+        Maps the position of a canvas event from the resized canvas to the layout of the chart, in which all handlers work.
+
+        Args:
+            event (tk.Event): Event on the canvas.
+
+        Returns:
+            tk.Event: The same event with the position in layout coordinates.
+        """
+        if self.drawer is None:
+            return event
+        return self.drawer.viewTransform.MapEvent(event)
+
+    def _endGesture(self):
+        """
+        Ends a mouse gesture, the canvas is redrawn in full quality if the gesture was rendered in degraded quality.
+        """
+        if self.drawer is not None:
+            self.drawer.EndGesture()
     
 
     def _updateDataView(self):
@@ -0,0 +1,240 @@
+"""Content addressed cache of exported pictures and data on the local disk.
+
+Exports are keyed by a hash of the solved layout of the chart, fields of the plot metadata and options of the output.
+Exporting a chart which did not change since its last export copies the cached file instead of rendering it again.
+The cache is bounded by the total size of the stored files, least recently used entries are removed first.
+"""
+import hashlib
+import os
+import pickle
+import tempfile
+from threading import Lock
+from typing import Any, BinaryIO, Callable
+from kiwiplots.solvers import ChartSolver
+from .plotmetadata import PlotMetadata
+
+class LayoutSnapshot:
+    """
+    Snapshot of the solved layout of a chart - values of all chart elements, origin and axis height.
+    Solvers replace their data on every update, so the snapshot is not affected by later changes of the chart.
+
+    The snapshot can stand in for the solver in picture drawers and data writers: value getters of the solver
+    (GetOrigin, GetPoints, GetCandleData, ...) are evaluated when the snapshot is taken and return the stored values.
+    Exports can therefore run on another thread while the chart is being edited.
+
+    Attributes:
+        data (Any): values of chart elements (ChartSolver.data)
+        origin (ValuePoint2D): origin of the chart
+        axisHeight (float): height of the y axis
+        layoutVersion (int): layout version of the solver when the snapshot was taken
+    """
+    GETTERS : tuple[str, ...] = ("GetOrigin", "GetAxisHeight", "GetWidth", "GetSpacing", "GetBarData", "GetCandleData", "GetBucketData",
+                                 "GetRectangleDataAsList", "GetLineData", "GetPoints")
+
+    def __init__(self, solver: ChartSolver):
+        self.data : Any = solver.data
+        self.origin = solver.GetOrigin()
+        self.axisHeight : float = solver.GetAxisHeight()
+        self.layoutVersion : int = solver.layoutVersion
+        self._values : dict[str, Any] = {name: getattr(solver, name)() for name in LayoutSnapshot.GETTERS if hasattr(solver, name)}
+        self._digest : str | None = None
+
+    def __getattr__(self, name: str) -> Callable[[], Any]:
+        values = self.__dict__.get("_values", {})
+        if name not in values:
+            raise AttributeError(f"{type(self).__name__} has no attribute {name}")
+        value = values[name]
+        return lambda: value
+
+    def Digest(self) -> str:
+        """Returns a hash of the values returned by the getters (names, colors, coordinates, ...). Equal layouts give equal digests.
+        The values are read from the chart elements, so the digest covers changes which did not update ChartSolver.data.
+
+        Returns:
+            str: Hexadecimal SHA-256 digest.
+        """
+        if self._digest is None:
+            content = pickle.dumps(sorted(self._values.items()), protocol=pickle.HIGHEST_PROTOCOL)
+            self._digest = hashlib.sha256(content).hexdigest()
+        return self._digest
+
+def _defaultDirectory() -> str:
+    """Directory of the cache in the user cache directory.
+    """
+    cacheHome = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(cacheHome, "kiwiplots", "exports")
+
+class ExportCache:
+    """
+    Size bounded LRU cache of exported files stored in a directory on the local disk.
+
+    Entries are written to temporary files and renamed when complete, so a partially written entry is never read.
+    Reading an entry updates its modification time, which is used as the time of the last use.
+
+    Attributes:
+        directory (str): directory of the cached files, created on the first write
+        maxBytes (int): maximal total size of the cached files in bytes
+    """
+    VERSION : int = 1
+    MAX_BYTES : int = 256 * 1024 * 1024
+    SUFFIX : str = ".export"
+    OPEN_ATTEMPTS : int = 3
+
+    def __init__(self, directory: str | None = None, maxBytes: int = MAX_BYTES):
+        self.directory : str = directory if directory is not None else _defaultDirectory()
+        self.maxBytes : int = maxBytes
+        self._lock : Lock = Lock()
+
+    def Snapshot(self, solver: ChartSolver) -> LayoutSnapshot:
+        """Returns a snapshot of the current layout of the solver. A new snapshot is taken on every call,
+        since not every change of a chart (e.g. a renamed element) changes the layout version of its solver.
+
+        Args:
+            solver (ChartSolver): Solver of the chart.
+
+        Returns:
+            LayoutSnapshot: Snapshot of the layout.
+        """
+        return LayoutSnapshot(solver)
+
+    def Key(self, plotMetadata: PlotMetadata, solver: ChartSolver | LayoutSnapshot, *options) -> str:
+        """Computes the key of an export.
+
+        Args:
+            plotMetadata (PlotMetadata): Metadata of the plot, all its fields are part of the key.
+            solver (ChartSolver | LayoutSnapshot): Solver of the chart or a snapshot of its layout.
+            options: Options of the output (exporter type, size, format, ...), their representations are part of the key.
+
+        Returns:
+            str: Hexadecimal key of the export.
+        """
+        snapshot = solver if isinstance(solver, LayoutSnapshot) else self.Snapshot(solver)
+        hasher = hashlib.sha256()
+        hasher.update(f"{ExportCache.VERSION}:{snapshot.Digest()}".encode("ascii"))
+        hasher.update(pickle.dumps((type(plotMetadata).__qualname__, sorted(vars(plotMetadata).items())), protocol=pickle.HIGHEST_PROTOCOL))
+        hasher.update(repr(options).encode("utf-8"))
+        return hasher.hexdigest()
+
+    def Get(self, key: str) -> str | None:
+        """Returns the path of a cached file and marks it as recently used.
+
+        Args:
+            key (str): Key of the export.
+
+        Returns:
+            str | None: Path of the cached file, None if the export is not cached.
+        """
+        path = self._path(key)
+        try:
+            os.utime(path)
+        except OSError:
+            return None
+        return path
+
+    def Put(self, key: str, write: Callable[[BinaryIO], None]) -> str:
+        """Stores an export in the cache and evicts least recently used entries if the cache is too large.
+
+        Args:
+            key (str): Key of the export.
+            write (Callable[[BinaryIO], None]): Function writing the exported content to a binary stream.
+
+        Returns:
+            str: Path of the cached file.
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        path = self._path(key)
+        handle, temporary = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(handle, "wb") as stream:
+                write(stream)
+            os.replace(temporary, path)
+        except BaseException:
+            ExportCache._remove(temporary)
+            raise
+        self._evict(keep=path)
+        return path
+
+    def Fetch(self, key: str, write: Callable[[BinaryIO], None]) -> str:
+        """Returns the path of a cached file, the file is created by the write function if the export is not cached.
+
+        Args:
+            key (str): Key of the export.
+            write (Callable[[BinaryIO], None]): Function writing the exported content to a binary stream.
+
+        Returns:
+            str: Path of the cached file.
+        """
+        path = self.Get(key)
+        return path if path is not None else self.Put(key, write)
+
+    def Open(self, key: str, write: Callable[[BinaryIO], None]) -> BinaryIO:
+        """Opens a cached export for reading, the export is created and cached first if it is not cached.
+
+        Args:
+            key (str): Key of the export.
+            write (Callable[[BinaryIO], None]): Function writing the exported content to a binary stream.
+
+        Returns:
+            BinaryIO: Binary stream of the cached file.
+
+        Raises:
+            FileNotFoundError: If the cached file was removed by another process before it could be opened in OPEN_ATTEMPTS attempts.
+        """
+        attempts = 1
+        while True:
+            # errors of the write function are not retried, only opening a file evicted by another process in the meantime is
+            path = self.Fetch(key, write)
+            try:
+                return open(path, "rb")
+            except FileNotFoundError:
+                if attempts >= ExportCache.OPEN_ATTEMPTS:
+                    raise
+                attempts += 1
+
+    def Clear(self):
+        """Removes all cached files.
+        """
+        with self._lock:
+            for entry in self._entries():
+                self._remove(entry.path)
+
+    def _path(self, key: str) -> str:
+        """Path of the cached file with the given key.
+        """
+        return os.path.join(self.directory, key + ExportCache.SUFFIX)
+
+    def _entries(self) -> list[os.DirEntry]:
+        """Cached files in the cache directory.
+        """
+        try:
+            return [entry for entry in os.scandir(self.directory) if entry.name.endswith(ExportCache.SUFFIX)]
+        except FileNotFoundError:
+            return []
+
+    def _evict(self, keep: str):
+        """Removes least recently used files until the total size is within the limit. The file given by keep is not removed.
+        """
+        with self._lock:
+            entries = []
+            for entry in self._entries():
+                try:
+                    status = entry.stat()
+                except OSError:
+                    continue
+                entries.append((status.st_mtime, status.st_size, entry.path))
+            total = sum(size for _, size, _ in entries)
+            for _, size, path in sorted(entries):
+                if total <= self.maxBytes:
+                    break
+                if path != keep:
+                    self._remove(path)
+                    total -= size
+
+    @staticmethod
+    def _remove(path: str):
+        """Removes a cached file, files removed by another process are ignored.
+        """
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
@@ -0,0 +1,102 @@
+"""Queue of exports run one after another on a worker thread.
+
+Exports are submitted from the Tk thread together with a snapshot of the chart, so the chart can be edited while it is exported.
+The worker never touches Tk widgets, it only reports the progress of exports to a thread-safe queue which is polled from the Tk thread.
+"""
+import queue
+from threading import Thread, Lock
+from typing import Callable
+
+class ExportEvent:
+    """
+    Progress of a queued export reported by the worker thread.
+
+    Attributes:
+        description (str): description of the export given when it was submitted
+        state (str): "started", "finished" or "failed"
+        pending (int): number of exports which are queued or running after this event
+        error (Exception | None): exception raised by a failed export
+    """
+    STARTED : str = "started"
+    FINISHED : str = "finished"
+    FAILED : str = "failed"
+
+    def __init__(self, description: str, state: str, pending: int, error: Exception | None = None):
+        self.description : str = description
+        self.state : str = state
+        self.pending : int = pending
+        self.error : Exception | None = error
+
+class ExportQueue:
+    """
+    Runs submitted exports in order on a single worker thread, which is started with the first export.
+
+    Exports are run one at a time, so picture drawers and data writers are never used by two exports at once.
+
+    Attributes:
+        pending (int): number of exports which are queued or running
+    """
+    def __init__(self):
+        self.pending : int = 0
+        self._jobs : queue.Queue[tuple[str, Callable[[], None]] | None] = queue.Queue()
+        self._events : queue.Queue[ExportEvent] = queue.Queue()
+        self._lock : Lock = Lock()
+        self._worker : Thread | None = None
+        self._closed : bool = False
+
+    def Submit(self, description: str, export: Callable[[], None]):
+        """Adds an export to the queue. The export must only use data which are not changed by the Tk thread (e.g. a LayoutSnapshot).
+
+        Args:
+            description (str): Description of the export reported in its events.
+            export (Callable[[], None]): Function performing the export.
+        """
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("Export queue is closed")
+            self.pending += 1
+            if self._worker is None:
+                self._worker = Thread(target=self._run, name="kiwiplots-export")
+                self._worker.start()
+            self._jobs.put((description, export))
+
+    def Poll(self) -> list[ExportEvent]:
+        """Returns events reported since the last call without waiting. Called from the Tk thread.
+
+        Returns:
+            list[ExportEvent]: Reported events in order.
+        """
+        events = []
+        while True:
+            try:
+                events.append(self._events.get_nowait())
+            except queue.Empty:
+                return events
+
+    def Close(self):
+        """Lets the worker finish the queued exports and stop. Does not wait for the worker. No exports can be submitted afterwards.
+        """
+        with self._lock:
+            self._closed = True
+            if self._worker is not None:
+                self._jobs.put(None)
+
+    def _run(self):
+        """Loop of the worker thread.
+        """
+        while True:
+            job = self._jobs.get()
+            if job is None:
+                return
+            description, export = job
+            self._events.put(ExportEvent(description, ExportEvent.STARTED, self.pending))
+            try:
+                export()
+            except Exception as error:
+                event = ExportEvent(description, ExportEvent.FAILED, self.pending - 1, error)
+            else:
+                event = ExportEvent(description, ExportEvent.FINISHED, self.pending - 1)
+            # the export stays pending until its event is queued, so a poller seeing no pending exports has all events
+            self._events.put(event)
+            with self._lock:
+                self.pending -= 1
@@ -0,0 +1,135 @@
+"""Process-wide caches of fonts and rendered label bitmaps used by picture drawers.
+
+Fonts are loaded once per process. Rendered texts are kept as grayscale masks in an LRU cache and pasted
+into images with ImageDraw.bitmap, so repeated tick labels and element names are rasterized only once.
+Masks are rendered at the fractional part of the position and pasted at its truncated part, which gives the same pixels as ImageDraw.text.
+"""
+import math
+from collections import OrderedDict
+from functools import lru_cache
+from threading import Lock
+from typing import Any
+from PIL import Image, ImageDraw, ImageFont
+
+Font = ImageFont.ImageFont | ImageFont.FreeTypeFont
+BoundingBox = tuple[int, int, int, int]
+
+@lru_cache(maxsize=None)
+def GetFont(fontFile: str | None = None, size: int | None = None) -> Font:
+    """Loads a font. Every font is loaded only once per process.
+
+    Args:
+        fontFile (str | None, optional): TrueType font file. Defaults to None (the default PIL font).
+        size (int | None, optional): Size of the TrueType font. Unused for the default font. Defaults to None.
+
+    Returns:
+        Font: The loaded font.
+    """
+    if fontFile is None:
+        return ImageFont.load_default()
+    return ImageFont.truetype(fontFile, size)
+
+class LabelBitmapCache:
+    """
+    LRU cache of rendered texts keyed by (text, font file, size, fractional part of the position). Safe to use from multiple threads.
+
+    ImageDraw.text truncates the position of a text and renders the glyphs shifted by the fractional part of the position,
+    so a text is rendered once for every fractional part it is drawn at. Positions are assumed not to be negative.
+
+    Attributes:
+        maxEntries (int): maximal number of cached bitmaps and bounding boxes
+    """
+    MAX_ENTRIES : int = 4096
+
+    def __init__(self, maxEntries: int = MAX_ENTRIES):
+        self.maxEntries : int = maxEntries
+        self._entries : OrderedDict[tuple, Any] = OrderedDict()
+        self._lock : Lock = Lock()
+
+    def GetBitmap(self, text: str, fontFile: str | None = None, size: int | None = None, fraction: tuple[float, float] = (0, 0)) -> tuple[Image.Image, tuple[int, int]]:
+        """Returns the rendered text, the text is rendered on the first request.
+
+        Args:
+            text (str): Text to render.
+            fontFile (str | None, optional): TrueType font file. Defaults to None (the default PIL font).
+            size (int | None, optional): Size of the TrueType font. Defaults to None.
+            fraction (tuple[float, float], optional): Fractional part of the position of the text. Defaults to (0, 0).
+
+        Returns:
+            tuple[Image.Image, tuple[int, int]]: Grayscale mask of the text and offset of the mask from the truncated position of the text.
+        """
+        key = (text, fontFile, size, fraction)
+        entry = self._get(key)
+        if entry is not None:
+            return entry
+
+        bbox = self.GetBoundingBox(text, fontFile, size)
+        # a margin of a pixel keeps glyphs shifted by the fraction in the mask, the text is drawn at a non-negative position
+        marginX, marginY = max(1 - bbox[0], 0), max(1 - bbox[1], 0)
+        mask = Image.new("L", (marginX + max(bbox[2], 0) + 2, marginY + max(bbox[3], 0) + 2), 0)
+        ImageDraw.Draw(mask).text((marginX + fraction[0], marginY + fraction[1]), text, fill=255, font=GetFont(fontFile, size))
+        content = mask.getbbox()
+        if content is None:
+            entry = (Image.new("L", (0, 0)), (0, 0))
+        else:
+            entry = (mask.crop(content), (content[0] - marginX, content[1] - marginY))
+        self._put(key, entry)
+        return entry
+
+    def GetBoundingBox(self, text: str, fontFile: str | None = None, size: int | None = None) -> BoundingBox:
+        """Returns the bounding box of a text (as given by font.getbbox).
+
+        Args:
+            text (str): Measured text.
+            fontFile (str | None, optional): TrueType font file. Defaults to None (the default PIL font).
+            size (int | None, optional): Size of the TrueType font. Defaults to None.
+        """
+        key = (text, fontFile, size)
+        bbox = self._get(key)
+        if bbox is None:
+            bbox = tuple(int(value) for value in GetFont(fontFile, size).getbbox(text))
+            self._put(key, bbox)
+        return bbox
+
+    def DrawText(self, draw: ImageDraw.ImageDraw, position: tuple[float, float], text: str, fill, fontFile: str | None = None, size: int | None = None, origin: tuple[int, int] = (0, 0)):
+        """Draws a text the same way as ImageDraw.text, using the cached bitmap.
+
+        Args:
+            draw (ImageDraw.ImageDraw): PIL ImageDraw object for rendering.
+            position (tuple[float, float]): Position of the text, as in ImageDraw.text.
+            text (str): Text to draw.
+            fill: Color of the text.
+            fontFile (str | None, optional): TrueType font file. Defaults to None (the default PIL font).
+            size (int | None, optional): Size of the TrueType font. Defaults to None.
+            origin (tuple[int, int], optional): Position of the drawn image in a larger picture, when only a tile of the picture is drawn. Defaults to (0, 0).
+        """
+        (fractionX, x), (fractionY, y) = math.modf(position[0]), math.modf(position[1])
+        mask, offset = self.GetBitmap(text, fontFile, size, (fractionX, fractionY))
+        if mask.width == 0 or mask.height == 0:
+            return
+        draw.bitmap((int(x) + offset[0] - origin[0], int(y) + offset[1] - origin[1]), mask, fill=fill)
+
+    def _get(self, key: tuple) -> Any:
+        """Returns a cached entry and marks it as recently used, None if it is not cached.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def _put(self, key: tuple, entry: Any):
+        """Caches an entry, the least recently used entry is removed when the cache is full.
+        """
+        with self._lock:
+            self._entries[key] = entry
+            if len(self._entries) > self.maxEntries:
+                self._entries.popitem(last=False)
+
+    def Clear(self):
+        """Removes all cached bitmaps.
+        """
+        with self._lock:
+            self._entries.clear()
+
+LABEL_BITMAPS : LabelBitmapCache = LabelBitmapCache()
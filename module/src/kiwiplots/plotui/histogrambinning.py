@@ -0,0 +1,129 @@
+"""Histograms of raw samples.
+
+Samples are read in chunks, so memory-mapped arrays (e.g. columns of datasets) larger than the memory can be binned.
+Counts are exact. Quantiles of samples which do not fit into a single chunk (used by the Freedman-Diaconis and
+quantile strategies) are interpolated from a fine histogram of the samples.
+"""
+import math
+from typing import Callable, Iterable, Iterator, Union
+import numpy as np
+from numpy.typing import ArrayLike
+
+Samples = Union[ArrayLike, Callable[[], Iterable[ArrayLike]]]
+
+class HistogramBinning:
+    """
+    Chooses intervals of a histogram for raw samples and counts the samples in them.
+
+    Strategies:
+        fixed: bins intervals of the same width between the minimum and maximum sample
+        fd: intervals of the same width 2*IQR/n^(1/3) (Freedman-Diaconis rule)
+        sturges: log2(n)+1 intervals of the same width (Sturges' rule)
+        quantile: bins intervals with (about) the same number of samples
+
+    Samples are an array or a function returning an iterable of chunks of samples, which is called once per pass over the samples.
+    Samples which are not finite are ignored.
+
+    Attributes:
+        strategy (str): strategy of choosing intervals, one of STRATEGIES
+        bins (int): number of intervals of the fixed and quantile strategies
+        chunkSize (int): number of samples of an array processed at once
+        sketchBins (int): number of intervals of the fine histogram used to estimate quantiles
+        maxBins (int): maximum number of intervals chosen by the fd strategy
+    """
+    STRATEGIES : tuple[str, ...] = ("fixed", "fd", "sturges", "quantile")
+    CHUNK_SIZE : int = 1 << 22
+    SKETCH_BINS : int = 1 << 16
+    MAX_BINS : int = 1000
+
+    def __init__(self, strategy: str = "fd", bins: int = 10, chunkSize: int = CHUNK_SIZE):
+        if strategy not in HistogramBinning.STRATEGIES:
+            raise ValueError(f"Unknown binning strategy {strategy}")
+        if bins < 1:
+            raise ValueError("Number of bins must be positive")
+        self.strategy : str = strategy
+        self.bins : int = bins
+        self.chunkSize : int = chunkSize
+        self.sketchBins : int = HistogramBinning.SKETCH_BINS
+        self.maxBins : int = HistogramBinning.MAX_BINS
+
+    def Bin(self, samples: Samples) -> tuple[np.ndarray, np.ndarray]:
+        """Chooses intervals for the samples and counts the samples in them. The last interval includes its upper boundary.
+
+        Args:
+            samples (Samples): Array of samples or a function returning chunks of samples.
+
+        Returns:
+            tuple[np.ndarray, np.ndarray]: Increasing boundaries of intervals and numbers of samples in the intervals.
+
+        Raises:
+            ValueError: If there are no finite samples.
+        """
+        count, low, high = self._summary(samples)
+        if low == high:
+            low, high = low - 0.5, high + 0.5
+        if self.strategy == "quantile":
+            boundaries = np.unique(self._quantiles(samples, np.linspace(0, 1, self.bins + 1), count, low, high))
+            boundaries[0], boundaries[-1] = low, high
+            if len(boundaries) < 2:
+                boundaries = np.array([low, high])
+            return boundaries, self._count(samples, boundaries)
+        binCount = self._binCount(samples, count, low, high)
+        return np.linspace(low, high, binCount + 1), self._count(samples, binCount, (low, high))
+
+    def _binCount(self, samples: Samples, count: int, low: float, high: float) -> int:
+        """Number of intervals of the same width chosen by the strategy.
+        """
+        sturges = math.ceil(math.log2(count)) + 1
+        if self.strategy == "fixed":
+            return self.bins
+        if self.strategy == "sturges":
+            return sturges
+        firstQuartile, thirdQuartile = self._quantiles(samples, np.array([0.25, 0.75]), count, low, high)
+        width = 2 * (thirdQuartile - firstQuartile) / count ** (1 / 3)
+        if width <= 0:
+            # more than half of the samples are equal
+            return sturges
+        return int(min(max(math.ceil((high - low) / width), 1), self.maxBins))
+
+    def _chunks(self, samples: Samples) -> Iterator[np.ndarray]:
+        """Finite samples as float arrays of at most chunkSize samples (for arrays).
+        """
+        if callable(samples):
+            parts = (np.asarray(chunk, dtype=np.float64).reshape(-1) for chunk in samples())
+        else:
+            array = np.asarray(samples).reshape(-1)
+            parts = (np.asarray(array[start:start + self.chunkSize], dtype=np.float64) for start in range(0, len(array), self.chunkSize))
+        for chunk in parts:
+            finite = np.isfinite(chunk)
+            yield chunk if finite.all() else chunk[finite]
+
+    def _summary(self, samples: Samples) -> tuple[int, float, float]:
+        """Number, minimum and maximum of the samples.
+        """
+        count, low, high = 0, math.inf, -math.inf
+        for chunk in self._chunks(samples):
+            if len(chunk):
+                count += len(chunk)
+                low, high = min(low, float(chunk.min())), max(high, float(chunk.max()))
+        if count == 0:
+            raise ValueError("There are no finite samples to bin")
+        return count, low, high
+
+    def _quantiles(self, samples: Samples, quantiles: np.ndarray, count: int, low: float, high: float) -> np.ndarray:
+        """Quantiles of the samples, exact for samples in a single chunk, otherwise interpolated from a fine histogram.
+        """
+        if count <= self.chunkSize:
+            return np.quantile(np.concatenate(list(self._chunks(samples))), quantiles)
+        counts = self._count(samples, self.sketchBins, (low, high))
+        cumulative = np.concatenate(([0], np.cumsum(counts)))
+        return np.interp(quantiles * count, cumulative, np.linspace(low, high, self.sketchBins + 1))
+
+    def _count(self, samples: Samples, bins, binRange: tuple[float, float] | None = None) -> np.ndarray:
+        """Numbers of samples in intervals given as for np.histogram, counted chunk by chunk.
+        """
+        total = None
+        for chunk in self._chunks(samples):
+            counts, _ = np.histogram(chunk, bins=bins, range=binRange)
+            total = counts if total is None else total + counts
+        return total # pyright: ignore[reportReturnType]
@@ -1,11 +1,11 @@
 import tkinter as tk
 from typing import Union
-from .canvasdrawers import HistogramCanvasDrawer
+from .canvasdrawers import HistogramCanvasDrawer, RasterHistogramCanvasDrawer
 from .eventhandlers import EventHandler
 from kiwiplots.solvers import HistogramSolver
 from .plotmetadata import BarChartMetadata, HistogramMetadata
 from .plotmath import isNear
-from .dataviewers import HistogramDataViewer
+from .dataviewers import HistogramDataViewer, VirtualizedHistogramDataViewer
 from kiwiplots.chartelements import ValueRectangle, ValuePoint2D
 from tkinter import simpledialog
 from tkinter import colorchooser
@@ -23,30 +23,32 @@ class HistogramEventHandler(BarChartEventHandler):
 
     LeftEvents: TypeAlias = BarChartEventHandler.RectangleEventRegistersLeftButton.RectangleLeftEvents
 
-    def __init__(self, plotMetadata: HistogramMetadata, solver: HistogramSolver):
+    def __init__(self, plotMetadata: HistogramMetadata, solver: HistogramSolver, canvasDrawerType: type[HistogramCanvasDrawer] | type[RasterHistogramCanvasDrawer] = HistogramCanvasDrawer, dataViewerType: type[HistogramDataViewer] | type[VirtualizedHistogramDataViewer] = HistogramDataViewer):
         """Initializes the histogram event handler with plot metadata and solver.
 
         Args:
             plotMetadata (HistogramMetadata): Metadata describing the histogram plot.
             solver (HistogramSolver): Solver containing histogram data.
+            canvasDrawerType (type[HistogramCanvasDrawer] | type[RasterHistogramCanvasDrawer], optional): Canvas drawer class used for rendering. Defaults to HistogramCanvasDrawer.
+            dataViewerType (type[HistogramDataViewer] | type[VirtualizedHistogramDataViewer], optional): Data viewer class used for showing values. Defaults to HistogramDataViewer.
         """
-        super().__init__(plotMetadata, solver) #pyright: ignore
+        super().__init__(plotMetadata, solver, canvasDrawerType, dataViewerType) #pyright: ignore
         self.plotSolver : HistogramSolver = solver
         self.plotMetadata : HistogramMetadata = plotMetadata
 
     def initializeDataView(self, textWindow: tk.Text) -> None:
-        """Creates the data viewer for displaying histogram values.
+        """Creates a data viewer of dataViewerType for displaying histogram values.
         """
-        self.dataViewer = HistogramDataViewer(textWindow)
+        self.dataViewer = self.dataViewerType(textWindow)
     
     def initializeCanvas(self, canvas: tk.Canvas, width: int, height: int) -> None:
         """Creates the canvas drawer for rendering the histogram.
         
-        Uses a HistogramCanvasDrawer with the provided canvas dimensions.
+        Uses a canvas drawer of canvasDrawerType with the provided canvas dimensions.
         """
         self.canvas = canvas
         self.canvasHeight = height
-        self.drawer = HistogramCanvasDrawer(canvas,width,height)
+        self.drawer = self.canvasDrawerType(canvas,width,height)
     
     def initializeDefaultRightClickMenu(self, menu: tk.Menu) -> None:
         """Extends the default context menu with histogram-specific commands.
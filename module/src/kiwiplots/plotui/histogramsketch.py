@@ -0,0 +1,211 @@
+"""Histograms of unbounded streams of samples.
+
+A HistogramSketch counts samples in at most maxBins intervals of the same width, so its memory does not grow with
+the number of samples. The range of intervals expands to new samples. When more than maxBins intervals would be needed,
+the width of intervals doubles and pairs of neighbouring intervals are merged. Sketches with the same origin merge exactly.
+A HistogramStream shows a sketch in a histogram chart.
+"""
+import copy
+import math
+import numpy as np
+from numpy.typing import ArrayLike
+from kiwiplots.solvers import HistogramSolver
+from .plotmetadata import HistogramMetadata
+from .datautils import AsValues, CalculateScaleFactor, RescaleList
+
+class HistogramSketch:
+    """
+    Counts of samples in intervals [origin + k*width, origin + (k+1)*width) for consecutive k.
+
+    Samples are added in batches: a batch costs one vectorized pass over its samples and at most a few passes over the
+    counts (when the range expands), so the cost per sample is constant for batches of at least maxBins samples.
+
+    Attributes:
+        maxBins (int): maximum number of intervals
+        width (float | None): width of intervals, chosen as a power of two by the first batch if None
+        origin (float): boundary of an interval
+        first (int): index k of the first interval
+        counts (np.ndarray): numbers of samples in the intervals
+        count (int): number of counted samples
+        ignored (int): number of samples which were not finite
+    """
+    MAX_BINS : int = 256
+
+    def __init__(self, maxBins: int = MAX_BINS, width: float | None = None, origin: float = 0):
+        if maxBins < 2:
+            raise ValueError("Sketch needs at least 2 intervals")
+        if width is not None and not width > 0:
+            raise ValueError("Width of intervals must be positive")
+        self.maxBins : int = maxBins
+        self.width : float | None = width
+        self.origin : float = origin
+        self.first : int = 0
+        self.counts : np.ndarray = np.zeros(0, dtype=np.int64)
+        self.count : int = 0
+        self.ignored : int = 0
+
+    def Add(self, samples: ArrayLike):
+        """Counts a batch of samples.
+
+        Args:
+            samples (ArrayLike): Samples, samples which are not finite are ignored.
+        """
+        values = AsValues(samples)
+        finite = np.isfinite(values)
+        if not finite.all():
+            self.ignored += int(len(values) - finite.sum())
+            values = values[finite]
+        if len(values) == 0:
+            return
+        if self.width is None:
+            span = float(values.max() - values.min())
+            self.width = 2.0 ** math.ceil(math.log2(span / self.maxBins)) if span > 0 else 1.0
+        indices = np.floor((values - self.origin) / self.width).astype(np.int64)
+        low, high = int(indices.min()), int(indices.max())
+        while not self._fits(low, high):
+            self._coarsen()
+            indices //= 2
+            low, high = low // 2, high // 2
+        self._extend(low, high)
+        self.counts += np.bincount(indices - self.first, minlength=len(self.counts))
+        self.count += len(values)
+
+    def Merge(self, other: "HistogramSketch"):
+        """Adds counts of another sketch with the same origin. The finer of the sketches is coarsened to the width of the other one.
+
+        Args:
+            other (HistogramSketch): Merged sketch, it is not changed.
+
+        Raises:
+            ValueError: If the sketches have different origins or their widths are not related by a power of two.
+        """
+        if other.width is None or len(other.counts) == 0:
+            self.ignored += other.ignored
+            return
+        if self.width is None:
+            self.width = other.width
+        if other.origin != self.origin:
+            raise ValueError("Merged sketches must have the same origin")
+        mantissa, _ = math.frexp(other.width / self.width)
+        if mantissa != 0.5:
+            raise ValueError("Widths of merged sketches must differ by a power of two")
+        other = other.Copy()
+        while other.width < self.width: # pyright: ignore[reportOperator]
+            other._coarsen()
+        while self.width < other.width:
+            self._coarsen()
+        low, high = other.first, other.first + len(other.counts) - 1
+        while not self._fits(low, high):
+            self._coarsen()
+            other._coarsen()
+            low, high = other.first, other.first + len(other.counts) - 1
+        self._extend(low, high)
+        self.counts[other.first - self.first:other.first - self.first + len(other.counts)] += other.counts
+        self.count += other.count
+        self.ignored += other.ignored
+
+    def Copy(self) -> "HistogramSketch":
+        """Returns an independent copy of the sketch.
+        """
+        return copy.deepcopy(self)
+
+    def Boundaries(self) -> np.ndarray:
+        """Returns the boundaries of the intervals.
+        """
+        if self.width is None:
+            return np.zeros(0)
+        return self.origin + (self.first + np.arange(len(self.counts) + 1)) * self.width
+
+    def Intervals(self) -> list[tuple[float, float]]:
+        """Returns the intervals as (start, end) pairs.
+        """
+        boundaries = self.Boundaries().tolist()
+        return list(zip(boundaries[:-1], boundaries[1:]))
+
+    def _fits(self, low: int, high: int) -> bool:
+        """Whether intervals low..high together with the current intervals are at most maxBins intervals.
+        """
+        if len(self.counts):
+            low, high = min(low, self.first), max(high, self.first + len(self.counts) - 1)
+        return high - low + 1 <= self.maxBins
+
+    def _extend(self, low: int, high: int):
+        """Expands the range of intervals to cover intervals low..high.
+        """
+        if len(self.counts) == 0:
+            self.first, self.counts = low, np.zeros(high - low + 1, dtype=np.int64)
+            return
+        last = self.first + len(self.counts) - 1
+        if low >= self.first and high <= last:
+            return
+        low, high = min(low, self.first), max(high, last)
+        counts = np.zeros(high - low + 1, dtype=np.int64)
+        counts[self.first - low:self.first - low + len(self.counts)] = self.counts
+        self.first, self.counts = low, counts
+
+    def _coarsen(self):
+        """Doubles the width of intervals, interval k of the coarser sketch merges intervals 2k and 2k+1.
+        """
+        self.width *= 2 # pyright: ignore[reportOperator]
+        if len(self.counts) == 0:
+            return
+        first = self.first // 2
+        counts = np.zeros((self.first + len(self.counts) - 1) // 2 - first + 1, dtype=np.int64)
+        np.add.at(counts, (self.first + np.arange(len(self.counts))) // 2 - first, self.counts)
+        self.first, self.counts = first, counts
+
+class HistogramStream:
+    """
+    Shows a sketch of a stream in a histogram chart. Every update sets intervals and heights of all buckets with one solve.
+    The scale factor of the chart is recalculated from the current counts only when the highest bucket would exceed the headroom
+    of the plot, heights of locked buckets are converted to the new scale then.
+
+    Attributes:
+        HEADROOM (float): default fraction of the plot height the highest bucket may reach before the counts are rescaled
+        solver (HistogramSolver): solver of the chart
+        plotMetadata (HistogramMetadata): metadata of the chart, counts are rescaled by its scale factor
+        plotHeight (int): height of the plot area in pixels
+        sketch (HistogramSketch): sketch of the stream
+        headroom (float): fraction of the plot height the highest bucket may reach before the counts are rescaled
+    """
+    HEADROOM : float = 0.95
+
+    def __init__(self, solver: HistogramSolver, plotMetadata: HistogramMetadata, plotHeight: int, sketch: HistogramSketch | None = None):
+        self.solver : HistogramSolver = solver
+        self.plotMetadata : HistogramMetadata = plotMetadata
+        self.plotHeight : int = plotHeight
+        self.sketch : HistogramSketch = sketch if sketch is not None else HistogramSketch()
+        self.headroom : float = HistogramStream.HEADROOM
+
+    def Add(self, samples: ArrayLike):
+        """Counts a batch of samples and updates the chart.
+
+        Args:
+            samples (ArrayLike): Samples of the stream.
+        """
+        self.sketch.Add(samples)
+        self.Update()
+
+    def Merge(self, other: HistogramSketch):
+        """Merges a sketch (e.g. of another part of the stream) and updates the chart.
+
+        Args:
+            other (HistogramSketch): Merged sketch.
+        """
+        self.sketch.Merge(other)
+        self.Update()
+
+    def Update(self):
+        """Shows the current counts of the sketch in the chart.
+        """
+        if len(self.sketch.counts) == 0:
+            return
+        lockedScale = 1.0
+        scaleFactor = self.plotMetadata.heightScaleFactor
+        if self.sketch.counts.max() * scaleFactor > self.plotHeight * self.headroom:
+            scaleFactor = CalculateScaleFactor(self.sketch.counts, self.plotHeight)
+            lockedScale = scaleFactor / self.plotMetadata.heightScaleFactor
+            self.plotMetadata.heightScaleFactor = scaleFactor
+        widthScales = [1.0] * len(self.sketch.counts)
+        self.plotMetadata.widthScaleFactor = [widthScales]
+        self.solver.SetBuckets(self.sketch.Intervals(), widthScales, RescaleList(self.sketch.counts, scaleFactor), lockedScale)
@@ -0,0 +1,92 @@
+"""Placement of element names and other labels drawn next to chart elements.
+
+Labels are placed greedily in the given order. A label is dropped when its text box lies outside of the
+drawn area or overlaps a label placed before it, so dense charts show a thinned out, readable subset of labels.
+Boxes of placed labels are stored in a spatial hash, so every label is only compared with its neighbours.
+"""
+from typing import Callable
+
+LabelSize = tuple[float, float]
+
+class LabelPlacer:
+    """
+    Chooses which labels are drawn, so that no two drawn labels overlap.
+
+    Sizes of the labels are measured by a given function and cached per text, the cache is kept between frames.
+
+    Attributes:
+        padding (float): minimal gap between two drawn labels in pixels
+        cellSize (float): size of a cell of the spatial hash in pixels
+    """
+    PADDING : float = 2
+    CELL_SIZE : float = 64
+    MAX_CACHED_SIZES : int = 20000
+
+    def __init__(self, measure: Callable[[str], LabelSize], padding: float = PADDING, cellSize: float = CELL_SIZE):
+        """
+        Args:
+            measure (Callable[[str], LabelSize]): Function returning width and height of a text in pixels.
+            padding (float, optional): Minimal gap between two drawn labels in pixels. Defaults to PADDING.
+            cellSize (float, optional): Size of a cell of the spatial hash in pixels. Defaults to CELL_SIZE.
+        """
+        self.padding : float = padding
+        self.cellSize : float = cellSize
+        self._measure : Callable[[str], LabelSize] = measure
+        self._sizes : dict[str, LabelSize] = {}
+
+    def Measure(self, text: str) -> LabelSize:
+        """Returns the cached size of a text, the text is measured on the first request.
+
+        Args:
+            text (str): Text of the label.
+
+        Returns:
+            LabelSize: Width and height of the text in pixels.
+        """
+        size = self._sizes.get(text)
+        if size is None:
+            if len(self._sizes) >= LabelPlacer.MAX_CACHED_SIZES:
+                self._sizes.clear()
+            size = self._measure(text)
+            self._sizes[text] = size
+        return size
+
+    def Place(self, labels: list[tuple[float, float, str]], width: float, height: float, anchor: str = "center") -> list[int]:
+        """Chooses labels which are drawn. Earlier labels take precedence over later ones.
+
+        Args:
+            labels (list[tuple[float, float, str]]): Anchor point (x, y) and text of every label.
+            width (float): Width of the drawn area in pixels.
+            height (float): Height of the drawn area in pixels.
+            anchor (str, optional): Position of the anchor point in the text box, "center" or "n" (middle of the top edge). Defaults to "center".
+
+        Returns:
+            list[int]: Indices of the labels which should be drawn, in the given order.
+        """
+        grid : dict[tuple[int, int], list[tuple[float, float, float, float]]] = {}
+        placed : list[int] = []
+        for index, (x, y, text) in enumerate(labels):
+            textWidth, textHeight = self.Measure(text)
+            left = x - textWidth / 2
+            right = x + textWidth / 2
+            top = y - textHeight / 2 if anchor == "center" else y
+            bottom = top + textHeight
+            if right < 0 or left > width or bottom < 0 or top > height:
+                continue
+
+            box = (left - self.padding, top - self.padding, right + self.padding, bottom + self.padding)
+            cells = [(column, row)
+                     for column in range(int(box[0] // self.cellSize), int(box[2] // self.cellSize) + 1)
+                     for row in range(int(box[1] // self.cellSize), int(box[3] // self.cellSize) + 1)]
+            if any(self._overlaps(box, other) for cell in cells for other in grid.get(cell, ())):
+                continue
+            for cell in cells:
+                grid.setdefault(cell, []).append(box)
+            placed.append(index)
+        return placed
+
+    @staticmethod
+    def _overlaps(first: tuple[float, float, float, float], second: tuple[float, float, float, float]) -> bool:
+        """Checks whether two boxes (left, top, right, bottom) overlap.
+        """
+        return first[0] < second[2] and second[0] < first[2] and first[1] < second[3] and second[1] < first[3]
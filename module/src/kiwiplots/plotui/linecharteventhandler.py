@@ -86,9 +86,11 @@ class LineChartEventHandler(EventHandler):
     # Initialization #
     ###################
     
-    def __init__(self, plotMetadata: LineChartMetadata, solver: LineChartSolver):
+    def __init__(self, plotMetadata: LineChartMetadata, solver: LineChartSolver, canvasDrawerType: type[LineChartCanvasDrawer] = LineChartCanvasDrawer, dataViewerType: type[LineChartDataViewer] = LineChartDataViewer):
         super().__init__(plotMetadata)
         self.plotSolver: LineChartSolver = solver
+        self.canvasDrawerType : type[LineChartCanvasDrawer] = canvasDrawerType
+        self.dataViewerType : type[LineChartDataViewer] = dataViewerType
         self.canvasHeight : int = None # pyright: ignore[reportAttributeAccessIssue]
         self.mode : LineChartEventHandler.EditMode = LineChartEventHandler.EditMode.VALUE
         self.plotMetadata : LineChartMetadata = self.plotMetadata
@@ -101,13 +103,13 @@ class LineChartEventHandler(EventHandler):
 
     @inheritdocstring(EventHandler.initializeDataView)
     def initializeDataView(self, textWindow: tk.Text) -> None:
-        self.dataViewer = LineChartDataViewer(textWindow)
+        self.dataViewer = self.dataViewerType(textWindow)
 
     @inheritdocstring(EventHandler.initializeCanvas)
     def initializeCanvas(self, canvas: tk.Canvas, width: int, height: int) -> None:
         self.canvas = canvas
         self.canvasHeight = height
-        self.drawer = LineChartCanvasDrawer(canvas, width, height)
+        self.drawer = self.canvasDrawerType(canvas, width, height)
 
     @inheritdocstring(EventHandler.initializeRightClickMenu)
     def initializeRightClickMenu(self, menu: tk.Menu) -> None:
@@ -227,6 +229,7 @@ class LineChartEventHandler(EventHandler):
     @inheritdocstring(EventHandler.on_left_up)
     def on_left_up(self, event: tk.Event) -> None:
         self.eventRegistersLeft.reset()
+        self._endGesture()
 
     def _clickedOnLineEnd(self, event: tk.Event, index: int, leftEdge: bool):
         """Registers that the user clicked on a line endpoint.
@@ -282,7 +285,7 @@ class LineChartEventHandler(EventHandler):
             if newHeight > 10:
                 self.plotSolver.ChangeAxisHeight(int(newHeight))
 
-        self._updateCanvas()
+        self._updateCanvas(interactive=True)
         self._updateDataView()
 
 
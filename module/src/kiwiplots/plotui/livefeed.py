@@ -0,0 +1,236 @@
+"""Live charts of growing CSV files.
+
+A CSVTailFollower polls the size of a file and parses only the bytes appended since the last poll.
+A LiveFeed appends the new rows to a line or candlestick chart on the Tk thread, in batches solved at once.
+"""
+import csv
+import math
+import os
+import time
+from collections import deque
+import tkinter as tk
+from kiwiplots.solvers import ChartSolver, LineChartSolver, CandlestickChartSolver
+from .plotmetadata import PlotMetadata
+from .eventhandlers import EventHandler
+from .datautils import RescaleList
+
+class CSVTailFollower:
+    """
+    Follows a CSV file which is appended to, like tail -f.
+
+    Only complete lines are parsed, a partially written last line is kept until it is finished.
+    If the file is truncated or replaced, it is followed again from its start.
+    Rows are lines of the file, quoted values must not contain line breaks.
+
+    Attributes:
+        file (str): path of the followed file
+        offset (int): position in the file up to which bytes were read
+        delimiter (str): delimiter of values
+        readSize (int): maximum number of bytes read by one poll
+    """
+    READ_SIZE : int = 1 << 16
+
+    def __init__(self, file: str, fromStart: bool = False, header: bool = False, delimiter: str = ","):
+        """
+        Args:
+            file (str): Path of the file.
+            fromStart (bool): Whether rows already in the file are read, otherwise only rows appended later are.
+            header (bool): Whether the first line of the file is a header, which is skipped.
+            delimiter (str): Delimiter of values.
+        """
+        self.file : str = file
+        self.delimiter : str = delimiter
+        self.readSize : int = CSVTailFollower.READ_SIZE
+        self._header : bool = header
+        self._partial : bytes = b""
+        self._inode : int | None = None
+        self.offset : int = 0
+        self._skipHeader : bool = header
+        if not fromStart:
+            try:
+                stat = os.stat(file)
+            except FileNotFoundError:
+                return
+            self._inode, self.offset, self._skipHeader = stat.st_ino, stat.st_size, False
+
+    def Backlog(self) -> int:
+        """Returns the number of bytes appended to the file which were not read yet.
+        """
+        try:
+            size = os.stat(self.file).st_size
+        except FileNotFoundError:
+            return 0
+        return max(size - self.offset, 0)
+
+    def Poll(self, maxBytes: int | None = None) -> list[list[str]]:
+        """Reads rows appended to the file since the last poll.
+
+        Args:
+            maxBytes (int | None): Maximum number of bytes read, readSize if None. Remaining bytes are read by later polls.
+
+        Returns:
+            list[list[str]]: Values of the new complete rows, empty rows are skipped.
+        """
+        try:
+            stream = open(self.file, "rb")
+        except FileNotFoundError:
+            # the file is being replaced
+            return []
+        with stream:
+            stat = os.fstat(stream.fileno())
+            if stat.st_ino != self._inode or stat.st_size < self.offset:
+                self._restart(stat.st_ino)
+            stream.seek(self.offset)
+            data = stream.read(maxBytes if maxBytes is not None else self.readSize)
+        self.offset += len(data)
+        data = self._partial + data
+        end = data.rfind(b"\n") + 1
+        self._partial = data[end:]
+        if end == 0:
+            return []
+        lines = data[:end].decode("utf-8", errors="replace").splitlines()
+        if self._skipHeader and lines:
+            lines = lines[1:]
+            self._skipHeader = False
+        return [row for row in csv.reader(lines, delimiter=self.delimiter) if row]
+
+    def _restart(self, inode: int):
+        """Follows the file from its start after it was truncated or replaced.
+        """
+        if self._inode is not None:
+            self.offset = 0
+            self._partial = b""
+            self._skipHeader = self._header
+        self._inode = inode
+
+class LiveFeed:
+    """
+    Appends rows of a followed CSV file to a line chart (name, value) or candlestick chart (name, opening, closing, minimum, maximum).
+
+    The feed runs on the Tk thread. Every tick applies one batch of rows with a single solve and redraws the chart.
+    The size of batches adapts so that a tick takes about frameBudget seconds, rows which do not fit are queued,
+    and the file is not read while the queue is full, so bursts of the feed do not block the UI.
+
+    Attributes:
+        follower (CSVTailFollower): followed file
+        pollInterval (int): milliseconds between polls of the file when all its rows were applied
+        frameBudget (float): seconds a tick may take
+        batchSize (int): current maximum number of rows applied by a tick
+        maxPending (int): maximum number of parsed rows waiting to be applied
+        appliedRows (int): number of rows added to the chart
+        skippedRows (int): number of rows which were not in the format of the chart
+    """
+    POLL_INTERVAL : int = 200
+    FRAME_BUDGET : float = 0.02
+    BATCH_SIZE : int = 64
+    MAX_BATCH_SIZE : int = 8192
+    MAX_PENDING : int = 1 << 16
+
+    def __init__(self, follower: CSVTailFollower, solver: ChartSolver, plotMetadata: PlotMetadata, eventHandler: EventHandler):
+        """
+        Args:
+            follower (CSVTailFollower): Followed file.
+            solver (ChartSolver): Solver of the chart, a LineChartSolver or CandlestickChartSolver.
+            plotMetadata (PlotMetadata): Metadata of the chart, values are rescaled by its scale factor.
+            eventHandler (EventHandler): Handler of the chart, which redraws it.
+
+        Raises:
+            ValueError: If the chart is neither a line chart nor a candlestick chart.
+        """
+        if not isinstance(solver, (LineChartSolver, CandlestickChartSolver)):
+            raise ValueError("Live feeds can be followed only by line charts and candlestick charts")
+        self.follower : CSVTailFollower = follower
+        self.solver : ChartSolver = solver
+        self.plotMetadata : PlotMetadata = plotMetadata
+        self.eventHandler : EventHandler = eventHandler
+        self.pollInterval : int = LiveFeed.POLL_INTERVAL
+        self.frameBudget : float = LiveFeed.FRAME_BUDGET
+        self.batchSize : int = LiveFeed.BATCH_SIZE
+        self.maxPending : int = LiveFeed.MAX_PENDING
+        self.appliedRows : int = 0
+        self.skippedRows : int = 0
+        self._columns : int = 2 if isinstance(solver, LineChartSolver) else 5
+        self._pending : deque[tuple] = deque()
+        self._root : tk.Misc | None = None
+        self._job : str | None = None
+
+    @property
+    def pending(self) -> int:
+        """Number of parsed rows waiting to be applied."""
+        return len(self._pending)
+
+    def Start(self, root: tk.Misc):
+        """Starts following the file on the Tk thread of root.
+        """
+        self._root = root
+        if self._job is None:
+            self._job = root.after(self.pollInterval, self._tick)
+
+    def Stop(self):
+        """Stops following the file. Queued rows are kept.
+        """
+        if self._job is not None and self._root is not None:
+            try:
+                self._root.after_cancel(self._job)
+            except tk.TclError:
+                # the window was destroyed together with its scheduled ticks
+                pass
+        self._job = None
+
+    def Update(self) -> int:
+        """Reads new rows while the queue is not full and applies one batch of queued rows.
+
+        Returns:
+            int: Number of rows added to the chart.
+        """
+        if len(self._pending) < self.maxPending:
+            for row in self.follower.Poll():
+                parsed = self._parse(row)
+                if parsed is None:
+                    self.skippedRows += 1
+                else:
+                    self._pending.append(parsed)
+        batch = [self._pending.popleft() for _ in range(min(self.batchSize, len(self._pending)))]
+        if batch:
+            self._apply(batch)
+            self.appliedRows += len(batch)
+        return len(batch)
+
+    def _tick(self):
+        """Applies a batch, adapts the size of batches to the frame budget and schedules the next tick.
+        """
+        start = time.perf_counter()
+        applied = self.Update()
+        if applied:
+            self.eventHandler.UpdateUI()
+            elapsed = time.perf_counter() - start
+            if elapsed > self.frameBudget:
+                self.batchSize = max(1, self.batchSize // 2)
+            elif elapsed < self.frameBudget / 2 and applied == self.batchSize:
+                self.batchSize = min(LiveFeed.MAX_BATCH_SIZE, self.batchSize * 2)
+        busy = self._pending or self.follower.Backlog() > 0
+        # ticks of a busy feed are scheduled as soon as Tk processed pending events
+        self._job = self._root.after(1 if busy else self.pollInterval, self._tick) # pyright: ignore[reportOptionalMemberAccess]
+
+    def _parse(self, row: list[str]) -> tuple | None:
+        """Converts values of a row, None if the row is not in the format of the chart.
+        """
+        if len(row) != self._columns:
+            return None
+        try:
+            values = [float(value) for value in row[1:]]
+        except ValueError:
+            return None
+        return (row[0].strip(), *values) if all(math.isfinite(value) for value in values) else None
+
+    def _apply(self, batch: list[tuple]):
+        """Adds rescaled rows to the chart.
+        """
+        scaleFactor = self.plotMetadata.heightScaleFactor
+        rescaledXAxisValue = self.plotMetadata.xAxisValue*scaleFactor
+        names, *columns = zip(*batch)
+        rescaled = [RescaleList(column, scaleFactor, rescaledXAxisValue) for column in columns]
+        if isinstance(self.solver, LineChartSolver):
+            self.solver.AddPoints(rescaled[0], list(names))
+        elif isinstance(self.solver, CandlestickChartSolver):
+            self.solver.AddCandles(list(names), *rescaled)
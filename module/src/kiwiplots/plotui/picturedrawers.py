@@ -1,9 +1,24 @@
 from abc import ABC
 from .plotmetadata import *
 from kiwiplots.solvers import *
-from kiwiplots.chartelements import ValuePoint2D, ValueBucket
-from PIL import Image, ImageDraw, ImageFont
+from kiwiplots.chartelements import ValuePoint2D, ValueBucket, ValueCandle, ValueRectangle
+from PIL import Image
+from typing import Union, BinaryIO
+import io
+import numpy as np
 from .plotmath import ceilToNearestTen, divideInterval
+from .downsampling import LineDownsampler, CandleResampler
+from .labelplacement import LabelPlacer, LabelSize
+from .fonts import LABEL_BITMAPS
+from .raster import RGBColor
+from kiwiplots.utils import inheritdocstring
+from .picturelayout import PictureLayout
+from .tiledexport import TiledExporter
+from .vectorexport import VectorWriter, SVGWriter, PDFWriter
+from .exportcache import ExportCache
+import os
+import shutil
+import tempfile
 
 # Reusable constants
 FONT_FILE = "arialbd.ttf"
@@ -16,27 +31,200 @@ MARGIN = 5
 TITLE_Y_POSITION = 20
 POINT_RADIUS = 4
 
+# permissions of new exported files are given by the umask, which can only be read by setting it
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
 class PictureDrawer(ABC):
     """
     Abstract class for generating image output of plots.
+    Subclasses record the plot into a PictureLayout. Data elements are then rasterized in bulk into a RasterBuffer,
+    which produces the same pixels as PIL.ImageDraw. PIL is only used for texts, axes and encoding of the image.
+    Texts are drawn from the process-wide cache of label bitmaps, so fonts are loaded and repeated texts rasterized only once.
+    PNG images with more than tiledPixelThreshold pixels are rendered in strips by the tiled exporter, which bounds the used memory.
+    Images can be saved to a file (draw), written to a binary stream (WriteStream) or rendered in memory (RenderImage, RenderBytes).
+    With an export cache, encoded images are cached by the content of the chart, so re-exporting an unchanged chart only copies the cached file.
+
+    Attributes:
+        labelPlacer (LabelPlacer): chooses which element labels are drawn, so that they do not overlap
+        tiledExporter (TiledExporter): renders and saves large images in strips
+        tiledPixelThreshold (int): PNG images with more pixels than this are exported in strips
+        exportCache (ExportCache | None): cache of encoded images, None disables caching
     """
+    TILED_PIXEL_THRESHOLD : int = 25_000_000
+
+    def __init__(self):
+        self.labelPlacer : LabelPlacer = LabelPlacer(self._measureLabel)
+        self.tiledExporter : TiledExporter = TiledExporter()
+        self.tiledPixelThreshold : int = PictureDrawer.TILED_PIXEL_THRESHOLD
+        self.exportCache : ExportCache | None = None
+        self._colorCache : dict[Union[str,int], RGBColor] = {}
+
+    def _rgb(self, color: Union[str,int]) -> RGBColor:
+        """Converts a color to RGB tuple, interpreting it the same way as PIL does when drawing into an RGB image.
+
+        Args:
+            color (Union[str,int]): Color name, hex string or integer.
+
+        Returns:
+            RGBColor: 8-bit RGB components.
+        """
+        if color not in self._colorCache:
+            self._colorCache[color] = Image.new("RGB", (1, 1), color).getpixel((0, 0)) # pyright: ignore[reportAttributeAccessIssue]
+        return self._colorCache[color]
+
+    def _rgbArray(self, colors: list[Union[str,int]]) -> np.ndarray:
+        """Converts a list of colors to an array of shape (n, 3).
+        """
+        return np.array([self._rgb(color) for color in colors], dtype=np.uint8).reshape(-1, 3)
+
+    def _measureLabel(self, text: str) -> LabelSize:
+        """Measures a text written with the default font.
+        """
+        bbox = LABEL_BITMAPS.GetBoundingBox(text)
+        return bbox[2] - bbox[0], bbox[3] - bbox[1]
+
+    def _writeLabels(self, layout: PictureLayout, labels: list[tuple[float, float, str]], width: int, height: int, anchor: str = "center"):
+        """Writes labels with the default font. Labels overlapping previously written labels or lying outside of the image are dropped.
+
+        Args:
+            layout (PictureLayout): Layout the labels are recorded into.
+            labels (list[tuple[float, float, str]]): Anchor point (x, y) and text of every label.
+            width (int): Width of the image in pixels.
+            height (int): Height of the image in pixels.
+            anchor (str, optional): Position of the anchor point in the text box, "center" or "n" (middle of the top edge). Defaults to "center".
+        """
+        for index in self.labelPlacer.Place(labels, width, height, anchor):
+            x, y, text = labels[index]
+            textWidth, textHeight = self.labelPlacer.Measure(text)
+            top = y - textHeight / 2 if anchor == "center" else y
+            layout.Text((x - textWidth / 2, top), text, "black")
     
     def draw(self, plotMetada : PlotMetadata, solver: ChartSolver, width: int, height: int, file : str):
         """
         Generates and saves an image of the plot.
         
-        This method should create an image representation of the plot,
-        including all data elements, axes, and labels, and save it to a file.
+        The plot is recorded into a layout by Layout method, which is then rendered and saved.
+        Large PNG images are rendered and saved in strips.
+        
+        Args:
+            plotMetada: Metadata about the plot including scale factor and axis values.
+            solver: The solver containing the plot data to be rendered.
+            width: The width of the output image in pixels. Corresponds to canvas width.
+            height: The height of the output image in pixels. Corresponds to canvas height.
+            file: File path to save image. The format of the image is given by the extension of the file.
+        """
+        imageFormat = os.path.splitext(file)[1][1:]
+        if imageFormat == "":
+            raise ValueError(f"Unknown image format of file {file}")
+        # the image is written next to the file and replaces it when complete, a failed export leaves an existing file intact
+        with tempfile.NamedTemporaryFile(dir=os.path.dirname(os.path.abspath(file)), suffix=".tmp", delete=False) as stream:
+            temporary = stream.name
+            try:
+                self.WriteStream(plotMetada, solver, width, height, stream, imageFormat)
+            except BaseException:
+                stream.close()
+                os.remove(temporary)
+                raise
+        try:
+            if os.path.exists(file):
+                shutil.copymode(file, temporary)
+            else:
+                os.chmod(temporary, 0o666 & ~_UMASK)
+            os.replace(temporary, file)
+        except BaseException:
+            os.remove(temporary)
+            raise
+
+    def WriteStream(self, plotMetada : PlotMetadata, solver: ChartSolver, width: int, height: int, stream: BinaryIO, imageFormat: str = "png"):
+        """
+        Generates an image of the plot and writes it to a binary stream, e.g. a response of a web server.
+
+        Args:
+            plotMetada: Metadata about the plot including scale factor and axis values.
+            solver: The solver containing the plot data to be rendered.
+            width: The width of the output image in pixels.
+            height: The height of the output image in pixels.
+            stream: Binary stream the image is written to.
+            imageFormat: Format of the image given as a file extension without the dot (e.g. "png" or "jpg"). Defaults to "png".
+        """
+        imageFormat = imageFormat.lower()
+        def writeImage(output: BinaryIO):
+            self._writeLayout(self.Layout(plotMetada, solver, width, height), output, imageFormat)
+        if self.exportCache is None:
+            writeImage(stream)
+            return
+        key = self.exportCache.Key(plotMetada, solver, *self._exportOptions(width, height, imageFormat))
+        with self.exportCache.Open(key, writeImage) as cached:
+            shutil.copyfileobj(cached, stream)
+
+    def RenderImage(self, plotMetada : PlotMetadata, solver: ChartSolver, width: int, height: int) -> Image.Image:
+        """
+        Generates an image of the plot in memory.
+
+        Args:
+            plotMetada: Metadata about the plot including scale factor and axis values.
+            solver: The solver containing the plot data to be rendered.
+            width: The width of the output image in pixels.
+            height: The height of the output image in pixels.
+
+        Returns:
+            Image.Image: RGB image of the plot.
+        """
+        return self.Layout(plotMetada, solver, width, height).Render()
+
+    def RenderBytes(self, plotMetada : PlotMetadata, solver: ChartSolver, width: int, height: int, imageFormat: str = "png") -> bytes:
+        """
+        Generates an encoded image of the plot in memory.
+
+        Args:
+            plotMetada: Metadata about the plot including scale factor and axis values.
+            solver: The solver containing the plot data to be rendered.
+            width: The width of the output image in pixels.
+            height: The height of the output image in pixels.
+            imageFormat: Format of the image given as a file extension without the dot (e.g. "png" or "jpg"). Defaults to "png".
+
+        Returns:
+            bytes: Encoded image, the same bytes as would be saved to a file.
+        """
+        stream = io.BytesIO()
+        self.WriteStream(plotMetada, solver, width, height, stream, imageFormat)
+        return stream.getvalue()
+
+    def _writeLayout(self, layout: PictureLayout, stream: BinaryIO, imageFormat: str):
+        """Renders a layout and writes it to a binary stream in the given format (lowercase file extension without the dot).
+        Large PNG images are rendered and written in strips.
+        """
+        if imageFormat == "png" and layout.width * layout.height > self.tiledPixelThreshold:
+            self.tiledExporter.WriteStream(layout, stream)
+            return
+        pilFormat = Image.registered_extensions().get(f".{imageFormat}")
+        if pilFormat is None:
+            raise ValueError(f"Unknown image format {imageFormat}")
+        layout.Render().save(stream, format=pilFormat)
+
+    def _exportOptions(self, width: int, height: int, imageFormat: str) -> tuple:
+        """Options which the encoded image depends on besides the chart and its metadata, part of the key of the export cache.
+        """
+        tiled = imageFormat == "png" and width * height > self.tiledPixelThreshold
+        return type(self).__qualname__, width, height, imageFormat, tiled, self.tiledExporter.compressLevel
+
+    def Layout(self, plotMetada : PlotMetadata, solver: ChartSolver, width: int, height: int) -> PictureLayout:
+        """
+        Records the image of the plot, including all data elements, axes, and labels, into a layout.
         
         Args:
             plotMetada: Metadata about the plot including scale factor and axis values.
             solver: The solver containing the plot data to be rendered.
             width: The width of the output image in pixels. Corresponds to canvas width.
             height: The height of the output image in pixels. Corresponds to canvas height.
+
+        Returns:
+            PictureLayout: Recorded image of the plot.
         """
-        raise NotImplementedError("Method PictureDrawer.draw must ASVbe declared in subclass")
+        raise NotImplementedError("Method PictureDrawer.Layout must be declared in subclass")
     
-    def _drawAxes(self, scaleFactor: float, height: int, xAxisValue: float, draw: ImageDraw.ImageDraw, maximumValue: float, leftCornerXAxis: int, origin : ValuePoint2D, minimumValue : int = 0, xAxisLabel:str = "", yAxisLabel: str = ""):  
+    def _drawAxes(self, scaleFactor: float, height: int, xAxisValue: float, layout: PictureLayout, maximumValue: float, leftCornerXAxis: int, origin : ValuePoint2D, minimumValue : int = 0, xAxisLabel:str = "", yAxisLabel: str = ""):  
         """
         Draws axes on the picture output
         """
@@ -44,47 +232,38 @@ class PictureDrawer(ABC):
 
         marks = divideInterval(minimumValue,topNumber, AXIS_MARKS_DIVISIONS)
       
-        draw.line((origin.X, height - origin.Y, leftCornerXAxis + TEXT_OFFSET, height - origin.Y), fill=(0,0,0), width=1)
-        draw.line((origin.X, height - origin.Y - minimumValue, origin.X, height - origin.Y - topNumber), fill=(0,0,0), width=1)
+        layout.Line((origin.X, height - origin.Y, leftCornerXAxis + TEXT_OFFSET, height - origin.Y), fill=(0,0,0), width=1)
+        layout.Line((origin.X, height - origin.Y - minimumValue, origin.X, height - origin.Y - topNumber), fill=(0,0,0), width=1)
 
         for mark in marks:
             y = height - origin.Y - mark
-            draw.line((origin.X - AXIS_MARK_PIXEL_WIDTH, y, origin.X, y), fill=(0,0,0))
+            layout.Line((origin.X - AXIS_MARK_PIXEL_WIDTH, y, origin.X, y), fill=(0,0,0))
 
             trueValue = mark/scaleFactor + xAxisValue
             valueString = f"{(trueValue):.2g}" if (trueValue <= 1e-04 or trueValue >= 1e06) else f"{(trueValue):.2f}"
-            font = ImageFont.load_default()
 
             # get text size
-            bbox = font.getbbox(valueString)
+            bbox = LABEL_BITMAPS.GetBoundingBox(valueString)
             textWidth = bbox[2] - bbox[0]
             textHeight = bbox[3] - bbox[1]
 
-            draw.text((origin.X - TEXT_OFFSET - textWidth, y - textHeight/2), text=f"{valueString}", fill = (0,0,0))
+            layout.Text((origin.X - TEXT_OFFSET - textWidth, y - textHeight/2), valueString, (0,0,0))
         
         #Axis labels
-        font = ImageFont.truetype(FONT_FILE, AXIS_FONT_SIZE)
-        bbox = font.getbbox(xAxisLabel)
+        bbox = LABEL_BITMAPS.GetBoundingBox(xAxisLabel, FONT_FILE, AXIS_FONT_SIZE)
         textW = bbox[2] - bbox[0]
         textH = bbox[3] - bbox[1]
-        draw.text(
-            (leftCornerXAxis + TEXT_OFFSET - textW/2, height - origin.Y + TEXT_OFFSET), 
-            text=xAxisLabel, fill=(0,0,0), font=font
-        )
+        layout.Text((leftCornerXAxis + TEXT_OFFSET - textW/2, height - origin.Y + TEXT_OFFSET), xAxisLabel, (0,0,0), FONT_FILE, AXIS_FONT_SIZE)
 
-        bbox = font.getbbox(yAxisLabel)
+        bbox = LABEL_BITMAPS.GetBoundingBox(yAxisLabel, FONT_FILE, AXIS_FONT_SIZE)
         textW = bbox[2] - bbox[0]
         textH = bbox[3] - bbox[1]
-        draw.text(
-            (origin.X - textW/2, height - origin.Y - topNumber - textH - MARGIN), 
-            text=yAxisLabel, fill=(0,0,0), font=font
-        )
-    def _writePlotTitle(self, draw: ImageDraw.ImageDraw, solver: ChartSolver, width: int, title: str):
-        font = ImageFont.truetype(FONT_FILE, TITLE_FONT_SIZE)
-        text = title
-        bbox = font.getbbox(text)
+        layout.Text((origin.X - textW/2, height - origin.Y - topNumber - textH - MARGIN), yAxisLabel, (0,0,0), FONT_FILE, AXIS_FONT_SIZE)
+
+    def _writePlotTitle(self, layout: PictureLayout, solver: ChartSolver, width: int, title: str):
+        bbox = LABEL_BITMAPS.GetBoundingBox(title, FONT_FILE, TITLE_FONT_SIZE)
         textWidth = bbox[2] - bbox[0]
-        draw.text((width / 2 - textWidth/2, TITLE_Y_POSITION),text=text,font=font,fill = (0,0,0))
+        layout.Text((width / 2 - textWidth/2, TITLE_Y_POSITION), title, (0,0,0), FONT_FILE, TITLE_FONT_SIZE)
 
 class CandlesticPictureDrawer(PictureDrawer):
     """
@@ -92,77 +271,75 @@ class CandlesticPictureDrawer(PictureDrawer):
     
     Renders candlestick data with wicks, body rectangles, and optional candle names.
     """
-    def _drawCandles(self, solver: CandlestickChartSolver, draw : ImageDraw.ImageDraw, height: int):
-        """Draws candlesticks with wicks and names on the image.
+    def __init__(self):
+        super().__init__()
+        self.resampler : CandleResampler = CandleResampler()
+
+    def _drawCandles(self, solver: CandlestickChartSolver, layout: PictureLayout, width: int, height: int) -> list[ValueCandle]:
+        """Records candle bodies and wicks.
 
         Args:
             solver (CandlestickChartSolver): Solver containing candle data.
-            draw (ImageDraw.ImageDraw): PIL ImageDraw object for rendering.
+            layout (PictureLayout): Layout the candles are recorded into.
+            width (int): Width of the plot area in pixels.
             height (int): Height of the plot area in pixels.
+
+        Returns:
+            list[ValueCandle]: Drawn candles.
         """
-        candles = solver.GetCandleData()
+        candles = self.resampler.GetCandles(solver, solver.GetCandleData(), width)
         origin = solver.GetOrigin()
-        for candle in candles:
-            leftBottomX, leftBottomY = None, None
-            rightTopX, rightTopY = None, None
-
-            if candle.closingCorner.Y - candle.openingCorner.Y >= 0:
-                leftBottomX, leftBottomY = candle.openingCorner.X, candle.openingCorner.Y
-                rightTopX, rightTopY = candle.closingCorner.X, candle.closingCorner.Y
-            else:
-                leftBottomX, leftBottomY = candle.openingCorner.X, candle.closingCorner.Y
-                rightTopX, rightTopY = candle.closingCorner.X, candle.openingCorner.Y
-
-
-            x1 = leftBottomX
-            y1 = height - leftBottomY - origin.Y
-            
-            x2 = rightTopX
-            y2 = height - rightTopY - origin.Y
-
-            draw.rectangle((x1,y2,x2,y1), fill=candle.color, outline="black")
-
-            xMax, yMax = candle.wickTop.X, height - candle.wickTop.Y - origin.Y
-            xMin, yMin = candle.wickBottom.X, height - candle.wickBottom.Y - origin.Y
-            draw.line((xMax,yMax,xMin,yMin), fill=candle.color, width=1) 
-
-            if candle.nameVisible:
-                font = ImageFont.load_default()
-                text = candle.name
-
-                # get text size
-                bbox = font.getbbox(text)
-                text_width = bbox[2] - bbox[0]
-                text_height = bbox[3] - bbox[1]
+        if len(candles) == 0:
+            return candles
+
+        left = np.array([candle.openingCorner.X for candle in candles])
+        right = np.array([candle.closingCorner.X for candle in candles])
+        opening = height - np.array([candle.openingCorner.Y for candle in candles]) - origin.Y
+        closing = height - np.array([candle.closingCorner.Y for candle in candles]) - origin.Y
+        colors = self._rgbArray([candle.color for candle in candles])
+        layout.FillRectangles(left, closing, right, opening, colors)
+        layout.OutlineRectangles(left, closing, right, opening, self._rgb("black"))
+
+        wickTopX = np.array([candle.wickTop.X for candle in candles])
+        wickTopY = height - np.array([candle.wickTop.Y for candle in candles]) - origin.Y
+        wickBottomX = np.array([candle.wickBottom.X for candle in candles])
+        wickBottomY = height - np.array([candle.wickBottom.Y for candle in candles]) - origin.Y
+        layout.DrawLines(wickTopX, wickTopY, wickBottomX, wickBottomY, colors)
+        return candles
+
+    def _writeCandleNames(self, layout: PictureLayout, candles: list[ValueCandle], origin: ValuePoint2D, width: int, height: int):
+        """Writes names of the candles with visible names under the x axis.
 
-                # text position
-                x_center = (x1 + x2) / 2
-                y_text = height - origin.Y + TEXT_OFFSET
-
-                draw.text(
-                    (x_center - text_width / 2, y_text - text_height/2),
-                    text,
-                    fill="black",
-                    font=font)
+        Args:
+            layout (PictureLayout): Layout the labels are recorded into.
+            candles (list[ValueCandle]): Drawn candles.
+            origin (ValuePoint2D): Origin of the chart.
+            width (int): Width of the plot area in pixels.
+            height (int): Height of the plot area in pixels.
+        """
+        y_text = height - origin.Y + TEXT_OFFSET
+        self._writeLabels(layout, [((candle.openingCorner.X + candle.closingCorner.X) / 2, y_text, candle.name) for candle in candles if candle.nameVisible], width, height)
     
-    def draw(self, plotMetadata: CandlesticPlotMetadata, solver: CandlestickChartSolver, width: int, height: int, file : str): # pyright: ignore[reportIncompatibleMethodOverride]
-        """Generates and saves image of candlestick chart.
+    def Layout(self, plotMetadata: CandlesticPlotMetadata, solver: CandlestickChartSolver, width: int, height: int) -> PictureLayout: # pyright: ignore[reportIncompatibleMethodOverride]
+        """Records image of candlestick chart.
 
         Args:
             plotMetadata (CandlesticPlotMetadata): Metadata about the plot.
             solver (CandlestickChartSolver): Solver containing candle data.
             width (int): Width of output image in pixels.
             height (int): Height of output image in pixels.
-            file (str): File path to save image.
+
+        Returns:
+            PictureLayout: Recorded image of the chart.
         """
         candles = solver.GetCandleData()
         lowestWickHeight = min([candle.wickBottom.Y for candle in candles])
-        img = Image.new("RGB", (width, height), color="white")
-        draw = ImageDraw.Draw(img)
-        self._drawCandles(solver, draw, height)
-        self._drawAxes(plotMetadata.heightScaleFactor,height, plotMetadata.xAxisValue,draw, solver.GetAxisHeight(), candles[-1].rightTop.X, solver.GetOrigin(), min(0, lowestWickHeight)) # pyright: ignore[reportArgumentType]
-        self._writePlotTitle(draw,solver,width,plotMetadata.title)
-        img.save(file)
+        layout = PictureLayout(width, height)
+        drawnCandles = self._drawCandles(solver, layout, width, height)
+        self._writeCandleNames(layout, drawnCandles, solver.GetOrigin(), width, height)
+        self._drawAxes(plotMetadata.heightScaleFactor,height, plotMetadata.xAxisValue,layout, solver.GetAxisHeight(), candles[-1].rightTop.X, solver.GetOrigin(), min(0, lowestWickHeight)) # pyright: ignore[reportArgumentType]
+        self._writePlotTitle(layout,solver,width,plotMetadata.title)
+        return layout
 
 class BarChartPictureDrawer(PictureDrawer):
     """
@@ -170,68 +347,68 @@ class BarChartPictureDrawer(PictureDrawer):
     
     Renders grouped bar rectangles with names and axes.
     """
-    def _drawRectangles(self, draw: ImageDraw.ImageDraw, solver: BarChartSolver, height: int):
-        """Draws rectangles (bars) with names on the image.
+    def _drawRectangles(self, layout: PictureLayout, solver: BarChartSolver, height: int) -> list[ValueRectangle]:
+        """Records rectangles (bars).
 
         Args:
-            draw (ImageDraw.ImageDraw): PIL ImageDraw object for rendering.
+            layout (PictureLayout): Layout the bars are recorded into.
             solver (BarChartSolver): Solver containing rectangle data.
             height (int): Height of the plot area in pixels.
-        """
-        rectangles = solver.GetBarDataAsList()
-        origin = solver.GetOrigin()
-        for rec in rectangles:
-            x1 = rec.leftBottom.X
-            y1 = height - rec.leftBottom.Y
-            
-            x2 = rec.rightTop.X
-            y2 = height - rec.rightTop.Y
-            draw.rectangle((x1,y2,x2,y1), fill=rec.color, outline="black")
-            font = ImageFont.load_default()
-            text = rec.name
-
-            # get text size
-            bbox = font.getbbox(text)
-            text_width = bbox[2] - bbox[0]
-            text_height = bbox[3] - bbox[1]
 
-            # text position
-            x_center = (x1 + x2) / 2
-            y_text = (y1 + TEXT_OFFSET)
+        Returns:
+            list[ValueRectangle]: Drawn rectangles.
+        """
+        rectangles = solver.GetRectangleDataAsList()
+        if len(rectangles) == 0:
+            return rectangles
+        x1 = np.array([rec.leftBottom.X for rec in rectangles])
+        y1 = height - np.array([rec.leftBottom.Y for rec in rectangles])
+        x2 = np.array([rec.rightTop.X for rec in rectangles])
+        y2 = height - np.array([rec.rightTop.Y for rec in rectangles])
+        layout.FillRectangles(x1, y2, x2, y1, self._rgbArray([rec.color for rec in rectangles]))
+        layout.OutlineRectangles(x1, y2, x2, y1, self._rgb("black"))
+        return rectangles
+
+    def _writeRectangleLabels(self, layout: PictureLayout, rectangles: list[ValueRectangle], width: int, height: int):
+        """Writes names of the bars under them.
 
-            draw.text(
-                (x_center - text_width / 2, y_text - text_height/2),
-                text,
-                fill="black",
-                font=font)
+        Args:
+            layout (PictureLayout): Layout the labels are recorded into.
+            rectangles (list[ValueRectangle]): Drawn rectangles.
+            width (int): Width of the plot area in pixels.
+            height (int): Height of the plot area in pixels.
+        """
+        self._writeLabels(layout, [((rec.leftBottom.X + rec.rightTop.X) / 2, height - rec.leftBottom.Y + TEXT_OFFSET, rec.name) for rec in rectangles], width, height)
 
 
-    def draw(self, plotMetadata: BarChartMetadata, solver: BarChartSolver, width:int, height: int, file : str):  # pyright: ignore[reportIncompatibleMethodOverride]
-        """Generates and saves image of bar chart.
+    def Layout(self, plotMetadata: BarChartMetadata, solver: BarChartSolver, width:int, height: int) -> PictureLayout:  # pyright: ignore[reportIncompatibleMethodOverride]
+        """Records image of bar chart.
 
         Args:
             plotMetadata (BarChartMetadata): Metadata about the plot.
             solver (BarChartSolver): Solver containing rectangle data.
             width (int): Width of output image in pixels.
             height (int): Height of output image in pixels.
-            file (str): File path to save image.
+
+        Returns:
+            PictureLayout: Recorded image of the chart.
         """
         rectangles = solver.GetRectangleDataAsList()
-        img = Image.new("RGB", (width, height), color="white")
-        draw = ImageDraw.Draw(img)
-        self._drawRectangles(draw,solver, height)
+        layout = PictureLayout(width, height)
+        self._drawRectangles(layout, solver, height)
+        self._writeRectangleLabels(layout, rectangles, width, height)
         self._drawAxes(plotMetadata.heightScaleFactor, 
                           height, 
                           plotMetadata.xAxisValue, 
-                          draw, 
+                          layout, 
                           solver.GetAxisHeight(), 
                           rectangles[-1].rightTop.X,  # pyright: ignore[reportArgumentType]
                           solver.GetOrigin(), 
                           0, 
                           plotMetadata.xAxisLabel, 
                           plotMetadata.yAxisLabel)
-        self._writePlotTitle(draw, solver,width,plotMetadata.title)
-        img.save(file)
+        self._writePlotTitle(layout, solver,width,plotMetadata.title)
+        return layout
 
 class HistorgramPictureDrawer(BarChartPictureDrawer):
     """
@@ -239,49 +416,24 @@ class HistorgramPictureDrawer(BarChartPictureDrawer):
     
     Extends BarChartPictureDrawer to render histogram buckets with interval labels.
     """
-    def _drawRectangles(self, draw: ImageDraw.ImageDraw, solver: BarChartSolver, height: int):
-        """Draws histogram buckets with interval labels on the image.
+    def _writeRectangleLabels(self, layout: PictureLayout, rectangles: list[ValueBucket], width: int, height: int): # pyright: ignore[reportIncompatibleMethodOverride]
+        """Writes interval bounds under the buckets. A bound shared by two adjacent buckets is written once, under the end of the first one.
 
         Args:
-            draw (ImageDraw.ImageDraw): PIL ImageDraw object for rendering.
-            solver (BarChartSolver): Solver containing bucket data.
+            layout (PictureLayout): Layout the labels are recorded into.
+            rectangles (list[ValueBucket]): Drawn buckets.
+            width (int): Width of the plot area in pixels.
             height (int): Height of the plot area in pixels.
         """
-        rectangles : list[ValueBucket] = solver.GetRectangleDataAsList() # pyright: ignore[reportAssignmentType]
+        labels : list[tuple[float, float, str]] = []
+        previousEnd = None
         for rec in rectangles:
-            x1 = rec.leftBottom.X
-            y1 = height - rec.leftBottom.Y
-            
-            x2 = rec.rightTop.X
-            y2 = height - rec.rightTop.Y
-            draw.rectangle((x1,y2,x2,y1), fill=rec.color, outline="black")
-            font = ImageFont.load_default()
-            textLeft = str(rec.interval[0])
-            textRight = str(rec.interval[1])
-
-            # get text size
-            bboxLeft = font.getbbox(textLeft)
-            textLeft_width = bboxLeft[2] - bboxLeft[0]
-            textLeft_height = bboxLeft[3] - bboxLeft[1]
-
-            bboxRight = font.getbbox(textRight)
-            textRight_width = bboxRight[2] - bboxRight[0]
-            textRight_height = bboxRight[3] - bboxRight[1]
-
-            # text position
-            x_center = (x1 + x2) / 2
-            y_text = (y1 + TEXT_OFFSET)
-
-            draw.text(
-                (x1 - textLeft_width / 2, y_text - textLeft_height/2),
-                textLeft,
-                fill="black",
-                font=font)
-            draw.text(
-                (x2 - textRight_width / 2, y_text - textRight_height/2),
-                textRight,
-                fill="black",
-                font=font)
+            y_text = height - rec.leftBottom.Y + TEXT_OFFSET
+            if rec.interval[0] != previousEnd:
+                labels.append((rec.leftBottom.X, y_text, str(rec.interval[0])))
+            labels.append((rec.rightTop.X, y_text, str(rec.interval[1])))
+            previousEnd = rec.interval[1]
+        self._writeLabels(layout, labels, width, height)
             
 class LineChartPictureDrawer(PictureDrawer):
     """
@@ -289,93 +441,73 @@ class LineChartPictureDrawer(PictureDrawer):
     
     Renders connected line segments with colored data points and point names.
     """
-    def _drawLines(self, plotMetadata: LineChartMetadata, solver: LineChartSolver, draw: ImageDraw.ImageDraw, height: int):
-        """Draws line segments with data points and point names on the image.
+    def __init__(self):
+        super().__init__()
+        self.downsampler : LineDownsampler = LineDownsampler()
+
+    def _drawLines(self, plotMetadata: LineChartMetadata, solver: LineChartSolver, layout: PictureLayout, width: int, height: int) -> list[ValuePoint2D]:
+        """Records line segments and data points.
+        Only points chosen by the downsampler are drawn.
 
         Args:
             plotMetadata (LineChartMetadata): Metadata containing line color.
             solver (LineChartSolver): Solver containing line data.
-            draw (ImageDraw.ImageDraw): PIL ImageDraw object for rendering.
+            layout (PictureLayout): Layout the lines are recorded into.
+            width (int): Width of the plot area in pixels.
             height (int): Height of the plot area in pixels.
+
+        Returns:
+            list[ValuePoint2D]: Drawn points.
         """
-        RADIUS: int = POINT_RADIUS
-        lines = solver.GetLineData()
-        origin = solver.GetOrigin()
+        points = solver.GetPoints()
+        indices = self.downsampler.GetIndices(solver, points, width)
+        visiblePoints = [points[index] for index in indices]
 
         color = plotMetadata.color if isinstance(plotMetadata.color, str) else f"#{plotMetadata.color:06x}"
 
-        for index, line in enumerate(lines):
-            x1, y1 = line.leftEnd.X, height - line.leftEnd.Y
-            x2, y2 = line.rightEnd.X, height - line.rightEnd.Y
-            
-            if not line.ignoreRight: 
-                draw.line((x1, y1, x2, y2), fill=(0, 0, 0), width=1)
-
-                draw.ellipse(
-                    (x1 - RADIUS, y1 - RADIUS, x1 + RADIUS, y1 + RADIUS),
-                    fill=color,
-                    outline=(0, 0, 0),
-                    width=1
-                )
-                draw.ellipse(
-                    (x2 - RADIUS, y2 - RADIUS, x2 + RADIUS, y2 + RADIUS),
-                    fill=color,
-                    outline=(0, 0, 0),
-                    width=1
-                )
-            else:
-                draw.ellipse(
-                    (x1 - RADIUS, y1 - RADIUS, x1 + RADIUS, y1 + RADIUS),
-                    fill=color,
-                    outline=(0, 0, 0),
-                    width=1
-                )
-
-            font = ImageFont.load_default()
-
-            leftBbox = font.getbbox(line.leftEnd.name)
-            leftTextWidth = leftBbox[2] - leftBbox[0]
-            draw.text(
-                (x1 - leftTextWidth / 2, height - origin.Y + TEXT_OFFSET),
-                text=line.leftEnd.name,
-                fill=(0, 0, 0),
-                font=font
-            )
-
-            if index == len(lines) - 1 and not line.ignoreRight:
-                rightBbox = font.getbbox(line.rightEnd.name)
-                rightTextWidth = rightBbox[2] - rightBbox[0]
-                draw.text(
-                    (x2 - rightTextWidth / 2, height - origin.Y + TEXT_OFFSET),
-                    text=line.rightEnd.name,
-                    fill=(0, 0, 0),
-                    font=font
-                )
-
-    def draw(self, plotMetadata: LineChartMetadata, solver: LineChartSolver, width: int, height: int, file: str):  # pyright: ignore[reportIncompatibleMethodOverride]
-        """Generates and saves image of line chart.
+        x = np.array([point.X for point in visiblePoints])
+        y = height - np.array([point.Y for point in visiblePoints])
+        layout.DrawPolyline(x, y, (0, 0, 0))
+        layout.DrawDiscs(x, y, POINT_RADIUS, self._rgb(color), (0, 0, 0))
+        return visiblePoints
+
+    def _writePointNames(self, layout: PictureLayout, points: list[ValuePoint2D], origin: ValuePoint2D, width: int, height: int):
+        """Writes names of the points under the x axis.
+
+        Args:
+            layout (PictureLayout): Layout the labels are recorded into.
+            points (list[ValuePoint2D]): Drawn points.
+            origin (ValuePoint2D): Origin of the chart.
+            width (int): Width of the plot area in pixels.
+            height (int): Height of the plot area in pixels.
+        """
+        self._writeLabels(layout, [(point.X, height - origin.Y + TEXT_OFFSET, point.name) for point in points], width, height, anchor="n")
+
+    def Layout(self, plotMetadata: LineChartMetadata, solver: LineChartSolver, width: int, height: int) -> PictureLayout:  # pyright: ignore[reportIncompatibleMethodOverride]
+        """Records image of line chart.
 
         Args:
             plotMetadata (LineChartMetadata): Metadata about the plot.
             solver (LineChartSolver): Solver containing line data.
             width (int): Width of output image in pixels.
             height (int): Height of output image in pixels.
-            file (str): File path to save image.
+
+        Returns:
+            PictureLayout: Recorded image of the chart.
         """
         lines = solver.GetLineData()
         origin = solver.GetOrigin()
 
         minimum: float = min([line.leftHeight for line in lines] + [line.rightHeight for line in lines])
 
-        img = Image.new("RGB", (width, height), color="white")
-        draw = ImageDraw.Draw(img)
-
-        self._drawLines(plotMetadata, solver, draw, height)
+        layout = PictureLayout(width, height)
+        drawnPoints = self._drawLines(plotMetadata, solver, layout, width, height)
+        self._writePointNames(layout, drawnPoints, origin, width, height)
         self._drawAxes(
             plotMetadata.heightScaleFactor,
             height,
             plotMetadata.xAxisValue,
-            draw,
+            layout,
             solver.GetAxisHeight(),
             int(lines[-1].rightEnd.X),
             origin,
@@ -383,5 +515,54 @@ class LineChartPictureDrawer(PictureDrawer):
             plotMetadata.xAxisLabel,
             plotMetadata.yAxisLabel
         )
-        self._writePlotTitle(draw, solver, width, plotMetadata.title)
-        img.save(file)
+        self._writePlotTitle(layout, solver, width, plotMetadata.title)
+        return layout
+
+class VectorPictureDrawer(PictureDrawer):
+    """
+    Picture drawer which saves SVG and PDF images as vector images and other formats as raster images.
+
+    Vector images are written from the same layout as raster images, element by element in chunks.
+
+    Attributes:
+        vectorWriters (dict[str, VectorWriter]): writers of vector formats by lowercase file extension without the dot
+    """
+    def __init__(self):
+        super().__init__()
+        self.vectorWriters : dict[str, VectorWriter] = {"svg": SVGWriter(), "pdf": PDFWriter()}
+
+    @inheritdocstring(PictureDrawer._exportOptions)
+    def _exportOptions(self, width: int, height: int, imageFormat: str) -> tuple:
+        writer = self.vectorWriters.get(imageFormat)
+        if writer is None:
+            return super()._exportOptions(width, height, imageFormat)
+        settings = sorted((name, value) for name, value in vars(writer).items() if not name.startswith("_"))
+        return type(self).__qualname__, width, height, imageFormat, type(writer).__qualname__, settings
+
+    @inheritdocstring(PictureDrawer._writeLayout)
+    def _writeLayout(self, layout: PictureLayout, stream: BinaryIO, imageFormat: str):
+        writer = self.vectorWriters.get(imageFormat)
+        if writer is None:
+            super()._writeLayout(layout, stream, imageFormat)
+        else:
+            writer.WriteStream(layout, stream)
+
+class VectorCandlesticPictureDrawer(VectorPictureDrawer, CandlesticPictureDrawer):
+    """
+    Picture drawer for candlestick charts with SVG and PDF output.
+    """
+
+class VectorBarChartPictureDrawer(VectorPictureDrawer, BarChartPictureDrawer):
+    """
+    Picture drawer for bar charts with SVG and PDF output.
+    """
+
+class VectorHistogramPictureDrawer(VectorPictureDrawer, HistorgramPictureDrawer):
+    """
+    Picture drawer for histograms with SVG and PDF output.
+    """
+
+class VectorLineChartPictureDrawer(VectorPictureDrawer, LineChartPictureDrawer):
+    """
+    Picture drawer for line charts with SVG and PDF output.
+    """
@@ -0,0 +1,232 @@
+"""Solved layout of an exported picture, recorded as a list of drawing operations in image coordinates.
+
+Picture drawers record shapes of data elements, texts and axes into a PictureLayout instead of drawing them directly.
+The layout can then be rendered whole or as horizontal strips of the image, so large pictures can be rendered and encoded
+with bounded memory. Arrays of the layout can be moved to multiprocessing.shared_memory, from which other processes
+render strips without copying or pickling the element data.
+"""
+from multiprocessing.shared_memory import SharedMemory
+from typing import Any
+from PIL import Image, ImageDraw
+import numpy as np
+from .raster import RasterBuffer, RGBColor
+from .fonts import LABEL_BITMAPS
+
+class PictureLayout:
+    """
+    Recorded drawing operations of a picture.
+
+    Shapes are recorded with the same methods as RasterBuffer provides and rasterized first, in the recorded order.
+    Lines and texts are drawn over the shapes with PIL, also in the recorded order.
+
+    Attributes:
+        width (int): width of the picture in pixels
+        height (int): height of the picture in pixels
+        background (RGBColor): background color of the picture
+        shapes (list[tuple[str, dict[str, np.ndarray], dict[str, Any]]]): recorded shapes - name of the RasterBuffer method, array arguments and other arguments
+        overlay (list[tuple]): recorded lines and texts
+    """
+    def __init__(self, width: int, height: int, background: RGBColor = (255, 255, 255)):
+        self.width : int = width
+        self.height : int = height
+        self.background : RGBColor = background
+        self.shapes : list[tuple[str, dict[str, np.ndarray], dict[str, Any]]] = []
+        self.overlay : list[tuple] = []
+
+    def FillRectangles(self, x1: np.ndarray, y1: np.ndarray, x2: np.ndarray, y2: np.ndarray, colors: np.ndarray):
+        """Records filled rectangles, see RasterBuffer.FillRectangles.
+        """
+        self._addShape("FillRectangles", {"x1": x1, "y1": y1, "x2": x2, "y2": y2, "colors": colors})
+
+    def OutlineRectangles(self, x1: np.ndarray, y1: np.ndarray, x2: np.ndarray, y2: np.ndarray, colors: np.ndarray, width: int = 1):
+        """Records outlines of rectangles, see RasterBuffer.OutlineRectangles.
+        """
+        self._addShape("OutlineRectangles", {"x1": x1, "y1": y1, "x2": x2, "y2": y2, "colors": colors}, width=width)
+
+    def DrawLines(self, x1: np.ndarray, y1: np.ndarray, x2: np.ndarray, y2: np.ndarray, colors: np.ndarray, width: int = 1):
+        """Records line segments, see RasterBuffer.DrawLines.
+        """
+        self._addShape("DrawLines", {"x1": x1, "y1": y1, "x2": x2, "y2": y2, "colors": colors}, width=width)
+
+    def DrawPolyline(self, x: np.ndarray, y: np.ndarray, color: RGBColor, width: int = 1):
+        """Records a polyline as its line segments, see RasterBuffer.DrawPolyline.
+        """
+        x = np.asarray(x, dtype=np.float64)
+        y = np.asarray(y, dtype=np.float64)
+        if len(x) < 2:
+            return
+        self.DrawLines(x[:-1], y[:-1], x[1:], y[1:], np.asarray(color, dtype=np.uint8), width)
+
+    def DrawDiscs(self, x: np.ndarray, y: np.ndarray, radius: int, fill: RGBColor, outline: RGBColor | None = None):
+        """Records discs, see RasterBuffer.DrawDiscs.
+        """
+        self._addShape("DrawDiscs", {"x": x, "y": y}, radius=radius, fill=fill, outline=outline)
+
+    def Line(self, xy: tuple[float, float, float, float], fill: RGBColor, width: int = 1):
+        """Records a line drawn over the shapes, as ImageDraw.line would draw it.
+
+        Args:
+            xy (tuple[float, float, float, float]): Coordinates of the end points (x1, y1, x2, y2).
+            fill (RGBColor): Color of the line.
+            width (int, optional): Width of the line in pixels. Defaults to 1.
+        """
+        # PIL truncates coordinates of lines, truncating here keeps lines in the same rows in every strip
+        self.overlay.append(("line", tuple(int(value) for value in xy), fill, width))
+
+    def Text(self, position: tuple[float, float], text: str, fill, fontFile: str | None = None, size: int | None = None):
+        """Records a text drawn over the shapes, see LabelBitmapCache.DrawText.
+
+        Args:
+            position (tuple[float, float]): Position of the text, as in ImageDraw.text.
+            text (str): Text to draw.
+            fill: Color of the text.
+            fontFile (str | None, optional): TrueType font file. Defaults to None (the default PIL font).
+            size (int | None, optional): Size of the TrueType font. Defaults to None.
+        """
+        self.overlay.append(("text", position, text, fill, fontFile, size))
+
+    def Render(self) -> Image.Image:
+        """Renders the whole picture.
+
+        Returns:
+            Image.Image: Rendered RGB picture.
+        """
+        return self.RenderStrip(0, self.height)
+
+    def RenderStrip(self, top: int, height: int) -> Image.Image:
+        """Renders a horizontal strip of the picture. Only shapes reaching into the strip are rasterized.
+
+        Args:
+            top (int): Y coordinate of the first row of the strip.
+            height (int): Height of the strip in pixels, clipped to the bottom of the picture.
+
+        Returns:
+            Image.Image: Rendered RGB strip of the picture.
+        """
+        height = min(height, self.height - top)
+        raster = RasterBuffer(self.width, height, self.background, top)
+        for method, arrays, arguments in self.shapes:
+            arrays = self._selectRows(method, arrays, arguments, top, top + height - 1)
+            if arrays is not None:
+                getattr(raster, method)(**arrays, **arguments)
+
+        img = Image.fromarray(raster.pixels)
+        draw = ImageDraw.Draw(img)
+        for operation in self.overlay:
+            if operation[0] == "line":
+                _, (x1, y1, x2, y2), fill, width = operation
+                draw.line((x1, y1 - top, x2, y2 - top), fill=fill, width=width)
+            else:
+                _, position, text, fill, fontFile, size = operation
+                LABEL_BITMAPS.DrawText(draw, position, text, fill, fontFile, size, origin=(0, top))
+        return img
+
+    def Share(self) -> "SharedLayout":
+        """Copies arrays of the recorded shapes to a block of shared memory.
+
+        Returns:
+            SharedLayout: Picklable description of the layout referring to the shared memory.
+        """
+        return SharedLayout(self)
+
+    def _addShape(self, method: str, arrays: dict[str, Any], **arguments):
+        """Records a shape, arguments which are arrays are converted to NumPy arrays.
+        """
+        self.shapes.append((method, {name: self._asArray(name, value) for name, value in arrays.items()}, arguments))
+
+    @staticmethod
+    def _asArray(name: str, value: Any) -> np.ndarray:
+        """Converts coordinates to float64 and colors to uint8 arrays.
+        """
+        return np.asarray(value, dtype=np.uint8 if name == "colors" else np.float64)
+
+    @staticmethod
+    def _selectRows(method: str, arrays: dict[str, np.ndarray], arguments: dict[str, Any], top: int, bottom: int) -> dict[str, np.ndarray] | None:
+        """Selects shapes which reach into rows from top to bottom (inclusive).
+
+        Returns:
+            dict[str, np.ndarray] | None: Arrays of the selected shapes, None when no shape is selected.
+        """
+        if method == "DrawDiscs":
+            centers = arrays["y"].astype(np.int64)
+            margin = arguments["radius"]
+            low, high = centers - margin, centers + margin
+        else:
+            first, second = arrays["y1"].astype(np.int64), arrays["y2"].astype(np.int64)
+            margin = arguments.get("width", 1) if method == "DrawLines" else 0
+            low, high = np.minimum(first, second) - margin, np.maximum(first, second) + margin
+
+        selected = (high >= top) & (low <= bottom)
+        if not selected.any():
+            return None
+        if selected.all():
+            return arrays
+        # a single color is shared by all shapes
+        return {name: value if name == "colors" and value.ndim == 1 else value[selected] for name, value in arrays.items()}
+
+class SharedLayout:
+    """
+    PictureLayout with arrays of shapes stored in multiprocessing.shared_memory.
+
+    Instances are small and picklable, so they can be sent to worker processes which render strips of the picture.
+    The process which created the instance must call Release (or use it as a context manager) when the rendering is done.
+    """
+    def __init__(self, layout: PictureLayout):
+        self.width : int = layout.width
+        self.height : int = layout.height
+        self.background : RGBColor = layout.background
+        self.overlay : list[tuple] = layout.overlay
+        # (method, {name: (offset, dtype, shape)}, arguments) of every shape
+        self._shapes : list[tuple[str, dict[str, tuple[int, str, tuple[int, ...]]], dict[str, Any]]] = []
+
+        offset = 0
+        for method, arrays, arguments in layout.shapes:
+            placement = {}
+            for name, value in arrays.items():
+                placement[name] = (offset, value.dtype.str, value.shape)
+                offset += (value.nbytes + 7) // 8 * 8
+            self._shapes.append((method, placement, arguments))
+
+        self._memory : SharedMemory | None = SharedMemory(create=True, size=max(offset, 1))
+        self.name : str = self._memory.name
+        for (method, arrays, arguments), (_, placement, _) in zip(layout.shapes, self._shapes):
+            for name, value in arrays.items():
+                start, dtype, shape = placement[name]
+                np.ndarray(shape, dtype=dtype, buffer=self._memory.buf, offset=start)[...] = value
+
+    def __getstate__(self) -> dict[str, Any]:
+        state = self.__dict__.copy()
+        state["_memory"] = None
+        return state
+
+    def __enter__(self) -> "SharedLayout":
+        return self
+
+    def __exit__(self, *exception):
+        self.Release()
+
+    def RenderStrip(self, top: int, height: int) -> Image.Image:
+        """Renders a horizontal strip of the picture, see PictureLayout.RenderStrip.
+        The shared memory is attached for the time of rendering.
+        """
+        memory = self._memory if self._memory is not None else SharedMemory(name=self.name)
+        try:
+            layout = PictureLayout(self.width, self.height, self.background)
+            layout.overlay = self.overlay
+            layout.shapes = [(method, {name: np.ndarray(shape, dtype=dtype, buffer=memory.buf, offset=start) for name, (start, dtype, shape) in placement.items()}, arguments)
+                             for method, placement, arguments in self._shapes]
+            strip = layout.RenderStrip(top, height)
+            # the arrays must not refer to the memory when it is closed
+            layout.shapes.clear()
+        finally:
+            if memory is not self._memory:
+                memory.close()
+        return strip
+
+    def Release(self):
+        """Frees the shared memory. Called by the process which created the layout.
+        """
+        if self._memory is not None:
+            self._memory.close()
+            self._memory.unlink()
+            self._memory = None
@@ -72,7 +72,6 @@ class LineChartMetadata(PlotMetadata):
         super().__init__(title, heightScaleFactor, xAxisValue, xAxisLabel, yAxisLabel)
         self.color : Union[str,int] = color
 
-from numpy import abs
 from .datautils import *
 from .uiconstants import *
 
@@ -80,10 +79,10 @@ def CreateCandlesticChartMetadata(title: str,
                             xAxisLabel: str, 
                             yAxisLabel: str, 
                             xAxisValue : float,
-                            initialOpening : list[float], 
-                            initialClosing : list[float], 
-                            initialMinimum : list[float], 
-                            initialMaximum : list[float],
+                            initialOpening : ArrayLike, 
+                            initialClosing : ArrayLike, 
+                            initialMinimum : ArrayLike, 
+                            initialMaximum : ArrayLike,
                             plotHeight : int
                             )-> CandlesticPlotMetadata:
     """
@@ -98,20 +97,20 @@ def CreateCandlesticChartMetadata(title: str,
         xAxisLabel (str): Label for the x-axis
         yAxisLabel (str): Label for the y-axis
         xAxisValue (float): The value where the x-axis is positioned
-        initialOpening (list[float]): List of opening prices
-        initialClosing (list[float]): List of closing prices
-        initialMinimum (list[float]): List of minimum prices
-        initialMaximum (list[float]): List of maximum prices
+        initialOpening (ArrayLike): Array of opening prices
+        initialClosing (ArrayLike): Array of closing prices
+        initialMinimum (ArrayLike): Array of minimum prices
+        initialMaximum (ArrayLike): Array of maximum prices
         plotHeight (int): Height of the plot area in pixels
         
     Returns:
         CandlesticPlotMetadata: Metadata object containing scale factor and axis information
     """
-    allValues : list[float] = abs(initialClosing) + abs(initialOpening) + abs(initialMinimum) + abs(initialMaximum) # pyright: ignore[reportAssignmentType]
+    allValues = ConcatenateValues((initialClosing, initialOpening, initialMinimum, initialMaximum))
 
     return CandlesticPlotMetadata(title,CalculateScaleFactor(allValues,plotHeight),xAxisValue,xAxisLabel,yAxisLabel)
 
-def CreateBarChartMetadata(title: str, xAxisLabel: str, yAxisLabel: str, initialValues: list[list[float]], plotHeight: int):
+def CreateBarChartMetadata(title: str, xAxisLabel: str, yAxisLabel: str, initialValues: list[ArrayLike], plotHeight: int):
     """
     Produce `BarChartMetadata` with a scale factor computed from all rectangle groups.
 
@@ -119,20 +118,16 @@ def CreateBarChartMetadata(title: str, xAxisLabel: str, yAxisLabel: str, initial
         title (str): Chart title.
         xAxisLabel (str): Label for the x-axis.
         yAxisLabel (str): Label for the y-axis.
-        initialValues (list[list[float]]): Grouped bar values.
+        initialValues (list[ArrayLike]): Grouped bar values.
         plotHeight (int): Pixel height of the plotting area.
 
     Returns:
         BarChartMetadata: Metadata instance with computed height scale.
     """
-    allValues : list[float] = []
-    for group in initialValues:
-        for value in group:
-            allValues.append(value)
-    return BarChartMetadata(title,CalculateScaleFactor(allValues,plotHeight),xAxisLabel,yAxisLabel)
+    return BarChartMetadata(title,CalculateScaleFactor(ConcatenateValues(initialValues),plotHeight),xAxisLabel,yAxisLabel)
 
 
-def CreateHistogramMetadata(title: str, xAxisLabel: str, yAxisLabel: str, initialValues : list[float], intervals: list[tuple[float,float]], plotHeight: int)-> HistogramMetadata:
+def CreateHistogramMetadata(title: str, xAxisLabel: str, yAxisLabel: str, initialValues : ArrayLike, intervals: list[tuple[float,float]], plotHeight: int)-> HistogramMetadata:
     """
     Build `HistogramMetadata` including height and per-interval width scales.
 
@@ -143,7 +138,7 @@ def CreateHistogramMetadata(title: str, xAxisLabel: str, yAxisLabel: str, initia
         title (str): Histogram title.
         xAxisLabel (str): X-axis label.
         yAxisLabel (str): Y-axis label.
-        initialValues (list[float]): Values to use when computing height scale.
+        initialValues (ArrayLike): Values to use when computing height scale.
         intervals (list[tuple[float,float]]): Bins defined by (start, end) tuples.
         plotHeight (int): Pixel height of the plotting area.
 
@@ -155,14 +150,14 @@ def CreateHistogramMetadata(title: str, xAxisLabel: str, yAxisLabel: str, initia
     return HistogramMetadata(title, heightScaleFactor, widthScales, xAxisLabel, yAxisLabel)
 
 
-def CreateLineChartMetadata(title: str, xAxisValue : float, values : list[float], xAxisLabel : str, yAxisLabel : str, height : int, color: str|int = DEFAULT_COLOR)->LineChartMetadata:
+def CreateLineChartMetadata(title: str, xAxisValue : float, values : ArrayLike, xAxisLabel : str, yAxisLabel : str, height : int, color: str|int = DEFAULT_COLOR)->LineChartMetadata:
     """
     Creates LineChartMetadata with height scale factor computed from data values.
 
     Args:
         title (str): Chart title.
         xAxisValue (float): X-axis origin value.
-        values (list[float]): Y-values for scale computation.
+        values (ArrayLike): Y-values for scale computation.
         xAxisLabel (str): X-axis label.
         yAxisLabel (str): Y-axis label.
         height (int): Plot height in pixels.
@@ -0,0 +1,202 @@
+"""Pixel buffer used for raster rendering of chart data.
+
+All drawing operations work on whole arrays of elements. Coordinates are truncated to integers
+and shapes include both of their end pixels, which matches the behaviour of PIL.ImageDraw.
+A buffer can also hold a horizontal strip of a larger image, shapes are then given in coordinates of the whole image.
+"""
+import numpy as np
+
+RGBColor = tuple[int, int, int]
+
+class RasterBuffer:
+    """
+    RGB pixel buffer backed by a NumPy array of shape (height, width, 3).
+
+    Attributes:
+        width (int): width of the buffer in pixels
+        height (int): height of the buffer in pixels
+        background (RGBColor): color used to clear the buffer
+        top (int): y coordinate of the first row of the buffer in the whole image
+        pixels (np.ndarray): pixel data
+    """
+    def __init__(self, width: int, height: int, background: RGBColor = (255, 255, 255), top: int = 0):
+        self.width : int = width
+        self.height : int = height
+        self.background : RGBColor = background
+        self.top : int = top
+        self.pixels : np.ndarray = np.empty((height, width, 3), dtype=np.uint8)
+        self.Clear()
+
+    def Clear(self):
+        """Fills the whole buffer with the background color.
+        """
+        row = np.empty((self.width, 3), dtype=np.uint8)
+        row[:] = self.background
+        self.pixels[:] = row
+
+    def FillRectangles(self, x1: np.ndarray, y1: np.ndarray, x2: np.ndarray, y2: np.ndarray, colors: np.ndarray):
+        """Fills axis aligned rectangles.
+
+        Args:
+            x1 (np.ndarray): X coordinates of the first corners.
+            y1 (np.ndarray): Y coordinates of the first corners.
+            x2 (np.ndarray): X coordinates of the opposite corners.
+            y2 (np.ndarray): Y coordinates of the opposite corners.
+            colors (np.ndarray): Colors of the rectangles, array of shape (n, 3) or a single color.
+        """
+        left, top, right, bottom = self._clipRectangles(x1, y1, x2, y2)
+        colors = self._broadcastColors(colors, len(left))
+        for i in np.flatnonzero((left <= right) & (top <= bottom)):
+            # filling the first row and copying it is much faster than broadcasting a single pixel into the whole block
+            block = self.pixels[top[i]:bottom[i]+1, left[i]:right[i]+1]
+            block[0] = colors[i]
+            block[1:] = block[0]
+
+    def OutlineRectangles(self, x1: np.ndarray, y1: np.ndarray, x2: np.ndarray, y2: np.ndarray, colors: np.ndarray, width: int = 1):
+        """Draws outlines of axis aligned rectangles. The outline is drawn inside of the rectangle.
+
+        Args:
+            x1 (np.ndarray): X coordinates of the first corners.
+            y1 (np.ndarray): Y coordinates of the first corners.
+            x2 (np.ndarray): X coordinates of the opposite corners.
+            y2 (np.ndarray): Y coordinates of the opposite corners.
+            colors (np.ndarray): Colors of the outlines, array of shape (n, 3) or a single color.
+            width (int, optional): Width of the outline in pixels. Defaults to 1.
+        """
+        x1, x2 = np.minimum(x1, x2).astype(np.int64), np.maximum(x1, x2).astype(np.int64)
+        y1, y2 = np.minimum(y1, y2).astype(np.int64), np.maximum(y1, y2).astype(np.int64)
+        inner = width - 1
+        self.FillRectangles(x1, y1, x2, np.minimum(y1 + inner, y2), colors)
+        self.FillRectangles(x1, np.maximum(y2 - inner, y1), x2, y2, colors)
+        self.FillRectangles(x1, y1, np.minimum(x1 + inner, x2), y2, colors)
+        self.FillRectangles(np.maximum(x2 - inner, x1), y1, x2, y2, colors)
+
+    def DrawLines(self, x1: np.ndarray, y1: np.ndarray, x2: np.ndarray, y2: np.ndarray, colors: np.ndarray, width: int = 1):
+        """Draws straight line segments. Pixels of all segments are generated at once.
+
+        Args:
+            x1 (np.ndarray): X coordinates of the starting points.
+            y1 (np.ndarray): Y coordinates of the starting points.
+            x2 (np.ndarray): X coordinates of the end points.
+            y2 (np.ndarray): Y coordinates of the end points.
+            colors (np.ndarray): Colors of the segments, array of shape (n, 3) or a single color.
+            width (int, optional): Width of the segments in pixels. Defaults to 1.
+        """
+        x1 = np.asarray(x1, dtype=np.float64).astype(np.int64)
+        y1 = np.asarray(y1, dtype=np.float64).astype(np.int64) - self.top
+        x2 = np.asarray(x2, dtype=np.float64).astype(np.int64)
+        y2 = np.asarray(y2, dtype=np.float64).astype(np.int64) - self.top
+        count = len(x1)
+        if count == 0:
+            return
+        colors = self._broadcastColors(colors, count)
+
+        dx, dy = x2 - x1, y2 - y1
+        steps = np.maximum(np.abs(dx), np.abs(dy))
+        # steep segments advance one row per step, so only the steps inside of the buffer rows are generated
+        first = np.zeros(count, dtype=np.int64)
+        last = steps.copy()
+        steep = (np.abs(dy) == steps) & (dy != 0)
+        direction = np.sign(dy)
+        rowFirst = np.where(direction > 0, -y1, y1 - (self.height - 1))
+        rowLast = np.where(direction > 0, self.height - 1 - y1, y1)
+        first[steep] = np.maximum(first, rowFirst)[steep]
+        last[steep] = np.minimum(last, rowLast)[steep]
+        lengths = np.maximum(last - first + 1, 0)
+        segment = np.repeat(np.arange(count), lengths)
+        offsets = np.cumsum(lengths) - lengths
+        t = np.arange(lengths.sum()) - offsets[segment] + first[segment]
+        # Bresenham in closed form: the offset on the minor axis is i * minor / major rounded half up
+        major = np.maximum(steps, 1)[segment]
+        xs = x1[segment] + np.sign(dx)[segment] * ((2 * np.abs(dx)[segment] * t + major) // (2 * major))
+        ys = y1[segment] + np.sign(dy)[segment] * ((2 * np.abs(dy)[segment] * t + major) // (2 * major))
+        pixelColors = colors[segment]
+
+        if width > 1:
+            # thicken steep segments horizontally and flat segments vertically
+            steep = (np.abs(dy) > np.abs(dx))[segment]
+            shifts = np.arange(width) - (width - 1) // 2
+            xs = (xs[:, None] + np.where(steep[:, None], shifts[None, :], 0)).ravel()
+            ys = (ys[:, None] + np.where(steep[:, None], 0, shifts[None, :])).ravel()
+            pixelColors = np.repeat(pixelColors, width, axis=0)
+
+        self._setPixels(xs, ys, pixelColors)
+
+    def DrawPolyline(self, x: np.ndarray, y: np.ndarray, color: RGBColor, width: int = 1):
+        """Draws a polyline connecting the given points in order.
+
+        Args:
+            x (np.ndarray): X coordinates of the points.
+            y (np.ndarray): Y coordinates of the points.
+            color (RGBColor): Color of the polyline.
+            width (int, optional): Width of the polyline in pixels. Defaults to 1.
+        """
+        if len(x) < 2:
+            return
+        self.DrawLines(x[:-1], y[:-1], x[1:], y[1:], np.asarray(color, dtype=np.uint8), width)
+
+    def DrawDiscs(self, x: np.ndarray, y: np.ndarray, radius: int, fill: RGBColor, outline: RGBColor | None = None):
+        """Draws filled discs with an optional one pixel wide outline.
+
+        Args:
+            x (np.ndarray): X coordinates of the centers.
+            y (np.ndarray): Y coordinates of the centers.
+            radius (int): Radius of the discs in pixels.
+            fill (RGBColor): Fill color.
+            outline (RGBColor | None, optional): Outline color. Defaults to None (no outline).
+        """
+        if len(x) == 0:
+            return
+        offsets = np.arange(-radius, radius + 1)
+        offsetX, offsetY = np.meshgrid(offsets, offsets)
+        distance = np.hypot(offsetX, offsetY)
+        inside = distance <= radius + 0.4
+        border = inside & (distance > radius - 0.6)
+        centerX = np.asarray(x, dtype=np.float64).astype(np.int64)
+        centerY = np.asarray(y, dtype=np.float64).astype(np.int64) - self.top
+
+        discX = (centerX[:, None] + offsetX[inside][None, :]).ravel()
+        discY = (centerY[:, None] + offsetY[inside][None, :]).ravel()
+        self._setPixels(discX, discY, np.asarray(fill, dtype=np.uint8))
+        if outline is not None:
+            ringX = (centerX[:, None] + offsetX[border][None, :]).ravel()
+            ringY = (centerY[:, None] + offsetY[border][None, :]).ravel()
+            self._setPixels(ringX, ringY, np.asarray(outline, dtype=np.uint8))
+
+    def ToPPM(self) -> bytes:
+        """Encodes the buffer as a binary PPM image. The format is understood by tk.PhotoImage without any conversion.
+
+        Returns:
+            bytes: PPM encoded image
+        """
+        return f"P6 {self.width} {self.height} 255\n".encode("ascii") + self.pixels.tobytes()
+
+    def _clipRectangles(self, x1: np.ndarray, y1: np.ndarray, x2: np.ndarray, y2: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """Normalizes rectangles to integer (left, top, right, bottom) bounds clipped to the buffer.
+        """
+        x1 = np.asarray(x1, dtype=np.float64).astype(np.int64)
+        y1 = np.asarray(y1, dtype=np.float64).astype(np.int64) - self.top
+        x2 = np.asarray(x2, dtype=np.float64).astype(np.int64)
+        y2 = np.asarray(y2, dtype=np.float64).astype(np.int64) - self.top
+        left = np.clip(np.minimum(x1, x2), 0, None)
+        right = np.clip(np.maximum(x1, x2), None, self.width - 1)
+        top = np.clip(np.minimum(y1, y2), 0, None)
+        bottom = np.clip(np.maximum(y1, y2), None, self.height - 1)
+        return left, top, right, bottom
+
+    def _broadcastColors(self, colors: np.ndarray, count: int) -> np.ndarray:
+        """Converts a single color or an array of colors to an array of shape (count, 3).
+        """
+        colors = np.asarray(colors, dtype=np.uint8)
+        if colors.ndim == 1:
+            return np.broadcast_to(colors, (count, 3))
+        return colors
+
+    def _setPixels(self, x: np.ndarray, y: np.ndarray, colors: np.ndarray):
+        """Sets colors of individual pixels, pixels outside of the buffer are ignored.
+        """
+        inside = (x >= 0) & (x < self.width) & (y >= 0) & (y < self.height)
+        if colors.ndim == 1:
+            self.pixels[y[inside], x[inside]] = colors
+        else:
+            self.pixels[y[inside], x[inside]] = colors[inside]
@@ -155,6 +155,7 @@ class RectangleEventHandler(EventHandler,ABC):
     @inheritdocstring(EventHandler.on_left_up)
     def on_left_up(self, event: tk.Event):
         self.eventRegistersLeft.reset()
+        self._endGesture()
     
     def _clickedOnOrigin(self, event):
         """Registers a click on the chart origin.
@@ -299,7 +300,7 @@ class RectangleEventHandler(EventHandler,ABC):
         elif self.eventRegistersLeft.eventType == self.LeftEvents.origin: #done
             self.plotSolver.ChangeOrigin(event.x, self.canvasHeight - event.y)
         
-        self._updateCanvas()
+        self._updateCanvas(interactive=True)
         self._updateDataView()
     
     @abstractmethod
@@ -0,0 +1,238 @@
+"""Chart data from SQLite databases.
+
+Aggregation (groups of bars, histogram bins, OHLC of periods) runs in SQLite, only the aggregated rows are read.
+Rows are read from the cursor in batches and collected to NumPy columns of a Dataset, which UIFactory.CreateFromDataset
+turns into a chart.
+"""
+import sqlite3
+from typing import Any, Iterator, Sequence
+import numpy as np
+from numpy.typing import ArrayLike
+from .datasets import Dataset
+
+class SQLiteSource:
+    """
+    Data source reading chart data from a SQLite database.
+
+    Tables and columns are given by names, which are quoted. Filters are SQL expressions with ? parameters
+    appended to the WHERE clause of the query.
+
+    Attributes:
+        connection (sqlite3.Connection): connection to the database
+        batchSize (int): number of rows fetched from the cursor at once
+    """
+    BATCH_SIZE : int = 10000
+    AGGREGATES : tuple[str, ...] = ("SUM", "TOTAL", "AVG", "MIN", "MAX", "COUNT")
+
+    def __init__(self, database: str | sqlite3.Connection, batchSize: int = BATCH_SIZE):
+        """Opens the database read-only, an open connection is used as it is.
+
+        Args:
+            database (str | sqlite3.Connection): Path of the database file or an open connection.
+            batchSize (int): Number of rows fetched from the cursor at once.
+        """
+        if isinstance(database, sqlite3.Connection):
+            self.connection : sqlite3.Connection = database
+            self._ownsConnection : bool = False
+        else:
+            self.connection = sqlite3.connect(f"file:{database}?mode=ro", uri=True)
+            self._ownsConnection = True
+        self.batchSize : int = batchSize
+
+    def __enter__(self) -> "SQLiteSource":
+        return self
+
+    def __exit__(self, *exc):
+        self.Close()
+
+    def Close(self):
+        """Closes the connection if it was opened by the source.
+        """
+        if self._ownsConnection:
+            self.connection.close()
+
+    def Query(self, sql: str, params: Sequence[Any] = ()) -> dict[str, np.ndarray]:
+        """Runs a query and collects its rows to columns named by the columns of the result.
+
+        A column is numeric if the values of the first batch are numbers or NULL, NULL is read as NaN.
+        Other columns are read as strings.
+
+        Args:
+            sql (str): The query.
+            params (Sequence[Any]): Parameters of the query.
+
+        Returns:
+            dict[str, np.ndarray]: Float or string array for each column of the result.
+
+        Raises:
+            ValueError: If a numeric column contains text in a later batch.
+        """
+        cursor = self.connection.execute(sql, params)
+        names = [description[0] for description in cursor.description]
+        chunks : list[list[np.ndarray]] = [[] for _ in names]
+        numeric : list[bool] | None = None
+        for batch in self._batches(cursor):
+            columns = list(zip(*batch))
+            if numeric is None:
+                numeric = [all(value is None or isinstance(value, (int, float)) for value in column) for column in columns]
+            for i, column in enumerate(columns):
+                if numeric[i]:
+                    try:
+                        chunks[i].append(np.array(column, dtype=np.float64))
+                    except (TypeError, ValueError) as error:
+                        raise ValueError(f"Column {names[i]} contains values which are not numbers") from error
+                else:
+                    chunks[i].append(np.array(["" if value is None else str(value) for value in column], dtype=np.str_))
+        return {name: np.concatenate(chunk) if chunk else np.empty(0) for name, chunk in zip(names, chunks)}
+
+    def _batches(self, cursor: sqlite3.Cursor) -> Iterator[list[tuple]]:
+        """Fetches rows from the cursor in batches of batchSize rows.
+        """
+        while True:
+            batch = cursor.fetchmany(self.batchSize)
+            if not batch:
+                return
+            yield batch
+
+    def BarChart(self, table: str, groupColumn: str, nameColumn: str, valueColumn: str, aggregate: str = "SUM", where: str = "", params: Sequence[Any] = ()) -> Dataset:
+        """Aggregates values of bars with the same group and name, groups and bars within groups are sorted by their keys.
+
+        Args:
+            table (str): Name of the table.
+            groupColumn (str): Column identifying the group of a bar.
+            nameColumn (str): Column with names of bars.
+            valueColumn (str): Column with values.
+            aggregate (str): SQL aggregate function, one of AGGREGATES.
+            where (str): Filter of rows.
+            params (Sequence[Any]): Parameters of the filter.
+
+        Returns:
+            Dataset: Bar chart dataset.
+        """
+        group, name, value = _quote(groupColumn), _quote(nameColumn), _quote(valueColumn)
+        columns = self.Query(f"SELECT CAST({group} AS TEXT), CAST({name} AS TEXT), {_aggregate(aggregate)}({value}) "
+                             f"FROM {_quote(table)} WHERE {value} IS NOT NULL{_filter(where)} "
+                             f"GROUP BY {group}, {name} ORDER BY {group}, {name}", params)
+        groups, names, values = columns.values()
+        starts = np.flatnonzero(groups[1:] != groups[:-1]) + 1
+        groupSizes = np.diff(np.concatenate(([0], starts, [len(groups)]))) if len(groups) else np.empty(0, dtype=np.int64)
+        return Dataset("bar_chart", {"names": names, "groups": values.astype(np.float64), Dataset.GROUP_SIZES: groupSizes})
+
+    def Histogram(self, table: str, column: str, bins: int | ArrayLike = 10, where: str = "", params: Sequence[Any] = ()) -> Dataset:
+        """Counts values of a column in bins. Values outside of the bins are not counted, the last bin includes its upper boundary.
+
+        Args:
+            table (str): Name of the table.
+            column (str): Column with values.
+            bins (int | ArrayLike): Number of bins of the same width between the minimum and maximum value, or increasing boundaries of bins.
+            where (str): Filter of rows.
+            params (Sequence[Any]): Parameters of the filter.
+
+        Returns:
+            Dataset: Histogram dataset.
+
+        Raises:
+            ValueError: If boundaries of bins do not increase or the column has no values to bin.
+        """
+        value, source, condition = _quote(column), _quote(table), f"{_quote(column)} IS NOT NULL{_filter(where)}"
+        if np.ndim(bins) == 0:
+            low, high = self.connection.execute(f"SELECT MIN({value}), MAX({value}) FROM {source} WHERE {condition}", params).fetchone()
+            if low is None:
+                raise ValueError(f"Column {column} has no values")
+            if low == high:
+                low, high = low - 0.5, high + 0.5
+            boundaries = np.linspace(low, high, int(bins) + 1) # pyright: ignore[reportArgumentType]
+        else:
+            boundaries = np.asarray(bins, dtype=np.float64)
+        if boundaries.ndim != 1 or len(boundaries) < 2 or not (np.diff(boundaries) > 0).all():
+            raise ValueError("Boundaries of bins must increase")
+        binCount = len(boundaries) - 1
+        widths = np.diff(boundaries)
+        if np.allclose(widths, widths[0]):
+            binIndex = f"MIN(CAST(({value} - ?) / ? AS INTEGER), {binCount - 1})"
+            binParams = [float(boundaries[0]), float(widths[0])]
+        else:
+            binIndex = "CASE " + " ".join(f"WHEN {value} < ? THEN {i}" for i in range(binCount - 1)) + f" ELSE {binCount - 1} END"
+            binParams = boundaries[1:-1].tolist()
+        columns = self.Query(f"SELECT {binIndex} AS bin, COUNT(*) FROM {source} "
+                             f"WHERE {condition} AND {value} >= ? AND {value} <= ? GROUP BY bin",
+                             [*binParams, *params, float(boundaries[0]), float(boundaries[-1])])
+        binIndices, counts = columns.values()
+        values = np.zeros(binCount)
+        values[binIndices.astype(np.int64)] = counts
+        return Dataset("histogram", {"values": values, "interval_boundries": boundaries})
+
+    def CandlestickChart(self, table: str, timeColumn: str, priceColumn: str, period: float | str, where: str = "", params: Sequence[Any] = ()) -> Dataset:
+        """Aggregates prices to opening, closing, minimum and maximum price of each period.
+
+        Args:
+            table (str): Name of the table.
+            timeColumn (str): Column ordering the prices within a period.
+            priceColumn (str): Column with prices.
+            period (float | str): Length of a period in units of the numeric time column,
+                                  or an SQL expression giving the period of a row, e.g. "date(time)".
+            where (str): Filter of rows.
+            params (Sequence[Any]): Parameters of the filter.
+
+        Returns:
+            Dataset: Candlestick chart dataset, candles are named by the start of their period.
+        """
+        time, price = _quote(timeColumn), _quote(priceColumn)
+        if isinstance(period, str):
+            key, keyParams, name = period, [], "CAST(period AS TEXT)"
+        else:
+            # floor of the quotient, CAST truncates towards zero
+            quotient = f"({time} * 1.0 / ?)"
+            key, keyParams, name = f"(CAST({quotient} AS INTEGER) - ({quotient} < CAST({quotient} AS INTEGER)))", [float(period)] * 3, "period"
+        columns = self.Query(f"SELECT {name}, opening, closing, MIN(price), MAX(price) FROM ("
+                             f"SELECT period, price, FIRST_VALUE(price) OVER w AS opening, LAST_VALUE(price) OVER w AS closing FROM ("
+                             f"SELECT {key} AS period, {time} AS time, {price} AS price FROM {_quote(table)} WHERE {price} IS NOT NULL{_filter(where)}) "
+                             f"WINDOW w AS (PARTITION BY period ORDER BY time ROWS BETWEEN UNBOUNDED PRECEDING AND UNBOUNDED FOLLOWING)) "
+                             f"GROUP BY period ORDER BY period", [*keyParams, *params])
+        periods, openings, closings, minimums, maximums = columns.values()
+        names = periods if isinstance(period, str) else np.array([f"{start:g}" for start in periods * period], dtype=np.str_)
+        return Dataset("candlestick_chart", {"names": names, "openings": openings, "closings": closings, "minimums": minimums, "maximums": maximums})
+
+    def LineChart(self, table: str, nameColumn: str, valueColumn: str, aggregate: str | None = None, orderBy: str | None = None, where: str = "", params: Sequence[Any] = ()) -> Dataset:
+        """Reads points of a line chart, optionally aggregating values of points with the same name.
+
+        Args:
+            table (str): Name of the table.
+            nameColumn (str): Column with names of points.
+            valueColumn (str): Column with values.
+            aggregate (str | None): SQL aggregate function, one of AGGREGATES, None reads every row as a point.
+            orderBy (str | None): Column ordering the points, aggregated points are ordered by its minimum in the group.
+                                  Points are in the order of the table, aggregated points by names, if None.
+            where (str): Filter of rows.
+            params (Sequence[Any]): Parameters of the filter.
+
+        Returns:
+            Dataset: Line chart dataset.
+        """
+        name, value = _quote(nameColumn), _quote(valueColumn)
+        source = f"FROM {_quote(table)} WHERE {value} IS NOT NULL{_filter(where)}"
+        if aggregate is None:
+            order = f" ORDER BY {_quote(orderBy)}" if orderBy is not None else ""
+            sql = f"SELECT CAST({name} AS TEXT), {value} {source}{order}"
+        else:
+            order = f"MIN({_quote(orderBy)})" if orderBy is not None else name
+            sql = f"SELECT CAST({name} AS TEXT), {_aggregate(aggregate)}({value}) {source} GROUP BY {name} ORDER BY {order}"
+        names, values = self.Query(sql, params).values()
+        return Dataset("line_chart", {"names": names, "points": values.astype(np.float64)})
+
+def _quote(identifier: str) -> str:
+    """Quotes a name of a table or column.
+    """
+    return '"' + identifier.replace('"', '""') + '"'
+
+def _aggregate(aggregate: str) -> str:
+    """Checks the name of an aggregate function.
+    """
+    if aggregate.upper() not in SQLiteSource.AGGREGATES:
+        raise ValueError(f"Unsupported aggregate function {aggregate}")
+    return aggregate.upper()
+
+def _filter(where: str) -> str:
+    """Appends a filter to a WHERE clause.
+    """
+    return f" AND ({where})" if where else ""
@@ -0,0 +1,195 @@
+"""Candles of raw price ticks.
+
+A TickAggregator aggregates (timestamp, price) ticks to opening, closing, minimum and maximum prices of intervals
+of the same length in constant time per tick. A CandleStream shows the aggregated candles in a candlestick chart:
+the candle of the open interval is changed in place and a new candle is added when the next interval opens.
+"""
+import csv
+import math
+from typing import Iterable, Iterator
+from kiwiplots.solvers import CandlestickChartSolver
+from .plotmetadata import PlotMetadata
+from .datautils import RescaleList
+
+class OHLCCandle:
+    """
+    Prices of an interval.
+
+    Attributes:
+        start (float): start of the interval
+        opening (float): price of the earliest tick
+        closing (float): price of the latest tick
+        minimum (float): minimum price
+        maximum (float): maximum price
+        ticks (int): number of aggregated ticks
+    """
+    def __init__(self, start: float, timestamp: float, price: float):
+        self.start : float = start
+        self.opening : float = price
+        self.closing : float = price
+        self.minimum : float = price
+        self.maximum : float = price
+        self.ticks : int = 1
+        self._firstTime : float = timestamp
+        self._lastTime : float = timestamp
+
+    def Add(self, timestamp: float, price: float):
+        """Aggregates a tick of the interval. Ticks may come out of order within the interval.
+        """
+        if timestamp < self._firstTime:
+            self._firstTime, self.opening = timestamp, price
+        if timestamp >= self._lastTime:
+            self._lastTime, self.closing = timestamp, price
+        if price < self.minimum:
+            self.minimum = price
+        elif price > self.maximum:
+            self.maximum = price
+        self.ticks += 1
+
+    def Prices(self) -> list[float]:
+        """Returns the opening, closing, minimum and maximum price.
+        """
+        return [self.opening, self.closing, self.minimum, self.maximum]
+
+class TickAggregator:
+    """
+    Aggregates ticks to candles of intervals [origin + k*interval, origin + (k+1)*interval).
+
+    Intervals without ticks have no candle. Ticks of intervals which were already closed are dropped and counted.
+
+    Attributes:
+        interval (float): length of intervals in units of timestamps
+        origin (float): start of an interval
+        current (OHLCCandle | None): candle of the open interval
+        lateTicks (int): number of dropped ticks of closed intervals
+    """
+    def __init__(self, interval: float, origin: float = 0):
+        if not interval > 0:
+            raise ValueError("Length of intervals must be positive")
+        self.interval : float = interval
+        self.origin : float = origin
+        self.current : OHLCCandle | None = None
+        self.lateTicks : int = 0
+
+    def Add(self, timestamp: float, price: float) -> OHLCCandle | None:
+        """Aggregates a tick.
+
+        Args:
+            timestamp (float): Time of the tick.
+            price (float): Price of the tick.
+
+        Returns:
+            OHLCCandle | None: Candle of the interval closed by the tick, None if the tick did not open a new interval.
+        """
+        start = self.origin + math.floor((timestamp - self.origin) / self.interval) * self.interval
+        current = self.current
+        if current is not None and start == current.start:
+            current.Add(timestamp, price)
+            return None
+        if current is not None and start < current.start:
+            self.lateTicks += 1
+            return None
+        self.current = OHLCCandle(start, timestamp, price)
+        return current
+
+    def Flush(self) -> OHLCCandle | None:
+        """Closes the open interval.
+
+        Returns:
+            OHLCCandle | None: Candle of the closed interval, None if no interval was open.
+        """
+        current, self.current = self.current, None
+        return current
+
+class CandleStream:
+    """
+    Appends candles of ticks to a candlestick chart. The last candle of the chart shows the open interval.
+
+    Attributes:
+        solver (CandlestickChartSolver): solver of the chart
+        plotMetadata (PlotMetadata): metadata of the chart, prices are rescaled by its scale factor
+        aggregator (TickAggregator): aggregator of the ticks
+        nameFormat (str): format of names of candles, applied to the start of their interval
+    """
+    NAME_FORMAT : str = "{:g}"
+
+    def __init__(self, solver: CandlestickChartSolver, plotMetadata: PlotMetadata, interval: float, origin: float = 0):
+        """
+        Args:
+            solver (CandlestickChartSolver): Solver of the chart.
+            plotMetadata (PlotMetadata): Metadata of the chart.
+            interval (float): Length of intervals of candles in units of timestamps.
+            origin (float): Start of an interval.
+        """
+        self.solver : CandlestickChartSolver = solver
+        self.plotMetadata : PlotMetadata = plotMetadata
+        self.aggregator : TickAggregator = TickAggregator(interval, origin)
+        self.nameFormat : str = CandleStream.NAME_FORMAT
+        self._shownStart : float | None = None
+
+    def Add(self, timestamp: float, price: float):
+        """Aggregates a tick and updates the chart.
+
+        Args:
+            timestamp (float): Time of the tick.
+            price (float): Price of the tick.
+        """
+        self.Consume(((timestamp, price),))
+
+    def Consume(self, ticks: Iterable[tuple[float, float]]):
+        """Aggregates ticks and updates the chart once: the shown candle is changed in place
+        and candles of intervals opened by the ticks are added together.
+
+        Args:
+            ticks (Iterable[tuple[float, float]]): Timestamps and prices of ticks.
+        """
+        closed : list[OHLCCandle] = []
+        for timestamp, price in ticks:
+            candle = self.aggregator.Add(timestamp, price)
+            if candle is not None:
+                closed.append(candle)
+        current = self.aggregator.current
+        candles = closed + ([current] if current is not None else [])
+        if not candles:
+            return
+        if candles[0].start == self._shownStart:
+            self.solver.SetCandleValues(len(self.solver.variableChart.candles)-1, *self._rescale(candles.pop(0).Prices()))
+        if candles:
+            columns = [self._rescale(column) for column in zip(*(candle.Prices() for candle in candles))]
+            self.solver.AddCandles([self.nameFormat.format(candle.start) for candle in candles], *columns)
+        if current is not None:
+            self._shownStart = current.start
+
+    def _rescale(self, prices) -> list[int]:
+        """Rescales prices to the chart.
+        """
+        scaleFactor = self.plotMetadata.heightScaleFactor
+        return RescaleList(prices, scaleFactor, self.plotMetadata.xAxisValue*scaleFactor)
+
+def ReadTicks(file: str, timeColumn: int = 0, priceColumn: int = 1, header: bool = False, delimiter: str = ",") -> Iterator[tuple[float, float]]:
+    """Reads ticks from a CSV file row by row.
+
+    Args:
+        file (str): Path of the file.
+        timeColumn (int): Index of the column with timestamps.
+        priceColumn (int): Index of the column with prices.
+        header (bool): Whether the first row is a header, which is skipped.
+        delimiter (str): Delimiter of values.
+
+    Yields:
+        tuple[float, float]: Timestamp and price of a tick.
+
+    Raises:
+        ValueError: If a row does not contain a numeric timestamp and price.
+    """
+    with open(file, newline="", encoding="utf-8") as stream:
+        reader = csv.reader(stream, delimiter=delimiter)
+        if header:
+            next(reader, None)
+        for row in reader:
+            if not row:
+                continue
+            try:
+                yield float(row[timeColumn]), float(row[priceColumn])
+            except (IndexError, ValueError) as error:
+                raise ValueError(f"Row {reader.line_num} of {file} is not a tick") from error
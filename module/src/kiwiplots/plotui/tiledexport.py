@@ -0,0 +1,224 @@
+"""Export of very large pictures rendered in horizontal strips.
+
+Strips of a PictureLayout are rendered one after another and streamed into a PNG encoder, so only a few strips
+are held in memory at once. Strips can optionally be rendered and compressed by a pool of processes, which read the layout
+from shared memory. Every strip is compressed separately and ends on a byte boundary, so compressed strips are simply concatenated.
+"""
+from concurrent.futures import Future, ProcessPoolExecutor
+from collections import deque
+import struct
+import zlib
+from typing import BinaryIO
+import numpy as np
+from .picturelayout import PictureLayout, SharedLayout
+
+EncodedRows = tuple[bytes, int, int, int]
+
+def EncodeRows(pixels: np.ndarray, previousRow: np.ndarray | None = None, compressLevel: int = 6) -> EncodedRows:
+    """Filters and compresses rows of a PNG image independently of other rows, so parts of an image can be encoded in parallel.
+
+    Every row is filtered with None, Sub or Up PNG filter, whichever gives the smallest sum of absolute filtered values
+    (the heuristic of libpng, evaluated on a sample of the bytes of the row).
+
+    Args:
+        pixels (np.ndarray): RGB pixels of the rows, array of shape (rows, width, 3) with dtype uint8.
+        previousRow (np.ndarray | None, optional): Pixels of the row above the first row. Defaults to None (the first row of the image).
+        compressLevel (int, optional): zlib compression level from 0 to 9. Defaults to 6 (same as PIL).
+
+    Returns:
+        EncodedRows: Raw deflate data ending on a byte boundary, adler32 checksum and length of the filtered data and number of rows.
+    """
+    rows = np.ascontiguousarray(pixels, dtype=np.uint8).reshape(len(pixels), -1)
+    previous = np.zeros(rows.shape[1], dtype=np.uint8) if previousRow is None else np.asarray(previousRow, dtype=np.uint8).reshape(-1)
+
+    # filter of every row is chosen by filtered values of sampled bytes, sample step is coprime with 3 so that all color channels are sampled
+    sample = np.arange(3, rows.shape[1], FILTER_COST_SAMPLE_STEP)
+    sampled = rows[:, sample]
+    above = np.vstack((previous[None, sample], sampled[:-1]))
+    costs = np.stack((_filterCost(sampled), _filterCost(sampled - rows[:, sample - 3]), _filterCost(sampled - above)))
+    filters = costs.argmin(axis=0).astype(np.uint8)
+
+    filtered = np.empty((len(rows), rows.shape[1] + 1), dtype=np.uint8)
+    filtered[:, 0] = filters
+    filtered[:, 1:] = rows
+    isSub = (filters == 1)[:, None]
+    np.subtract(rows[:, 3:], rows[:, :-3], out=filtered[:, 4:], where=isSub)
+    isUp = (filters == 2)[:, None]
+    np.subtract(rows[1:], rows[:-1], out=filtered[1:, 1:], where=isUp[1:])
+    if len(rows) > 0 and filters[0] == 2:
+        filtered[0, 1:] = rows[0] - previous
+
+    data = filtered.data
+    compressor = zlib.compressobj(compressLevel, zlib.DEFLATED, -zlib.MAX_WBITS)
+    compressed = compressor.compress(data) + compressor.flush(zlib.Z_SYNC_FLUSH)
+    return compressed, zlib.adler32(data), filtered.nbytes, len(rows)
+
+FILTER_COST_SAMPLE_STEP : int = 7
+
+def _filterCost(filteredBytes: np.ndarray) -> np.ndarray:
+    """Heuristic of libpng - sum of the filtered bytes of every row interpreted as signed values.
+    """
+    return np.minimum(filteredBytes, 0 - filteredBytes).sum(axis=1, dtype=np.int64)
+
+def _combineAdler32(first: int, second: int, secondLength: int) -> int:
+    """Checksum of concatenated data from adler32 checksums of its parts (adler32_combine of zlib).
+    """
+    base = 65521
+    remainder = secondLength % base
+    sum1 = first & 0xFFFF
+    sum2 = (remainder * sum1) % base
+    sum1 = (sum1 + (second & 0xFFFF) + base - 1) % base
+    sum2 = (sum2 + (first >> 16) + (second >> 16) + base - remainder) % base
+    return sum1 | (sum2 << 16)
+
+class PNGStreamWriter:
+    """
+    Writes an RGB PNG image row by row. Rows are filtered and compressed as they come, so the whole image never has to be in memory.
+
+    Rows can also be encoded elsewhere (e.g. in other processes) by EncodeRows and appended in order by WriteEncoded.
+
+    Attributes:
+        width (int): width of the image in pixels
+        height (int): height of the image in pixels
+        compressLevel (int): zlib compression level
+        rowsWritten (int): number of rows written so far
+    """
+    SIGNATURE : bytes = b"\x89PNG\r\n\x1a\n"
+    ZLIB_HEADER : bytes = b"\x78\x9c"
+    IDAT_SIZE : int = 1 << 20
+
+    def __init__(self, stream: BinaryIO, width: int, height: int, compressLevel: int = 6):
+        """
+        Args:
+            stream (BinaryIO): Binary stream the image is written to.
+            width (int): Width of the image in pixels.
+            height (int): Height of the image in pixels.
+            compressLevel (int, optional): zlib compression level from 0 to 9. Defaults to 6 (same as PIL).
+        """
+        self.width : int = width
+        self.height : int = height
+        self.compressLevel : int = compressLevel
+        self.rowsWritten : int = 0
+        self._stream : BinaryIO = stream
+        self._pending : bytearray = bytearray(PNGStreamWriter.ZLIB_HEADER)
+        self._checksum : int = zlib.adler32(b"")
+        self._previousRow : np.ndarray | None = None
+
+        self._stream.write(PNGStreamWriter.SIGNATURE)
+        self._writeChunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0))
+
+    def WriteRows(self, pixels: np.ndarray):
+        """Encodes and appends rows to the image.
+
+        Args:
+            pixels (np.ndarray): RGB pixels of the rows, array of shape (rows, width, 3) with dtype uint8.
+        """
+        if len(pixels) == 0:
+            return
+        self.WriteEncoded(EncodeRows(pixels, self._previousRow, self.compressLevel))
+        self._previousRow = np.array(pixels[-1], dtype=np.uint8)
+
+    def WriteEncoded(self, rows: EncodedRows):
+        """Appends rows encoded by EncodeRows. The rows must have been encoded with the last row written before as the previous row.
+
+        Args:
+            rows (EncodedRows): Encoded rows.
+        """
+        compressed, checksum, length, count = rows
+        if self.rowsWritten + count > self.height:
+            raise ValueError("More rows written than the height of the image")
+        self._pending += compressed
+        self._checksum = _combineAdler32(self._checksum, checksum, length)
+        self.rowsWritten += count
+        self._flushPending(PNGStreamWriter.IDAT_SIZE)
+
+    def Close(self):
+        """Finishes the image. All rows must be written before.
+        """
+        if self.rowsWritten != self.height:
+            raise ValueError(f"Image has {self.height} rows, but {self.rowsWritten} were written")
+        # empty final block of the deflate stream and checksum of the zlib stream
+        self._pending += zlib.compressobj(0, zlib.DEFLATED, -zlib.MAX_WBITS).flush()
+        self._pending += struct.pack(">I", self._checksum)
+        self._flushPending(1)
+        self._writeChunk(b"IEND", b"")
+
+    def _flushPending(self, minimalSize: int):
+        """Writes compressed data as IDAT chunks once at least minimalSize bytes are pending.
+        """
+        if len(self._pending) >= minimalSize:
+            self._writeChunk(b"IDAT", bytes(self._pending))
+            self._pending.clear()
+
+    def _writeChunk(self, chunkType: bytes, data: bytes):
+        """Writes a PNG chunk with its length and checksum.
+        """
+        self._stream.write(struct.pack(">I", len(data)))
+        self._stream.write(chunkType)
+        self._stream.write(data)
+        self._stream.write(struct.pack(">I", zlib.crc32(data, zlib.crc32(chunkType))))
+
+def _renderSharedStrip(layout: SharedLayout, top: int, height: int, compressLevel: int) -> EncodedRows:
+    """Renders and encodes a strip of a shared layout in a worker process.
+    The row above the strip is rendered as well, it is needed by the Up filter of the first row.
+    """
+    first = max(top - 1, 0)
+    pixels = np.asarray(layout.RenderStrip(first, height + top - first))
+    if top == 0:
+        return EncodeRows(pixels, None, compressLevel)
+    return EncodeRows(pixels[1:], pixels[0], compressLevel)
+
+class TiledExporter:
+    """
+    Renders pictures in horizontal strips and streams them into a PNG file.
+
+    Attributes:
+        tileHeight (int): height of a rendered strip in pixels
+        processes (int): number of worker processes rendering the strips, strips are rendered in the calling process when it is at most 1
+        compressLevel (int): zlib compression level of the PNG file
+    """
+    TILE_HEIGHT : int = 256
+    COMPRESS_LEVEL : int = 6
+
+    def __init__(self, tileHeight: int = TILE_HEIGHT, processes: int = 0, compressLevel: int = COMPRESS_LEVEL):
+        self.tileHeight : int = tileHeight
+        self.processes : int = processes
+        self.compressLevel : int = compressLevel
+
+    def Export(self, layout: PictureLayout, file: str):
+        """Renders the layout and saves it as a PNG file.
+
+        Args:
+            layout (PictureLayout): Layout of the picture.
+            file (str): File path to save the image.
+        """
+        with open(file, "wb") as stream:
+            self.WriteStream(layout, stream)
+
+    def WriteStream(self, layout: PictureLayout, stream: BinaryIO):
+        """Renders the layout and writes it as a PNG image to a binary stream. The stream does not have to be seekable.
+
+        Args:
+            layout (PictureLayout): Layout of the picture.
+            stream (BinaryIO): Binary stream the image is written to.
+        """
+        writer = PNGStreamWriter(stream, layout.width, layout.height, self.compressLevel)
+        tops = range(0, layout.height, self.tileHeight)
+        if self.processes > 1:
+            self._exportParallel(layout, tops, writer)
+        else:
+            for top in tops:
+                writer.WriteRows(np.asarray(layout.RenderStrip(top, self.tileHeight)))
+        writer.Close()
+
+    def _exportParallel(self, layout: PictureLayout, tops: range, writer: PNGStreamWriter):
+        """Renders and compresses strips in a process pool. At most two strips per process are in flight, which bounds the memory.
+        """
+        with layout.Share() as sharedLayout, ProcessPoolExecutor(self.processes) as pool:
+            rendered : deque[Future] = deque()
+            for top in tops:
+                if len(rendered) >= 2 * self.processes:
+                    writer.WriteEncoded(rendered.popleft().result())
+                rendered.append(pool.submit(_renderSharedStrip, sharedLayout, top, min(self.tileHeight, layout.height - top), self.compressLevel))
+            while rendered:
+                writer.WriteEncoded(rendered.popleft().result())
@@ -7,4 +7,7 @@ INITIAL_ORIGIN_X : int = 50
 INITIAL_ORIGIN_Y : int = 30
 INITIAL_PADDING : int = 10
 DEFAULT_COLOR : Union[str,int] = "blue"
-INITIAL_PADDING : int = 10
\ No newline at end of file
+INITIAL_PADDING : int = 10
+RASTER_BACKEND_ELEMENT_THRESHOLD : int = 2000
+VIRTUALIZED_VIEWER_ELEMENT_THRESHOLD : int = 500
+EXPORT_CACHE_MAX_BYTES : int = 256 * 1024 * 1024
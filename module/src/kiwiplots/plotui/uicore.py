@@ -1,13 +1,17 @@
-from typing import Union
+from typing import Union, Callable
 import tkinter as tk
-from tkinter import simpledialog, filedialog
+from tkinter import simpledialog, filedialog, messagebox
 from kiwiplots.solvers import ChartSolver
 from .plotmetadata import PlotMetadata
 from .eventhandlers import EventHandler
 from .picturedrawers import PictureDrawer
 from .datawriters import DataWriter
+from .exportcache import LayoutSnapshot
+from .exportqueue import ExportQueue, ExportEvent
+from .livefeed import CSVTailFollower, LiveFeed
 from kiwiplots.chartelements import ValuePoint2D
 import os
+import copy
 """
 Handles communication between UI features.
 """
@@ -24,8 +28,15 @@ class UICore:
         plotWidth (int) : width of the plot
         plotHeight (int) : height of the plot
         plotMetadata (PlotMetadata) : plot metadata (shared facts about the chart)
+        exportQueue (ExportQueue) : queue of picture and data exports running on a worker thread
+        pollInterval (int) : milliseconds between checks of the progress of queued exports
+        resizeDelay (int) : milliseconds without a new size of the window after which the chart is projected to the new size
+        liveFeeds (list[LiveFeed]) : followed files whose new rows are appended to the chart while it is viewed
     
     """
+    POLL_INTERVAL : int = 100
+    RESIZE_DELAY : int = 100
+
     def __init__(self, plotMetadata: PlotMetadata, solver : ChartSolver, canvasHandler : EventHandler, pictureDrawer : PictureDrawer, dataWriter: DataWriter, plotWidth: int, plotHeight: int):
         """
         Initializes UICore with all required components.
@@ -47,6 +58,12 @@ class UICore:
         self.plotHeight = plotHeight
         self.plotMetadata : PlotMetadata = plotMetadata
         self.initialOrigin : ValuePoint2D = self.solver.GetOrigin()
+        self.exportQueue : ExportQueue = ExportQueue()
+        self.pollInterval : int = UICore.POLL_INTERVAL
+        self._pollJob : str | None = None
+        self.resizeDelay : int = UICore.RESIZE_DELAY
+        self._resizeJob : str | None = None
+        self.liveFeeds : list[LiveFeed] = []
 
 
     def initializeUIElements(self):
@@ -55,10 +72,10 @@ class UICore:
         """
         self.root = tk.Tk()
         self.frame = tk.Frame(self.root)
-        self.frame.pack()
+        self.frame.pack(fill=tk.BOTH, expand=True)
 
         self.canvas = tk.Canvas(self.frame, width=self.plotWidth, height=self.plotHeight, bg="white")
-        self.canvas.pack()
+        self.canvas.pack(fill=tk.BOTH, expand=True)
 
         self.buttonFrame = tk.Frame(self.frame)
         self.buttonFrame.pack(pady=5)
@@ -69,6 +86,8 @@ class UICore:
         self.savePictureButton.pack(side=tk.LEFT, padx=5)
         self.saveDataButton.pack(side=tk.LEFT, padx=5)
         self.resetOriginButton.pack(side=tk.LEFT, padx=5)
+        self.exportStatus = tk.Label(self.buttonFrame, text="")
+        self.exportStatus.pack(side=tk.LEFT, padx=5)
 
         self.dataWindow = tk.Text(self.frame, height=20, width=40)
         self.dataWindow.pack()
@@ -91,23 +110,95 @@ class UICore:
         """
         Handles the 'Save data' button click event.
         
-        Prompts the user for a file path and exports the plot data.
+        Prompts the user for a file path and queues the export of the plot data. The data are written on the export worker thread.
         """
 
-        fileName = filedialog.asksaveasfilename(title="Save data as csv", defaultextension=".csv", filetypes=[("CSV file","*.csv"),("All files","*.*")],parent=self.root)        
-        self.dataWriter.write(self.plotMetadata, self.solver, fileName)
+        fileName = filedialog.asksaveasfilename(title="Save data", defaultextension=".csv", filetypes=[("CSV file","*.csv"),("NumPy archive","*.npz"),("JSON Lines","*.jsonl"),("Compressed CSV","*.csv.gz *.csv.bz2 *.csv.xz"),("All files","*.*")],parent=self.root)
+        if not fileName:
+            return
+        plotMetadata, snapshot = self._snapshot()
+        self._submitExport(f"Saving {os.path.basename(fileName)}", lambda: self.dataWriter.write(plotMetadata, snapshot, fileName)) # pyright: ignore[reportArgumentType]
     
     def on_savePictureButton_click(self):
         """
         Handles the 'Save as PNG' button click event.
         
-        Prompts the user for a file path and saves the plot as a PNG image.
+        Prompts the user for a file path and queues the export of the plot as an image. SVG and PDF files are saved as vector images.
+        The image is rendered on the export worker thread from a snapshot of the chart, so the chart can be edited in the meantime.
         """
         self.canvasHandler.UpdateUI()
         
-        pictureAddress = filedialog.asksaveasfilename(parent=self.root,title="Save chart",defaultextension=".png",filetypes=[("PNG image","*.png"),("JPG image","*.jpg"),("All files","*.*")])
-        self.pictureDrawer.draw(self.plotMetadata, self.solver, self.plotWidth, self.plotHeight, pictureAddress)
+        pictureAddress = filedialog.asksaveasfilename(parent=self.root,title="Save chart",defaultextension=".png",filetypes=[("PNG image","*.png"),("JPG image","*.jpg"),("SVG image","*.svg"),("PDF document","*.pdf"),("All files","*.*")])
+        if not pictureAddress:
+            return
+        plotMetadata, snapshot = self._snapshot()
+        width, height = self.plotWidth, self.plotHeight
+        self._submitExport(f"Saving {os.path.basename(pictureAddress)}", lambda: self.pictureDrawer.draw(plotMetadata, snapshot, width, height, pictureAddress)) # pyright: ignore[reportArgumentType]
+
+    def _snapshot(self) -> tuple[PlotMetadata, LayoutSnapshot]:
+        """Copies the plot metadata and takes a snapshot of the solved layout, which are not affected by later edits of the chart.
+        """
+        return copy.deepcopy(self.plotMetadata), LayoutSnapshot(self.solver)
+
+    def _submitExport(self, description: str, export: Callable[[], None]):
+        """Queues an export and starts polling its progress.
+        """
+        self.exportQueue.Submit(description, export)
+        self.exportStatus.config(text=f"{description} ({self.exportQueue.pending} pending)")
+        if self._pollJob is None:
+            self._pollJob = self.root.after(self.pollInterval, self._pollExports)
+
+    def _pollExports(self):
+        """Shows the progress of queued exports reported by the worker thread. Runs on the Tk thread while any export is pending.
+        """
+        pending = self.exportQueue.pending
+        for event in self.exportQueue.Poll():
+            if event.state == ExportEvent.STARTED:
+                self.exportStatus.config(text=f"{event.description}... ({event.pending} pending)")
+            elif event.state == ExportEvent.FAILED:
+                self.exportStatus.config(text=f"{event.description} failed")
+                messagebox.showerror("Error", f"{event.description} failed: {event.error}", parent=self.root)
+            elif event.pending == 0:
+                self.exportStatus.config(text="Saved")
+        self._pollJob = self.root.after(self.pollInterval, self._pollExports) if pending > 0 else None
     
+    def on_canvas_configure(self, event: tk.Event):
+        """
+        Handles changes of the canvas size. Resizing is debounced, the chart is projected to the new size once the size stops changing.
+
+        Args:
+            event (tk.Event): Configure event of the canvas.
+        """
+        if self._resizeJob is not None:
+            self.root.after_cancel(self._resizeJob)
+        self._resizeJob = self.root.after(self.resizeDelay, self._resizeCanvas)
+
+    def _resizeCanvas(self):
+        """Projects the chart to the current size of the drawable area of the canvas.
+        """
+        self._resizeJob = None
+        border = 2 * (int(self.canvas.cget("highlightthickness")) + int(self.canvas.cget("borderwidth")))
+        self.canvasHandler.Resize(self.canvas.winfo_width() - border, self.canvas.winfo_height() - border)
+
+    def _inLayout(self, handler: Callable[[tk.Event], None]) -> Callable[[tk.Event], None]:
+        """Wraps a canvas event handler, positions of events are mapped from the resized canvas to the layout of the chart.
+        """
+        return lambda event: handler(self.canvasHandler.MapEvent(event))
+
+    def Follow(self, follower: CSVTailFollower) -> LiveFeed:
+        """
+        Appends rows of a growing CSV file to the chart while it is viewed. Only line charts and candlestick charts can follow files.
+
+        Args:
+            follower (CSVTailFollower): Followed file.
+
+        Returns:
+            LiveFeed: The feed, which can be stopped or tuned.
+        """
+        feed = LiveFeed(follower, self.solver, self.plotMetadata, self.canvasHandler)
+        self.liveFeeds.append(feed)
+        return feed
+
     def on_resetOriginButton_click(self):
         """Resets chart origin to initial value.
         """
@@ -124,6 +215,8 @@ class UICore:
         self.inicializeHandlers()
 
         self.canvasHandler.UpdateUI() #initial draw
+        for feed in self.liveFeeds:
+            feed.Start(self.root)
         self._UIRun()
     
     def _UIRun(self):
@@ -132,10 +225,15 @@ class UICore:
         
         Starts the main tkinter event loop.
         """
-        self.canvas.bind("<Button-1>", self.canvasHandler.on_left_down) # type: ignore
-        self.canvas.bind("<B1-Motion>", self.canvasHandler.on_mouse_move) # type: ignore
-        self.canvas.bind("<ButtonRelease-1>", self.canvasHandler.on_left_up) # type: ignore
-        self.canvas.bind("<Motion>", self.canvasHandler.check_cursor) # type: ignore
-        self.canvas.bind("<Button-3>", self.canvasHandler.on_right_down) # type: ignore
-        self.canvas.bind("<ButtonRelease-3>", self.canvasHandler.on_right_up) # type: ignore
+        self.canvas.bind("<Button-1>", self._inLayout(self.canvasHandler.on_left_down)) # type: ignore
+        self.canvas.bind("<B1-Motion>", self._inLayout(self.canvasHandler.on_mouse_move)) # type: ignore
+        self.canvas.bind("<ButtonRelease-1>", self._inLayout(self.canvasHandler.on_left_up)) # type: ignore
+        self.canvas.bind("<Motion>", self._inLayout(self.canvasHandler.check_cursor)) # type: ignore
+        self.canvas.bind("<Button-3>", self._inLayout(self.canvasHandler.on_right_down)) # type: ignore
+        self.canvas.bind("<ButtonRelease-3>", self._inLayout(self.canvasHandler.on_right_up)) # type: ignore
+        self.canvas.bind("<Configure>", self.on_canvas_configure) # type: ignore
         self.root.mainloop()
+        for feed in self.liveFeeds:
+            feed.Stop()
+        # exports queued before the window was closed are still finished
+        self.exportQueue.Close()
@@ -9,22 +9,82 @@ from .linecharteventhandler import LineChartEventHandler
 from kiwiplots.variablechart import *
 from .picturedrawers import *
 from .datawriters import *
-from numpy import abs
 from .datautils import *
 from .uiconstants import *
+from .canvasdrawers import *
+from .dataviewers import *
+from .exportcache import ExportCache
+from .datasets import Dataset
+from .histogrambinning import HistogramBinning, Samples
 
 class UIFactory:
     """Static class for UI core creation. Creates specific charts via dependency injection. Contains necessary factory methods.
+
+    Attributes:
+        rasterBackendThreshold (int): charts with more data elements than this are rendered by raster canvas drawers
+        virtualizedViewerThreshold (int): charts with more data elements than this show their values in virtualized data viewers
+        exportCache (ExportCache | None): on-disk cache of exported pictures and data shared by charts created afterwards,
+                                          None (the default) disables caching, see EnableExportCache
     """
+    rasterBackendThreshold : int = RASTER_BACKEND_ELEMENT_THRESHOLD
+    virtualizedViewerThreshold : int = VIRTUALIZED_VIEWER_ELEMENT_THRESHOLD
+    exportCache : ExportCache | None = None
+
+    @staticmethod
+    def EnableExportCache(directory: str | None = None, maxBytes: int = EXPORT_CACHE_MAX_BYTES) -> ExportCache:
+        """
+        Caches exports of charts created afterwards on the disk. Exports of unchanged charts are then copied from the cache,
+        other exports are written to the cache first.
+
+        Args:
+            directory (str | None): Directory of the cached files, None uses kiwiplots/exports in the user cache directory.
+            maxBytes (int): Maximal total size of the cached files in bytes.
+
+        Returns:
+            ExportCache: The cache shared by created charts.
+        """
+        UIFactory.exportCache = ExportCache(directory, maxBytes)
+        return UIFactory.exportCache
+
+    @staticmethod
+    def _selectCanvasDrawerType(elementCount: int, vectorType: type[CanvasDrawer], rasterType: type[RasterCanvasDrawer]) -> type:
+        """
+        Chooses the canvas drawer backend based on the number of data elements.
+
+        Args:
+            elementCount (int): Number of data elements of the chart.
+            vectorType (type[CanvasDrawer]): Drawer creating one canvas item per element.
+            rasterType (type[RasterCanvasDrawer]): Drawer rasterizing the elements into a single image.
+
+        Returns:
+            type: rasterType if elementCount exceeds UIFactory.rasterBackendThreshold, vectorType otherwise.
+        """
+        return rasterType if elementCount > UIFactory.rasterBackendThreshold else vectorType
+
+    @staticmethod
+    def _selectDataViewerType(elementCount: int, fullType: type[DataViewer], virtualizedType: type[VirtualizedDataViewer]) -> type:
+        """
+        Chooses the data viewer based on the number of data elements.
+
+        Args:
+            elementCount (int): Number of data elements of the chart.
+            fullType (type[DataViewer]): Viewer writing a row for every element.
+            virtualizedType (type[VirtualizedDataViewer]): Viewer writing only the rows visible in the text window.
+
+        Returns:
+            type: virtualizedType if elementCount exceeds UIFactory.virtualizedViewerThreshold, fullType otherwise.
+        """
+        return virtualizedType if elementCount > UIFactory.virtualizedViewerThreshold else fullType
+
     @staticmethod
     def CreateCandlesticChart(title: str, 
                               xAxisLabel : str, 
                               yAxisLabel : str,
                               xAxisValue : float, 
-                              initialOpening : list[float], 
-                              initialClosing : list[float], 
-                              initialMinimum : list[float], 
-                              initialMaximum : list[float], 
+                              initialOpening : ArrayLike, 
+                              initialClosing : ArrayLike, 
+                              initialMinimum : ArrayLike, 
+                              initialMaximum : ArrayLike, 
                               names : list[str],
                               plotWidth: int,
                               plotHeight: int
@@ -37,10 +97,10 @@ class UIFactory:
             xAxisLabel (str): Label for the x-axis
             yAxisLabel (str): Label for the y-axis
             xAxisValue (float): The value where the x-axis is positioned
-            initialOpening (list[float]): List of opening prices for each candlestick
-            initialClosing (list[float]): List of closing prices for each candlestick
-            initialMinimum (list[float]): List of minimum prices for each candlestick
-            initialMaximum (list[float]): List of maximum prices for each candlestick
+            initialOpening (ArrayLike): Array of opening prices for each candlestick
+            initialClosing (ArrayLike): Array of closing prices for each candlestick
+            initialMinimum (ArrayLike): Array of minimum prices for each candlestick
+            initialMaximum (ArrayLike): Array of maximum prices for each candlestick
             names (list[str]): Names/labels for each candlestick
             plotWidth (int): Width of the plot area in pixels
             plotHeight (int): Height of the plot area in pixels
@@ -51,19 +111,22 @@ class UIFactory:
         """
         metadata : CandlesticPlotMetadata = CreateCandlesticChartMetadata(title,xAxisLabel,yAxisLabel, xAxisValue, initialOpening,initialClosing,initialMinimum,initialMaximum,plotHeight)
         solver : ChartSolver = UIFactory._createCandlesticChartSolver(metadata,initialOpening,initialClosing,initialMinimum,initialMaximum,names)
-        eventHandler : EventHandler = CandlesticEventHandler(metadata, solver)
-        pictureDrawer : PictureDrawer = CandlesticPictureDrawer()
+        canvasDrawerType = UIFactory._selectCanvasDrawerType(len(names), CandlesticCanvasDrawer, RasterCandlesticCanvasDrawer)
+        dataViewerType = UIFactory._selectDataViewerType(len(names), CandlesticDataViewer, VirtualizedCandlesticDataViewer)
+        eventHandler : EventHandler = CandlesticEventHandler(metadata, solver, canvasDrawerType, dataViewerType)
+        pictureDrawer : PictureDrawer = VectorCandlesticPictureDrawer()
         dataWriter : DataWriter = CandlesticDataWriter()
+        pictureDrawer.exportCache = dataWriter.exportCache = UIFactory.exportCache
         return UICore(metadata,solver,eventHandler,pictureDrawer,dataWriter,plotWidth,plotHeight)
 
 
     
     @staticmethod
     def _createCandlesticChartSolver(metadata : CandlesticPlotMetadata,
-                                     initialOpening : list[float], 
-                                     initialClosing : list[float], 
-                                     initialMinimum : list[float], 
-                                     initialMaximum : list[float],
+                                     initialOpening : ArrayLike, 
+                                     initialClosing : ArrayLike, 
+                                     initialMinimum : ArrayLike, 
+                                     initialMaximum : ArrayLike,
                                      names : list[str]
                                      )-> CandlestickChartSolver:
         """
@@ -75,10 +138,10 @@ class UIFactory:
         
         Args:
             metadata (CandlesticPlotMetadata): Chart metadata including scale factor and axis information
-            initialOpening (list[float]): List of opening prices to be rescaled
-            initialClosing (list[float]): List of closing prices to be rescaled
-            initialMinimum (list[float]): List of minimum prices to be rescaled
-            initialMaximum (list[float]): List of maximum prices to be rescaled
+            initialOpening (ArrayLike): Array of opening prices to be rescaled
+            initialClosing (ArrayLike): Array of closing prices to be rescaled
+            initialMinimum (ArrayLike): Array of minimum prices to be rescaled
+            initialMaximum (ArrayLike): Array of maximum prices to be rescaled
             names (list[str]): Names/labels for each candlestick
             title (str): The title of the chart
             
@@ -90,7 +153,7 @@ class UIFactory:
         
         rescaledXAxisValue : float = metadata.xAxisValue*metadata.heightScaleFactor
 
-        chart : VariableCandlesticChart = VariableCandlesticChart([initialOpening[i] - initialClosing[i] >= 0 for i in range(len(initialOpening))], names)
+        chart : VariableCandlesticChart = VariableCandlesticChart((AsValues(initialOpening) - AsValues(initialClosing) >= 0).tolist(), names)
 
         return CandlestickChartSolver(chart,
                                       INITIAL_WIDTH,
@@ -106,7 +169,7 @@ class UIFactory:
     def CreateBarChart( title: str, 
                         xAxisLabel : str, 
                         yAxisLabel : str, 
-                        initialValues : list[list[float]],
+                        initialValues : list[ArrayLike],
                         rectangleNames : list[list[str]],
                         plotWidth: int,
                         plotHeight: int
@@ -122,7 +185,7 @@ class UIFactory:
             title (str): Chart title.
             xAxisLabel (str): X-axis label.
             yAxisLabel (str): Y-axis label.
-            initialValues (list[list[float]]): Grouped numeric values for the bars.
+            initialValues (list[ArrayLike]): Grouped numeric values for the bars.
             rectangleNames (list[list[str]]): Labels for individual bars within groups.
             plotWidth (int): Width of the plot area in pixels.
             plotHeight (int): Height of the plot area in pixels.
@@ -132,15 +195,18 @@ class UIFactory:
         """
         metadata : BarChartMetadata = CreateBarChartMetadata(title, xAxisLabel, yAxisLabel, initialValues, plotHeight)
         solver : ChartSolver = UIFactory._createBarChartSolver(metadata,initialValues,rectangleNames)
-        pictureDrawer : PictureDrawer = BarChartPictureDrawer()
+        pictureDrawer : PictureDrawer = VectorBarChartPictureDrawer()
         dataWriter : DataWriter = BarChartDataWriter()
-        eventHandler : EventHandler = BarChartEventHandler(metadata,solver)
+        pictureDrawer.exportCache = dataWriter.exportCache = UIFactory.exportCache
+        canvasDrawerType = UIFactory._selectCanvasDrawerType(sum(len(group) for group in initialValues), BarChartCanvasDrawer, RasterBarChartCanvasDrawer)
+        dataViewerType = UIFactory._selectDataViewerType(sum(len(group) for group in initialValues), BarChartDataViewer, VirtualizedBarChartDataViewer)
+        eventHandler : EventHandler = BarChartEventHandler(metadata,solver,canvasDrawerType,dataViewerType)
         return UICore(metadata,solver,eventHandler,pictureDrawer,dataWriter,plotWidth,plotHeight)
     
     
     @staticmethod
     def _createBarChartSolver(metadata: BarChartMetadata, 
-                              initialValues: list[list[float]], 
+                              initialValues: list[ArrayLike], 
                               rectangleNames : list[list[str]], 
                               initialSpacing : int = INITIAL_SPACING, 
                               initialInnerSpacing : int = INITIAL_INNER_SPACING)->BarChartSolver:
@@ -152,7 +218,7 @@ class UIFactory:
 
         Args:
             metadata (BarChartMetadata): Chart metadata including scale factor.
-            initialValues (list[list[float]]): Grouped numeric values.
+            initialValues (list[ArrayLike]): Grouped numeric values.
             rectangleNames (list[list[str]]): Labels per bar.
             initialSpacing (int): Spacing between groups of bars.
             initialInnerSpacing (int): Spacing between bars within a group.
@@ -160,9 +226,7 @@ class UIFactory:
         Returns:
             BarChartSolver: Solver configured with rescaled integer bar heights.
         """
-        rescaledGroupValues : list[list[float]] = []
-        for group in initialValues:
-            rescaledGroupValues.append([int(metadata.heightScaleFactor*value) for value in group])
+        rescaledGroupValues : list[list[int]] = RescaleListOfLists(initialValues, metadata.heightScaleFactor)
         
         chart : VariableBarChart = VariableBarChart(rectangleNames)
 
@@ -173,7 +237,7 @@ class UIFactory:
     def CreateHistogram(title: str,
                         xAxisLabel: str,
                         yAxisLabel: str,
-                        initialValues: list[float], 
+                        initialValues: ArrayLike, 
                         intervals: list[tuple[float,float]],
                         plotWidth: int,
                         plotHeight: int):
@@ -188,7 +252,7 @@ class UIFactory:
             title (str): Histogram title.
             xAxisLabel (str): Label for the x-axis.
             yAxisLabel (str): Label for the y-axis.
-            initialValues (list[float]): Values to be binned into intervals.
+            initialValues (ArrayLike): Values to be binned into intervals.
             intervals (list[tuple[float,float]]): List of (start, end) tuples for bins.
             plotWidth (int): Pixel width of the plot.
             plotHeight (int): Pixel height of the plot.
@@ -198,13 +262,48 @@ class UIFactory:
         """
         metadata : HistogramMetadata = CreateHistogramMetadata(title,xAxisLabel,yAxisLabel,initialValues,intervals,plotHeight)
         solver : ChartSolver = UIFactory._createHistogramSolver(metadata, initialValues, intervals)
-        pictureDrawer : PictureDrawer = HistorgramPictureDrawer()
+        pictureDrawer : PictureDrawer = VectorHistogramPictureDrawer()
         dataWriter : DataWriter = HistogramDataWriter()
-        eventHandler : EventHandler = HistogramEventHandler(metadata,solver)
+        pictureDrawer.exportCache = dataWriter.exportCache = UIFactory.exportCache
+        canvasDrawerType = UIFactory._selectCanvasDrawerType(len(intervals), HistogramCanvasDrawer, RasterHistogramCanvasDrawer)
+        dataViewerType = UIFactory._selectDataViewerType(len(intervals), HistogramDataViewer, VirtualizedHistogramDataViewer)
+        eventHandler : EventHandler = HistogramEventHandler(metadata,solver,canvasDrawerType,dataViewerType)
         return UICore(metadata,solver,eventHandler,pictureDrawer,dataWriter,plotWidth,plotHeight)
 
     @staticmethod
-    def _createHistogramSolver(plotMetadata: HistogramMetadata, initialValues: list[float], intervals: list[tuple[float,float]]) -> HistogramSolver:
+    def CreateHistogramFromSamples(title: str,
+                                   xAxisLabel: str,
+                                   yAxisLabel: str,
+                                   samples: Samples,
+                                   plotWidth: int,
+                                   plotHeight: int,
+                                   strategy: str = "fd",
+                                   bins: int = 10):
+        """
+        Create a histogram UI component of raw samples.
+
+        Intervals are chosen by a `HistogramBinning` strategy and the samples are counted in them.
+        Samples are read in chunks, so large memory-mapped arrays can be binned.
+
+        Args:
+            title (str): Histogram title.
+            xAxisLabel (str): Label for the x-axis.
+            yAxisLabel (str): Label for the y-axis.
+            samples (Samples): Array of samples or a function returning chunks of samples.
+            plotWidth (int): Pixel width of the plot.
+            plotHeight (int): Pixel height of the plot.
+            strategy (str): Binning strategy, one of HistogramBinning.STRATEGIES. Defaults to "fd".
+            bins (int): Number of intervals of the fixed and quantile strategies. Defaults to 10.
+
+        Returns:
+            UICore: Configured histogram UI component.
+        """
+        boundaries, counts = HistogramBinning(strategy, bins).Bin(samples)
+        intervals = list(zip(boundaries[:-1].tolist(), boundaries[1:].tolist()))
+        return UIFactory.CreateHistogram(title, xAxisLabel, yAxisLabel, counts, intervals, plotWidth, plotHeight)
+
+    @staticmethod
+    def _createHistogramSolver(plotMetadata: HistogramMetadata, initialValues: ArrayLike, intervals: list[tuple[float,float]]) -> HistogramSolver:
         """
         Create a `BarChartSolver` configured for histogram rendering.
 
@@ -214,7 +313,7 @@ class UIFactory:
 
         Args:
             metadata (HistogramMetadata): Metadata including width scales.
-            initialValues (list[float]): Values binned into intervals.
+            initialValues (ArrayLike): Values binned into intervals.
             intervals (list[tuple[float,float]]): Bin ranges.
 
         Returns:
@@ -236,7 +335,7 @@ class UIFactory:
                         xAxisLabel: str, 
                         yAxisLabel: str, 
                         xAxisValue : float, 
-                        initialValues: list[float], 
+                        initialValues: ArrayLike, 
                         names: list[str], 
                         plotWidth: int,
                         plotHeight: int
@@ -252,7 +351,7 @@ class UIFactory:
             xAxisLabel (str): X-axis label.
             yAxisLabel (str): Y-axis label.
             xAxisValue (float): X-axis origin value.
-            initialValues (list[float]): Y-values for data points.
+            initialValues (ArrayLike): Y-values for data points.
             names (list[str]): Labels for each data point.
             plotWidth (int): Pixel width of the plot.
             plotHeight (int): Pixel height of the plot.
@@ -262,14 +361,17 @@ class UIFactory:
         """
         metadata : LineChartMetadata = CreateLineChartMetadata(title,xAxisValue,initialValues,xAxisLabel,yAxisLabel, plotHeight)
         solver : LineChartSolver = UIFactory._createLineChartSolver(metadata, initialValues, names)
-        pictureDrawer : PictureDrawer = LineChartPictureDrawer()
+        pictureDrawer : PictureDrawer = VectorLineChartPictureDrawer()
         dataWriter : DataWriter = LineChartDataWriter()
-        eventHandler : EventHandler = LineChartEventHandler(metadata, solver)
+        pictureDrawer.exportCache = dataWriter.exportCache = UIFactory.exportCache
+        canvasDrawerType = UIFactory._selectCanvasDrawerType(len(names), LineChartCanvasDrawer, RasterLineChartCanvasDrawer)
+        dataViewerType = UIFactory._selectDataViewerType(len(names), LineChartDataViewer, VirtualizedLineChartDataViewer)
+        eventHandler : EventHandler = LineChartEventHandler(metadata, solver, canvasDrawerType, dataViewerType)
         return UICore(metadata,solver,eventHandler,pictureDrawer,dataWriter,plotWidth,plotHeight)
     
     @staticmethod
     def _createLineChartSolver(metadata : LineChartMetadata, 
-                               initialValues : list[float], 
+                               initialValues : ArrayLike, 
                                names : list[str]):
         """
         Create a `LineChartSolver` from data values and names.
@@ -279,14 +381,52 @@ class UIFactory:
 
         Args:
             metadata (LineChartMetadata): Chart metadata including scale factor.
-            initialValues (list[float]): Y-values to be rescaled.
+            initialValues (ArrayLike): Y-values to be rescaled.
             names (list[str]): Labels for each data point.
 
         Returns:
             LineChartSolver: Solver configured with rescaled data points.
         """
-        rescaledValues : list[float] = RescaleList(initialValues,metadata.heightScaleFactor,metadata.xAxisValue*metadata.heightScaleFactor)
+        rescaledValues : list[int] = RescaleList(initialValues,metadata.heightScaleFactor,metadata.xAxisValue*metadata.heightScaleFactor)
         chart : VariableLineChart = VariableLineChart(names)
         return LineChartSolver(chart,INITIAL_WIDTH,rescaledValues,INITIAL_ORIGIN_X,INITIAL_ORIGIN_Y,INITIAL_PADDING)
-        
-    
\ No newline at end of file
+
+    @staticmethod
+    def CreateFromDataset(dataset: Dataset,
+                          title: str,
+                          xAxisLabel: str,
+                          yAxisLabel: str,
+                          plotWidth: int,
+                          plotHeight: int,
+                          xAxisValue: float | None = None
+                          )->UICore:
+        """
+        Create the chart of a dataset.
+
+        Numeric columns are passed to the chart as they are, memory-mapped columns are not copied.
+
+        Args:
+            dataset (Dataset): Dataset with the columns of its chart type.
+            title (str): Chart title.
+            xAxisLabel (str): X-axis label.
+            yAxisLabel (str): Y-axis label.
+            plotWidth (int): Pixel width of the plot.
+            plotHeight (int): Pixel height of the plot.
+            xAxisValue (float | None): X-axis value of candlestick and line charts, the attribute x_axis_value
+                                       of the dataset (or 0) if None.
+
+        Returns:
+            UICore: Configured UI component for the chart of the dataset.
+        """
+        if xAxisValue is None:
+            xAxisValue = float(dataset.attributes.get("x_axis_value", 0))
+        if dataset.chart == "bar_chart":
+            names = [group.tolist() for group in dataset.Grouped("names")]
+            return UIFactory.CreateBarChart(title, xAxisLabel, yAxisLabel, dataset.Grouped("groups"), names, plotWidth, plotHeight)
+        if dataset.chart == "histogram":
+            boundaries = dataset["interval_boundries"].tolist()
+            return UIFactory.CreateHistogram(title, xAxisLabel, yAxisLabel, dataset["values"], list(zip(boundaries[:-1], boundaries[1:])), plotWidth, plotHeight)
+        if dataset.chart == "candlestick_chart":
+            return UIFactory.CreateCandlesticChart(title, xAxisLabel, yAxisLabel, xAxisValue, dataset["openings"], dataset["closings"],
+                                                   dataset["minimums"], dataset["maximums"], dataset["names"].tolist(), plotWidth, plotHeight)
+        return UIFactory.CreateLineChart(title, xAxisLabel, yAxisLabel, xAxisValue, dataset["points"], dataset["names"].tolist(), plotWidth, plotHeight)
@@ -0,0 +1,387 @@
+"""Vector (SVG and PDF) export of recorded picture layouts.
+
+Writers go through the operations of a PictureLayout and write the elements to the output file in chunks,
+so the memory used does not grow with the number of elements. Elements of one operation which share a style
+(e.g. the fill color) are written in one group with the style set only once, which keeps the files small.
+Coordinates are truncated to whole pixels in the same way as by the raster export, so both outputs match.
+"""
+from abc import ABC, abstractmethod
+from functools import lru_cache
+from typing import Any, Iterator, TextIO, BinaryIO
+from xml.sax.saxutils import escape, quoteattr
+import io
+import zlib
+import numpy as np
+from PIL import ImageColor, ImageFont
+from .picturelayout import PictureLayout
+from .raster import RGBColor
+from .fonts import GetFont, LABEL_BITMAPS
+from kiwiplots.utils import inheritdocstring
+
+FontStyle = tuple[str, bool, float, float]
+
+@lru_cache(maxsize=None)
+def GetFontStyle(fontFile: str | None = None, size: int | None = None) -> FontStyle:
+    """Describes a font used by picture drawers for vector output.
+
+    Args:
+        fontFile (str | None, optional): TrueType font file. Defaults to None (the default PIL font).
+        size (int | None, optional): Size of the TrueType font. Defaults to None.
+
+    Returns:
+        FontStyle: Font family, whether the font is bold, font size and ascent of the font in pixels.
+    """
+    font = GetFont(fontFile, size)
+    if isinstance(font, ImageFont.FreeTypeFont):
+        family, style = font.getname()
+        return family or "sans-serif", "Bold" in (style or ""), font.size, font.getmetrics()[0]
+    bbox = LABEL_BITMAPS.GetBoundingBox("Ay", fontFile, size)
+    return "sans-serif", False, bbox[3], bbox[3]
+
+def _hexColor(color: Any) -> str:
+    """Formats a color as #rrggbb, names of colors are kept.
+    """
+    if isinstance(color, str):
+        return color
+    red, green, blue = (int(component) for component in color)
+    return f"#{red:02x}{green:02x}{blue:02x}"
+
+class VectorWriter(ABC):
+    """
+    Abstract writer of picture layouts to vector formats.
+
+    Shapes are written in the recorded order. Within one recorded operation the shapes are grouped by color,
+    which does not change the picture, because data elements of one operation do not overlap.
+
+    Attributes:
+        chunkSize (int): number of elements formatted and written at once
+    """
+    CHUNK_SIZE : int = 4096
+
+    def __init__(self, chunkSize: int = CHUNK_SIZE):
+        self.chunkSize : int = chunkSize
+
+    def Write(self, layout: PictureLayout, file: str):
+        """Writes the layout to a file.
+
+        Args:
+            layout (PictureLayout): Recorded picture.
+            file (str): File path to save the picture.
+        """
+        with open(file, "wb") as stream:
+            self.WriteStream(layout, stream)
+
+    @abstractmethod
+    def WriteStream(self, layout: PictureLayout, stream: BinaryIO):
+        """Writes the layout to a binary stream. The stream does not have to be seekable.
+
+        Args:
+            layout (PictureLayout): Recorded picture.
+            stream (BinaryIO): Binary stream the picture is written to.
+        """
+        raise NotImplementedError("Method VectorWriter.WriteStream must be declared in subclass")
+
+    def _groups(self, arrays: dict[str, np.ndarray], colors: np.ndarray | None) -> Iterator[tuple[RGBColor | None, dict[str, list[int]]]]:
+        """Splits shapes of an operation to chunks of shapes with the same color.
+
+        Args:
+            arrays (dict[str, np.ndarray]): Coordinates of the shapes, truncated to whole pixels.
+            colors (np.ndarray | None): Colors of the shapes, a single color or None.
+
+        Yields:
+            tuple[RGBColor | None, dict[str, list[int]]]: Color and coordinates of a chunk of shapes.
+        """
+        count = len(next(iter(arrays.values())))
+        if count == 0:
+            return
+        if colors is None or colors.ndim == 1:
+            groups = [(None if colors is None else tuple(int(value) for value in colors), np.arange(count))]
+        else:
+            keys = (colors[:, 0].astype(np.uint32) << 16) | (colors[:, 1].astype(np.uint32) << 8) | colors[:, 2]
+            unique, inverse = np.unique(keys, return_inverse=True)
+            order = np.argsort(inverse, kind="stable")
+            bounds = np.searchsorted(inverse[order], np.arange(len(unique) + 1))
+            groups = [((int(key) >> 16, (int(key) >> 8) & 0xFF, int(key) & 0xFF), order[bounds[index]:bounds[index + 1]]) for index, key in enumerate(unique)]
+
+        for color, indices in groups:
+            for start in range(0, len(indices), self.chunkSize):
+                chunk = indices[start:start + self.chunkSize]
+                # formatting of Python numbers is much faster than formatting of NumPy scalars
+                yield color, {name: value[chunk].tolist() for name, value in arrays.items()}
+
+    @staticmethod
+    def _pixels(arrays: dict[str, np.ndarray]) -> dict[str, np.ndarray]:
+        """Truncates coordinates to whole pixels, as the raster export does.
+        """
+        return {name: np.asarray(value, dtype=np.float64).astype(np.int64) for name, value in arrays.items() if name != "colors"}
+
+    @staticmethod
+    def _rectangleBounds(arrays: dict[str, np.ndarray]) -> dict[str, np.ndarray]:
+        """Converts rectangles given by two corners to left, top, right and bottom pixels.
+        """
+        return {"left": np.minimum(arrays["x1"], arrays["x2"]), "top": np.minimum(arrays["y1"], arrays["y2"]),
+                "right": np.maximum(arrays["x1"], arrays["x2"]), "bottom": np.maximum(arrays["y1"], arrays["y2"])}
+
+class SVGWriter(VectorWriter):
+    """
+    Writes picture layouts as SVG documents.
+    """
+    @inheritdocstring(VectorWriter.WriteStream)
+    def WriteStream(self, layout: PictureLayout, stream: BinaryIO):
+        text = io.TextIOWrapper(stream, encoding="utf-8", newline="\n") # pyright: ignore[reportArgumentType]
+        try:
+            self._writeDocument(text, layout)
+            text.flush()
+        finally:
+            # the stream stays open for the caller
+            text.detach()
+
+    def _writeDocument(self, stream: TextIO, layout: PictureLayout):
+        """Writes the whole SVG document.
+        """
+        stream.write(f'<?xml version="1.0" encoding="UTF-8"?>\n'
+                     f'<svg xmlns="http://www.w3.org/2000/svg" width="{layout.width}" height="{layout.height}" viewBox="0 0 {layout.width} {layout.height}">\n'
+                     f'<rect width="100%" height="100%" fill="{_hexColor(layout.background)}"/>\n')
+        for method, arrays, arguments in layout.shapes:
+            self._writeShapes(stream, method, arrays, arguments)
+        self._writeOverlay(stream, layout.overlay)
+        stream.write("</svg>\n")
+
+    def _writeShapes(self, stream: TextIO, method: str, arrays: dict[str, np.ndarray], arguments: dict[str, Any]):
+        """Writes shapes of one recorded operation, every chunk of shapes with the same color in one group.
+        """
+        pixels = self._pixels(arrays)
+        colors = arrays.get("colors")
+        if method == "FillRectangles":
+            for color, chunk in self._groups(self._rectangleBounds(pixels), colors):
+                stream.write(f'<g fill="{_hexColor(color)}">' + "".join(
+                    f'<rect x="{left}" y="{top}" width="{right - left + 1}" height="{bottom - top + 1}"/>'
+                    for left, top, right, bottom in zip(chunk["left"], chunk["top"], chunk["right"], chunk["bottom"])) + "</g>\n")
+        elif method == "OutlineRectangles":
+            inset = arguments["width"] / 2
+            for color, chunk in self._groups(self._rectangleBounds(pixels), colors):
+                stream.write(f'<g fill="none" stroke="{_hexColor(color)}" stroke-width="{arguments["width"]}">' + "".join(
+                    f'<rect x="{left + inset}" y="{top + inset}" width="{right - left + 1 - 2 * inset}" height="{bottom - top + 1 - 2 * inset}"/>'
+                    for left, top, right, bottom in zip(chunk["left"], chunk["top"], chunk["right"], chunk["bottom"])) + "</g>\n")
+        elif method == "DrawLines":
+            for color, chunk in self._groups(pixels, colors):
+                stream.write(f'<path fill="none" stroke="{_hexColor(color)}" stroke-width="{arguments["width"]}" stroke-linecap="square" d="{self._pathData(chunk)}"/>\n')
+        elif method == "DrawDiscs":
+            fill, outline, radius = arguments["fill"], arguments["outline"], arguments["radius"]
+            style = f'fill="{_hexColor(fill)}"' + ("" if outline is None else f' stroke="{_hexColor(outline)}" stroke-width="1"')
+            for _, chunk in self._groups(pixels, None):
+                stream.write(f"<g {style}>" + "".join(
+                    f'<circle cx="{x + 0.5}" cy="{y + 0.5}" r="{radius if outline is not None else radius + 0.5}"/>'
+                    for x, y in zip(chunk["x"], chunk["y"])) + "</g>\n")
+
+    @staticmethod
+    def _pathData(chunk: dict[str, list[int]]) -> str:
+        """Path data of line segments through pixel centers. Segments continuing from the end of the previous one are joined.
+        """
+        parts = []
+        previous = None
+        for x1, y1, x2, y2 in zip(chunk["x1"], chunk["y1"], chunk["x2"], chunk["y2"]):
+            if previous != (x1, y1):
+                parts.append(f"M{x1 + 0.5} {y1 + 0.5}")
+            parts.append(f"L{x2 + 0.5} {y2 + 0.5}")
+            previous = (x2, y2)
+        return "".join(parts)
+
+    def _writeOverlay(self, stream: TextIO, overlay: list[tuple]):
+        """Writes lines and texts drawn over the shapes. Consecutive texts with the same font and color share one group.
+        """
+        group = None
+        parts : list[str] = []
+        for operation in overlay:
+            if operation[0] == "line":
+                _, (x1, y1, x2, y2), fill, width = operation
+                key = ("line", _hexColor(fill), width)
+                element = f"M{x1 + 0.5} {y1 + 0.5}L{x2 + 0.5} {y2 + 0.5}"
+            else:
+                _, (x, y), text, fill, fontFile, size = operation
+                family, bold, fontSize, ascent = GetFontStyle(fontFile, size)
+                key = ("text", _hexColor(fill), family, bold, fontSize)
+                element = f"<text x=\"{x:g}\" y=\"{y + ascent:g}\">{escape(text)}</text>"
+
+            if key != group or len(parts) >= self.chunkSize:
+                self._closeOverlayGroup(stream, group, parts)
+                group, parts = key, []
+            parts.append(element)
+        self._closeOverlayGroup(stream, group, parts)
+
+    @staticmethod
+    def _closeOverlayGroup(stream: TextIO, group: tuple | None, parts: list[str]):
+        """Writes a group of lines or texts with the same style.
+        """
+        if group is None or len(parts) == 0:
+            return
+        if group[0] == "line":
+            stream.write(f'<path fill="none" stroke="{group[1]}" stroke-width="{group[2]}" stroke-linecap="square" d="{"".join(parts)}"/>\n')
+        else:
+            _, fill, family, bold, fontSize = group
+            weight = ' font-weight="bold"' if bold else ""
+            stream.write(f'<g fill="{fill}" font-family={quoteattr(f"{family}, sans-serif")} font-size="{fontSize:g}"{weight}>' + "".join(parts) + "</g>\n")
+
+class PDFWriter(VectorWriter):
+    """
+    Writes picture layouts as single page PDF documents.
+
+    The page has the size of the picture in points. Texts use the standard Helvetica fonts, which are not embedded.
+    The content stream is compressed as it is written, its length is stored in a separate object written after it.
+
+    Attributes:
+        compressLevel (int): zlib compression level of the content stream
+    """
+    FONTS : dict[bool, tuple[str, str]] = {False: ("F1", "Helvetica"), True: ("F2", "Helvetica-Bold")}
+    COMPRESS_LEVEL : int = 6
+
+    def __init__(self, chunkSize: int = VectorWriter.CHUNK_SIZE, compressLevel: int = COMPRESS_LEVEL):
+        super().__init__(chunkSize)
+        self.compressLevel : int = compressLevel
+        self._stream : BinaryIO | None = None
+        self._position : int = 0
+        self._offsets : list[int] = []
+        self._compressor = zlib.compressobj()
+        self._length : int = 0
+
+    @inheritdocstring(VectorWriter.WriteStream)
+    def WriteStream(self, layout: PictureLayout, stream: BinaryIO):
+        self._stream = stream
+        self._position = 0
+        self._offsets = []
+        self._write(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+        self._writeObject(b"<< /Type /Catalog /Pages 2 0 R >>")
+        self._writeObject(b"<< /Type /Pages /Kids [3 0 R] /Count 1 >>")
+        fonts = " ".join(f"/{name} << /Type /Font /Subtype /Type1 /BaseFont /{font} /Encoding /WinAnsiEncoding >>" for name, font in PDFWriter.FONTS.values())
+        self._writeObject(f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 {layout.width} {layout.height}] /Contents 4 0 R /Resources << /Font << {fonts} >> >> >>".encode("ascii"))
+
+        self._beginObject()
+        self._write(b"<< /Length 5 0 R /Filter /FlateDecode >>\nstream\n")
+        self._compressor = zlib.compressobj(self.compressLevel)
+        self._length = 0
+        # image coordinates - origin in the top left corner, y axis pointing down
+        self._emit(f"1 0 0 -1 0 {layout.height} cm 2 J\n{self._color(layout.background)} rg 0 0 {layout.width} {layout.height} re f\n")
+        for method, arrays, arguments in layout.shapes:
+            self._writeShapes(method, arrays, arguments)
+        self._writeOverlay(layout.overlay)
+        tail = self._compressor.flush()
+        self._write(tail)
+        self._length += len(tail)
+        self._write(b"\nendstream\nendobj\n")
+        self._writeObject(str(self._length).encode("ascii"))
+
+        xref = self._position
+        self._write(f"xref\n0 {len(self._offsets) + 1}\n0000000000 65535 f \n".encode("ascii"))
+        self._write("".join(f"{offset:010d} 00000 n \n" for offset in self._offsets).encode("ascii"))
+        self._write(f"trailer\n<< /Size {len(self._offsets) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode("ascii"))
+        self._stream = None
+
+    def _write(self, data: bytes):
+        """Writes data to the output stream, offsets are counted here, so the stream does not have to be seekable.
+        """
+        self._stream.write(data) # pyright: ignore[reportOptionalMemberAccess]
+        self._position += len(data)
+
+    def _beginObject(self):
+        """Starts a new indirect object and remembers its offset for the cross-reference table.
+        """
+        self._offsets.append(self._position)
+        self._write(f"{len(self._offsets)} 0 obj\n".encode("ascii"))
+
+    def _writeObject(self, content: bytes):
+        """Writes an indirect object.
+        """
+        self._beginObject()
+        self._write(content + b"\nendobj\n")
+
+    def _emit(self, content: str):
+        """Appends operators to the compressed content stream.
+        """
+        data = self._compressor.compress(content.encode("cp1252", errors="replace"))
+        self._write(data)
+        self._length += len(data)
+
+    @staticmethod
+    def _color(color: Any) -> str:
+        """Formats an RGB color as PDF color components.
+        """
+        return " ".join(f"{int(component) / 255:.3g}" for component in color)
+
+    def _writeShapes(self, method: str, arrays: dict[str, np.ndarray], arguments: dict[str, Any]):
+        """Writes shapes of one recorded operation, the color is set once for every chunk of shapes with the same color.
+        """
+        pixels = self._pixels(arrays)
+        colors = arrays.get("colors")
+        if method == "FillRectangles":
+            for color, chunk in self._groups(self._rectangleBounds(pixels), colors):
+                self._emit(f"{self._color(color)} rg\n" + "".join(
+                    f"{left} {top} {right - left + 1} {bottom - top + 1} re\n"
+                    for left, top, right, bottom in zip(chunk["left"], chunk["top"], chunk["right"], chunk["bottom"])) + "f\n")
+        elif method == "OutlineRectangles":
+            inset = arguments["width"] / 2
+            for color, chunk in self._groups(self._rectangleBounds(pixels), colors):
+                self._emit(f"{self._color(color)} RG {arguments['width']} w\n" + "".join(
+                    f"{left + inset:g} {top + inset:g} {right - left + 1 - 2 * inset:g} {bottom - top + 1 - 2 * inset:g} re\n"
+                    for left, top, right, bottom in zip(chunk["left"], chunk["top"], chunk["right"], chunk["bottom"])) + "S\n")
+        elif method == "DrawLines":
+            for color, chunk in self._groups(pixels, colors):
+                parts = [f"{self._color(color)} RG {arguments['width']} w\n"]
+                previous = None
+                for x1, y1, x2, y2 in zip(chunk["x1"], chunk["y1"], chunk["x2"], chunk["y2"]):
+                    if previous != (x1, y1):
+                        parts.append(f"{x1 + 0.5} {y1 + 0.5} m ")
+                    parts.append(f"{x2 + 0.5} {y2 + 0.5} l\n")
+                    previous = (x2, y2)
+                self._emit("".join(parts) + "S\n")
+        elif method == "DrawDiscs":
+            fill, outline, radius = arguments["fill"], arguments["outline"], arguments["radius"]
+            style = f"{self._color(fill)} rg" + ("" if outline is None else f" {self._color(outline)} RG 1 w")
+            paint = "f" if outline is None else "B"
+            discRadius = radius if outline is not None else radius + 0.5
+            for _, chunk in self._groups(pixels, None):
+                self._emit(style + "\n" + "".join(self._circle(x + 0.5, y + 0.5, discRadius) + paint + "\n" for x, y in zip(chunk["x"], chunk["y"])))
+
+    @staticmethod
+    def _circle(x: float, y: float, radius: float) -> str:
+        """Path of a circle approximated by four Bezier curves.
+        """
+        k = radius * 0.5523
+        return (f"{x + radius:g} {y:g} m "
+                f"{x + radius:g} {y + k:g} {x + k:g} {y + radius:g} {x:g} {y + radius:g} c "
+                f"{x - k:g} {y + radius:g} {x - radius:g} {y + k:g} {x - radius:g} {y:g} c "
+                f"{x - radius:g} {y - k:g} {x - k:g} {y - radius:g} {x:g} {y - radius:g} c "
+                f"{x + k:g} {y - radius:g} {x + radius:g} {y - k:g} {x + radius:g} {y:g} c ")
+
+    def _writeOverlay(self, overlay: list[tuple]):
+        """Writes lines and texts drawn over the shapes. Colors and fonts are only set when they change.
+        """
+        state : dict[str, Any] = {}
+        parts : list[str] = []
+        for operation in overlay:
+            if operation[0] == "line":
+                _, (x1, y1, x2, y2), fill, width = operation
+                if state.get("stroke") != (fill, width):
+                    state["stroke"] = (fill, width)
+                    parts.append(f"{self._color(self._rgb(fill))} RG {width} w\n")
+                parts.append(f"{x1 + 0.5} {y1 + 0.5} m {x2 + 0.5} {y2 + 0.5} l S\n")
+            else:
+                _, (x, y), text, fill, fontFile, size = operation
+                _, bold, fontSize, ascent = GetFontStyle(fontFile, size)
+                if state.get("fill") != fill:
+                    state["fill"] = fill
+                    parts.append(f"{self._color(self._rgb(fill))} rg\n")
+                escaped = text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+                # text matrix flips the y axis back, so that the text is not mirrored
+                parts.append(f"BT /{PDFWriter.FONTS[bold][0]} {fontSize:g} Tf 1 0 0 -1 {x:g} {y + ascent:g} Tm ({escaped}) Tj ET\n")
+            if len(parts) >= self.chunkSize:
+                self._emit("".join(parts))
+                parts = []
+        self._emit("".join(parts))
+
+    @staticmethod
+    def _rgb(color: Any) -> RGBColor:
+        """Converts a color of the overlay (a name or RGB tuple) to an RGB tuple.
+        """
+        if isinstance(color, str):
+            return ImageColor.getrgb(color)[:3] # pyright: ignore[reportReturnType]
+        return color
@@ -0,0 +1,155 @@
+"""Projection of the solved layout of a chart to the pixels of a resizable canvas.
+
+The solver lays the chart out in layout space - pixels of the canvas at the size the chart was created with.
+When the canvas is resized, the solved layout is only projected to the new size, the constraint system is not solved again.
+Events on the canvas are mapped back to the layout space, so event handlers keep working with layout coordinates.
+"""
+import tkinter as tk
+import numpy as np
+from .raster import RasterBuffer, RGBColor
+
+class ViewTransform:
+    """
+    Scaling of the layout space to the view (the resized canvas). The origin of both spaces is the top left corner of the canvas.
+
+    Attributes:
+        layoutWidth (int): width of the layout space
+        layoutHeight (int): height of the layout space
+        viewWidth (int): width of the canvas in pixels
+        viewHeight (int): height of the canvas in pixels
+    """
+    def __init__(self, layoutWidth: int, layoutHeight: int):
+        self.layoutWidth : int = layoutWidth
+        self.layoutHeight : int = layoutHeight
+        self.viewWidth : int = layoutWidth
+        self.viewHeight : int = layoutHeight
+
+    @property
+    def scaleX(self) -> float:
+        """Horizontal scale from layout space to the view."""
+        return self.viewWidth / self.layoutWidth
+
+    @property
+    def scaleY(self) -> float:
+        """Vertical scale from layout space to the view."""
+        return self.viewHeight / self.layoutHeight
+
+    def IsIdentity(self) -> bool:
+        """Whether the view has the size of the layout space.
+        """
+        return self.viewWidth == self.layoutWidth and self.viewHeight == self.layoutHeight
+
+    def Resize(self, viewWidth: int, viewHeight: int) -> bool:
+        """Sets the size of the view.
+
+        Args:
+            viewWidth (int): Width of the canvas in pixels.
+            viewHeight (int): Height of the canvas in pixels.
+
+        Returns:
+            bool: True if the size changed.
+        """
+        viewWidth, viewHeight = max(viewWidth, 1), max(viewHeight, 1)
+        if (viewWidth, viewHeight) == (self.viewWidth, self.viewHeight):
+            return False
+        self.viewWidth, self.viewHeight = viewWidth, viewHeight
+        return True
+
+    def ToView(self, x, y):
+        """Projects layout coordinates (numbers or arrays) to the view.
+        """
+        return x * self.scaleX, y * self.scaleY
+
+    def ToLayout(self, x, y):
+        """Maps view coordinates (numbers or arrays) back to the layout space.
+        """
+        return x / self.scaleX, y / self.scaleY
+
+    def MapEvent(self, event: tk.Event) -> tk.Event:
+        """Maps the position of a canvas event to the layout space. The event is modified in place.
+
+        Args:
+            event (tk.Event): Event with coordinates in the view.
+
+        Returns:
+            tk.Event: The same event with coordinates in the layout space. Root coordinates (x_root, y_root) are kept.
+        """
+        if not self.IsIdentity():
+            event.x, event.y = self.ToLayout(event.x, event.y)
+        return event
+
+    def ProjectCanvas(self, canvas: tk.Canvas):
+        """Projects all items drawn on the canvas in layout coordinates to the view. Sizes of fonts and widths of lines are kept.
+
+        Args:
+            canvas (tk.Canvas): Canvas with items in layout coordinates.
+        """
+        if not self.IsIdentity():
+            canvas.scale("all", 0, 0, self.scaleX, self.scaleY)
+
+class ProjectedRaster:
+    """
+    Raster buffer of the size of the view. Shapes are given in layout coordinates and projected by the view transform,
+    so they are rasterized in the resolution of the view instead of being stretched. It provides the drawing methods of RasterBuffer.
+    Sizes of discs and widths of lines are given in pixels of the view.
+
+    Attributes:
+        transform (ViewTransform): projection of the layout space to the view
+        buffer (RasterBuffer): pixel buffer of the view
+    """
+    def __init__(self, transform: ViewTransform, background: RGBColor = (255, 255, 255)):
+        self.transform : ViewTransform = transform
+        self.buffer : RasterBuffer = RasterBuffer(transform.viewWidth, transform.viewHeight, background)
+
+    @property
+    def width(self) -> int:
+        """Width of the buffer in pixels."""
+        return self.buffer.width
+
+    @property
+    def height(self) -> int:
+        """Height of the buffer in pixels."""
+        return self.buffer.height
+
+    def Clear(self):
+        """Clears the buffer, which is reallocated first if the size of the view changed. See RasterBuffer.Clear.
+        """
+        if (self.buffer.width, self.buffer.height) != (self.transform.viewWidth, self.transform.viewHeight):
+            self.buffer = RasterBuffer(self.transform.viewWidth, self.transform.viewHeight, self.buffer.background)
+        else:
+            self.buffer.Clear()
+
+    def FillRectangles(self, x1: np.ndarray, y1: np.ndarray, x2: np.ndarray, y2: np.ndarray, colors: np.ndarray):
+        """Projects and fills rectangles, see RasterBuffer.FillRectangles.
+        """
+        self.buffer.FillRectangles(*self._project(x1, y1), *self._project(x2, y2), colors)
+
+    def OutlineRectangles(self, x1: np.ndarray, y1: np.ndarray, x2: np.ndarray, y2: np.ndarray, colors: np.ndarray, width: int = 1):
+        """Projects and outlines rectangles, see RasterBuffer.OutlineRectangles.
+        """
+        self.buffer.OutlineRectangles(*self._project(x1, y1), *self._project(x2, y2), colors, width)
+
+    def DrawLines(self, x1: np.ndarray, y1: np.ndarray, x2: np.ndarray, y2: np.ndarray, colors: np.ndarray, width: int = 1):
+        """Projects and draws line segments, see RasterBuffer.DrawLines.
+        """
+        self.buffer.DrawLines(*self._project(x1, y1), *self._project(x2, y2), colors, width)
+
+    def DrawPolyline(self, x: np.ndarray, y: np.ndarray, color: RGBColor, width: int = 1):
+        """Projects and draws a polyline, see RasterBuffer.DrawPolyline.
+        """
+        self.buffer.DrawPolyline(*self._project(x, y), color, width)
+
+    def DrawDiscs(self, x: np.ndarray, y: np.ndarray, radius: int, fill: RGBColor, outline: RGBColor | None = None):
+        """Projects centers of discs and draws them, see RasterBuffer.DrawDiscs.
+        """
+        self.buffer.DrawDiscs(*self._project(x, y), radius, fill, outline)
+
+    def ToPPM(self) -> bytes:
+        """Encodes the buffer, see RasterBuffer.ToPPM.
+        """
+        return self.buffer.ToPPM()
+
+    def _project(self, x: np.ndarray, y: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """Projects coordinates to the view.
+        """
+        return self.transform.ToView(np.asarray(x, dtype=np.float64), np.asarray(y, dtype=np.float64))
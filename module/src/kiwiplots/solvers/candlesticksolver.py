@@ -147,6 +147,33 @@ class CandlestickChartSolver(ChartSolver):
         self.switchConstraintLock(self.variableChart.spacing, spacingConstrLock)  # pyright: ignore[reportArgumentType]
         self.switchConstraintLock(self.variableChart.width, widthConstrLock) # pyright: ignore[reportArgumentType]
     
+    def SetCandleValues(self, candleIndex: int, opening: float, closing: float, minimum: float, maximum: float):
+        """Changes all prices of a candle at once, the chart is solved once.
+
+        Args:
+            candleIndex (int): Index of the candle to modify
+            opening (float): New opening price
+            closing (float): New closing price
+            minimum (float): New minimum price (wick bottom)
+            maximum (float): New maximum price (wick top)
+        """
+        if candleIndex in self.lockedCandles:
+            return
+        candle = self.variableChart.candles[candleIndex]
+        self.solver.suggestValue(candle.height, closing-opening)
+        self.solver.suggestValue(candle.openingCorner.Y, opening)
+        self.solver.suggestValue(candle.wickBottom.Y, minimum)
+        self.solver.suggestValue(candle.wickTop.Y, maximum)
+        originConstrLock = self.switchConstraintLock(self.variableChart.origin.X)
+        spacingConstrLock = self.switchConstraintLock(self.variableChart.spacing)
+        widthConstrLock = self.switchConstraintLock(self.variableChart.width)
+
+        self.Solve()
+
+        self.switchConstraintLock(self.variableChart.origin.X, originConstrLock)
+        self.switchConstraintLock(self.variableChart.spacing, spacingConstrLock)
+        self.switchConstraintLock(self.variableChart.width, widthConstrLock)
+
     def SwitchNameVisibility(self, index : int):
         """Toggles the visibility of a candle's name.
 
@@ -284,21 +311,34 @@ class CandlestickChartSolver(ChartSolver):
             minimum (float): Minimum price for the candle's wick
             maximum (float): Maximum price for the candle's wick
         """
+        self.AddCandles([name], [opening], [closing], [minimum], [maximum])
+
+    def AddCandles(self, names: list[str], openings: list[float], closings: list[float], minimums: list[float], maximums: list[float]):
+        """Appends new candles to the chart. The chart is solved once after all candles are added.
+
+        Args:
+            names (list[str]): Names of the new candles
+            openings (list[float]): Opening prices of the candles
+            closings (list[float]): Closing prices of the candles
+            minimums (list[float]): Minimum prices for the candles' wicks
+            maximums (list[float]): Maximum prices for the candles' wicks
+        """
         spacingLock = self.switchConstraintLock(self.variableChart.spacing)
         widthLock = self.switchConstraintLock(self.variableChart.width)
 
-        newCandle, newConstraints = self.variableChart.AddCandle(name, opening-closing >=0)
-        for constr in newConstraints:
-            self.solver.addConstraint(constr)
-        self.solver.addEditVariable(newCandle.height,"strong")
-        self.solver.addEditVariable(newCandle.openingCorner.Y,"strong")
-        self.solver.addEditVariable(newCandle.wickBottom.Y,"strong")
-        self.solver.addEditVariable(newCandle.wickTop.Y,"strong")
-
-        self.solver.suggestValue(newCandle.height, closing-opening)
-        self.solver.suggestValue(newCandle.openingCorner.Y, opening)
-        self.solver.suggestValue(newCandle.wickBottom.Y,minimum)
-        self.solver.suggestValue(newCandle.wickTop.Y,maximum)
+        for name, opening, closing, minimum, maximum in zip(names, openings, closings, minimums, maximums):
+            newCandle, newConstraints = self.variableChart.AddCandle(name, opening-closing >=0)
+            for constr in newConstraints:
+                self.solver.addConstraint(constr)
+            self.solver.addEditVariable(newCandle.height,"strong")
+            self.solver.addEditVariable(newCandle.openingCorner.Y,"strong")
+            self.solver.addEditVariable(newCandle.wickBottom.Y,"strong")
+            self.solver.addEditVariable(newCandle.wickTop.Y,"strong")
+
+            self.solver.suggestValue(newCandle.height, closing-opening)
+            self.solver.suggestValue(newCandle.openingCorner.Y, opening)
+            self.solver.suggestValue(newCandle.wickBottom.Y,minimum)
+            self.solver.suggestValue(newCandle.wickTop.Y,maximum)
 
         self.Solve()
         self.switchConstraintLock(self.variableChart.spacing,spacingLock)
@@ -12,12 +12,14 @@ class ChartSolver(ABC):
         solve (Solver) : constraint solver instance
         variableChart (VariableChart) : VaraibleChart which is solved by the solver
         data (Any) : data cache. Type depends on the chart type
+        layoutVersion (int) : counter incremented whenever the cached data is updated. Renderers use it to invalidate their caches
 
     """
     def __init__(self, chart : VariableChart):
         self.solver : Solver = Solver()
         self.variableChart : VariableChart = chart
         self.data = None
+        self.layoutVersion : int = 0
         self._setConstraints()
         self._addEditVariables()
         self._initialSuggest()
@@ -88,6 +90,7 @@ class ChartSolver(ABC):
         Updates cached data.
         """
         self.data = self.variableChart.Value()
+        self.layoutVersion += 1
     
     def GetOrigin(self):
         """Origin value getter
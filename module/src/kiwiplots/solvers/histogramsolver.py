@@ -106,7 +106,16 @@ class HistogramSolver(RectangleSolver):
         """
         shortestInterval = self.variableChart.GetShortestInterval()
         shoretestLength = shortestInterval[1] - shortestInterval[0]
-        widthScale = (end-start)/shoretestLength
+        self._appendBucket(start, end, (end-start)/shoretestLength, recHeight)
+        widthLock = self.switchConstraintLock(self.variableChart.width)
+        spacingLock = self.switchConstraintLock(self.variableChart.spacing)
+        self.Solve()
+        self.switchConstraintLock(self.variableChart.width, widthLock)
+        self.switchConstraintLock(self.variableChart.spacing, spacingLock)
+
+    def _appendBucket(self, start: float, end: float, widthScale: float, recHeight: float):
+        """Appends a new bucket to the chart and the solver without solving.
+        """
         height, constraintsToAdd, constraintsToRemove = self.variableChart.AddBucket(widthScale,start,end)
         for constr in constraintsToRemove:
             if self.solver.hasConstraint(constr): # pyright: ignore[reportArgumentType]
@@ -116,10 +125,54 @@ class HistogramSolver(RectangleSolver):
         
         self.solver.addEditVariable(height,"strong")
         self.solver.suggestValue(height, recHeight)
-        widthLock = self.switchConstraintLock(self.variableChart.width)
-        spacingLock = self.switchConstraintLock(self.variableChart.spacing)
+
+    def SetBuckets(self, intervals: list[tuple[float,float]], widthScales: list[float], heights: list[float], lockedScale: float = 1):
+        """Changes intervals and heights of all buckets, the chart is solved once.
+
+        The buckets are updated in place (see VariableHistogram.SetIntervals): intervals appended or prepended to the current
+        intervals add buckets, coarser intervals merge the buckets they contain, other buckets keep their variables and constraints.
+        A bucket is locked if a bucket merged into it was locked, its height is then the sum of the current heights of the merged
+        buckets multiplied by lockedScale instead of the given height. The axis is raised above the highest bucket.
+
+        Args:
+            intervals (list[tuple[float,float]]): Sorted start/end pairs of all buckets
+            widthScales (list[float]): Relative width scale of each bucket
+            heights (list[float]): Heights of all buckets
+            lockedScale (float, optional): Factor converting current heights of locked buckets to the scale of heights. Defaults to 1.
+        """
+        group = self.variableChart.groups[0]
+        currentHeights = [bucket.height.value() for bucket in group.rectangles]
+        sources, added, removed, constraintsToAdd, constraintsToRemove = self.variableChart.SetIntervals(intervals, widthScales)
+        for bucket in removed:
+            if self.solver.hasEditVariable(bucket.height):
+                self.solver.removeEditVariable(bucket.height)
+        for constr in constraintsToRemove:
+            if self.solver.hasConstraint(constr): # pyright: ignore[reportArgumentType]
+                self.solver.removeConstraint(constr) # pyright: ignore[reportArgumentType]
+        for constr in constraintsToAdd:
+            self.solver.addConstraint(constr)
+        for bucket in added:
+            self.solver.addEditVariable(bucket.height, "strong")
+
+        heights = list(heights)
+        lockedRectangles : set[tuple[int,int]] = set()
+        for index, indices in enumerate(sources):
+            if any((0, source) in self.lockedRectangles for source in indices):
+                lockedRectangles.add((0, index))
+                heights[index] = sum(currentHeights[source] for source in indices) * lockedScale
+            self.solver.suggestValue(group.rectangles[index].height, heights[index])
+        self.lockedRectangles = lockedRectangles
+        if len(heights) and max(heights)+10 > self.GetAxisHeight():
+            self.solver.suggestValue(self.variableChart.yAxisHeight, max(heights)+10)
+
+        originConstrLock = self.switchConstraintLock(self.variableChart.origin.X)
+        innerSpacingConstrLock = self.switchConstraintLock(self.variableChart.innerSpacing)
+        spacingConstrLock = self.switchConstraintLock(self.variableChart.spacing)
+        widthConstrLock = self.switchConstraintLock(self.variableChart.width)
+
         self.Solve()
-        self.switchConstraintLock(self.variableChart.width, widthLock)
-        self.switchConstraintLock(self.variableChart.spacing, spacingLock)
 
-   
\ No newline at end of file
+        self.switchConstraintLock(self.variableChart.origin.X, originConstrLock)
+        self.switchConstraintLock(self.variableChart.innerSpacing, innerSpacingConstrLock)
+        self.switchConstraintLock(self.variableChart.spacing, spacingConstrLock)
+        self.switchConstraintLock(self.variableChart.width, widthConstrLock)
@@ -150,6 +150,7 @@ class LineChartSolver(ChartSolver):
             name (str): New name for the point
         """
         self.variableChart.ChangeName(pointIndex, name)
+        self.Update()
 
     def ChangeWidthX(self, pointIndex: int, newX: float):
         """Change global width of lines by stretching right side of a given line (in other words: set width of lines from cursor position).
@@ -203,19 +204,33 @@ class LineChartSolver(ChartSolver):
             value (float): Y value (height) of the new point
             name (str): Name of the new point
         """
-        lastLine = self.variableChart.lines[-1]
-        if lastLine.ignoreRight:
-            lastLine.SwitchIgnoreRight()
-            pointIndex = len(self.GetPoints())-1
-            self.ChangeName(pointIndex,name)
-            self.ChangeHeight(pointIndex,value)
-        else:
-            lastPointValue = lastLine.rightHeight.value()
-            newLine, newConstraints = self.variableChart.AddPoint(name)
-            self.solver.addEditVariable(newLine.leftHeight, "strong")
-            self.solver.addEditVariable(newLine.rightHeight, "medium")
-            for constr in newConstraints:
-                self.solver.addConstraint(constr)
-            self.solver.suggestValue(newLine.leftHeight,lastPointValue)
-            self.solver.suggestValue(newLine.rightHeight,value)
-            self.Solve()
+        self.AddPoints([value], [name])
+
+    def AddPoints(self, values: list[float], names: list[str]):
+        """Appends new data points to the chart. The chart is solved once after all points are added.
+
+        Args:
+            values (list[float]): Y values (heights) of the new points
+            names (list[str]): Names of the new points
+        """
+        previousValue : float | None = None
+        for value, name in zip(values, names):
+            lastLine = self.variableChart.lines[-1]
+            if lastLine.ignoreRight:
+                lastLine.SwitchIgnoreRight()
+                pointIndex = len(self.variableChart.lines)
+                self.ChangeName(pointIndex,name)
+                if pointIndex not in self.lockedPoints:
+                    self.solver.suggestValue(lastLine.rightHeight, value)
+            else:
+                # points added in this batch are not solved yet, the last one continues from its suggested value
+                lastPointValue = lastLine.rightHeight.value() if previousValue is None else previousValue
+                newLine, newConstraints = self.variableChart.AddPoint(name)
+                self.solver.addEditVariable(newLine.leftHeight, "strong")
+                self.solver.addEditVariable(newLine.rightHeight, "medium")
+                for constr in newConstraints:
+                    self.solver.addConstraint(constr)
+                self.solver.suggestValue(newLine.leftHeight,lastPointValue)
+                self.solver.suggestValue(newLine.rightHeight,value)
+            previousValue = value
+        self.Solve()
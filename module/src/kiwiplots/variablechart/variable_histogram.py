@@ -9,7 +9,7 @@ class VariableHistogram(VariableRectangleGroupChart):
     """VariableChart implementation for histograms.
 
     Manages a single group of buckets whose widths are proportional to their
-    interval lengths. Provides methods for appending new intervals at runtime.
+    interval lengths. Provides methods for appending new intervals and changing all intervals at runtime.
 
     Attributes:
         shortestInterval (tuple[float, float]): The interval with the smallest width, used for scaling.
@@ -109,8 +109,28 @@ class VariableHistogram(VariableRectangleGroupChart):
         self.shortestInterval = self.shortestInterval if abs(intervalEnd - intervalStart) >= abs(self.shortestInterval[1]-self.shortestInterval[0]) else (intervalStart,intervalEnd)
         newBucket = self.groups[0].AddBucket((intervalStart,intervalEnd),widthScale)
         constraintsToAdd.extend(newBucket.GetAllConstraints())
-        constraintsToAdd.append((self.groups[0].rectangles[0].leftBottom.Y == newBucket.leftBottom.Y)|"required")
+        constraintsToAdd.append(self.groups[0].alignmentConstraints[newBucket])
         return newBucket.height, constraintsToAdd, constraintsToRemove
+
+    def SetIntervals(self, intervals: list[tuple[float,float]], widthScales: list[float]):
+        """Changes intervals of all buckets, keeping the variables of the buckets whose intervals remain (see VariableBucketGroup.SetIntervals).
+
+        Args:
+            intervals (list[tuple[float, float]]): Sorted start/end pairs of all buckets.
+            widthScales (list[float]): Relative width scale for each bucket.
+
+        Returns:
+            tuple: Indices of current buckets mapped to each new bucket, added buckets, removed buckets,
+                   list of constraints to add, and list of constraints to remove.
+        """
+        firstBucket = self.groups[0].rectangles[0]
+        sources, added, removed, constraintsToAdd, constraintsToRemove = self.groups[0].SetIntervals(intervals, widthScales)
+        if self.groups[0].rectangles[0] is not firstBucket:
+            constraintsToRemove.append(self.leftRectangleXCoordinateConstraint)
+            self.leftRectangleXCoordinateConstraint = (self.groups[0].leftMostX == self.origin.X + self.spacing) | "required"
+            constraintsToAdd.append(self.leftRectangleXCoordinateConstraint)
+        self.shortestInterval = min(intervals, key= lambda i: abs(i[1]-i[0]))
+        return sources, added, removed, constraintsToAdd, constraintsToRemove
     
     def GetName(self, groupIndex: int, rectangleIndex: int) -> str:
         """Returns the display name of the specified bucket.
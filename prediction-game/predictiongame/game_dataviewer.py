@@ -1,4 +1,7 @@
 from tkinter import Text
+from typing import Callable
+from kiwiplots.utils import inheritdocstring
+from kiwiplots.plotui.dataviewers import HeaderSegment
 from kiwiplots import *
 from kiwiplots import ChartSolver, PlotMetadata
 
@@ -51,31 +54,23 @@ class GameBarChartDataViewer(GameDataViewer):
         """Initializes the bar chart game data viewer."""
         super().__init__(textWindow)
     
-    def Write(self, plotMetadata: PlotMetadata, solver: BarChartSolver, changedIndex: int, valueChanged : bool) -> None:
-        """Displays the current bar values, highlighting the bar being edited.
+    def _prepareRows(self, plotMetadata: PlotMetadata, solver: BarChartSolver) -> tuple[int, Callable[[int], str]]: # pyright: ignore[reportIncompatibleMethodOverride]
+        """Prepares one line per bar with its name and current value.
 
         Args:
             plotMetadata (PlotMetadata): Metadata for value scaling.
             solver (BarChartSolver): Solver containing the current bar data.
-            changedIndex (int): Index of the bar currently being edited.
-            valueChanged (bool): Whether a bar value is actively being changed.
         """
-        self.dataWindow.config(state="normal")
-        self.dataWindow.delete("1.0", "end")
-
-        
         rectangles = solver.GetBarDataAsList()
-        for i in range(len(rectangles)-1, -1, -1):
+
+        def formatRow(i: int) -> str:
             rec = rectangles[i]
-            trueValue = rec.GetHeight()/plotMetadata.heightScaleFactor
-            valueString = FormatFloat(trueValue)
+            return f"{rec.name} = {FormatFloat(rec.GetHeight()/plotMetadata.heightScaleFactor)}\n"
+        return len(rectangles), formatRow
 
-            if valueChanged and i == changedIndex:
-                self.dataWindow.insert("1.0",f"{rec.name} = {valueString}\n", "changing_Value")
-            else:
-                self.dataWindow.insert("1.0",f"{rec.name} = {valueString}\n")
-        self.dataWindow.insert("1.0","rectangle name = your guess\n\n","header")
-        self.dataWindow.config(state="disabled")
+    @inheritdocstring(DataViewer._getHeader)
+    def _getHeader(self) -> list[HeaderSegment]:
+        return [("rectangle name = your guess\n\n", "header")]
 
     def WriteSolution(self, userSolver: BarChartSolver, solutionSolver: BarChartSolver, plotMetadata: PlotMetadata):
         """Displays each bar's guessed value next to the solution value.
@@ -85,6 +80,7 @@ class GameBarChartDataViewer(GameDataViewer):
             solutionSolver (BarChartSolver): Solver containing the solution bar data.
             plotMetadata (PlotMetadata): Metadata for value scaling.
         """
+        self._invalidateRows()
         self.dataWindow.config(state="normal")
         self.dataWindow.delete("1.0", "end")
 
@@ -141,34 +137,24 @@ class GameLineChartDataViewer(GameDataViewer):
         return result
 
     
-    def Write(self, plotMetadata: LineChartMetadata, solver: LineChartSolver, changedIndex: int, valueChanged : bool) -> None:
-        """Displays the current point values, highlighting the point being edited.
+    def _prepareRows(self, plotMetadata: LineChartMetadata, solver: LineChartSolver) -> tuple[int, Callable[[int], str]]: # pyright: ignore[reportIncompatibleMethodOverride]
+        """Prepares one line per point with its name and current value.
 
         Args:
             plotMetadata (LineChartMetadata): Metadata for value scaling.
             solver (LineChartSolver): Solver containing the current line data.
-            changedIndex (int): Index of the point currently being edited.
-            valueChanged (bool): Whether a point value is actively being changed.
         """
-        self.dataWindow.config(state="normal")
-        self.dataWindow.delete("1.0", "end")
-
-        
         lines = solver.GetLineData()
         points = GameLineChartDataViewer._getPoints(lines)
         names = GameLineChartDataViewer._getPointNames(lines)
-        
-        for i in range(len(points)-1, -1, -1):
-            value = points[i]
-            trueValue = value/plotMetadata.heightScaleFactor
-            valueString = FormatFloat(trueValue)
 
-            if valueChanged and i == changedIndex:
-                self.dataWindow.insert("1.0",f"{names[i]} = {valueString}\n", "changing_Value")
-            else:
-                self.dataWindow.insert("1.0",f"{names[i]} = {valueString}\n")
-        self.dataWindow.insert("1.0","point name = your guess\n\n","header")
-        self.dataWindow.config(state="disabled")
+        def formatRow(i: int) -> str:
+            return f"{names[i]} = {FormatFloat(points[i]/plotMetadata.heightScaleFactor)}\n"
+        return len(points), formatRow
+
+    @inheritdocstring(DataViewer._getHeader)
+    def _getHeader(self) -> list[HeaderSegment]:
+        return [("point name = your guess\n\n", "header")]
     
     def WriteSolution(self, userSolver: LineChartSolver, solutionSolver: LineChartSolver, plotMetadata: LineChartMetadata):
         """Displays each point's guessed value next to the solution value.
@@ -178,6 +164,7 @@ class GameLineChartDataViewer(GameDataViewer):
             solutionSolver (LineChartSolver): Solver containing the solution line data.
             plotMetadata (LineChartMetadata): Metadata for value scaling.
         """
+        self._invalidateRows()
         self.dataWindow.config(state="normal")
         self.dataWindow.delete("1.0", "end")
 
@@ -218,39 +205,29 @@ class GameCandlestickChartDataViewer(GameDataViewer):
         """Initializes the candlestick chart game data viewer."""
         super().__init__(textWindow)
     
-    def Write(self, plotMetadata: CandlesticPlotMetadata, solver: CandlestickChartSolver, changedIndex: int, valueChanged : bool) -> None:
-        """Displays the current candle values, highlighting the candle being edited.
+    def _prepareRows(self, plotMetadata: CandlesticPlotMetadata, solver: CandlestickChartSolver) -> tuple[int, Callable[[int], str]]: # pyright: ignore[reportIncompatibleMethodOverride]
+        """Prepares one line per candle with its opening, closing, minimum and maximum value.
 
         Args:
             plotMetadata (CandlesticPlotMetadata): Metadata for value scaling.
             solver (CandlestickChartSolver): Solver containing the current candle data.
-            changedIndex (int): Index of the candle currently being edited.
-            valueChanged (bool): Whether a candle value is actively being changed.
         """
         xAxisValue = plotMetadata.xAxisValue
         scaleFactor = plotMetadata.heightScaleFactor
-        self.dataWindow.config(state="normal")
-        self.dataWindow.delete("1.0", "end")
-
-        self.dataWindow.tag_configure("changing_Value", foreground="red")
-        eventType = CandlesticEventHandler.CandleEventRegistersLeftButton.CandleLeftEvents
-        
         candles = solver.GetCandleData()
 
-        for i in range(len(candles)-1, -1, -1):
+        def formatRow(i: int) -> str:
             candle = candles[i]
             openingValue = FormatFloat(candle.openingCorner.Y/scaleFactor + xAxisValue)
             closingValue = FormatFloat(candle.closingCorner.Y/scaleFactor + xAxisValue)
             maximumValue = FormatFloat(candle.wickTop.Y/scaleFactor + xAxisValue)
             minimumValue = FormatFloat(candle.wickBottom.Y/scaleFactor + xAxisValue/scaleFactor)
-            
-            string = f"{candle.name}:\t{openingValue}, {closingValue}, {minimumValue}, {maximumValue}\n"
-            if valueChanged and i == changedIndex:
-                self.dataWindow.insert("1.0",f"{string}", "changing_Value")
-            else:
-                self.dataWindow.insert("1.0",f"{string}")
-        self.dataWindow.insert("1.0","candle:\t opening, closing, min, max\n\n","header")
-        self.dataWindow.config(state="disabled")
+            return f"{candle.name}:\t{openingValue}, {closingValue}, {minimumValue}, {maximumValue}\n"
+        return len(candles), formatRow
+
+    @inheritdocstring(DataViewer._getHeader)
+    def _getHeader(self) -> list[HeaderSegment]:
+        return [("candle:\t opening, closing, min, max\n\n", "header")]
 
     def WriteSolution(self, userSolver: CandlestickChartSolver, solutionSolver: CandlestickChartSolver, plotMetadata: CandlesticPlotMetadata):
         """Displays each candle's guessed values next to the solution values.
@@ -262,6 +239,7 @@ class GameCandlestickChartDataViewer(GameDataViewer):
         """
         xAxisValue = plotMetadata.xAxisValue
         scaleFactor = plotMetadata.heightScaleFactor
+        self._invalidateRows()
         self.dataWindow.config(state="normal")
         self.dataWindow.delete("1.0", "end")
 
@@ -306,23 +284,16 @@ class GameHistogramDataViewer(GameDataViewer):
     edited. After the game ends, shows each bucket's value alongside the solution.
     """
 
-    def Write(self, plotMetadata: HistogramMetadata, solver: HistogramSolver, changedIndex: int, valueChanged : bool) -> None:
-        """Displays the current bucket values, highlighting the bucket being edited.
+    def _prepareRows(self, plotMetadata: HistogramMetadata, solver: HistogramSolver) -> tuple[int, Callable[[int], str]]: # pyright: ignore[reportIncompatibleMethodOverride]
+        """Prepares one line per bucket with its interval and current value.
 
         Args:
             plotMetadata (HistogramMetadata): Metadata for value scaling.
             solver (HistogramSolver): Solver containing the current histogram data.
-            changedIndex (int): Index of the bucket currently being edited.
-            valueChanged (bool): Whether a bucket value is actively being changed.
         """
-        self.dataWindow.config(state="normal")
-        self.dataWindow.delete("1.0", "end")
-
-        self.dataWindow.tag_configure("changing_Value", foreground="red")
-        
         rectangles : list[ValueBucket] = solver.GetRectangleDataAsList() # pyright: ignore[reportAssignmentType]
 
-        for i in range(len(rectangles)-1, -1, -1):
+        def formatRow(i: int) -> str:
             rec = rectangles[i]
             trueValue = rec.GetHeight()/plotMetadata.heightScaleFactor
             valueString = ""
@@ -330,14 +301,12 @@ class GameHistogramDataViewer(GameDataViewer):
                 valueString = f"{trueValue:.4g}"
             else:
                 valueString = str(trueValue)
+            return f"({rec.interval[0]}, {rec.interval[1]}) = {valueString}\n"
+        return len(rectangles), formatRow
 
-
-            if valueChanged and i == changedIndex:
-                self.dataWindow.insert("1.0",f"({rec.interval[0]}, {rec.interval[1]}) = {valueString}\n", "changing_Value")
-            else:
-                self.dataWindow.insert("1.0",f"({rec.interval[0]}, {rec.interval[1]}) = {valueString}\n")
-        self.dataWindow.insert("1.0","(interval start, interval end) = value\n","header")
-        self.dataWindow.config(state="disabled")
+    @inheritdocstring(DataViewer._getHeader)
+    def _getHeader(self) -> list[HeaderSegment]:
+        return [("(interval start, interval end) = value\n", "header")]
     
     def WriteSolution(self, userSolver: HistogramSolver, solutionSolver: HistogramSolver, plotMetadata: HistogramMetadata):
         """Displays each bucket's guessed value next to the solution value.
@@ -347,6 +316,7 @@ class GameHistogramDataViewer(GameDataViewer):
             solutionSolver (HistogramSolver): Solver containing the solution histogram data.
             plotMetadata (HistogramMetadata): Metadata for value scaling.
         """
+        self._invalidateRows()
         self.dataWindow.config(state="normal")
         self.dataWindow.delete("1.0", "end")
 
@@ -11,6 +11,7 @@ from .gamemodes import GameModes
 from .gameevaluator import GameEvaluator
 from dataclasses import dataclass
 from .utils import *
+import numpy as np
 
 INITIAL_WIDTH : int   = 100
 INITIAL_SPACING : int = 15
@@ -40,6 +41,9 @@ X_AXIS_VALUE_KEY     = "x_axis_value"
 
 IS_GUESS_KEY = "is_guess"
 NAMES_KEY    = "names"
+DATASET_KEY  = "dataset"
+
+DATA_CONFIG_SECTION_HEADERS = (BARCHART_DATA_CONFIG_SECTION_HEADER, HISTOGRAM_DATA_CONFIG_SECTION_HEADER, CANDLESTICK_DATA_CONFIG_SECTION_HEADER, LINECHART_DATA_CONFIG_SECTION_HEADER)
 
 class LoadFailedException(Exception):
     """Base exception for all game loading errors."""
@@ -138,7 +142,7 @@ class GameLoader(ABC):
     @staticmethod
     def _loadConfig(configFilePath: str)->dict[str,Any]:
         """
-        Loads TOML configuration file.
+        Loads TOML configuration file. Datasets referenced by data sections are opened memory-mapped.
 
         Args:
             configFilePath (str): Path to the config file.
@@ -148,7 +152,35 @@ class GameLoader(ABC):
         """
         with open(configFilePath,"rb") as configFile:
             data = tomllib.load(configFile)
-            return data
+        GameLoader._loadDatasets(data, Path(configFilePath).parent)
+        return data
+
+    @staticmethod
+    def _loadDatasets(data: dict[str,Any], configDirectory: Path):
+        """
+        Fills data sections from datasets given under the dataset key (path relative to the config file).
+        Keys of the section which are missing are taken from columns and attributes of the dataset.
+
+        Args:
+            data (dict[str,Any]): Loaded config file, modified in place.
+            configDirectory (Path): Directory of the config file.
+
+        Raises:
+            LoadFailedException: Dataset cannot be opened.
+            InvalidDataFormatException: Dataset contains data of another chart type.
+        """
+        for header in DATA_CONFIG_SECTION_HEADERS:
+            if header not in data or DATASET_KEY not in data[header]:
+                continue
+            path = configDirectory / data[header][DATASET_KEY]
+            try:
+                dataset = Dataset.Open(str(path))
+            except (OSError, ValueError) as e:
+                raise LoadFailedException(f"Dataset {path} cannot be opened. {e}")
+            if dataset.chart != header:
+                raise InvalidDataFormatException(f"Dataset {path} contains data of {dataset.chart}, data of {header} are expected.",DATASET_KEY)
+            for key, value in dataset.Section().items():
+                data[header].setdefault(key, value)
     
     def _loadEvaluatorClass(self, source: str) -> None:
         """
@@ -293,10 +325,17 @@ class GameLoader(ABC):
         """Returns the game mode identifier for this loader."""
         pass
 
+ARRAY_KINDS = {float.__name__: "iuf", bool.__name__: "b", str.__name__: "U"}
+
 def ValidateListUnderKeyword(keyword : str, listToValidate : list, itemType : type|Union[Any,Any]):
-    """Raises InvalidDataFormatException if listToValidate is not a list of the expected item type."""
+    """Raises InvalidDataFormatException if listToValidate is not a list of the expected item type.
+    Columns of datasets (NumPy arrays) are validated by their data type."""
     #TODO better using get_args abd get_origin
     typeName = itemType.__name__ if itemType != Union[int,float] else float.__name__
+    if isinstance(listToValidate, np.ndarray):
+        if listToValidate.ndim != 1 or listToValidate.dtype.kind not in ARRAY_KINDS.get(typeName, ""):
+            raise InvalidDataFormatException(f"Data under \"{keyword}\" keyword must be a list of {typeName}.",keyword)
+        return
     if not isinstance(listToValidate, list):
         raise InvalidDataFormatException(f"Data under \"{keyword}\" keyword must be a list of {typeName}.",keyword)
     for item in listToValidate:
@@ -825,12 +864,11 @@ class HistogramGameLoader(GameLoader):
         if len(intervals)-1 != len(values):
             raise InvalidDataFormatException(f"Invalid amount of interval boundaries. List under \"{INTERVALS_KEY}\" key must contain one less item than list under \"{BUCKET_VALUE_KEY}\" key.", INTERVALS_KEY) 
 
-        boundary = intervals[0]
-        for i in range(1,len(intervals)):
-            current = intervals[i]
-            if current <= boundary:
-                raise InvalidDataFormatException(f"Interval boundries in under \"{INTERVALS_KEY}\" key must be ordered and non-equal. Values {boundary} and {current} are either equal or in wrong order.",INTERVALS_KEY)
-            boundary = current
+        boundaries = np.asarray(intervals, dtype=np.float64)
+        unordered = np.flatnonzero(boundaries[1:] <= boundaries[:-1])
+        if len(unordered) > 0:
+            boundary, current = intervals[unordered[0]], intervals[unordered[0]+1]
+            raise InvalidDataFormatException(f"Interval boundries in under \"{INTERVALS_KEY}\" key must be ordered and non-equal. Values {boundary} and {current} are either equal or in wrong order.",INTERVALS_KEY)
 
     @staticmethod
     def _getUserData(data: list[float], isGuess : list[bool]):
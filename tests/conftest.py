@@ -0,0 +1,39 @@
+"""Makes the kiwiplots package and the chart editor modules importable without installing them."""
+import os
+import sys
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+for path in (os.path.join(ROOT, "module", "src"), os.path.join(ROOT, "editable-plots")):
+    if path not in sys.path:
+        sys.path.insert(0, path)
+
+FONT_VARIABLE = "KIWIPLOTS_TEST_FONT"
+
+@pytest.fixture
+def pictureFont(monkeypatch):
+    """Font of exported pictures. Arial Bold is not installed everywhere, a TrueType font can be given by KIWIPLOTS_TEST_FONT instead."""
+    from PIL import ImageFont
+    from kiwiplots.plotui import picturedrawers
+    fontFile = os.environ.get(FONT_VARIABLE, picturedrawers.FONT_FILE)
+    try:
+        ImageFont.truetype(fontFile, 12)
+    except OSError:
+        pytest.skip(f"Font {fontFile} cannot be loaded, set {FONT_VARIABLE} to the path of a TrueType font")
+    monkeypatch.setattr(picturedrawers, "FONT_FILE", fontFile)
+    return fontFile
+
+@pytest.fixture
+def charts(pictureFont):
+    """Small chart of every type, keyed by the chart type."""
+    from kiwiplots.plotui.uifactory import UIFactory
+    count = 30
+    values = [(index * 7) % 11 + 1. for index in range(count)]
+    return {
+        "bar": UIFactory.CreateBarChart("Bars", "x", "y", [values[index:index + 3] for index in range(0, count, 3)],
+                                        [[f"b{index + offset}" for offset in range(3)] for index in range(0, count, 3)], 400, 300),
+        "histogram": UIFactory.CreateHistogram("Histogram", "x", "y", values, [(index, index + 1) for index in range(count)], 400, 300),
+        "line": UIFactory.CreateLineChart("Line", "x", "y", 0, values, [f"p{index}" for index in range(count)], 400, 300),
+        "candlestick": UIFactory.CreateCandlesticChart("Candles", "x", "y", 0, values, [value + 1 for value in values], [value - 1 for value in values],
+                                                       [value + 2 for value in values], [f"c{index}" for index in range(count)], 400, 300),
+    }
@@ -0,0 +1,65 @@
+import csv
+import pytest
+from csvImport import (CSVFormatError, CSVImport, ImportEvent, BarChartDataParser, HistogramDataParser,
+                       CandlestickDataParser, LineChartDataParser)
+
+def test_bar_chart_rows():
+    rows = [["a", "1", "b", "2.5"], ["c", "3"], []]
+    assert BarChartDataParser().ParseRows(rows, chunkRows=2) == [[["a", "b"], ["c"], []], [[1.0, 2.5], [3.0], []]]
+
+def test_histogram_rows():
+    rows = [["0", "1", "5"], ["1", "3", "2"], ["3", "3.5", "0"]]
+    assert HistogramDataParser().ParseRows(rows, chunkRows=2) == [[5.0, 2.0, 0.0], [(0.0, 1.0), (1.0, 3.0), (3.0, 3.5)]]
+
+def test_candlestick_rows():
+    rows = [["x", "2", "3", "1", "4"], ["y", "3", "2", "2", "3"]]
+    assert CandlestickDataParser().ParseRows(rows) == [["x", "y"], [2.0, 3.0], [3.0, 2.0], [1.0, 2.0], [4.0, 3.0]]
+
+def test_line_chart_rows():
+    rows = [[f"p{i}", str(i / 2)] for i in range(7)]
+    assert LineChartDataParser().ParseRows(rows, chunkRows=3) == [[f"p{i}" for i in range(7)], [i / 2 for i in range(7)]]
+
+@pytest.mark.parametrize("parser,rows,row,message", [
+    (BarChartDataParser, [["a", "1"], ["b", "2", "c"]], 2, "pairs"),
+    (BarChartDataParser, [["a", "1"], ["b", "2", "c", "x"]], 2, "not a number"),
+    (HistogramDataParser, [["0", "1", "5"], ["1", "2"]], 2, "low and high"),
+    (HistogramDataParser, [["0", "1", "5"], ["2", "3", "1"]], 2, "contiguous"),
+    (HistogramDataParser, [["0", "1", "5"], ["1", "1", "1"]], 2, "nonempty"),
+    (HistogramDataParser, [["0", "1", "5"], ["1", "2", "five"]], 2, "not a number"),
+    (CandlestickDataParser, [["x", "2", "3", "1", "4"], ["y", "5", "3", "1", "4"]], 2, "between"),
+    (CandlestickDataParser, [["x", "2", "3", "1"]], 1, "name, opening"),
+    (LineChartDataParser, [["a", "1"], ["b", "2"], ["c", ""]], 3, "not a number"),
+    (LineChartDataParser, [["a", "1"], ["b", "x"], ["c"]], 2, "not a number"),
+])
+@pytest.mark.parametrize("chunkRows", [1, 2, 100])
+def test_first_invalid_row_is_reported(parser, rows, row, message, chunkRows):
+    with pytest.raises(CSVFormatError, match=message) as error:
+        parser().ParseRows(rows, chunkRows=chunkRows)
+    assert error.value.row == row
+
+def test_histogram_intervals_are_contiguous_across_chunks():
+    with pytest.raises(CSVFormatError) as error:
+        HistogramDataParser().ParseRows([["0", "1", "5"], ["1.5", "2", "1"]], chunkRows=1)
+    assert error.value.row == 2
+
+def importFile(path, plotType, chunkRows):
+    csvImport = CSVImport(str(path), plotType, chunkRows)
+    csvImport.Start()
+    csvImport._worker.join(10)
+    return csvImport.Poll()
+
+def test_import_reports_progress_and_result(tmp_path):
+    path = tmp_path / "line.csv"
+    with open(path, "w", newline="") as file:
+        csv.writer(file).writerows([f"p{i}", i] for i in range(10))
+    events = importFile(path, "Line chart", 4)
+    assert [event.state for event in events] == [ImportEvent.PROGRESS] * 3 + [ImportEvent.FINISHED]
+    assert [event.rows for event in events] == [4, 8, 10, 10]
+    assert events[-1].result == [[f"p{i}" for i in range(10)], [float(i) for i in range(10)]]
+
+def test_import_stops_at_invalid_row(tmp_path):
+    path = tmp_path / "line.csv"
+    path.write_text("a,1\nb,2\nc,3\nd\n")
+    events = importFile(path, "Line chart", 2)
+    assert events[-1].state == ImportEvent.FAILED
+    assert isinstance(events[-1].error, CSVFormatError) and events[-1].error.row == 4
@@ -0,0 +1,92 @@
+import math
+import numpy as np
+import pytest
+from kiwiplots.chartelements import ValuePoint2D, ValueCandle
+from kiwiplots.plotui.downsampling import LargestTriangleThreeBuckets, VisibleIndices, LineDownsampler, CandleResampler
+from kiwiplots.plotui.uifactory import UIFactory
+
+def referenceLTTB(x, y, threshold):
+    """Straightforward LTTB as published by Sveinn Steinarsson."""
+    count = len(x)
+    every = (count - 2) / (threshold - 2)
+    selected = [0]
+    previous = 0
+    for bucket in range(threshold - 2):
+        averageStart = int(math.floor((bucket + 1) * every)) + 1
+        averageEnd = min(int(math.floor((bucket + 2) * every)) + 1, count)
+        averageX = sum(x[averageStart:averageEnd]) / (averageEnd - averageStart)
+        averageY = sum(y[averageStart:averageEnd]) / (averageEnd - averageStart)
+        start = int(math.floor(bucket * every)) + 1
+        end = int(math.floor((bucket + 1) * every)) + 1
+        maxArea, maxIndex = -1.0, start
+        for index in range(start, end):
+            area = abs((x[previous] - averageX) * (y[index] - y[previous]) - (x[previous] - x[index]) * (averageY - y[previous]))
+            if area > maxArea:
+                maxArea, maxIndex = area, index
+        selected.append(maxIndex)
+        previous = maxIndex
+    selected.append(count - 1)
+    return selected
+
+@pytest.mark.parametrize("count,threshold", [(10, 3), (100, 7), (1000, 100), (1001, 999), (5000, 800)])
+def test_lttb_matches_reference(count, threshold):
+    rng = np.random.default_rng(count)
+    x = np.sort(rng.uniform(0, 1000, count))
+    y = np.cumsum(rng.normal(0, 1, count))
+    indices = LargestTriangleThreeBuckets(x, y, threshold)
+    assert indices.tolist() == referenceLTTB(x.tolist(), y.tolist(), threshold)
+
+def test_lttb_keeps_all_points_below_threshold():
+    x = np.arange(5, dtype=np.float64)
+    assert LargestTriangleThreeBuckets(x, x, 5).tolist() == [0, 1, 2, 3, 4]
+    assert LargestTriangleThreeBuckets(x, x, 2).tolist() == [0, 1, 2, 3, 4]
+
+def test_visible_indices_keep_neighbours_outside_of_range():
+    x = np.array([-20., -10., 0., 10., 20., 30.])
+    assert VisibleIndices(x, 0, 15).tolist() == [1, 2, 3, 4]
+    assert VisibleIndices(x, -100, 100).tolist() == [0, 1, 2, 3, 4, 5]
+
+def test_line_downsampler_reduces_to_pixel_width():
+    points = [ValuePoint2D(i / 10, math.sin(i / 50)) for i in range(10000)]
+    solver = UIFactory.CreateLineChart("t", "x", "y", 0, [1., 2., 3.], ["a", "b", "c"], 800, 600).solver
+    indices = LineDownsampler().GetIndices(solver, points, 500)
+    assert len(indices) == 500
+    assert indices[0] == 0 and np.all(np.diff(indices) > 0)
+
+def candles(count, step=1.0, shift=0.0):
+    result = []
+    for i in range(count):
+        left = i * step + shift
+        opening, closing = 10 + i % 7, 10 + (i * 3) % 5
+        result.append(ValueCandle(ValuePoint2D(left, opening), ValuePoint2D(left + step / 2, closing),
+                                  ValuePoint2D(left + step / 4, min(opening, closing) - 1), ValuePoint2D(left + step / 4, max(opening, closing) + 1),
+                                  "green" if closing >= opening else "red", f"c{i}"))
+    return result
+
+def test_candle_resampler_merges_ohlc():
+    data = candles(300)
+    bars = CandleResampler(minimalBarPixels=3).GetCandles(UIFactory.CreateLineChart("t", "x", "y", 0, [1.], ["a"], 800, 600).solver, data, 1000)
+    assert len(bars) == 100
+    for index, bar in enumerate(bars):
+        merged = data[3*index:3*index+3]
+        assert bar.openingCorner.Y == merged[0].openingCorner.Y
+        assert bar.closingCorner.Y == merged[-1].closingCorner.Y
+        assert bar.wickBottom.Y == min(candle.wickBottom.Y for candle in merged)
+        assert bar.wickTop.Y == max(candle.wickTop.Y for candle in merged)
+        assert bar.name == merged[0].name
+
+def test_candle_resampler_cache_is_invalidated_by_layout_version():
+    solver = UIFactory.CreateLineChart("t", "x", "y", 0, [1.], ["a"], 800, 600).solver
+    resampler = CandleResampler(minimalBarPixels=3)
+    first = resampler.GetCandles(solver, candles(300), 1000)
+    # same layout version: the cached geometry is reused even though the candles moved
+    cached = resampler.GetCandles(solver, candles(300, shift=5), 1000)
+    assert [bar.openingCorner.X for bar in cached] == [bar.openingCorner.X for bar in first]
+    solver.Update()
+    moved = resampler.GetCandles(solver, candles(300, shift=5), 1000)
+    assert [bar.openingCorner.X for bar in moved] == [bar.openingCorner.X + 5 for bar in first]
+
+def test_candle_resampler_returns_wide_candles_unchanged():
+    solver = UIFactory.CreateLineChart("t", "x", "y", 0, [1.], ["a"], 800, 600).solver
+    data = candles(20, step=10)
+    assert CandleResampler().GetCandles(solver, data, 1000) == data
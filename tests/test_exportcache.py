@@ -0,0 +1,145 @@
+import io
+import os
+import pytest
+from kiwiplots.plotui.exportcache import ExportCache, LayoutSnapshot
+from kiwiplots.plotui.uifactory import UIFactory
+
+class CountingWrite:
+    """Write function of the cache recording how often it was called."""
+    def __init__(self, content=b"content", error=None):
+        self.content = content
+        self.error = error
+        self.calls = 0
+
+    def __call__(self, stream):
+        self.calls += 1
+        stream.write(self.content)
+        if self.error is not None:
+            raise self.error
+
+def barChart():
+    return UIFactory.CreateBarChart("Bars", "x", "y", [[3., 5.], [4.]], [["a", "b"], ["c"]], 400, 300)
+
+def cachedFiles(directory):
+    return sorted(name for name in os.listdir(directory) if not name.endswith(".tmp"))
+
+def test_fetch_writes_on_miss_only(tmp_path):
+    cache = ExportCache(str(tmp_path / "cache"))
+    write = CountingWrite()
+    assert cache.Get("key") is None
+    path = cache.Fetch("key", write)
+    assert cache.Fetch("key", write) == path == cache.Get("key")
+    assert write.calls == 1
+    with open(path, "rb") as file:
+        assert file.read() == b"content"
+
+def test_least_recently_used_entries_are_evicted(tmp_path):
+    cache = ExportCache(str(tmp_path), maxBytes=25)
+    paths = [cache.Put(key, CountingWrite(b"0123456789")) for key in "abc"]
+    # the oldest entry was evicted when the third one exceeded the limit
+    assert cache.Get("a") is None
+    for time, path in enumerate(paths[1:], start=1):
+        os.utime(path, (time, time))
+    assert cache.Get("b") is not None
+    cache.Put("d", CountingWrite(b"0123456789"))
+    assert cache.Get("c") is None
+    assert cachedFiles(tmp_path) == ["b" + ExportCache.SUFFIX, "d" + ExportCache.SUFFIX]
+
+def test_entry_larger_than_limit_is_kept(tmp_path):
+    cache = ExportCache(str(tmp_path), maxBytes=5)
+    path = cache.Put("large", CountingWrite(b"0123456789"))
+    assert cache.Get("large") == path
+
+def test_failed_write_leaves_no_entry(tmp_path):
+    cache = ExportCache(str(tmp_path))
+    write = CountingWrite(error=RuntimeError("disk full"))
+    with pytest.raises(RuntimeError):
+        cache.Put("key", write)
+    assert os.listdir(tmp_path) == []
+    assert cache.Get("key") is None
+
+def test_open_does_not_retry_failed_writes(tmp_path):
+    cache = ExportCache(str(tmp_path))
+    write = CountingWrite(error=FileNotFoundError("missing input"))
+    with pytest.raises(FileNotFoundError):
+        cache.Open("key", write)
+    assert write.calls == 1
+    assert os.listdir(tmp_path) == []
+
+def test_open_retries_removed_files(tmp_path, monkeypatch):
+    cache = ExportCache(str(tmp_path))
+    write = CountingWrite()
+    fetch = cache.Fetch
+    removals = []
+    def fetchRemoved(key, write):
+        # another process evicts the entry between fetching and opening it
+        path = fetch(key, write)
+        if len(removals) < ExportCache.OPEN_ATTEMPTS - 1:
+            removals.append(path)
+            os.remove(path)
+        return path
+    monkeypatch.setattr(cache, "Fetch", fetchRemoved)
+    with cache.Open("key", write) as stream:
+        assert stream.read() == b"content"
+    assert write.calls == ExportCache.OPEN_ATTEMPTS
+
+def test_open_gives_up_after_attempts(tmp_path, monkeypatch):
+    cache = ExportCache(str(tmp_path))
+    calls = []
+    def fetchMissing(key, write):
+        calls.append(key)
+        return str(tmp_path / "missing")
+    monkeypatch.setattr(cache, "Fetch", fetchMissing)
+    with pytest.raises(FileNotFoundError):
+        cache.Open("key", CountingWrite())
+    assert len(calls) == ExportCache.OPEN_ATTEMPTS
+
+def test_clear(tmp_path):
+    cache = ExportCache(str(tmp_path))
+    for key in "ab":
+        cache.Put(key, CountingWrite())
+    cache.Clear()
+    assert cache.Get("a") is None and cache.Get("b") is None
+    ExportCache(str(tmp_path / "missing")).Clear()
+
+def test_key_follows_layout_metadata_and_options():
+    cache = ExportCache()
+    core = barChart()
+    key = cache.Key(core.plotMetadata, core.solver, "png", 400, 300)
+    assert cache.Key(core.plotMetadata, core.solver, "png", 400, 300) == key
+    assert cache.Key(core.plotMetadata, core.solver, "jpg", 400, 300) != key
+    snapshot = cache.Snapshot(core.solver)
+    assert cache.Key(core.plotMetadata, snapshot, "png", 400, 300) == key
+    core.solver.ChangeName(0, 0, "renamed")
+    renamed = cache.Key(core.plotMetadata, core.solver, "png", 400, 300)
+    assert renamed != key
+    # the snapshot keeps the layout from before the change
+    assert cache.Key(core.plotMetadata, snapshot, "png", 400, 300) == key
+    core.plotMetadata.title = "Other"
+    assert cache.Key(core.plotMetadata, core.solver, "png", 400, 300) != renamed
+
+def test_snapshot_getters():
+    core = barChart()
+    snapshot = LayoutSnapshot(core.solver)
+    assert [rectangle.name for rectangle in snapshot.GetRectangleDataAsList()] == ["a", "b", "c"]
+    assert snapshot.GetAxisHeight() == core.solver.GetAxisHeight()
+    with pytest.raises(AttributeError):
+        snapshot.GetPoints()
+
+def test_cache_is_opt_in(tmp_path, monkeypatch):
+    monkeypatch.setattr(UIFactory, "exportCache", None)
+    assert barChart().dataWriter.exportCache is None
+    cache = UIFactory.EnableExportCache(str(tmp_path))
+    assert UIFactory.exportCache is cache
+    core = barChart()
+    assert core.dataWriter.exportCache is cache and core.pictureDrawer.exportCache is cache
+    first, second = io.BytesIO(), io.BytesIO()
+    core.dataWriter.WriteBinary(core.plotMetadata, core.solver, first)
+    core.dataWriter.WriteBinary(core.plotMetadata, core.solver, second)
+    assert first.getvalue() == second.getvalue() != b""
+    assert len(cachedFiles(tmp_path)) == 1
+    core.solver.ChangeName(0, 1, "renamed")
+    renamed = io.BytesIO()
+    core.dataWriter.WriteBinary(core.plotMetadata, core.solver, renamed)
+    assert b"renamed" in renamed.getvalue()
+    assert len(cachedFiles(tmp_path)) == 2
@@ -0,0 +1,50 @@
+import numpy as np
+import pytest
+from kiwiplots.plotui.histogrambinning import HistogramBinning
+
+@pytest.fixture
+def samples():
+    rng = np.random.default_rng(7)
+    return np.concatenate((rng.normal(0, 1, 5000), rng.exponential(3, 2000)))
+
+@pytest.mark.parametrize("strategy,bins", [("fd", "fd"), ("sturges", "sturges"), ("fixed", 17)])
+def test_boundaries_match_numpy(samples, strategy, bins):
+    boundaries, counts = HistogramBinning(strategy, bins=17).Bin(samples)
+    expected = np.histogram_bin_edges(samples, bins=bins)
+    assert np.allclose(boundaries, expected)
+    assert counts.tolist() == np.histogram(samples, bins=expected)[0].tolist()
+
+def test_quantile_bins_hold_equal_counts(samples):
+    boundaries, counts = HistogramBinning("quantile", bins=10).Bin(samples)
+    assert np.allclose(boundaries, np.quantile(samples, np.linspace(0, 1, 11)))
+    assert counts.sum() == len(samples)
+    assert counts.max() - counts.min() <= 2
+
+@pytest.mark.parametrize("strategy", ["fixed", "sturges", "quantile"])
+def test_chunks_give_the_same_counts(samples, strategy):
+    whole = HistogramBinning(strategy, bins=12).Bin(samples)
+    chunked = HistogramBinning(strategy, bins=12, chunkSize=1000)
+    generated = chunked.Bin(lambda: (samples[start:start + 999] for start in range(0, len(samples), 999)))
+    # quantiles of samples in several chunks are interpolated from a histogram of sketchBins intervals
+    tolerance = 10 * (samples.max() - samples.min()) / chunked.sketchBins if strategy == "quantile" else 0
+    for boundaries, counts in (chunked.Bin(samples), generated):
+        assert np.allclose(boundaries, whole[0], rtol=0, atol=tolerance)
+        assert counts.sum() == len(samples)
+
+def test_samples_which_are_not_finite_are_ignored():
+    boundaries, counts = HistogramBinning("fixed", bins=2).Bin(np.array([0., 1., np.nan, np.inf, 2., 4.]))
+    assert boundaries.tolist() == [0., 2., 4.]
+    assert counts.tolist() == [2, 2]
+
+def test_equal_samples_get_a_unit_interval():
+    boundaries, counts = HistogramBinning("fd").Bin(np.full(100, 3.))
+    assert boundaries[0] == 2.5 and boundaries[-1] == 3.5
+    assert counts.sum() == 100
+
+def test_invalid_arguments():
+    with pytest.raises(ValueError):
+        HistogramBinning("auto")
+    with pytest.raises(ValueError):
+        HistogramBinning("fixed", bins=0)
+    with pytest.raises(ValueError):
+        HistogramBinning().Bin(np.array([np.nan]))
@@ -0,0 +1,84 @@
+import numpy as np
+import pytest
+from kiwiplots.plotui.histogramsketch import HistogramSketch, HistogramStream
+from kiwiplots.plotui.datautils import RescaleList
+from kiwiplots.plotui.uifactory import UIFactory
+
+def assertMatchesNumpy(sketch, samples):
+    counts, _ = np.histogram(samples, bins=sketch.Boundaries())
+    # np.histogram closes the last interval, the sketch counts a sample on a boundary in the interval it starts
+    assert sketch.counts.sum() == len(samples)
+    assert np.abs(sketch.counts - counts).sum() <= 2 * np.isin(samples, sketch.Boundaries()).sum()
+
+def test_add_counts_samples():
+    samples = np.random.default_rng(1).normal(0, 5, 10000)
+    sketch = HistogramSketch(64)
+    sketch.Add(samples)
+    assert len(sketch.counts) <= 64
+    assertMatchesNumpy(sketch, samples)
+
+def test_growing_range_coarsens_intervals():
+    sketch = HistogramSketch(16, width=1)
+    sketch.Add(np.arange(10.))
+    sketch.Add(np.array([100., np.nan]))
+    assert sketch.width == 8
+    assert len(sketch.counts) <= 16
+    assert sketch.count == 11 and sketch.ignored == 1
+
+@pytest.mark.parametrize("widths", [(0.25, 0.25), (0.25, 1.0), (2.0, 0.5)])
+def test_merge_equals_sketch_of_all_samples(widths):
+    rng = np.random.default_rng(2)
+    first, second = rng.normal(0, 1, 3000), rng.normal(20, 3, 5000)
+    left, right, whole = HistogramSketch(128, width=widths[0]), HistogramSketch(128, width=widths[1]), HistogramSketch(128, width=max(widths))
+    left.Add(first)
+    right.Add(second)
+    whole.Add(first)
+    whole.Add(second)
+    left.Merge(right)
+    assert left.width == whole.width
+    assert left.first == whole.first
+    assert left.counts.tolist() == whole.counts.tolist()
+    assert left.count == 8000
+
+def test_merge_rejects_incompatible_sketches():
+    sketch = HistogramSketch(width=1)
+    sketch.Add([1., 2.])
+    other = HistogramSketch(width=3)
+    other.Add([1.])
+    with pytest.raises(ValueError):
+        sketch.Merge(other)
+    other = HistogramSketch(width=1, origin=0.5)
+    other.Add([1.])
+    with pytest.raises(ValueError):
+        sketch.Merge(other)
+
+def test_stream_updates_buckets_in_place():
+    rng = np.random.default_rng(3)
+    sketch = HistogramSketch(32, width=0.25)
+    sketch.Add(rng.normal(0, 1, 100))
+    core = UIFactory.CreateHistogram("t", "x", "y", sketch.counts, sketch.Intervals(), 800, 500)
+    stream = HistogramStream(core.solver, core.plotMetadata, core.plotHeight, sketch)
+    solver = core.solver.solver
+    lockedStart = sketch.Intervals()[8][0]
+    core.solver.SwitchBucketLock(8)
+    core.solver.ChangeColor(0, 5, "red")
+    redStart = sketch.Intervals()[5][0]
+
+    for samples in (rng.normal(0, 1, 1000), rng.normal(-6, 1, 30000), rng.normal(0, 30, 50000)):
+        previousScale = core.plotMetadata.heightScaleFactor
+        previousHeights = {bucket.interval: bucket.GetHeight() for bucket in core.solver.GetBucketData()}
+        stream.Add(samples)
+        assert core.solver.solver is solver
+        buckets = core.solver.GetBucketData()
+        assert [bucket.interval for bucket in buckets] == sketch.Intervals()
+
+        (lockedGroup, locked), = core.solver.lockedRectangles
+        start, end = buckets[locked].interval
+        assert start <= lockedStart < end
+        merged = sum(height for interval, height in previousHeights.items() if start <= interval[0] < end)
+        assert buckets[locked].GetHeight() == pytest.approx(merged * core.plotMetadata.heightScaleFactor / previousScale, abs=1)
+
+        expected = RescaleList(sketch.counts, core.plotMetadata.heightScaleFactor)
+        assert all(abs(bucket.GetHeight() - height) <= 1 for index, (bucket, height) in enumerate(zip(buckets, expected)) if index != locked)
+        assert max(bucket.GetHeight() for bucket in buckets) <= core.plotHeight
+        assert [bucket.interval[0] <= redStart < bucket.interval[1] for bucket in buckets] == [bucket.color == "red" for bucket in buckets]
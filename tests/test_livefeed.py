@@ -0,0 +1,76 @@
+import os
+import pytest
+from kiwiplots.plotui.livefeed import CSVTailFollower
+from kiwiplots.plotui.uifactory import UIFactory
+
+VALUES = [3., 7., 1., 4., 9., 2., 6.]
+CANDLES = [(5., 6., 4., 7.), (6., 4., 3., 6.5), (4., 8., 4., 9.), (8., 7., 6., 8.)]
+
+def lineChart():
+    return UIFactory.CreateLineChart("t", "x", "y", 0, [2., 5.], ["a", "b"], 800, 600)
+
+def candlestickChart():
+    return UIFactory.CreateCandlesticChart("t", "x", "y", 0, [5.], [6.], [4.], [7.], ["c"], 800, 600)
+
+def coordinates(points):
+    return [(point.X, point.Y) for point in points]
+
+def test_add_points_matches_sequential_adds():
+    batch, sequential = lineChart(), lineChart()
+    batch.solver.AddPoints([value * 10 for value in VALUES], [f"p{i}" for i in range(len(VALUES))])
+    for i, value in enumerate(VALUES):
+        sequential.solver.AddPoint(value * 10, f"p{i}")
+    assert coordinates(batch.solver.GetPoints()) == pytest.approx(coordinates(sequential.solver.GetPoints()))
+    assert [point.name for point in batch.solver.GetPoints()] == ["a", "b"] + [f"p{i}" for i in range(len(VALUES))]
+
+def test_add_points_keeps_locked_points():
+    batch, sequential = lineChart(), lineChart()
+    for core in (batch, sequential):
+        core.solver.SwitchPointLock(1)
+    batch.solver.AddPoints([10., 20.], ["c", "d"])
+    sequential.solver.AddPoint(10., "c")
+    sequential.solver.AddPoint(20., "d")
+    assert coordinates(batch.solver.GetPoints()) == pytest.approx(coordinates(sequential.solver.GetPoints()))
+    assert batch.solver.GetPoints()[1].Y == pytest.approx(lineChart().solver.GetPoints()[1].Y)
+
+def candleCoordinates(candles):
+    return [(candle.openingCorner.X, candle.openingCorner.Y, candle.closingCorner.X, candle.closingCorner.Y, candle.wickBottom.Y, candle.wickTop.Y) for candle in candles]
+
+def test_add_candles_matches_sequential_adds():
+    batch, sequential = candlestickChart(), candlestickChart()
+    columns = [[values[column] * 10 for values in CANDLES] for column in range(4)]
+    names = [f"c{i}" for i in range(len(CANDLES))]
+    batch.solver.AddCandles(names, *columns)
+    for name, values in zip(names, CANDLES):
+        sequential.solver.AddCandle(name, *(value * 10 for value in values))
+    assert candleCoordinates(batch.solver.GetCandleData()) == pytest.approx(candleCoordinates(sequential.solver.GetCandleData()))
+    assert [candle.color for candle in batch.solver.GetCandleData()] == [candle.color for candle in sequential.solver.GetCandleData()]
+
+def append(path, text):
+    with open(path, "a", newline="") as file:
+        file.write(text)
+
+def test_follower_reads_complete_appended_lines(tmp_path):
+    path = str(tmp_path / "feed.csv")
+    append(path, "old,1\n")
+    follower = CSVTailFollower(path)
+    assert follower.Poll() == []
+    append(path, "a,2\nb,")
+    assert follower.Poll() == [["a", "2"]]
+    assert follower.Backlog() == 0
+    append(path, "3\n\nc,4\n")
+    assert follower.Poll(maxBytes=3) == [["b", "3"]]
+    assert follower.Poll() == [["c", "4"]]
+
+def test_follower_restarts_on_truncation(tmp_path):
+    path = str(tmp_path / "feed.csv")
+    append(path, "name,value\na,1\n")
+    follower = CSVTailFollower(path, fromStart=True, header=True)
+    assert follower.Poll() == [["a", "1"]]
+    with open(path, "w", newline="") as file:
+        file.write("name,value\nb\n")
+    assert follower.Poll() == [["b"]]
+    replacement = str(tmp_path / "replacement.csv")
+    append(replacement, "name,value\nc,3\nd,4\n")
+    os.replace(replacement, path)
+    assert follower.Poll() == [["c", "3"], ["d", "4"]]
@@ -0,0 +1,69 @@
+import numpy as np
+import pytest
+from PIL import Image, ImageDraw
+from kiwiplots.plotui.raster import RasterBuffer
+
+WIDTH, HEIGHT = 120, 90
+
+def pillowImage():
+    return Image.new("RGB", (WIDTH, HEIGHT), (255, 255, 255))
+
+def assertSamePixels(buffer, image):
+    assert np.array_equal(buffer.pixels, np.asarray(image))
+
+def randomSegments(seed, count=200):
+    rng = np.random.default_rng(seed)
+    return [rng.uniform(-20, [WIDTH + 20, HEIGHT + 20, WIDTH + 20, HEIGHT + 20], size=(count, 4))[:, i] for i in range(4)]
+
+def test_fill_rectangles_match_pillow():
+    x1, y1, x2, y2 = randomSegments(1, 50)
+    colors = np.random.default_rng(2).integers(0, 256, size=(50, 3), dtype=np.uint8)
+    buffer = RasterBuffer(WIDTH, HEIGHT)
+    buffer.FillRectangles(x1, y1, x2, y2, colors)
+    image = pillowImage()
+    draw = ImageDraw.Draw(image)
+    for i in range(50):
+        draw.rectangle([min(int(x1[i]), int(x2[i])), min(int(y1[i]), int(y2[i])), max(int(x1[i]), int(x2[i])), max(int(y1[i]), int(y2[i]))], fill=tuple(int(c) for c in colors[i]))
+    assertSamePixels(buffer, image)
+
+@pytest.mark.parametrize("width", [1, 3])
+def test_outline_rectangles_match_pillow(width):
+    x1, y1, x2, y2 = (np.array([10, 50, 5]), np.array([10, 20, 60]), np.array([40, 60, 100]), np.array([70, 80, 85]))
+    buffer = RasterBuffer(WIDTH, HEIGHT)
+    buffer.OutlineRectangles(x1, y1, x2, y2, (200, 0, 0), width)
+    image = pillowImage()
+    draw = ImageDraw.Draw(image)
+    for i in range(3):
+        draw.rectangle([int(x1[i]), int(y1[i]), int(x2[i]), int(y2[i])], outline=(200, 0, 0), width=width)
+    assertSamePixels(buffer, image)
+
+def test_lines_match_pillow():
+    x1, y1, x2, y2 = (np.floor(a) for a in randomSegments(3))
+    buffer = RasterBuffer(WIDTH, HEIGHT)
+    image = pillowImage()
+    draw = ImageDraw.Draw(image)
+    for i in range(len(x1)):
+        buffer.DrawLines(x1[i:i+1], y1[i:i+1], x2[i:i+1], y2[i:i+1], (0, 0, 255))
+        draw.line([(x1[i], y1[i]), (x2[i], y2[i])], fill=(0, 0, 255))
+    assertSamePixels(buffer, image)
+
+def test_strips_compose_the_whole_image():
+    x1, y1, x2, y2 = randomSegments(4)
+    whole = RasterBuffer(WIDTH, HEIGHT)
+    whole.DrawLines(x1, y1, x2, y2, (0, 0, 0), 3)
+    whole.FillRectangles(x1[:20], y1[:20], x1[:20] + 5, y1[:20] + 5, (0, 128, 0))
+    whole.DrawDiscs(x2, y2, 3, (255, 0, 0), (0, 0, 0))
+    strips = []
+    for top in range(0, HEIGHT, 32):
+        strip = RasterBuffer(WIDTH, min(32, HEIGHT - top), top=top)
+        strip.DrawLines(x1, y1, x2, y2, (0, 0, 0), 3)
+        strip.FillRectangles(x1[:20], y1[:20], x1[:20] + 5, y1[:20] + 5, (0, 128, 0))
+        strip.DrawDiscs(x2, y2, 3, (255, 0, 0), (0, 0, 0))
+        strips.append(strip.pixels)
+    assert np.array_equal(np.concatenate(strips), whole.pixels)
+
+def test_ppm_encoding():
+    buffer = RasterBuffer(4, 3, background=(1, 2, 3))
+    image = Image.open(__import__("io").BytesIO(buffer.ToPPM()))
+    assert image.size == (4, 3)
+    assert np.array_equal(np.asarray(image), buffer.pixels)
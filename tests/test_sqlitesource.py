@@ -0,0 +1,91 @@
+import sqlite3
+import numpy as np
+import pytest
+from kiwiplots.plotui.datasets import Dataset
+from kiwiplots.plotui.sqlitesource import SQLiteSource
+from kiwiplots.plotui.uifactory import UIFactory
+
+@pytest.fixture
+def database(tmp_path):
+    path = str(tmp_path / "data.db")
+    connection = sqlite3.connect(path)
+    connection.execute('CREATE TABLE sales ("region" TEXT, product TEXT, amount REAL, time REAL)')
+    rows = [("north", "apples", 3, 0), ("north", "pears", 1, 1), ("north", "apples", 4, 2), ("south", "apples", 2, 3),
+            ("south", "plums", None, 4), ("south", "plums", 5, 5), ("east", "pears", 7, 6), ("east", "pears", 1, 7)]
+    connection.executemany("INSERT INTO sales VALUES (?, ?, ?, ?)", rows)
+    connection.commit()
+    connection.close()
+    return path
+
+def test_bar_chart_aggregates_groups(database):
+    with SQLiteSource(database, batchSize=2) as source:
+        dataset = source.BarChart("sales", "region", "product", "amount")
+    assert [group.tolist() for group in dataset.Grouped("names")] == [["pears"], ["apples", "pears"], ["apples", "plums"]]
+    assert [group.tolist() for group in dataset.Grouped("groups")] == [[8.], [7., 1.], [2., 5.]]
+
+def test_bar_chart_filter_and_aggregate(database):
+    with SQLiteSource(database) as source:
+        dataset = source.BarChart("sales", "region", "product", "amount", aggregate="max", where="time >= ?", params=[3])
+    assert dataset["names"].tolist() == ["pears", "apples", "plums"]
+    assert dataset["groups"].tolist() == [7., 2., 5.]
+    with pytest.raises(ValueError):
+        SQLiteSource(database).BarChart("sales", "region", "product", "amount", aggregate="median")
+
+@pytest.mark.parametrize("bins", [3, [0., 1.5, 2., 8.]])
+def test_histogram_matches_numpy(database, bins):
+    amounts = np.array([3, 1, 4, 2, 5, 7, 1], dtype=np.float64)
+    with SQLiteSource(database) as source:
+        dataset = source.Histogram("sales", "amount", bins)
+    counts, boundaries = np.histogram(amounts, bins=bins)
+    assert np.allclose(dataset["interval_boundries"], boundaries)
+    assert dataset["values"].tolist() == counts.tolist()
+
+def test_histogram_rejects_bad_bins(database):
+    with SQLiteSource(database) as source:
+        with pytest.raises(ValueError):
+            source.Histogram("sales", "amount", [0., 2., 1.])
+        with pytest.raises(ValueError):
+            source.Histogram("sales", "amount", where="time > 100")
+
+def test_candlestick_chart_periods(database):
+    with SQLiteSource(database) as source:
+        dataset = source.CandlestickChart("sales", "time", "amount", 3)
+    assert dataset["names"].tolist() == ["0", "3", "6"]
+    assert dataset["openings"].tolist() == [3., 2., 7.]
+    assert dataset["closings"].tolist() == [4., 5., 1.]
+    assert dataset["minimums"].tolist() == [1., 2., 1.]
+    assert dataset["maximums"].tolist() == [4., 5., 7.]
+
+def test_candlestick_chart_period_expression(database):
+    with SQLiteSource(database) as source:
+        dataset = source.CandlestickChart("sales", "time", "amount", "region")
+    assert dataset["names"].tolist() == ["east", "north", "south"]
+    assert dataset["openings"].tolist() == [7., 3., 2.]
+    assert dataset["closings"].tolist() == [1., 4., 5.]
+
+def test_line_chart(database):
+    with SQLiteSource(database) as source:
+        rows = source.LineChart("sales", "product", "amount", orderBy="time")
+        totals = source.LineChart("sales", "product", "amount", aggregate="SUM", orderBy="time")
+    assert rows["names"].tolist() == ["apples", "pears", "apples", "apples", "plums", "pears", "pears"]
+    assert totals["names"].tolist() == ["apples", "pears", "plums"]
+    assert totals["points"].tolist() == [9., 9., 5.]
+
+def test_query_columns(database):
+    connection = sqlite3.connect(database)
+    source = SQLiteSource(connection, batchSize=3)
+    columns = source.Query('SELECT "region", amount FROM sales ORDER BY time')
+    source.Close()
+    assert columns["region"].tolist() == ["north", "north", "north", "south", "south", "south", "east", "east"]
+    assert np.isnan(columns["amount"][4])
+    # a connection passed to the source stays open
+    assert connection.execute("SELECT COUNT(*) FROM sales").fetchone() == (8,)
+    with pytest.raises(ValueError):
+        source.Query("SELECT amount FROM (SELECT amount, time FROM sales UNION ALL SELECT 'text', 100) ORDER BY time")
+
+def test_datasets_create_charts(database):
+    with SQLiteSource(database) as source:
+        dataset = source.Histogram("sales", "amount", 4)
+    assert isinstance(dataset, Dataset)
+    core = UIFactory.CreateFromDataset(dataset, "t", "x", "y", 800, 600)
+    assert len(core.solver.GetBucketData()) == 4
@@ -0,0 +1,67 @@
+import numpy as np
+import pytest
+from kiwiplots.plotui.tickaggregator import TickAggregator, CandleStream, ReadTicks
+from kiwiplots.plotui.datautils import RescaleList
+from kiwiplots.plotui.uifactory import UIFactory
+
+def referenceCandles(ticks, interval):
+    """OHLC of intervals computed from all ticks at once."""
+    starts = {}
+    for timestamp, price in sorted(ticks, key=lambda tick: tick[0]):
+        starts.setdefault(np.floor(timestamp / interval) * interval, []).append(price)
+    return {start: [prices[0], prices[-1], min(prices), max(prices)] for start, prices in starts.items()}
+
+def test_aggregator_matches_reference():
+    rng = np.random.default_rng(4)
+    timestamps = np.sort(rng.uniform(0, 100, 2000))
+    prices = 100 + np.cumsum(rng.normal(0, 1, 2000))
+    ticks = list(zip(timestamps.tolist(), prices.tolist()))
+    aggregator = TickAggregator(7.5)
+    candles = [candle for candle in (aggregator.Add(*tick) for tick in ticks) if candle is not None]
+    candles.append(aggregator.Flush())
+    assert {candle.start: candle.Prices() for candle in candles} == referenceCandles(ticks, 7.5)
+    assert sum(candle.ticks for candle in candles) == len(ticks)
+    assert aggregator.Flush() is None
+
+def test_ticks_out_of_order():
+    aggregator = TickAggregator(10, origin=5)
+    assert aggregator.Add(6, 1.) is None
+    assert aggregator.Add(9, 3.) is None
+    assert aggregator.Add(7, 2.) is None
+    closed = aggregator.Add(15, 4.)
+    assert (closed.start, closed.Prices()) == (5, [1., 3., 1., 3.])
+    # a tick of a closed interval is dropped
+    assert aggregator.Add(14, 0.) is None
+    assert aggregator.lateTicks == 1
+    assert aggregator.current.Prices() == [4., 4., 4., 4.]
+
+def test_invalid_interval():
+    with pytest.raises(ValueError):
+        TickAggregator(0)
+
+def test_candle_stream_updates_open_candle():
+    core = UIFactory.CreateCandlesticChart("t", "x", "y", 0, [100.], [101.], [99.], [102.], ["start"], 800, 600)
+    stream = CandleStream(core.solver, core.plotMetadata, 10)
+    ticks = [(0, 100.), (3, 104.), (5, 98.), (12, 101.), (13, 103.), (25, 99.)]
+    stream.Consume(ticks[:2])
+    assert len(core.solver.GetCandleData()) == 2
+    stream.Add(*ticks[2])
+    assert len(core.solver.GetCandleData()) == 2
+    stream.Consume(ticks[3:])
+    candles = core.solver.GetCandleData()
+    assert [candle.name for candle in candles] == ["start", "0", "10", "20"]
+    scaleFactor = core.plotMetadata.heightScaleFactor
+    for candle, prices in zip(candles[1:], ([100., 98., 98., 104.], [101., 103., 101., 103.], [99., 99., 99., 99.])):
+        opening, closing, minimum, maximum = RescaleList(prices, scaleFactor, core.plotMetadata.xAxisValue * scaleFactor)
+        assert candle.openingCorner.Y == pytest.approx(opening, abs=1)
+        assert candle.closingCorner.Y == pytest.approx(closing, abs=1)
+        assert candle.wickBottom.Y == pytest.approx(minimum, abs=1)
+        assert candle.wickTop.Y == pytest.approx(maximum, abs=1)
+
+def test_read_ticks(tmp_path):
+    path = tmp_path / "ticks.csv"
+    path.write_text("price;time\n1.5;0\n\n2.5;1\n")
+    assert list(ReadTicks(str(path), timeColumn=1, priceColumn=0, header=True, delimiter=";")) == [(0., 1.5), (1., 2.5)]
+    path.write_text("0,1\n1,x\n")
+    with pytest.raises(ValueError, match="Row 2"):
+        list(ReadTicks(str(path)))
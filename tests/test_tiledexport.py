@@ -0,0 +1,85 @@
+import io
+import struct
+import zlib
+import numpy as np
+import pytest
+from PIL import Image
+from kiwiplots.plotui.tiledexport import EncodeRows, PNGStreamWriter, TiledExporter
+
+def chunks(png):
+    """Splits a PNG file to (type, data) chunks, checking the signature and the CRC of every chunk."""
+    assert png[:8] == PNGStreamWriter.SIGNATURE
+    position, result = 8, []
+    while position < len(png):
+        length, = struct.unpack(">I", png[position:position + 4])
+        chunkType, data = png[position + 4:position + 8], png[position + 8:position + 8 + length]
+        crc, = struct.unpack(">I", png[position + 8 + length:position + 12 + length])
+        assert crc == zlib.crc32(chunkType + data)
+        result.append((chunkType, data))
+        position += 12 + length
+    return result
+
+def decodedPixels(png):
+    return np.asarray(Image.open(io.BytesIO(png)).convert("RGB"))
+
+@pytest.mark.parametrize("chart", ["bar", "histogram", "line", "candlestick"])
+@pytest.mark.parametrize("tileHeight", [1, 37, 256, 1000])
+def test_tiles_match_render(charts, chart, tileHeight):
+    core = charts[chart]
+    layout = core.pictureDrawer.Layout(core.plotMetadata, core.solver, core.plotWidth, core.plotHeight)
+    stream = io.BytesIO()
+    TiledExporter(tileHeight=tileHeight).WriteStream(layout, stream)
+    assert np.array_equal(decodedPixels(stream.getvalue()), np.asarray(layout.Render()))
+
+def test_parallel_tiles_match_render(charts):
+    core = charts["line"]
+    layout = core.pictureDrawer.Layout(core.plotMetadata, core.solver, core.plotWidth, core.plotHeight)
+    stream = io.BytesIO()
+    TiledExporter(tileHeight=50, processes=2).WriteStream(layout, stream)
+    assert np.array_equal(decodedPixels(stream.getvalue()), np.asarray(layout.Render()))
+
+def test_png_chunks_and_zlib_stream():
+    rng = np.random.default_rng(5)
+    pixels = rng.integers(0, 4, size=(70, 33, 3), dtype=np.uint8) * 60
+    stream = io.BytesIO()
+    writer = PNGStreamWriter(stream, 33, 70)
+    writer.IDAT_SIZE = 1
+    for top in range(0, 70, 16):
+        writer.WriteRows(pixels[top:top + 16])
+    writer.Close()
+    png = chunks(stream.getvalue())
+    assert png[0] == (b"IHDR", struct.pack(">IIBBBBB", 33, 70, 8, 2, 0, 0, 0))
+    assert png[-1] == (b"IEND", b"")
+    assert {chunkType for chunkType, _ in png[1:-1]} == {b"IDAT"}
+    # zlib.decompress checks the adler32 checksum of the concatenated strips
+    filtered = np.frombuffer(zlib.decompress(b"".join(data for _, data in png[1:-1])), dtype=np.uint8).reshape(70, 33 * 3 + 1)
+    assert set(filtered[:, 0].tolist()) <= {0, 1, 2}
+    assert np.array_equal(decodedPixels(stream.getvalue()), pixels)
+
+def test_encoded_rows_can_be_written_in_order():
+    pixels = np.random.default_rng(6).integers(0, 256, size=(20, 10, 3), dtype=np.uint8)
+    whole, parts = io.BytesIO(), io.BytesIO()
+    writer = PNGStreamWriter(whole, 10, 20)
+    writer.WriteRows(pixels)
+    writer.Close()
+    writer = PNGStreamWriter(parts, 10, 20)
+    writer.WriteEncoded(EncodeRows(pixels[:7]))
+    writer.WriteEncoded(EncodeRows(pixels[7:], pixels[6]))
+    writer.Close()
+    assert np.array_equal(decodedPixels(parts.getvalue()), decodedPixels(whole.getvalue()))
+
+def test_wrong_number_of_rows():
+    writer = PNGStreamWriter(io.BytesIO(), 2, 2)
+    with pytest.raises(ValueError):
+        writer.WriteRows(np.zeros((3, 2, 3), dtype=np.uint8))
+    writer.WriteRows(np.zeros((1, 2, 3), dtype=np.uint8))
+    with pytest.raises(ValueError):
+        writer.Close()
+
+def test_drawer_switches_to_tiles_above_threshold(charts):
+    core = charts["bar"]
+    full = core.pictureDrawer.RenderBytes(core.plotMetadata, core.solver, core.plotWidth, core.plotHeight)
+    core.pictureDrawer.tiledPixelThreshold = 0
+    tiled = core.pictureDrawer.RenderBytes(core.plotMetadata, core.solver, core.plotWidth, core.plotHeight)
+    assert tiled != full
+    assert np.array_equal(decodedPixels(tiled), decodedPixels(full))
@@ -0,0 +1,95 @@
+import io
+import re
+import zlib
+import xml.etree.ElementTree as ElementTree
+import pytest
+from kiwiplots.plotui.vectorexport import SVGWriter, PDFWriter
+
+SVG = "{http://www.w3.org/2000/svg}"
+
+class UnseekableStream(io.RawIOBase):
+    """Write-only stream without tell and seek, like a pipe or a socket."""
+    def __init__(self):
+        self.data = bytearray()
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self.data += data
+        return len(data)
+
+def layout(core):
+    return core.pictureDrawer.Layout(core.plotMetadata, core.solver, core.plotWidth, core.plotHeight)
+
+def pdfObjects(pdf):
+    """Checks the cross-reference table of a PDF file and returns its objects by number."""
+    startxref = int(re.search(rb"startxref\n(\d+)\n%%EOF\n$", pdf).group(1))
+    assert pdf[startxref:startxref + 5] == b"xref\n"
+    header = re.match(rb"xref\n0 (\d+)\n", pdf[startxref:])
+    count = int(header.group(1))
+    entries = pdf[startxref + header.end():].split(b"\n")[:count]
+    assert entries[0] == b"0000000000 65535 f "
+    objects = {}
+    for number, entry in enumerate(entries[1:], start=1):
+        assert len(entry) == 19 and entry.endswith(b" 00000 n ")
+        offset = int(entry[:10])
+        assert pdf[offset:].startswith(b"%d 0 obj\n" % number)
+        objects[number] = pdf[offset:pdf.index(b"endobj\n", offset)]
+    assert re.search(rb"trailer\n<< /Size %d /Root 1 0 R >>" % count, pdf)
+    return objects
+
+@pytest.mark.parametrize("chart", ["bar", "histogram", "line", "candlestick"])
+def test_svg_is_well_formed(charts, chart):
+    core = charts[chart]
+    svg = core.pictureDrawer.RenderBytes(core.plotMetadata, core.solver, core.plotWidth, core.plotHeight, "svg")
+    root = ElementTree.fromstring(svg)
+    assert root.tag == f"{SVG}svg"
+    assert (root.get("width"), root.get("height")) == (str(core.plotWidth), str(core.plotHeight))
+    texts = [element.text for element in root.iter(f"{SVG}text")]
+    assert core.plotMetadata.title in texts
+
+def test_svg_escapes_texts(charts):
+    core = charts["bar"]
+    core.plotMetadata.title = 'Sales & <"costs">'
+    root = ElementTree.fromstring(core.pictureDrawer.RenderBytes(core.plotMetadata, core.solver, core.plotWidth, core.plotHeight, "svg"))
+    assert 'Sales & <"costs">' in [element.text for element in root.iter(f"{SVG}text")]
+
+def test_svg_bars(charts):
+    core = charts["bar"]
+    root = ElementTree.fromstring(core.pictureDrawer.RenderBytes(core.plotMetadata, core.solver, core.plotWidth, core.plotHeight, "svg"))
+    filled = [element for group in root.iter(f"{SVG}g") if group.get("fill") not in (None, "none", "black", "#000000") for element in group.iter(f"{SVG}rect")]
+    assert len(filled) == len(core.solver.GetRectangleDataAsList())
+
+@pytest.mark.parametrize("chart", ["bar", "histogram", "line", "candlestick"])
+def test_pdf_cross_reference_table(charts, chart):
+    core = charts[chart]
+    pdf = core.pictureDrawer.RenderBytes(core.plotMetadata, core.solver, core.plotWidth, core.plotHeight, "pdf")
+    assert pdf.startswith(b"%PDF-1.4\n")
+    objects = pdfObjects(pdf)
+    assert b"/MediaBox [0 0 %d %d]" % (core.plotWidth, core.plotHeight) in objects[3]
+    stream = objects[4]
+    data = stream[stream.index(b"stream\n") + 7:stream.rindex(b"\nendstream")]
+    length = int(objects[5].split(b"\n")[1])
+    assert len(data) == length
+    content = zlib.decompress(data)
+    assert b" re f" in content and b"BT" in content
+
+def test_writers_do_not_need_seekable_streams(charts):
+    picture = layout(charts["line"])
+    for writer in (SVGWriter(chunkSize=3), PDFWriter(chunkSize=3)):
+        stream, seekable = UnseekableStream(), io.BytesIO()
+        writer.WriteStream(picture, stream)
+        writer.WriteStream(picture, seekable)
+        assert bytes(stream.data) == seekable.getvalue()
+    pdfObjects(bytes(stream.data))
+
+def svgRectangles(svg):
+    return sorted(ElementTree.tostring(element) for element in ElementTree.fromstring(svg).iter(f"{SVG}rect"))
+
+def test_chunks_do_not_change_the_picture(charts):
+    picture = layout(charts["candlestick"])
+    small, large = io.BytesIO(), io.BytesIO()
+    SVGWriter(chunkSize=2).WriteStream(picture, small)
+    SVGWriter().WriteStream(picture, large)
+    assert svgRectangles(small.getvalue()) == svgRectangles(large.getvalue())